@@ -0,0 +1,193 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from downloader import YouTubeDownloader
+from logger import get_logger
+
+class AsyncYouTubeDownloader:
+    """asyncio 서비스에서 사용할 수 있는 YouTubeDownloader 비동기 래퍼"""
+
+    def __init__(self, download_path="downloads", cookies_file=None, max_workers=2,
+                 progress_queue_size=100, downloader_factory=None):
+        """
+        비동기 다운로더 초기화
+
+        동시에 실행되는 작업은 max_workers개로 제한되며, 그 이상의 호출은
+        스레드를 점유하지 않고 이벤트 루프에서 대기합니다.
+
+        Args:
+            download_path (str): 다운로드 폴더
+            cookies_file (str): 쿠키 파일 경로 (선택)
+            max_workers (int): 동시에 실행할 최대 작업 수
+            progress_queue_size (int): 진행률 구독자별 최대 대기 이벤트 수
+            downloader_factory: YouTubeDownloader를 만드는 함수 (선택)
+        """
+        self.download_path = download_path
+        self.cookies_file = cookies_file
+        self.max_workers = max_workers
+        self.progress_queue_size = progress_queue_size
+        self.downloader_factory = downloader_factory or self._default_downloader_factory
+        self.logger = get_logger()
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='async-download')
+        self._semaphore = None  # 이벤트 루프 안에서 처음 사용할 때 생성
+        self._idle_downloaders = []
+        self._downloaders = []
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def download_video(self, url, quality='best', info=None):
+        """비디오 다운로드 (download_video와 동일, 취소 가능)"""
+        return await self._run(url, 'download_video', url, quality, info=info)
+
+    async def download_subtitles(self, url, languages=['ko', 'en'], info=None):
+        """자막 다운로드 (download_subtitles와 동일, 취소 가능)"""
+        return await self._run(url, 'download_subtitles', url, languages, info=info)
+
+    async def download_video_with_subtitles(self, url, quality='best', subtitle_langs=['ko', 'en'], info=None):
+        """비디오+자막 다운로드 (download_video_with_subtitles와 동일, 취소 가능)"""
+        return await self._run(url, 'download_video_with_subtitles', url, quality, subtitle_langs, info=info)
+
+    async def get_video_info(self, url, info=None):
+        """비디오 정보 가져오기"""
+        return await self._run(url, 'get_video_info', url, info=info)
+
+    async def get_available_subtitles(self, url, info=None):
+        """사용 가능한 자막 목록 가져오기"""
+        return await self._run(url, 'get_available_subtitles', url, info=info)
+
+    async def extract_info(self, url):
+        """비디오 정보 추출 (다운로드 메서드에 info로 전달 가능)"""
+        return await self._run(url, 'extract_info', url)
+
+    async def progress_events(self):
+        """
+        진행률 이벤트를 비동기로 하나씩 반환 (set_progress_callback 대체)
+
+        각 이벤트는 yt-dlp 진행률 딕셔너리에 'url' 키를 더한 것입니다.
+        구독자가 따라오지 못하면 가장 오래된 이벤트부터 버립니다.
+
+        Yields:
+            dict: 진행률 이벤트
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.progress_queue_size)
+        subscriber = (loop, queue)
+
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+    async def close(self):
+        """실행 중인 작업이 끝나길 기다린 뒤 모든 리소스 정리"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            subscribers = list(self._subscribers)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown, True)
+
+        for downloader in self._downloaders:
+            downloader.close()
+
+        # 진행률 구독자에게 종료 알림
+        for subscriber in subscribers:
+            self._deliver(subscriber, None)
+
+    def _default_downloader_factory(self):
+        return YouTubeDownloader(download_path=self.download_path, cookies_file=self.cookies_file)
+
+    async def _run(self, url, method_name, *args, **kwargs):
+        """
+        다운로더 메서드를 작업자 스레드에서 실행
+
+        코루틴이 취소되면 다운로더의 cancel_flag를 설정하고, 스레드 작업이
+        실제로 멈출 때까지 기다린 뒤 CancelledError를 다시 발생시킵니다.
+        """
+        if self._closed:
+            raise RuntimeError("AsyncYouTubeDownloader가 이미 종료되었습니다.")
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            downloader = self._checkout()
+            cancel_flag = threading.Event()
+            downloader.set_cancel_flag(cancel_flag)
+            downloader.set_progress_callback(lambda d: self._publish(url, d))
+
+            method = getattr(downloader, method_name)
+            future = loop.run_in_executor(self._executor, lambda: method(*args, **kwargs))
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                cancel_flag.set()
+                self.logger.info(f"비동기 작업 취소 요청: {method_name} {url}")
+                # 작업자 스레드가 취소 플래그를 확인하고 끝날 때까지 대기
+                await asyncio.wait({future})
+                raise
+            finally:
+                self._checkin(downloader)
+
+    def _checkout(self):
+        with self._lock:
+            if self._idle_downloaders:
+                return self._idle_downloaders.pop()
+
+        downloader = self.downloader_factory()
+        with self._lock:
+            self._downloaders.append(downloader)
+        return downloader
+
+    def _checkin(self, downloader):
+        downloader.set_cancel_flag(None)
+        downloader.set_progress_callback(None)
+        with self._lock:
+            self._idle_downloaders.append(downloader)
+
+    def _publish(self, url, d):
+        """작업자 스레드에서 받은 진행률을 구독자의 이벤트 루프로 전달"""
+        event = dict(d)
+        event['url'] = url
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            self._deliver(subscriber, event)
+
+    def _deliver(self, subscriber, event):
+        loop, queue = subscriber
+
+        def put():
+            if event is not None and queue.full():
+                queue.get_nowait()
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # 종료 알림은 반드시 전달
+                queue.get_nowait()
+                queue.put_nowait(event)
+
+        try:
+            loop.call_soon_threadsafe(put)
+        except RuntimeError:
+            # 구독자의 이벤트 루프가 이미 닫힘
+            pass
@@ -0,0 +1,316 @@
+import itertools
+import threading
+import time
+from datetime import datetime
+from logger import get_logger
+
+# 현재 스레드에서 진행 중인 다운로드의 대역폭 작업 (구간 다운로더가 작업자 스레드에 전달)
+_local = threading.local()
+
+def current_job():
+    """현재 스레드의 대역폭 작업 (없으면 None)"""
+    return getattr(_local, 'job', None)
+
+class BandwidthProfile:
+    """시간대별 전체 속도 제한 (예: 업무 시간 09:00-18:00에는 2MB/s)"""
+
+    def __init__(self, start, end, limit):
+        """
+        Args:
+            start (str): 시작 시각 'HH:MM'
+            end (str): 종료 시각 'HH:MM' (시작보다 이르면 자정을 넘김)
+            limit (float): 전체 속도 제한 (bytes/s, 0이면 제한 없음)
+        """
+        self.start = self._minutes(start)
+        self.end = self._minutes(end)
+        self.limit = limit
+
+    @classmethod
+    def from_dict(cls, data, unit=1024):
+        """설정 항목 {'start': '09:00', 'end': '18:00', 'limit': 2048} (limit 단위: KB/s)"""
+        return cls(data['start'], data['end'], float(data.get('limit') or 0) * unit)
+
+    def matches(self, now):
+        minutes = now.hour * 60 + now.minute
+        if self.start <= self.end:
+            return self.start <= minutes < self.end
+        return minutes >= self.start or minutes < self.end
+
+    def _minutes(self, value):
+        hours, minutes = str(value).split(':')
+        return int(hours) * 60 + int(minutes)
+
+class BandwidthJob:
+    """대역폭 관리자에 등록된 다운로드 하나 (작업별 토큰 버킷)"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, manager, weight=1.0, cancel_event=None):
+        self.id = next(self._ids)
+        self.manager = manager
+        self.weight = max(float(weight or 1.0), 0.01)
+        self.cancel_event = cancel_event
+        self.rate = 0.0  # 할당된 속도 (bytes/s, 0이면 제한 없음)
+        self.usage = None  # 최근 사용 속도 (bytes/s, 측정 전에는 None)
+        self.starved = False  # 최근 할당량이 부족해 기다렸는지 여부
+        # 구간 다운로더처럼 받은 즉시 consume()을 호출하는 경우 진행률 훅은 측정하지 않음
+        self.external_metering = False
+
+        self._tokens = 0.0
+        self._refilled_at = None
+        self._throttled = False
+        self._used_bytes = 0
+        self._offsets = {}  # 파일별 마지막 downloaded_bytes
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes):
+        """
+        받은 바이트 수만큼 토큰 사용 (할당 속도를 넘으면 대기)
+
+        제한 변경과 취소가 바로 반영되도록 짧게 나누어 기다립니다.
+        """
+        self.manager._record_usage(self, nbytes)
+        first = True
+        while True:
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                return
+            self.manager._maybe_reallocate()
+            with self._lock:
+                now = self.manager.clock()
+                rate = self.rate
+                if rate <= 0:
+                    self._tokens = 0.0
+                    self._refilled_at = now
+                    return
+                if self._refilled_at is not None:
+                    capacity = rate * self.manager.burst_seconds
+                    self._tokens = min(capacity, self._tokens + (now - self._refilled_at) * rate)
+                self._refilled_at = now
+                if first:
+                    self._tokens -= nbytes
+                    first = False
+                if self._tokens >= 0:
+                    return
+                # 할당량을 다 쓰고 기다리는 작업은 더 많은 대역폭이 필요한 작업으로 분류
+                self._throttled = True
+                wait = -self._tokens / rate
+            if wait <= self.manager.max_sleep:
+                self.manager.sleep(wait)
+                return
+            self.manager.sleep(self.manager.max_sleep)
+
+    def on_progress(self, d):
+        """yt-dlp 진행률 훅 (받은 양의 증가분만큼 consume)"""
+        if self.external_metering or d.get('status') != 'downloading':
+            return
+        downloaded = d.get('downloaded_bytes')
+        if downloaded is None:
+            return
+        key = d.get('tmpfilename') or d.get('filename')
+        with self._lock:
+            previous = self._offsets.get(key)
+            self._offsets[key] = downloaded
+        # 첫 보고는 이어받기로 이미 있던 크기일 수 있으므로 기준점으로만 사용
+        if previous is not None and downloaded > previous:
+            self.consume(downloaded - previous)
+
+class BandwidthManager:
+    """동시에 실행 중인 모든 다운로드가 공유하는 전체 대역폭 관리자"""
+
+    def __init__(self, limit=0, profiles=None, reallocate_interval=0.5, burst_seconds=0.5,
+                 min_rate=16 * 1024, headroom=1.25, satisfied_ratio=0.9,
+                 clock=time.monotonic, sleep=time.sleep, now=datetime.now):
+        """
+        대역폭 관리자 초기화
+
+        전체 제한을 작업별 가중치로 나누되, 할당량보다 적게 쓰는 작업의 남는 몫은
+        다른 작업에 다시 나눕니다(최대-최소 공정 분배). 시간대 프로필이 맞으면
+        기본 제한 대신 프로필의 제한을 사용합니다.
+
+        Args:
+            limit (float): 전체 속도 제한 (bytes/s, 0이면 제한 없음)
+            profiles (list): BandwidthProfile 목록 (앞쪽이 우선)
+            reallocate_interval (float): 작업별 할당을 다시 계산하는 간격 (초)
+            burst_seconds (float): 작업별로 몰아서 받을 수 있는 양 (할당 속도 x 초)
+            min_rate (float): 작업 하나에 보장하는 최소 속도 (bytes/s)
+            headroom (float): 적게 쓰는 작업에 사용량보다 더 주는 비율 (속도를 올릴 여유)
+            satisfied_ratio (float): 사용량이 몫의 이 비율 미만이면 더 필요 없는 작업으로 판단
+        """
+        self.limit = limit
+        self.profiles = list(profiles or [])
+        self.reallocate_interval = reallocate_interval
+        self.burst_seconds = burst_seconds
+        self.min_rate = min_rate
+        self.headroom = headroom
+        self.satisfied_ratio = satisfied_ratio
+        self.max_sleep = 0.25
+        self.clock = clock
+        self.sleep = sleep
+        self.now = now
+        self.logger = get_logger()
+
+        self._jobs = []
+        self._allocated_at = None
+        self._last_limit = None
+        self._lock = threading.Lock()
+
+    def configure(self, limit=None, profiles=None):
+        """
+        실행 중에 제한 변경 (진행 중인 다운로드에도 바로 적용)
+
+        Args:
+            limit (float): 전체 속도 제한 (bytes/s, 0이면 제한 없음)
+            profiles (list): BandwidthProfile 목록
+        """
+        with self._lock:
+            if limit is not None:
+                self.limit = max(float(limit), 0.0)
+            if profiles is not None:
+                self.profiles = list(profiles)
+        self._reallocate()
+
+    def configure_from_config(self, config):
+        """설정의 bandwidth_limit(KB/s)와 bandwidth_profiles 적용"""
+        profiles = []
+        for data in config.get('bandwidth_profiles') or []:
+            try:
+                profiles.append(BandwidthProfile.from_dict(data))
+            except (KeyError, ValueError) as e:
+                self.logger.warning(f"잘못된 대역폭 프로필 무시: {data} ({e})")
+        self.configure(limit=float(config.get('bandwidth_limit') or 0) * 1024, profiles=profiles)
+
+    def current_limit(self):
+        """지금 적용되는 전체 속도 제한 (bytes/s, 0이면 제한 없음)"""
+        now = self.now()
+        for profile in self.profiles:
+            if profile.matches(now):
+                return profile.limit
+        return self.limit
+
+    def register(self, weight=1.0, cancel_event=None):
+        """
+        다운로드 등록
+
+        Args:
+            weight (float): 대역폭 가중치 (2면 1인 작업의 두 배)
+            cancel_event: 설정되면 대기를 멈출 threading.Event (선택)
+
+        Returns:
+            BandwidthJob: 등록된 작업
+        """
+        job = BandwidthJob(self, weight, cancel_event)
+        with self._lock:
+            self._jobs.append(job)
+        self._reallocate()
+        return job
+
+    def unregister(self, job):
+        """다운로드 등록 해제 (남은 작업에 대역폭 재분배)"""
+        with self._lock:
+            if job in self._jobs:
+                self._jobs.remove(job)
+        self._reallocate()
+
+    def allocations(self):
+        """작업별 할당 속도 {작업 ID: bytes/s}"""
+        with self._lock:
+            return {job.id: job.rate for job in self._jobs}
+
+    def attach(self, ydl, weight_getter=None, cancel_event_getter=None):
+        """
+        YoutubeDL 인스턴스의 다운로드를 대역폭 관리자에 등록
+
+        다운로드(dl)마다 작업을 등록하고 진행률 훅에서 받은 양만큼 대기시킵니다.
+        """
+        original_dl = ydl.dl
+
+        def managed_dl(name, info, subtitle=False, test=False):
+            if test:
+                return original_dl(name, info, subtitle=subtitle, test=test)
+
+            weight = weight_getter() if weight_getter else 1.0
+            cancel_event = cancel_event_getter() if cancel_event_getter else None
+            job = self.register(weight, cancel_event)
+            previous_job = current_job()
+            _local.job = job
+            ydl._progress_hooks.append(job.on_progress)
+            try:
+                return original_dl(name, info, subtitle=subtitle, test=test)
+            finally:
+                ydl._progress_hooks.remove(job.on_progress)
+                _local.job = previous_job
+                self.unregister(job)
+
+        ydl.dl = managed_dl
+        return ydl
+
+    def _record_usage(self, job, nbytes):
+        with job._lock:
+            job._used_bytes += nbytes
+
+    def _maybe_reallocate(self):
+        if self._allocated_at is None or self.clock() - self._allocated_at >= self.reallocate_interval:
+            self._reallocate()
+
+    def _reallocate(self):
+        """가중치 기반 최대-최소 공정 분배로 작업별 속도 다시 계산"""
+        with self._lock:
+            now = self.clock()
+            elapsed = None if self._allocated_at is None else now - self._allocated_at
+            self._allocated_at = now
+
+            # 최근 사용 속도 측정
+            for job in self._jobs:
+                with job._lock:
+                    used, job._used_bytes = job._used_bytes, 0
+                    job.starved, job._throttled = job._throttled, False
+                if elapsed and elapsed > 0:
+                    measured = used / elapsed
+                    job.usage = measured if job.usage is None else (job.usage + measured) / 2
+
+            limit = self.current_limit()
+            if limit != self._last_limit:
+                self.logger.info(f"전체 다운로드 속도 제한: {self._format_rate(limit)}")
+                self._last_limit = limit
+
+            if limit <= 0:
+                for job in self._jobs:
+                    job.rate = 0.0
+                return
+
+            remaining = float(limit)
+            active = list(self._jobs)
+            while active:
+                share = remaining / sum(job.weight for job in active)
+                # 몫보다 적게 쓰는 작업은 사용량(+여유)만 주고, 남는 몫은 나머지 작업에 재분배
+                satisfied = [
+                    job for job in active
+                    if job.usage is not None and not job.starved
+                    and job.usage < share * job.weight * self.satisfied_ratio
+                ]
+                if not satisfied:
+                    break
+                for job in satisfied:
+                    job.rate = min(max(job.usage * self.headroom, self.min_rate), share * job.weight)
+                    remaining -= job.rate
+                    active.remove(job)
+
+            if active:
+                total_weight = sum(job.weight for job in active)
+                for job in active:
+                    job.rate = max(remaining * job.weight / total_weight, self.min_rate)
+
+    def _format_rate(self, rate):
+        if rate <= 0:
+            return "제한 없음"
+        return f"{rate / 1024:,.0f}KB/s"
+
+# 전역 대역폭 관리자 인스턴스 (프로세스 내 모든 다운로드가 공유)
+_manager_instance = None
+
+def get_bandwidth_manager():
+    """전역 대역폭 관리자 인스턴스 가져오기"""
+    global _manager_instance
+    if _manager_instance is None:
+        _manager_instance = BandwidthManager()
+    return _manager_instance
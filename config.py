@@ -1,5 +1,8 @@
+import atexit
+import copy
 import json
 import os
+import threading
 from pathlib import Path
 
 class Config:
@@ -11,18 +14,38 @@ class Config:
         'default_subtitle_lang': 'ko',
         'default_download_mode': 'video_only',
         'recent_urls': [],
-        'max_recent_urls': 10
+        'max_recent_urls': 10,
+        'request_rate_limit': 1.0,  # YouTube 요청 속도 제한 (초당 요청 수, 0이면 제한 없음)
+        'format_strategy': 'balanced',  # 포맷 선택 전략 (balanced, smallest, fastest)
+        'bandwidth_limit': 0,  # 전체 다운로드 속도 제한 (KB/s, 0이면 제한 없음)
+        'bandwidth_profiles': [],  # 시간대별 제한 [{'start': '09:00', 'end': '18:00', 'limit': 2048}, ...]
+        'content_store': False,  # 받은 파일을 내용 해시로 한 번만 보관하고 하드링크로 연결
+        'content_store_path': 'cache/content_store'  # 다운로드 폴더와 같은 디스크여야 공간이 절약됨
     }
     
-    def __init__(self, config_file='config.json'):
+    def __init__(self, config_file='config.json', save_delay=1.0):
         """
         설정 관리자 초기화
-        
+
+        변경한 값은 메모리에 모아 두었다가 마지막 변경 후 save_delay초가 지나거나 프로그램이
+        끝날 때 한 번에 저장합니다 (임시 파일에 쓴 뒤 이름을 바꾸므로 저장 중에 종료되어도
+        설정 파일이 깨지지 않음). 여러 작업 스레드에서 동시에 사용할 수 있습니다.
+
         Args:
             config_file (str): 설정 파일 경로
+            save_delay (float): 변경 후 저장까지 기다리는 시간 (초, 0이면 바로 저장)
         """
         self.config_file = config_file
+        self.save_delay = save_delay
         self.config = self._load_config()
+
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()  # 저장 순서 보장 (오래된 내용이 나중에 써지지 않도록)
+        self._dirty = False
+        self._timer = None
+        self._subscribers = []
+        # 저장하지 않은 변경은 종료 시 저장
+        atexit.register(self.flush)
     
     def _load_config(self):
         """설정 파일을 로드합니다. 없으면 기본값을 사용합니다."""
@@ -31,58 +54,154 @@ class Config:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     loaded_config = json.load(f)
                     # 기본값과 병합 (새로운 설정 항목 추가 대응)
-                    config = self.DEFAULT_CONFIG.copy()
+                    config = copy.deepcopy(self.DEFAULT_CONFIG)
                     config.update(loaded_config)
                     return config
             except Exception as e:
                 print(f"설정 파일 로드 실패: {e}")
                 print("기본 설정을 사용합니다.")
-                return self.DEFAULT_CONFIG.copy()
+                return copy.deepcopy(self.DEFAULT_CONFIG)
         else:
-            return self.DEFAULT_CONFIG.copy()
+            return copy.deepcopy(self.DEFAULT_CONFIG)
     
     def save_config(self):
-        """현재 설정을 파일에 저장합니다."""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"설정 파일 저장 실패: {e}")
-            return False
+        """현재 설정을 파일에 바로 저장합니다."""
+        with self._write_lock:
+            with self._lock:
+                self._cancel_timer()
+                self._dirty = False
+                data = json.dumps(self.config, indent=4, ensure_ascii=False)
+
+            temp_file = f"{self.config_file}.tmp"
+            try:
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(temp_file, self.config_file)
+                return True
+            except Exception as e:
+                print(f"설정 파일 저장 실패: {e}")
+                with self._lock:
+                    self._dirty = True
+                return False
+
+    def flush(self):
+        """저장하지 않은 변경이 있으면 바로 저장합니다."""
+        with self._lock:
+            if not self._dirty:
+                return True
+        return self.save_config()
+
+    def close(self):
+        """저장하지 않은 변경을 저장하고 종료 시 저장 등록을 해제합니다."""
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def subscribe(self, callback):
+        """
+        설정 변경 알림 등록
+
+        Args:
+            callback: callback(key, value) 형태의 함수 (값을 바꾼 스레드에서 호출됨,
+                      초기화로 삭제된 항목은 value가 None)
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """설정 변경 알림 해제"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _changed(self, changes):
+        """변경을 저장 예약하고 구독자에게 알림 (잠금 밖에서 호출)"""
+        if not changes:
+            return
+        with self._lock:
+            self._dirty = True
+            subscribers = list(self._subscribers)
+            if self.save_delay <= 0:
+                immediate = True
+            else:
+                immediate = False
+                # 마지막 변경 후 save_delay초 동안 변경이 없으면 저장 (연속 변경은 한 번만 저장)
+                self._cancel_timer()
+                self._timer = threading.Timer(self.save_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if immediate:
+            self.flush()
+
+        for key, value in changes:
+            for callback in subscribers:
+                try:
+                    callback(key, value)
+                except Exception as e:
+                    print(f"설정 변경 알림 실패 ({key}): {e}")
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
     
     def get(self, key, default=None):
         """설정 값을 가져옵니다."""
-        return self.config.get(key, default)
+        with self._lock:
+            return self.config.get(key, default)
     
     def set(self, key, value):
-        """설정 값을 변경하고 저장합니다."""
-        self.config[key] = value
-        self.save_config()
+        """설정 값을 변경합니다. (저장은 잠시 후 한 번에)"""
+        self.update({key: value})
+
+    def update(self, values):
+        """
+        여러 설정 값을 한 번에 변경합니다.
+
+        Args:
+            values (dict): 변경할 설정 {키: 값}
+        """
+        with self._lock:
+            changes = self._apply(values)
+        self._changed(changes)
+
+    def _apply(self, values):
+        """값이 바뀐 항목만 반영하고 (키, 값) 목록 반환 (잠금 안에서 호출)"""
+        changes = []
+        for key, value in values.items():
+            if key in self.config and self.config[key] == value:
+                continue
+            self.config[key] = value
+            changes.append((key, value))
+        return changes
     
     def add_recent_url(self, url):
         """최근 사용한 URL을 추가합니다."""
-        recent_urls = self.config.get('recent_urls', [])
-        
-        # 이미 있으면 제거 (맨 앞으로 이동하기 위해)
-        if url in recent_urls:
-            recent_urls.remove(url)
-        
-        # 맨 앞에 추가
-        recent_urls.insert(0, url)
-        
-        # 최대 개수 제한
-        max_recent = self.config.get('max_recent_urls', 10)
-        recent_urls = recent_urls[:max_recent]
-        
-        self.config['recent_urls'] = recent_urls
-        self.save_config()
+        with self._lock:
+            recent_urls = list(self.config.get('recent_urls', []))
+
+            # 이미 있으면 제거 (맨 앞으로 이동하기 위해)
+            if url in recent_urls:
+                recent_urls.remove(url)
+
+            # 맨 앞에 추가
+            recent_urls.insert(0, url)
+
+            # 최대 개수 제한
+            max_recent = self.config.get('max_recent_urls', 10)
+            recent_urls = recent_urls[:max_recent]
+            changes = self._apply({'recent_urls': recent_urls})
+        self._changed(changes)
     
     def get_recent_urls(self):
         """최근 사용한 URL 목록을 가져옵니다."""
-        return self.config.get('recent_urls', [])
+        return self.get('recent_urls', [])
     
     def reset_to_defaults(self):
-        """설정을 기본값으로 초기화합니다."""
-        self.config = self.DEFAULT_CONFIG.copy()
-        self.save_config()
+        """설정을 기본값으로 초기화합니다. (기본값에 없는 항목은 삭제)"""
+        defaults = copy.deepcopy(self.DEFAULT_CONFIG)
+        with self._lock:
+            changes = [(key, value) for key, value in defaults.items()
+                       if key not in self.config or self.config[key] != value]
+            changes += [(key, None) for key in self.config if key not in defaults]
+            self.config = defaults
+        self._changed(changes)
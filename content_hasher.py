@@ -0,0 +1,223 @@
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from logger import get_logger
+
+try:
+    import xxhash
+except ImportError:  # 선택 의존성 (없으면 zlib.crc32 사용)
+    xxhash = None
+
+class IncrementalHash:
+    """받는 순서대로 바이트를 넣어 SHA-256과 빠른 비암호 해시를 함께 계산"""
+
+    def __init__(self, fast=True):
+        """
+        Args:
+            fast (bool): 빠른 비암호 해시(xxh64, 없으면 crc32)도 함께 계산할지 여부
+        """
+        self._sha256 = hashlib.sha256()
+        self._fast = None
+        self._crc = 0
+        self.fast_algorithm = None
+        if fast:
+            if xxhash is not None:
+                self._fast = xxhash.xxh64()
+                self.fast_algorithm = 'xxh64'
+            else:
+                self.fast_algorithm = 'crc32'
+        self.size = 0
+
+    def update(self, data):
+        self._sha256.update(data)
+        if self._fast is not None:
+            self._fast.update(data)
+        elif self.fast_algorithm == 'crc32':
+            self._crc = zlib.crc32(data, self._crc)
+        self.size += len(data)
+
+    def sha256(self):
+        return self._sha256.hexdigest()
+
+    def fast_hash(self):
+        """'알고리즘:값' 형식 (예: 'xxh64:...', 'crc32:...'), 계산하지 않으면 None"""
+        if self.fast_algorithm is None:
+            return None
+        if self._fast is not None:
+            return f"{self.fast_algorithm}:{self._fast.hexdigest()}"
+        return f"crc32:{self._crc:08x}"
+
+    def to_dict(self):
+        return {'sha256': self.sha256(), 'fast_hash': self.fast_hash(), 'file_size': self.size}
+
+class _FileFollower:
+    """쓰는 중인 파일의 앞부분부터 새로 기록된 바이트만 읽어 해시에 넣음"""
+
+    def __init__(self, fast):
+        self.hash = IncrementalHash(fast)
+        self.offset = 0
+
+    def advance(self, path, upto=None, chunk_size=1024 * 1024):
+        """
+        path에서 현재 위치부터 upto까지 (없으면 파일 끝까지) 읽기
+
+        Returns:
+            bool: 계속 따라갈 수 있으면 True (파일이 줄어들면 False)
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return True
+        if size < self.offset:
+            return False  # 처음부터 다시 쓰는 중 (이어받기 실패 등)
+        limit = size if upto is None else min(upto, size)
+        if limit <= self.offset:
+            return True
+
+        # 방금 기록된 부분이라 디스크가 아닌 페이지 캐시에서 읽힘
+        # 열어 둔 채로 두면 Windows에서 .part 이름 변경이 실패하므로 매번 열고 닫음
+        with open(path, 'rb') as f:
+            f.seek(self.offset)
+            while self.offset < limit:
+                data = f.read(min(chunk_size, limit - self.offset))
+                if not data:
+                    break
+                self.hash.update(data)
+                self.offset += len(data)
+        return True
+
+class ContentHasher:
+    """다운로드와 동시에 파일 해시(SHA-256 + 빠른 해시)를 계산"""
+
+    def __init__(self, fast=True, chunk_size=1024 * 1024, max_results=256):
+        """
+        콘텐츠 해시 계산기 초기화
+
+        진행률 훅이 알려 주는 만큼 방금 기록된 바이트를 순서대로 읽어 해시를 갱신하므로,
+        다운로드가 끝난 뒤 수 GB 파일을 다시 읽지 않습니다. 여러 연결로 받는 구간
+        다운로드는 앞에서부터 빈틈없이 받은 부분(contiguous_bytes)까지만 따라갑니다.
+
+        Args:
+            fast (bool): 빠른 비암호 해시도 함께 계산할지 여부
+            chunk_size (int): 한 번에 읽는 크기 (bytes), 이만큼 쌓일 때마다 읽음
+            max_results (int): 아직 가져가지 않은 결과를 보관할 최대 개수
+        """
+        self.fast = fast
+        self.chunk_size = chunk_size
+        self.max_results = max_results
+        self.logger = get_logger()
+        self._results = OrderedDict()  # 절대 경로 -> (결과, 크기, 수정 시각)
+        self._lock = threading.Lock()
+
+    def attach(self, ydl, enabled_getter=None):
+        """
+        YoutubeDL 인스턴스의 파일 다운로드(dl)마다 해시를 함께 계산하도록 연결
+
+        결과는 최종 파일 경로로 result_for()에서 가져갑니다.
+
+        Args:
+            ydl: yt_dlp.YoutubeDL 인스턴스
+            enabled_getter: 해시 계산 여부를 반환하는 함수 (선택)
+        """
+        original_dl = ydl.dl
+
+        def hashing_dl(name, info, subtitle=False, test=False):
+            enabled = enabled_getter() if enabled_getter else True
+            if not enabled or subtitle or test or name == '-':
+                return original_dl(name, info, subtitle=subtitle, test=test)
+
+            follower = _FileFollower(self.fast)
+            state = {'valid': True, 'seen': False}
+
+            def hook(d):
+                if not state['valid'] or d.get('filename') != name:
+                    return
+                state['seen'] = True
+                if d.get('status') == 'downloading':
+                    upto = d.get('contiguous_bytes', d.get('downloaded_bytes'))
+                    path = d.get('tmpfilename') or name
+                    if upto is not None and upto - follower.offset < self.chunk_size:
+                        return
+                    state['valid'] = follower.advance(path, upto, self.chunk_size)
+
+            ydl._progress_hooks.append(hook)
+            try:
+                success, real_download = original_dl(name, info, subtitle=subtitle, test=test)
+            finally:
+                ydl._progress_hooks.remove(hook)
+
+            # 진행률을 보고하지 않은 경우(FFmpeg 구간 다운로드 등)는 파일을 따라가지 않음
+            if success and real_download and state['valid'] and state['seen']:
+                self._finish(name, follower)
+            return success, real_download
+
+        ydl.dl = hashing_dl
+        return ydl
+
+    def result_for(self, path):
+        """
+        다운로드 중에 계산한 해시 결과 가져오기
+
+        후처리(병합, 변환 등)로 파일이 바뀌었으면 None을 반환합니다.
+
+        Returns:
+            dict: {'sha256', 'fast_hash', 'file_size'} 또는 None
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._results.pop(key, None)
+        if entry is None:
+            return None
+        result, size, mtime = entry
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size != size or stat.st_mtime_ns != mtime:
+            return None
+        return result
+
+    def hash_file(self, path):
+        """
+        파일 전체를 읽어 해시 계산 (FFmpeg가 새로 만든 병합/변환 결과처럼 따라갈 수 없었던 경우)
+
+        Returns:
+            dict: {'sha256', 'fast_hash', 'file_size'}
+        """
+        digest = IncrementalHash(self.fast)
+        with open(path, 'rb') as f:
+            while True:
+                data = f.read(self.chunk_size)
+                if not data:
+                    break
+                digest.update(data)
+        return digest.to_dict()
+
+    def _finish(self, name, follower):
+        # 남은 부분 (마지막 훅 이후 기록분, 이름 변경 후 최종 파일)
+        if not follower.advance(name, None, self.chunk_size):
+            return
+        try:
+            stat = os.stat(name)
+        except OSError:
+            return
+        if stat.st_size != follower.offset:
+            self.logger.debug(f"해시 계산 중 파일이 바뀌어 결과를 버림: {name}")
+            return
+
+        with self._lock:
+            self._results[os.path.abspath(name)] = (follower.hash.to_dict(), stat.st_size, stat.st_mtime_ns)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+
+# 전역 해시 계산기 인스턴스
+_hasher_instance = None
+
+def get_content_hasher():
+    """전역 콘텐츠 해시 계산기 인스턴스 가져오기"""
+    global _hasher_instance
+    if _hasher_instance is None:
+        _hasher_instance = ContentHasher()
+    return _hasher_instance
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+from logger import get_logger
+
+class ContentStore:
+    """비디오 ID + 포맷 ID(받은 뒤에는 내용 해시)로 파일을 한 번만 보관하는 저장소"""
+
+    # Linux FICLONE ioctl (btrfs, XFS 등에서 블록을 공유하는 복사)
+    FICLONE = 0x40049409
+
+    def __init__(self, store_dir='cache/content_store', enabled=False):
+        """
+        콘텐츠 저장소 초기화
+
+        받은 파일은 objects/<해시 앞 2자리>/<SHA-256>.<확장자>로 한 번만 보관하고,
+        다운로드 폴더의 파일은 같은 내용을 가리키는 하드링크(안 되면 reflink)로 만듭니다.
+        같은 요청이 다시 오면 네트워크 없이 저장소에서 바로 링크를 만듭니다.
+
+        하드링크와 reflink는 같은 파일 시스템 안에서만 가능하므로 저장소는 다운로드 폴더와
+        같은 디스크에 두어야 공간이 절약됩니다.
+
+        Args:
+            store_dir (str): 저장소 폴더
+            enabled (bool): 사용 여부 (기본: 사용 안 함)
+        """
+        self.store_dir = store_dir
+        self.enabled = enabled
+        self.logger = get_logger()
+        self._index = None  # {'keys': {키: sha256}, 'objects': {sha256: 정보}}
+        self._lock = threading.RLock()
+
+    def configure(self, enabled=None, store_dir=None):
+        """
+        사용 여부나 저장소 위치 변경
+
+        Args:
+            enabled (bool): 사용 여부
+            store_dir (str): 저장소 폴더
+        """
+        with self._lock:
+            if enabled is not None:
+                self.enabled = bool(enabled)
+            if store_dir and store_dir != self.store_dir:
+                self.store_dir = store_dir
+                self._index = None
+
+    def configure_from_config(self, config):
+        """설정의 content_store(사용 여부)와 content_store_path 적용"""
+        self.configure(enabled=config.get('content_store'), store_dir=config.get('content_store_path'))
+
+    @property
+    def index_file(self):
+        return os.path.join(self.store_dir, 'index.json')
+
+    def lookup(self, keys):
+        """
+        키 목록 중 저장소에 있는 첫 번째 항목 찾기
+
+        보관된 파일이 없거나 크기/수정 시각이 기록과 다르면(링크된 파일을 직접 수정한 경우)
+        항목을 지우고 없는 것으로 처리합니다.
+
+        Args:
+            keys (list): 'video_id:...' 형식의 키 목록
+
+        Returns:
+            dict: {'sha256', 'path', 'name', 'size', ...} 또는 None
+        """
+        with self._lock:
+            index = self._load()
+            for key in keys:
+                sha256 = index['keys'].get(key)
+                if not sha256:
+                    continue
+                entry = index['objects'].get(sha256)
+                if entry is None:
+                    continue
+                path = self._object_path(sha256, entry.get('ext'))
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    stat = None
+                if stat is None or stat.st_size != entry.get('size') or stat.st_mtime_ns != entry.get('mtime'):
+                    self.logger.warning(f"저장소 파일이 없거나 바뀌어 항목 제거: {path}")
+                    self._drop_object(index, sha256)
+                    self._save(index)
+                    continue
+                return dict(entry, sha256=sha256, path=path)
+        return None
+
+    def materialize(self, entry, target_path):
+        """
+        저장소의 파일을 target_path에 링크로 만들기
+
+        target_path에 이미 파일이 있으면 같은 내용(크기와 SHA-256이 같음)일 때만 링크로 바꾸고,
+        다른 파일(제목이 같은 다른 영상, 사용자가 둔 파일 등)이면 지우지 않고
+        '이름 (1).확장자'처럼 비어 있는 새 이름에 만듭니다.
+
+        Returns:
+            tuple: (사용한 방법 ('existing', 'hardlink', 'reflink', 'copy'), 실제 경로)
+        """
+        source = entry['path']
+        os.makedirs(os.path.dirname(os.path.abspath(target_path)), exist_ok=True)
+        if os.path.exists(target_path):
+            if os.path.samefile(source, target_path):
+                return 'existing', target_path
+            if self._same_content(entry, target_path):
+                temp_path = f"{target_path}.restore"
+                method = self._link(source, temp_path, allow_copy=True)
+                os.replace(temp_path, target_path)
+                return method, target_path
+            target_path = self._free_path(target_path)
+            self.logger.info(f"같은 이름의 다른 파일이 있어 새 이름으로 복원: {target_path}")
+        return self._link(source, target_path, allow_copy=True), target_path
+
+    def _same_content(self, entry, path):
+        """path의 내용이 저장소 항목과 같은지 확인 (크기가 다르면 읽지 않음)"""
+        try:
+            if os.path.getsize(path) != entry.get('size'):
+                return False
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for data in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(data)
+        except OSError:
+            return False
+        return digest.hexdigest() == entry.get('sha256')
+
+    @staticmethod
+    def _free_path(path):
+        """path가 이미 있으면 '이름 (1).확장자'처럼 비어 있는 이름 반환"""
+        root, ext = os.path.splitext(path)
+        number = 1
+        while os.path.exists(f"{root} ({number}){ext}"):
+            number += 1
+        return f"{root} ({number}){ext}"
+
+    def add(self, path, keys, digest):
+        """
+        받은 파일을 저장소에 등록
+
+        같은 내용(SHA-256)이 이미 있으면 path를 기존 파일의 링크로 바꿔 중복 공간을 없애고,
+        없으면 path를 저장소에 링크합니다. 링크할 수 없으면(다른 디스크 등) 등록하지 않습니다.
+
+        Args:
+            path (str): 받은 파일
+            keys (list): 이 파일을 찾을 키 목록 (요청 키, 포맷 키)
+            digest (dict): {'sha256', 'fast_hash', 'file_size'}
+
+        Returns:
+            bool: 등록 여부
+        """
+        sha256 = (digest or {}).get('sha256')
+        if not sha256 or not os.path.isfile(path):
+            return False
+
+        ext = os.path.splitext(path)[1].lstrip('.')
+        with self._lock:
+            index = self._load()
+            object_path = self._object_path(sha256, ext)
+            try:
+                if os.path.exists(object_path):
+                    if not os.path.samefile(object_path, path):
+                        # 같은 내용이 이미 있으면 새로 받은 파일을 기존 파일의 링크로 교체
+                        temp_path = f"{path}.dedup"
+                        self._link(object_path, temp_path, allow_copy=False)
+                        os.replace(temp_path, path)
+                        self.logger.info(f"중복 파일을 저장소 링크로 교체: {path}")
+                else:
+                    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                    self._link(path, object_path, allow_copy=False)
+            except OSError as e:
+                self.logger.warning(f"저장소에 링크할 수 없어 등록하지 않음 (다운로드 폴더와 같은 디스크인지 확인): {e}")
+                if os.path.exists(f"{path}.dedup"):
+                    os.remove(f"{path}.dedup")
+                return False
+
+            stat = os.stat(object_path)
+            index['objects'][sha256] = {
+                'ext': ext,
+                'name': os.path.basename(path),
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'fast_hash': digest.get('fast_hash'),
+            }
+            for key in keys:
+                index['keys'][key] = sha256
+            self._save(index)
+        return True
+
+    def stats(self):
+        """저장소 통계 (키 수, 파일 수, 전체 크기)"""
+        with self._lock:
+            index = self._load()
+            return {
+                'keys': len(index['keys']),
+                'objects': len(index['objects']),
+                'total_size': sum(entry.get('size') or 0 for entry in index['objects'].values()),
+            }
+
+    def _link(self, source, target, allow_copy):
+        """하드링크 -> reflink -> (허용 시) 복사 순서로 시도"""
+        try:
+            os.link(source, target)
+            return 'hardlink'
+        except OSError as e:
+            error = e
+        if self._reflink(source, target):
+            return 'reflink'
+        if not allow_copy:
+            raise error
+        shutil.copy2(source, target)
+        return 'copy'
+
+    def _reflink(self, source, target):
+        if not sys.platform.startswith('linux'):
+            return False
+        import fcntl
+        try:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), self.FICLONE, src.fileno())
+            return True
+        except OSError:
+            if os.path.exists(target):
+                os.remove(target)
+            return False
+
+    def _object_path(self, sha256, ext):
+        name = f"{sha256}.{ext}" if ext else sha256
+        return os.path.join(self.store_dir, 'objects', sha256[:2], name)
+
+    def _drop_object(self, index, sha256):
+        index['objects'].pop(sha256, None)
+        for key in [key for key, value in index['keys'].items() if value == sha256]:
+            del index['keys'][key]
+
+    def _load(self):
+        if self._index is None:
+            self._index = {'keys': {}, 'objects': {}}
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._index['keys'].update(data.get('keys') or {})
+                self._index['objects'].update(data.get('objects') or {})
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"저장소 색인을 읽지 못해 새로 시작: {e}")
+        return self._index
+
+    def _save(self, index):
+        os.makedirs(self.store_dir, exist_ok=True)
+        temp_path = self.index_file + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(temp_path, self.index_file)
+
+# 전역 콘텐츠 저장소 인스턴스 (설정으로 켜기 전에는 사용하지 않음)
+_store_instance = None
+
+def get_content_store():
+    """전역 콘텐츠 저장소 인스턴스 가져오기"""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = ContentStore()
+    return _store_instance
@@ -0,0 +1,204 @@
+import os
+import threading
+from logger import get_logger
+
+class DownloadArchive:
+    """이미 다운로드한 (비디오 ID, 종류, 품질/언어) 목록"""
+
+    VIDEO = 'video'
+    SUBTITLE = 'subtitle'
+    AUDIO = 'audio'
+    CLIP = 'clip'
+
+    # 삭제 기록 줄의 접두사 (파일은 추가만 하고, 삭제는 표시 후 로드 시 정리)
+    REMOVED_PREFIX = '-'
+
+    def __init__(self, archive_file='cache/download_archive.txt'):
+        """
+        다운로드 아카이브 초기화
+
+        파일은 처음 사용할 때 한 번만 읽어 메모리의 딕셔너리로 유지하므로
+        확인은 네트워크 요청 없이 O(1)로 끝납니다.
+
+        Args:
+            archive_file (str): 아카이브 파일 경로
+        """
+        self.archive_file = archive_file
+        self.logger = get_logger()
+
+        self._entries = None  # (video_id, kind, variant) -> 파일 경로 (모르면 None)
+        self._lock = threading.RLock()
+
+    def contains(self, video_id, kind, variant, folder=None):
+        """
+        다운로드 완료 여부 확인
+
+        기록된 파일이 다운로드 폴더에서 삭제되었거나 파일 경로가 없는 기록(이전 버전)이면
+        기록도 제거하고 False를 반환합니다.
+
+        Args:
+            video_id (str): 비디오 ID
+            kind (str): 'video', 'subtitle', 'audio', 'clip'
+            variant (str): 비디오 품질, 자막 언어, 오디오 형식 또는 구간 (예: 'best@3600-3630')
+            folder (str): 저장할 폴더 (지정하면 이 폴더 안에 받은 파일만 완료로 봄)
+
+        Returns:
+            bool: 다운로드 완료 여부
+        """
+        key = (video_id, kind, variant)
+        with self._lock:
+            entries = self._load()
+            if key not in entries:
+                return False
+            path = entries[key]
+
+        if not path or not os.path.exists(path):
+            self.logger.info(f"아카이브 파일 없음, 다시 다운로드 대상: {path or (video_id, kind, variant)}")
+            self.remove(video_id, kind, variant)
+            return False
+        if folder is not None and not self._is_inside(path, folder):
+            self.logger.info(f"다른 폴더에 받은 파일이므로 다시 다운로드 대상: {path}")
+            return False
+        return True
+
+    @staticmethod
+    def _is_inside(path, folder):
+        folder = os.path.abspath(folder)
+        try:
+            return os.path.commonpath([folder, path]) == folder
+        except ValueError:
+            # Windows에서 드라이브가 다른 경우
+            return False
+
+    def is_complete(self, video_id, mode, quality='best', subtitle_langs=None, folder=None):
+        """
+        다운로드 모드 전체가 완료되었는지 확인
+
+        Args:
+            video_id (str): 비디오 ID
+            mode (str): 다운로드 모드 (video_only, subs_only, video_subs, audio_only, clip)
+            quality (str): 비디오 품질 (audio_only이면 오디오 형식, clip이면 구간 이름)
+            subtitle_langs (list): 자막 언어 목록
+            folder (str): 저장할 폴더 (선택, contains() 참고)
+
+        Returns:
+            bool: 모두 다운로드되어 있으면 True
+        """
+        if not video_id:
+            return False
+
+        if mode == 'audio_only':
+            return self.contains(video_id, self.AUDIO, quality, folder)
+        if mode == 'clip':
+            return self.contains(video_id, self.CLIP, quality, folder)
+        if mode in ('video_only', 'video_subs') and not self.contains(video_id, self.VIDEO, quality, folder):
+            return False
+        if mode in ('subs_only', 'video_subs'):
+            if not subtitle_langs:
+                return False
+            return all(self.contains(video_id, self.SUBTITLE, lang, folder) for lang in subtitle_langs)
+        return True
+
+    def add(self, video_id, kind, variant, path):
+        """
+        다운로드 완료 기록
+
+        Args:
+            video_id (str): 비디오 ID
+            kind (str): 'video', 'subtitle', 'audio', 'clip'
+            variant (str): 비디오 품질, 자막 언어, 오디오 형식 또는 구간
+            path (str): 저장된 파일 경로 (없으면 기록하지 않음 - 파일을 확인할 수 없는 기록은 영구히 완료로 남음)
+        """
+        if not video_id:
+            return
+        if not isinstance(path, str) or not path:
+            self.logger.debug(f"파일 경로를 모르는 다운로드는 아카이브에 기록하지 않음: {video_id} {kind} {variant}")
+            return
+
+        path = os.path.abspath(path)
+        key = (video_id, kind, variant)
+
+        with self._lock:
+            entries = self._load()
+            if entries.get(key, False) == path:
+                return
+            entries[key] = path
+            self._append('\t'.join([video_id, kind, variant, path or '']))
+
+    def remove(self, video_id, kind, variant):
+        """기록 하나 삭제"""
+        with self._lock:
+            if self._load().pop((video_id, kind, variant), False) is not False:
+                self._append('\t'.join([self.REMOVED_PREFIX, video_id, kind, variant]))
+
+    def remove_video(self, video_id):
+        """비디오 하나의 모든 기록 삭제"""
+        with self._lock:
+            for key in [key for key in self._load() if key[0] == video_id]:
+                self.remove(*key)
+
+    def clear(self):
+        """모든 기록 삭제"""
+        with self._lock:
+            self._entries = {}
+            if os.path.exists(self.archive_file):
+                os.remove(self.archive_file)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+
+        entries = {}
+        removed_lines = 0
+        if os.path.exists(self.archive_file):
+            try:
+                with open(self.archive_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        fields = line.rstrip('\n').split('\t')
+                        if fields[0] == self.REMOVED_PREFIX and len(fields) == 4:
+                            entries.pop(tuple(fields[1:]), None)
+                            removed_lines += 1
+                        elif len(fields) == 4:
+                            entries[tuple(fields[:3])] = fields[3] or None
+            except OSError as e:
+                self.logger.error(f"다운로드 아카이브 로드 실패: {e}")
+
+        self._entries = entries
+        if removed_lines:
+            self._rewrite()
+        return entries
+
+    def _append(self, line):
+        try:
+            directory = os.path.dirname(self.archive_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.archive_file, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        except OSError as e:
+            self.logger.error(f"다운로드 아카이브 기록 실패: {e}")
+
+    def _rewrite(self):
+        """삭제 표시를 정리하여 현재 기록만 남김"""
+        tmp_file = self.archive_file + '.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for (video_id, kind, variant), path in self._entries.items():
+                    f.write('\t'.join([video_id, kind, variant, path or '']) + '\n')
+            os.replace(tmp_file, self.archive_file)
+        except OSError as e:
+            self.logger.error(f"다운로드 아카이브 정리 실패: {e}")
+
+# 전역 아카이브 인스턴스
+_archive_instance = None
+
+def get_download_archive():
+    """전역 다운로드 아카이브 인스턴스 가져오기"""
+    global _archive_instance
+    if _archive_instance is None:
+        _archive_instance = DownloadArchive()
+    return _archive_instance
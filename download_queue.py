@@ -0,0 +1,602 @@
+import itertools
+from collections import deque
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from downloader import YouTubeDownloader
+from history import get_history
+from job_journal import JobJournal, partial_bytes, get_job_journal
+from logger import get_logger
+from security import get_validator
+from section_downloader import SectionDownloader
+
+class DownloadJob:
+    """다운로드 작업 하나의 상태"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+    _ids = itertools.count(1)
+
+    def __init__(self, url, mode='video_only', quality='best', subtitle_langs=None, download_path=None,
+                 weight=1.0):
+        """
+        다운로드 작업 생성
+
+        Args:
+            url (str): YouTube URL
+            mode (str): 다운로드 모드 (video_only, subs_only, video_subs, audio_only, clip)
+            quality (str): 비디오 품질 (audio_only이면 오디오 형식, clip이면 'best@60-90'처럼 품질과 구간)
+            subtitle_langs (list): 자막 언어 목록 (기본: YouTubeDownloader.DEFAULT_SUBTITLE_LANGS)
+            download_path (str): 저장 경로 (None이면 큐의 기본 경로)
+            weight (float): 대역폭 가중치 (전체 속도 제한을 작업끼리 나누는 비율)
+        """
+        self.id = next(self._ids)
+        self.journal_id = None
+        self.url = url
+        self.mode = mode
+        self.quality = quality
+        self.subtitle_langs = list(subtitle_langs or YouTubeDownloader.DEFAULT_SUBTITLE_LANGS)
+        self.download_path = download_path
+        self.weight = weight
+
+        self.state = self.QUEUED
+        self.skipped = False  # 이미 다운로드되어 있어 건너뛰었는지 여부
+        self.file = None  # 받은 파일 정보 (file_path, file_size, sha256, fast_hash)
+        self.title = None
+        self.uploader = None
+        self.error = None
+        self.progress = {}
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+        self.cancel_event = threading.Event()
+        self._done_event = threading.Event()
+        self._done_callbacks = []
+
+    @property
+    def is_finished(self):
+        """작업 종료 여부"""
+        return self.state in self.FINISHED_STATES
+
+    def cancel(self):
+        """작업 취소 요청"""
+        self.cancel_event.set()
+
+    def wait(self, timeout=None):
+        """작업이 끝날 때까지 대기"""
+        return self._done_event.wait(timeout)
+
+    def add_done_callback(self, callback):
+        """작업이 끝나면 호출할 함수 등록 callback(job)"""
+        self._done_callbacks.append(callback)
+
+    def to_dict(self):
+        """작업 정보를 딕셔너리로 변환"""
+        return {
+            'id': self.id,
+            'url': self.url,
+            'mode': self.mode,
+            'quality': self.quality,
+            'subtitle_langs': self.subtitle_langs,
+            'weight': self.weight,
+            'state': self.state,
+            'skipped': self.skipped,
+            'title': self.title,
+            'error': self.error,
+        }
+
+class DownloadQueue:
+    """여러 URL을 동시에 처리하는 다운로드 큐"""
+
+    # 같은 서비스를 가리키는 호스트 이름 통합
+    HOST_ALIASES = {
+        'youtu.be': 'youtube.com',
+        'www.youtube.com': 'youtube.com',
+        'm.youtube.com': 'youtube.com',
+    }
+
+    def __init__(self, download_path='downloads', max_workers=3, per_host_limit=None,
+                 history=None, downloader_factory=None, on_job_update=None, on_progress=None,
+                 max_pending=None, journal=None):
+        """
+        다운로드 큐 초기화
+
+        Args:
+            download_path (str): 기본 저장 경로
+            max_workers (int): 동시에 실행할 최대 작업 수
+            per_host_limit (int): 호스트별 동시 작업 수 제한 (None이면 max_workers와 같음)
+            history: DownloadHistory 인스턴스 (None이면 전역 히스토리)
+            downloader_factory: 작업자별 YouTubeDownloader를 만드는 함수 (선택)
+            on_job_update: 작업 상태가 바뀔 때 호출할 함수 callback(job)
+            on_progress: 진행률 콜백 callback(job, progress_dict)
+            max_pending (int): 재생목록/채널 하나에서 미리 추가해 둘 최대 작업 수
+            journal: 작업 진행 상황을 기록할 JobJournal (선택, 비정상 종료 후 이어받기용)
+        """
+        self.download_path = download_path
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit or max_workers
+        self.history = history or get_history()
+        self.downloader_factory = downloader_factory or self._default_downloader_factory
+        self.on_job_update = on_job_update
+        self.on_progress = on_progress
+        self.max_pending = max_pending or max_workers * 4
+        self.journal = journal
+        self.logger = get_logger()
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='download')
+        self._local = threading.local()
+        self._downloaders = []
+        self._jobs = []
+        self._feeders = []
+        self._stopping = threading.Event()
+        self._host_running = {}  # 호스트별 실행 중(작업자에 넘긴) 작업 수
+        self._host_waiting = {}  # 호스트별 제한 때문에 기다리는 작업
+        self._lock = threading.Lock()
+
+    def submit(self, url, mode='video_only', quality='best', subtitle_langs=None, download_path=None, weight=1.0):
+        """
+        다운로드 작업 추가
+
+        Returns:
+            DownloadJob: 추가된 작업
+        """
+        return self._enqueue(DownloadJob(url, mode, quality, subtitle_langs, download_path, weight))
+
+    def resume_from_journal(self):
+        """
+        저널에 남은 미완료 작업을 다시 추가
+
+        같은 경로와 옵션으로 다시 실행하므로 yt-dlp가 남아 있는 .part 파일을
+        이어서 받습니다.
+
+        Returns:
+            list: 다시 추가한 DownloadJob 목록
+        """
+        if self.journal is None:
+            return []
+
+        jobs = []
+        for entry in self.journal.pending_jobs():
+            options = entry['options']
+            job = DownloadJob(
+                entry['url'],
+                mode=options.get('mode', 'video_only'),
+                quality=options.get('quality', 'best'),
+                subtitle_langs=options.get('subtitle_langs'),
+                download_path=options.get('download_path'),
+                weight=options.get('weight', 1.0),
+            )
+            job.journal_id = entry['id']
+
+            resumed_bytes = partial_bytes(entry)
+            self.logger.info(
+                f"중단된 작업 이어받기: {entry['url']} (단계: {entry['phase']}, "
+                f"이미 받은 크기: {resumed_bytes:,} bytes)"
+            )
+            jobs.append(self._enqueue(job))
+        return jobs
+
+    def submit_many(self, urls, **kwargs):
+        """여러 URL을 같은 옵션으로 추가"""
+        return [self.submit(url, **kwargs) for url in urls]
+
+    def submit_collection(self, url, **kwargs):
+        """
+        재생목록/채널 URL을 펼쳐 발견되는 항목부터 바로 작업으로 추가
+
+        항목 목록은 별도 스레드에서 페이지 단위로 가져오며, 아직 끝나지 않은
+        작업이 max_pending개를 넘으면 다음 항목을 가져오지 않고 기다립니다.
+
+        Args:
+            url (str): 재생목록 또는 채널 URL
+            **kwargs: submit()과 같은 작업 옵션
+
+        Returns:
+            threading.Thread: 항목을 추가하는 스레드
+        """
+        feeder = threading.Thread(
+            target=self._feed_collection, args=(url, kwargs),
+            name='collection-feeder', daemon=True
+        )
+        with self._lock:
+            self._feeders.append(feeder)
+        feeder.start()
+        return feeder
+
+    def _enqueue(self, job):
+        if self.journal is not None:
+            if job.journal_id is None:
+                job.journal_id = self.journal.new_job_id()
+            self.journal.begin(job.journal_id, job.url, {
+                'mode': job.mode,
+                'quality': job.quality,
+                'subtitle_langs': job.subtitle_langs,
+                'download_path': job.download_path or self.download_path,
+                'weight': job.weight,
+            })
+
+        with self._lock:
+            self._jobs.append(job)
+
+        self.logger.info(f"작업 추가 #{job.id} - URL: {job.url}, 모드: {job.mode}")
+        self._notify(job)
+        self._dispatch(job)
+        return job
+
+    def jobs(self):
+        """모든 작업 목록"""
+        with self._lock:
+            return list(self._jobs)
+
+    def counts(self):
+        """상태별 작업 수"""
+        result = {state: 0 for state in (DownloadJob.QUEUED, DownloadJob.RUNNING) + DownloadJob.FINISHED_STATES}
+        for job in self.jobs():
+            result[job.state] += 1
+        return result
+
+    def cancel_all(self):
+        """끝나지 않은 모든 작업 취소 (재생목록 항목 추가도 중단)"""
+        self._stopping.set()
+        for job in self.jobs():
+            if not job.is_finished:
+                job.cancel()
+
+    def wait(self, timeout=None):
+        """
+        모든 작업이 끝날 때까지 대기
+
+        Returns:
+            bool: 제한 시간 안에 모두 끝났는지 여부
+        """
+        deadline = None if timeout is None else time.time() + timeout
+
+        def remaining():
+            return None if deadline is None else max(0, deadline - time.time())
+
+        # 재생목록 항목 추가가 끝나야 전체 작업 목록이 확정됨
+        with self._lock:
+            feeders = list(self._feeders)
+        for feeder in feeders:
+            feeder.join(remaining())
+            if feeder.is_alive():
+                return False
+
+        for job in self.jobs():
+            if not job.wait(remaining()):
+                return False
+        return True
+
+    def shutdown(self, wait=True, cancel=False):
+        """큐 종료"""
+        if cancel:
+            self.cancel_all()
+        if wait:
+            with self._lock:
+                feeders = list(self._feeders)
+            for feeder in feeders:
+                feeder.join()
+        self._stopping.set()
+        self._executor.shutdown(wait=wait)
+
+        for downloader in self._downloaders:
+            downloader.close()
+
+    def _default_downloader_factory(self):
+        return YouTubeDownloader(download_path=self.download_path)
+
+    def _get_downloader(self):
+        """작업자 스레드마다 하나의 다운로더 사용 (취소 플래그/진행률 콜백 분리)"""
+        downloader = getattr(self._local, 'downloader', None)
+        if downloader is None:
+            downloader = self.downloader_factory()
+            self._local.downloader = downloader
+            with self._lock:
+                self._downloaders.append(downloader)
+        return downloader
+
+    def _host_key(self, url):
+        host = urlparse(url).netloc.lower()
+        return self.HOST_ALIASES.get(host, host)
+
+    def _dispatch(self, job):
+        """
+        호스트 자리가 있으면 작업자에게 넘기고, 없으면 호스트별 대기열에 보관
+
+        작업자 스레드 안에서 호스트 제한을 기다리면 다른 호스트 작업까지 막히므로
+        자리를 먼저 확보한 작업만 스레드 풀에 넘깁니다.
+        """
+        key = self._host_key(job.url)
+        with self._lock:
+            if self._host_running.get(key, 0) >= self.per_host_limit:
+                self._host_waiting.setdefault(key, deque()).append(job)
+                return
+            self._host_running[key] = self._host_running.get(key, 0) + 1
+        self._start(job)
+
+    def _release_host(self, job):
+        """끝난 작업의 호스트 자리를 같은 호스트의 다음 대기 작업에 넘김"""
+        key = self._host_key(job.url)
+        with self._lock:
+            waiting = self._host_waiting.get(key)
+            if not waiting:
+                self._host_running[key] -= 1
+                return
+            next_job = waiting.popleft()
+        self._start(next_job)
+
+    def _start(self, job):
+        try:
+            self._executor.submit(self._run_job, job)
+        except RuntimeError:
+            # 큐가 이미 종료됨
+            job.cancel()
+            self._set_state(job, DownloadJob.CANCELLED)
+            self._release_host(job)
+
+    def _notify(self, job):
+        if self.on_job_update:
+            try:
+                self.on_job_update(job)
+            except Exception as e:
+                self.logger.warning(f"작업 상태 콜백 오류: {e}")
+
+    def _set_state(self, job, state):
+        job.state = state
+        if state == DownloadJob.RUNNING:
+            job.started_at = time.time()
+        elif state in DownloadJob.FINISHED_STATES:
+            job.finished_at = time.time()
+        self._notify(job)
+        if state in DownloadJob.FINISHED_STATES:
+            job._done_event.set()
+            for callback in job._done_callbacks:
+                callback(job)
+
+    def _feed_collection(self, url, options):
+        downloader = self.downloader_factory()
+        pending = threading.Semaphore(self.max_pending)
+        count = 0
+
+        try:
+            for entry_url in downloader.iter_collection_entries(url):
+                # 처리 대기 중인 작업이 너무 많으면 다음 항목을 가져오기 전에 대기
+                while not pending.acquire(timeout=0.5):
+                    if self._stopping.is_set():
+                        return
+                if self._stopping.is_set():
+                    return
+
+                job = DownloadJob(entry_url, **options)
+                job.add_done_callback(lambda _job: pending.release())
+                self._enqueue(job)
+                count += 1
+        except Exception as e:
+            self.logger.error(f"재생목록/채널 항목 가져오기 실패: {url}, 에러: {e}")
+        finally:
+            self.logger.info(f"재생목록/채널 항목 {count}개 추가 완료: {url}")
+            downloader.close()
+
+    def _run_job(self, job):
+        try:
+            if job.cancel_event.is_set():
+                success = False
+            else:
+                self._set_state(job, DownloadJob.RUNNING)
+                success = self._execute(job)
+        except Exception as e:
+            job.error = str(e)
+            success = False
+            self.logger.error(f"작업 #{job.id} 실행 오류: {e}", exc_info=True)
+        finally:
+            self._release_host(job)
+
+        if job.cancel_event.is_set():
+            state = DownloadJob.CANCELLED
+        elif success:
+            job.error = None
+            state = DownloadJob.DONE
+        else:
+            state = DownloadJob.FAILED
+
+        if not job.skipped:
+            self._record_history(job, state)
+        if self.journal is not None:
+            self.journal.finish(job.journal_id, state)
+        self._set_state(job, state)
+
+    def _execute(self, job):
+        downloader = self._get_downloader()
+        downloader.download_path = job.download_path or self.download_path
+        downloader.set_cancel_flag(job.cancel_event)
+        downloader.set_progress_callback(lambda d: self._handle_progress(job, d))
+        downloader.bandwidth_weight = job.weight
+
+        # 이미 받은 항목은 정보 추출 없이 건너뜀 (다시 실행한 일괄 작업)
+        if downloader.is_archived(job.url, job.mode, job.quality, job.subtitle_langs):
+            job.skipped = True
+            self.logger.info(f"작업 #{job.id} 이미 다운로드됨, 건너뜀: {job.url}")
+            return True
+
+        # 콘텐츠 저장소에 있으면 정보 추출 없이 링크로 복원
+        if getattr(downloader, 'content_store', None) is not None and \
+                downloader.restore_from_store(job.url, job.mode, job.quality):
+            job.file = downloader.last_file
+            return True
+
+        if self.journal is not None:
+            self.journal.set_phase(job.journal_id, JobJournal.EXTRACTING)
+
+        # 정보는 한 번만 추출해서 제목 기록과 다운로드에 재사용
+        info = None
+        try:
+            info = downloader.extract_info(job.url)
+            job.title = info.get('title')
+            job.uploader = info.get('uploader')
+        except Exception as e:
+            job.error = str(e)
+
+        try:
+            if job.mode == 'subs_only':
+                return downloader.download_subtitles(job.url, job.subtitle_langs, info=info)
+            elif job.mode == 'video_subs':
+                return downloader.download_video_with_subtitles(job.url, job.quality, job.subtitle_langs, info=info)
+            elif job.mode == 'audio_only':
+                return downloader.download_audio(job.url, job.quality, info=info)
+            elif job.mode == 'clip':
+                quality, start, end = SectionDownloader.parse_variant(job.quality)
+                return downloader.download_section(job.url, start, end, quality, info=info)
+            return downloader.download_video(job.url, job.quality, info=info)
+        finally:
+            job.file = getattr(downloader, 'last_file', None)
+
+    def _handle_progress(self, job, d):
+        job.progress = d
+        if self.journal is not None:
+            self.journal.track_progress(job.journal_id, d)
+        if self.on_progress:
+            self.on_progress(job, d)
+
+    def _record_history(self, job, state):
+        status = {
+            DownloadJob.DONE: 'success',
+            DownloadJob.FAILED: 'failed',
+            DownloadJob.CANCELLED: 'cancelled',
+        }[state]
+
+        # 받은 파일 정보가 있으면 최종 파일 경로, 크기, 해시를 함께 기록 (없으면 저장 폴더)
+        file_info = (job.file or {}) if status == 'success' else {}
+        file_path = file_info.get('file_path') or (job.download_path or self.download_path)
+
+        try:
+            saved = self.history.add_download(
+                url=job.url,
+                title=job.title or 'Unknown',
+                mode=job.mode,
+                quality=job.quality if job.mode != 'subs_only' else None,
+                subtitle_langs=job.subtitle_langs if job.mode in ('subs_only', 'video_subs') else None,
+                file_path=file_path if status == 'success' else None,
+                file_size=file_info.get('file_size'),
+                status=status,
+                sha256=file_info.get('sha256'),
+                fast_hash=file_info.get('fast_hash'),
+                uploader=job.uploader
+            )
+            if saved is False:
+                self.logger.error(f"히스토리 기록 실패: 작업 #{job.id} {job.url}")
+        except Exception as e:
+            self.logger.error(f"히스토리 기록 실패: {e}")
+
+def read_url_file(path):
+    """
+    URL 목록 파일 읽기 (빈 줄과 # 주석 제외)
+
+    Args:
+        path (str): 파일 경로
+
+    Returns:
+        list: URL 목록
+    """
+    urls = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                urls.append(line)
+    return urls
+
+def run_batch(urls_file, mode='video_only', quality='best', subtitle_langs=None,
+              max_workers=3, download_path='downloads'):
+    """
+    URL 목록 파일의 모든 항목을 다운로드 큐로 처리
+
+    Returns:
+        int: 종료 코드 (모두 성공하면 0)
+    """
+    return run_urls(read_url_file(urls_file), mode=mode, quality=quality, subtitle_langs=subtitle_langs,
+                    max_workers=max_workers, download_path=download_path)
+
+def run_urls(urls, mode='video_only', quality='best', subtitle_langs=None,
+             max_workers=3, download_path='downloads'):
+    """
+    여러 URL(비디오, 재생목록, 채널)을 다운로드 큐로 처리
+
+    재생목록/채널은 항목이 발견되는 대로 작업자에게 전달됩니다.
+
+    Returns:
+        int: 종료 코드 (모두 성공하면 0)
+    """
+    validator = get_validator()
+
+    valid_urls = []
+    for url in urls:
+        is_valid, error_msg = validator.validate_youtube_url(url, allow_collections=True)
+        if is_valid:
+            valid_urls.append(url)
+        else:
+            print(f"⚠️  건너뜀: {url} ({error_msg})")
+
+    if not valid_urls:
+        print("다운로드할 URL이 없습니다.")
+        return 1
+
+    print(f"총 {len(valid_urls)}개 URL을 {max_workers}개 작업자로 다운로드합니다...")
+
+    options = {'mode': mode, 'quality': quality, 'subtitle_langs': subtitle_langs}
+
+    def submit_all(queue):
+        for url in valid_urls:
+            if validator.is_collection_url(url):
+                print(f"재생목록/채널 항목을 가져오는 중: {url}")
+                queue.submit_collection(url, **options)
+            else:
+                queue.submit(url, **options)
+
+    return _run_queue(submit_all, max_workers=max_workers, download_path=download_path)
+
+def run_resume(max_workers=3, download_path='downloads'):
+    """
+    비정상 종료로 끝나지 않은 작업을 저널에서 찾아 이어서 다운로드
+
+    Returns:
+        int: 종료 코드 (모두 성공하면 0)
+    """
+    pending = get_job_journal().pending_jobs()
+    if not pending:
+        print("이어받을 작업이 없습니다.")
+        return 0
+
+    print(f"중단된 작업 {len(pending)}개를 이어서 다운로드합니다...")
+    return _run_queue(lambda queue: queue.resume_from_journal(),
+                      max_workers=max_workers, download_path=download_path)
+
+def _run_queue(submit, max_workers, download_path):
+    """작업을 추가하고 모두 끝날 때까지 진행 상황 출력"""
+    def report(job):
+        if job.is_finished:
+            state = 'skipped' if job.skipped else job.state
+            print(f"[{state}] #{job.id} {job.title or job.url}")
+
+    queue = DownloadQueue(download_path=download_path, max_workers=max_workers,
+                          on_job_update=report, journal=get_job_journal())
+    try:
+        submit(queue)
+        queue.wait()
+    except KeyboardInterrupt:
+        print("\n취소 중...")
+        queue.cancel_all()
+        queue.wait()
+    finally:
+        queue.shutdown()
+
+    counts = queue.counts()
+    print(f"\n완료: {counts['done']}개 | 실패: {counts['failed']}개 | 취소: {counts['cancelled']}개")
+    return 0 if counts['done'] == len(queue.jobs()) else 1
@@ -1,8 +1,23 @@
 import yt_dlp
+import copy
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from logger import get_logger
 from security import get_validator
+from metadata_cache import get_metadata_cache
+from session_pool import YoutubeDLPool
+from rate_limiter import get_rate_limiter
+from postprocess_scheduler import get_postprocess_scheduler
+from download_archive import DownloadArchive, get_download_archive
+from format_selector import get_format_selector
+from segmented_downloader import get_segmented_downloader
+from fragment_tuner import get_fragment_tuner
+from bandwidth_manager import get_bandwidth_manager
+from subtitle_converter import SubtitleConverter
+from section_downloader import SectionDownloader, get_section_downloader
+from content_hasher import get_content_hasher
+from content_store import get_content_store
 import os
 import sys
 from logger import get_logger
@@ -10,11 +25,59 @@ import os
 import sys
 
 class YouTubeDownloader:
-    def __init__(self, download_path="downloads", cookies_file=None):
+    # 자막 일괄 다운로드 시 선호하는 포맷 순서
+    SUBTITLE_FORMAT_PREFERENCE = ['srt', 'vtt', 'srv3', 'srv2', 'srv1', 'json3', 'ttml']
+    # 오디오만 받을 때 FFmpeg로 변환할 수 있는 형식 ('best'는 원본 그대로 저장)
+    AUDIO_FORMATS = ['best', 'mp3', 'm4a', 'opus', 'flac', 'wav']
+    # 자막 언어를 지정하지 않았을 때 받는 언어 (CLI, 일괄/재생목록 큐 공통)
+    DEFAULT_SUBTITLE_LANGS = ('ko', 'en')
+
+    # SRT로 직접 변환할 때의 선호 순서 (자동 생성 자막의 롤업 중복이 없는 포맷 우선)
+    CONVERTIBLE_SUBTITLE_PREFERENCE = ['srt', 'json3', 'srv3', 'vtt', 'srv2', 'srv1', 'ttml']
+
+    def __init__(self, download_path="downloads", cookies_file=None, metadata_cache=None, rate_limiter=None,
+                 postprocess_scheduler=None, archive=None, content_store=None):
         self.download_path = download_path
         self.cookies_file = cookies_file or self._find_cookies()
+        self.ffmpeg_location = self._find_ffmpeg()
         self.logger = get_logger()
         self.validator = get_validator()
+        self.metadata_cache = metadata_cache or get_metadata_cache()
+        # YouTube 요청 속도 제한 (프로세스 전체 공유)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        # FFmpeg 병합/변환은 다운로드 수와 관계없이 CPU 코어 수만큼만 동시 실행 (프로세스 전체 공유)
+        self.postprocess_scheduler = postprocess_scheduler or get_postprocess_scheduler()
+        # 호출마다 새로 만들지 않고 옵션별로 재사용하는 YoutubeDL 세션
+        self.session_pool = YoutubeDLPool(factory=self._create_ydl)
+        # 이미 받은 비디오/자막은 네트워크 요청 없이 건너뜀
+        self.archive = archive if archive is not None else get_download_archive()
+        # 포맷 목록을 점수화하여 불필요한 병합과 전송량을 줄임 (전략은 전역 설정)
+        self.format_selector = get_format_selector()
+        # 크기가 큰 단일 파일(progressive) 포맷은 여러 연결로 구간을 나누어 동시에 받음
+        self.segmented_downloader = get_segmented_downloader()
+        self.segment_connections = 4
+        # DASH/HLS 조각 동시 다운로드 수는 처리량을 측정하여 호스트별로 자동 조절
+        self.fragment_tuner = get_fragment_tuner()
+        self.fragment_autotune = True
+        # 전체 대역폭은 실행 중인 모든 다운로드가 가중치에 따라 나누어 사용 (프로세스 전체 공유)
+        self.bandwidth_manager = get_bandwidth_manager()
+        self.bandwidth_weight = 1.0
+        # 구간(클립) 다운로드는 필요한 부분만 받음 (DASH는 겹치는 조각만, 단일 파일은 FFmpeg 탐색)
+        self.section_downloader = get_section_downloader()
+        # 받는 동안 파일 해시(SHA-256 + 빠른 해시)를 함께 계산하여 다 받은 뒤 다시 읽지 않음
+        self.content_hasher = get_content_hasher()
+        self.hash_downloads = True
+        # 받은 파일을 내용 해시로 한 번만 보관하고 다운로드 폴더에는 하드링크로 둠 (설정으로 켬)
+        self.content_store = content_store or get_content_store()
+        # 마지막으로 받은 파일 정보 (file_path, file_size, sha256, fast_hash), 히스토리 기록용
+        self.last_file = None
+
+        # 자막 일괄 다운로드: 한 번 추출한 정보에서 모든 언어의 자막 URL을 동시에 받음
+        self.bulk_subtitles = True
+        self.subtitle_connections = 3
+        # 받은 자막은 FFmpeg 없이 프로세스 안에서 SRT로 변환
+        self.convert_subtitles = True
+        self.subtitle_converter = SubtitleConverter()
 
         # 다운로드 폴더가 없으면 생성
         if not os.path.exists(download_path):
@@ -34,7 +97,10 @@ class YouTubeDownloader:
                 self.logger.warning(f"쿠키 파일 보안 경고: {warning}")
 
 
-    
+    def close(self):
+        """보관 중인 YoutubeDL 세션을 모두 종료합니다."""
+        self.session_pool.close()
+
     def _find_cookies(self):
         """쿠키 파일 자동 검색"""
         possible_locations = [
@@ -47,13 +113,9 @@ class YouTubeDownloader:
             if os.path.exists(location):
                 return location
         return None
-    
-    def _get_base_ydl_opts(self):
-        """기본 yt-dlp 옵션"""
-        opts = {
-            'outtmpl': f'{self.download_path}/%(title)s.%(ext)s',
-        }
 
+    def _find_ffmpeg(self):
+        """프로그램과 함께 배포된 FFmpeg 경로 검색 (없으면 None - PATH의 ffmpeg 사용)"""
         # PyInstaller 대응 FFmpeg 경로 처리
         if getattr(sys, 'frozen', False):
             base_path = sys._MEIPASS
@@ -68,7 +130,52 @@ class YouTubeDownloader:
         ffmpeg_path = os.path.join(base_path, ffmpeg_name)
 
         if os.path.exists(ffmpeg_path):
-            opts['ffmpeg_location'] = ffmpeg_path
+            return ffmpeg_path
+        return None
+
+    def _create_ydl(self, opts):
+        """세션 풀용 YoutubeDL 생성 (클립/구간 다운로드, 조각 동시 수 조절, 대역폭 관리, 해시 계산, FFmpeg 후처리 스케줄러 연결)"""
+        ydl = yt_dlp.YoutubeDL(opts).__enter__()
+        self.section_downloader.attach(ydl, run_ffmpeg=self.run_ffmpeg)
+        self.segmented_downloader.attach(ydl, cancel_event_getter=lambda: getattr(self, 'cancel_flag', None))
+        self.fragment_tuner.attach(ydl)
+        self.bandwidth_manager.attach(
+            ydl, weight_getter=lambda: self.bandwidth_weight,
+            cancel_event_getter=lambda: getattr(self, 'cancel_flag', None)
+        )
+        self.content_hasher.attach(ydl, enabled_getter=lambda: self.hash_downloads)
+        return self.postprocess_scheduler.attach(ydl, lambda: getattr(self, 'cancel_flag', None))
+
+    def run_ffmpeg(self, args, step='ffmpeg'):
+        """
+        ffmpeg 명령을 후처리 스케줄러를 통해 실행
+
+        Args:
+            args (list): ffmpeg 인자 (실행 파일 제외)
+            step (str): 단계 이름 (처리 시간 기록용)
+
+        Returns:
+            subprocess.CompletedProcess: 실행 결과
+        """
+        return self.postprocess_scheduler.run_ffmpeg(
+            args, ffmpeg_location=self.ffmpeg_location, step=step,
+            cancel_event=getattr(self, 'cancel_flag', None)
+        )
+    
+    def _get_base_ydl_opts(self):
+        """기본 yt-dlp 옵션"""
+        opts = {
+            'outtmpl': f'{self.download_path}/%(title)s.%(ext)s',
+            # 중단된 다운로드는 남아 있는 .part 파일에서 이어받기
+            'continuedl': True,
+            # 구간 다운로드 동시 연결 수 (0이면 yt-dlp 기본 다운로더만 사용)
+            'segmented_connections': self.segment_connections,
+            # 조각(DASH/HLS) 동시 다운로드 수 자동 조절
+            'fragment_autotune': self.fragment_autotune,
+        }
+
+        if self.ffmpeg_location:
+            opts['ffmpeg_location'] = self.ffmpeg_location
         
         # Node.js 경로 자동 감지 및 설정
         import shutil
@@ -109,26 +216,343 @@ class YouTubeDownloader:
         if hasattr(self, 'progress_callback') and self.progress_callback:
             self.progress_callback(d)
 
-    
-    def download_video(self, url, quality='best'):
+    def _acquire_request_slot(self):
+        """공유 속도 제한기에서 YouTube 요청 허가를 받습니다."""
+        cancel_flag = getattr(self, 'cancel_flag', None)
+        if not self.rate_limiter.acquire(cancel_event=cancel_flag):
+            raise Exception("사용자가 다운로드를 취소했습니다.")
+
+    def extract_info(self, url):
+        """
+        비디오 정보를 한 번만 추출합니다. (다운로드 없음)
+
+        반환된 info 딕셔너리를 다른 메서드의 info 인자로 넘기면
+        포맷 선택, 비디오 다운로드, 자막 확인, 자막 다운로드가
+        추가 추출 없이 같은 정보를 재사용합니다.
+        비디오 ID별로 메타데이터 캐시를 먼저 확인하며, 캐시 적중 시
+        네트워크 요청이 없습니다.
+
+        Args:
+            url (str): YouTube 비디오 URL
+
+        Returns:
+            dict: yt-dlp info 딕셔너리
+        """
+        video_id = self.validator.extract_video_id(url)
+        if video_id:
+            cached = self.metadata_cache.get(video_id)
+            if cached:
+                if cached.get('error'):
+                    self.logger.debug(f"메타데이터 캐시 적중 (오류): {video_id}")
+                    raise yt_dlp.DownloadError(cached['error'])
+                self.logger.debug(f"메타데이터 캐시 적중: {video_id}")
+                return cached['info']
+
+        ydl_opts = self._get_base_ydl_opts()
+        ydl_opts['quiet'] = True
+
+        self._acquire_request_slot()
+        try:
+            with self.session_pool.session(ydl_opts) as ydl:
+                info = ydl.extract_info(url, download=False)
+        except yt_dlp.DownloadError as e:
+            self.rate_limiter.report(e)
+            # 비공개/삭제 영상은 짧은 시간 동안 실패 결과를 캐시
+            if video_id and self.metadata_cache.is_negative_error(e):
+                self.metadata_cache.put_negative(video_id, str(e))
+            raise
+        self.rate_limiter.report()
+
+        if video_id and isinstance(info, dict):
+            self.metadata_cache.put(video_id, info)
+        return info
+
+    def iter_collection_entries(self, url):
+        """
+        재생목록/채널 URL의 비디오 URL을 발견되는 대로 하나씩 반환합니다.
+
+        평면(flat) 추출로 항목의 전체 정보를 미리 만들지 않으며, 다음 페이지는
+        소비자가 앞의 항목을 가져간 뒤에야 요청합니다.
+
+        Args:
+            url (str): 재생목록 또는 채널 URL
+
+        Yields:
+            str: 비디오 URL
+        """
+        ydl_opts = self._get_base_ydl_opts()
+        ydl_opts.update({
+            'quiet': True,
+            'extract_flat': 'in_playlist',
+            'lazy_playlist': True,
+        })
+
+        with self.session_pool.session(ydl_opts) as ydl:
+            yield from self._iter_flat_entries(ydl, url, depth=0)
+
+    def _iter_flat_entries(self, ydl, url, depth):
+        """평면 추출 결과를 따라가며 비디오 URL을 반환 (채널 탭 등 중첩 목록 포함)"""
+        if depth > 3:
+            return
+
+        self._acquire_request_slot()
+        try:
+            result = ydl.extract_info(url, download=False, process=False)
+        except Exception as e:
+            self.rate_limiter.report(e)
+            raise
+        self.rate_limiter.report()
+
+        if not result:
+            return
+
+        result_type = result.get('_type', 'video')
+        if result_type in ('url', 'url_transparent') and result.get('url') != url:
+            # 채널 홈 -> /videos 탭처럼 다른 목록으로 연결되는 경우
+            yield from self._iter_flat_entries(ydl, result['url'], depth + 1)
+            return
+
+        if result_type != 'playlist':
+            video_id = result.get('id')
+            if video_id:
+                yield f"https://www.youtube.com/watch?v={video_id}"
+            return
+
+        for entry in result.get('entries') or []:
+            if not entry:
+                continue
+
+            if entry.get('_type') == 'playlist' or entry.get('ie_key') == 'YoutubeTab':
+                nested_url = entry.get('url') or entry.get('webpage_url')
+                if nested_url:
+                    yield from self._iter_flat_entries(ydl, nested_url, depth + 1)
+            elif entry.get('id'):
+                yield f"https://www.youtube.com/watch?v={entry['id']}"
+
+    def _download_with_ydl(self, ydl, url, info=None):
+        """
+        미리 추출한 info가 있으면 재추출 없이 처리하고, 없으면 URL로 다운로드합니다.
+
+        Args:
+            ydl: yt_dlp.YoutubeDL 인스턴스
+            url (str): YouTube 비디오 URL
+            info (dict): extract_info()로 미리 추출한 정보 (선택)
+
+        Returns:
+            dict: 처리 결과 (requested_downloads에 최종 파일 경로 포함)
+        """
+        if info is None:
+            # URL로 다운로드하면 정보 추출 요청이 함께 발생
+            # (ydl.download()는 결과를 돌려주지 않아 아카이브에 파일 경로를 남길 수 없음)
+            self._acquire_request_slot()
+            try:
+                result = ydl.extract_info(url, download=True)
+            except Exception as e:
+                self.rate_limiter.report(e)
+                raise
+            self.rate_limiter.report()
+            return result
+        else:
+            # process_ie_result가 info를 변경하므로 정리된 사본을 넘김
+            return ydl.process_ie_result(ydl.sanitize_info(copy.deepcopy(info), True), download=True)
+
+    def _choose_format(self, quality, info=None):
+        """
+        다운로드할 포맷 결정
+
+        추출한 정보가 있으면 포맷 선택 엔진이 고른 포맷만 남긴 info를 사용하고,
+        없으면 품질별 기본 포맷 문자열을 사용합니다.
+
+        Returns:
+            tuple: (포맷 문자열, 다운로드에 사용할 info, FormatDecision 또는 None)
+        """
+        decision = self.format_selector.select(info, quality) if info else None
+        if decision is None:
+            return self.format_selector.fallback_format(quality), info, None
+
+        # 포맷 문자열은 고정하여 세션 풀 재사용을 유지하고, 고를 수 있는 포맷만 제한
+        restricted = self.format_selector.restrict_formats(info, decision)
+        return self.format_selector.fallback_format('best'), restricted, decision
+
+    def _choose_audio_format(self, info=None):
+        """
+        오디오만 받을 때 다운로드할 포맷 결정
+
+        Returns:
+            tuple: (포맷 문자열, 다운로드에 사용할 info, FormatDecision 또는 None)
+        """
+        decision = self.format_selector.select_audio(info) if info else None
+        if decision is None:
+            return self.format_selector.AUDIO_FALLBACK_FORMAT, info, None
+
+        restricted = self.format_selector.restrict_formats(info, decision)
+        return 'ba/b', restricted, decision
+
+    def _video_id(self, url, info=None):
+        """네트워크 요청 없이 비디오 ID 확인 (추출 정보가 있으면 우선 사용)"""
+        if isinstance(info, dict) and info.get('id'):
+            return info['id']
+        return self.validator.extract_video_id(url)
+
+    def _result_filepath(self, result):
+        """yt-dlp 처리 결과에서 최종 파일 경로 찾기"""
+        if not isinstance(result, dict):
+            return None
+        for download in result.get('requested_downloads') or []:
+            if isinstance(download, dict) and isinstance(download.get('filepath'), str):
+                return download['filepath']
+        filepath = result.get('filepath')
+        return filepath if isinstance(filepath, str) else None
+
+    def _record_file(self, result, store_keys=None):
+        """
+        처리 결과의 최종 파일 정보를 last_file에 기록
+
+        콘텐츠 저장소를 사용하면 해시를 계산한 파일을 store_keys로 저장소에 등록합니다.
+
+        Returns:
+            str: 최종 파일 경로 (없으면 None)
+        """
+        filepath = self._result_filepath(result)
+        if not filepath or not os.path.isfile(filepath):
+            return filepath
+
+        record = {'file_path': filepath, 'file_size': os.path.getsize(filepath)}
+        if self.hash_downloads:
+            digest = self.content_hasher.result_for(filepath)
+            if digest is None:
+                # 병합/변환으로 FFmpeg가 새로 만든 파일은 받는 동안 따라갈 수 없으므로 한 번 읽어서 계산
+                try:
+                    digest = self.postprocess_scheduler.run(
+                        'hash_file', lambda: self.content_hasher.hash_file(filepath),
+                        cancel_event=getattr(self, 'cancel_flag', None)
+                    )
+                except Exception as e:
+                    self.logger.warning(f"파일 해시 계산 실패: {filepath} ({e})")
+            if digest is not None:
+                record['sha256'] = digest['sha256']
+                record['fast_hash'] = digest['fast_hash']
+                if store_keys and self.content_store.enabled:
+                    self.content_store.add(filepath, store_keys, digest)
+        self.last_file = record
+        return filepath
+
+    def _store_keys(self, video_id, kind, variant, decision=None, suffix=''):
+        """
+        콘텐츠 저장소 키 목록
+
+        요청 키('ID:종류:품질')는 정보 추출 없이 찾을 수 있고, 포맷 키('ID:format:포맷 ID')는
+        품질 이름이 달라도 같은 포맷을 고른 요청끼리 공유합니다.
+
+        Args:
+            suffix (str): 같은 포맷이라도 결과가 다른 경우의 구분 (변환 형식, 구간)
+        """
+        if not video_id:
+            return []
+        keys = [f"{video_id}:{kind}:{variant}"]
+        if decision is not None:
+            keys.append(f"{video_id}:format:{decision.format_spec}{suffix}")
+        return keys
+
+    def _restore_stored(self, video_id, kind, variant, keys):
+        """
+        콘텐츠 저장소에 있으면 네트워크 없이 다운로드 폴더에 링크로 만듦
+
+        Returns:
+            bool: 복원 여부
+        """
+        if not keys or not self.content_store.enabled:
+            return False
+        entry = self.content_store.lookup(keys)
+        if entry is None:
+            return False
+
+        filepath = os.path.join(self.download_path, entry['name'])
+        try:
+            method, filepath = self.content_store.materialize(entry, filepath)
+        except OSError as e:
+            self.logger.warning(f"저장소에서 복원 실패, 다시 다운로드: {filepath} ({e})")
+            return False
+
+        self.content_store.add(filepath, keys, {'sha256': entry['sha256'], 'fast_hash': entry.get('fast_hash')})
+        self.archive.add(video_id, kind, variant, filepath)
+        self.last_file = {
+            'file_path': filepath,
+            'file_size': entry.get('size'),
+            'sha256': entry['sha256'],
+            'fast_hash': entry.get('fast_hash'),
+        }
+        print(f"저장소에 있는 파일입니다 (다운로드 없이 복원): {filepath}")
+        self.logger.info(f"콘텐츠 저장소에서 복원 ({method}) - {video_id} {kind} {variant}: {filepath}")
+        return True
+
+    def restore_from_store(self, url, mode='video_only', quality='best'):
+        """
+        요청한 파일이 콘텐츠 저장소에 있으면 정보 추출 없이 복원 (네트워크 요청 없음)
+
+        Args:
+            url (str): YouTube 비디오 URL
+            mode (str): 다운로드 모드 (video_only, audio_only, clip만 해당)
+            quality (str): 비디오 품질 (audio_only이면 오디오 형식, clip이면 구간 이름)
+
+        Returns:
+            bool: 복원했으면 True
+        """
+        kind = {
+            'video_only': DownloadArchive.VIDEO,
+            'audio_only': DownloadArchive.AUDIO,
+            'clip': DownloadArchive.CLIP,
+        }.get(mode)
+        if kind is None or not self.content_store.enabled:
+            return False
+        self.last_file = None
+        video_id = self._video_id(url)
+        return self._restore_stored(video_id, kind, quality, self._store_keys(video_id, kind, quality))
+
+    def _pending_subtitle_langs(self, video_id, langs):
+        """아직 받지 않은 자막 언어만 반환"""
+        return [lang for lang in langs
+                if not self.archive.contains(video_id, DownloadArchive.SUBTITLE, lang, self.download_path)]
+
+    def is_archived(self, url, mode='video_only', quality='best', subtitle_langs=None):
+        """
+        요청한 다운로드가 이미 완료되어 있는지 확인 (네트워크 요청 없음)
+
+        Args:
+            url (str): YouTube 비디오 URL
+            mode (str): 다운로드 모드 (video_only, subs_only, video_subs, audio_only)
+            quality (str): 비디오 품질 (audio_only이면 오디오 형식)
+            subtitle_langs (list): 자막 언어 목록
+
+        Returns:
+            bool: 이미 다운로드되어 있으면 True
+        """
+        return self.archive.is_complete(self._video_id(url), mode, quality, subtitle_langs, self.download_path)
+
+    def download_video(self, url, quality='best', info=None):
         """
         YouTube 비디오를 다운로드합니다.
 
         Args:
             url (str): YouTube 비디오 URL
             quality (str): 비디오 품질 ('best', 'worst', '720p', '480p' 등)
+            info (dict): extract_info()로 미리 추출한 정보 (선택)
         """
-        # 품질 설정을 더 유연한 포맷으로 변환
-        format_map = {
-            'best': 'bv*+ba/b',  # 가장 호환성 좋은 포맷
-            'worst': 'worst',
-            '720p': 'bv*[height<=720]+ba/b[height<=720]',
-            '480p': 'bv*[height<=480]+ba/b[height<=480]',
-            '360p': 'bv*[height<=360]+ba/b[height<=360]',
-        }
+        self.last_file = None
+        video_id = self._video_id(url, info)
+        if self.archive.contains(video_id, DownloadArchive.VIDEO, quality, self.download_path):
+            print(f"이미 다운로드한 비디오입니다 (건너뜀): {url}")
+            self.logger.info(f"아카이브에 있는 비디오 건너뜀 - URL: {url}, 품질: {quality}")
+            return True
+
+        # 품질 설정과 포맷 목록으로 다운로드할 포맷 결정
+        format_spec, info, decision = self._choose_format(quality, info)
+        store_keys = self._store_keys(video_id, DownloadArchive.VIDEO, quality, decision)
+        if self._restore_stored(video_id, DownloadArchive.VIDEO, quality, store_keys):
+            return True
 
         ydl_opts = self._get_base_ydl_opts()
-        ydl_opts['format'] = format_map.get(quality, format_map['best'])
+        ydl_opts['format'] = format_spec
 
         # 진행률 훅 추가
         if hasattr(self, 'progress_callback') and self.progress_callback:
@@ -137,11 +561,12 @@ class YouTubeDownloader:
         try:
             self.logger.log_download_start(url, 'video', quality=quality)
             print(f"다운로드 시작: {url}")
-            print(f"사용 포맷: {format_map.get(quality, format_map['best'])}")
+            print(f"사용 포맷: {decision.describe() if decision else format_spec}")
 
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+            with self.session_pool.session(ydl_opts) as ydl:
+                result = self._download_with_ydl(ydl, url, info)
 
+            self.archive.add(video_id, DownloadArchive.VIDEO, quality, self._record_file(result, store_keys))
             print("다운로드 완료!")
             self.logger.log_download_success(url, 'video')
             return True
@@ -157,84 +582,231 @@ class YouTubeDownloader:
                 traceback.print_exc()
             return False
 
+    def download_section(self, url, start, end, quality='best', info=None, precise=False):
+        """
+        YouTube 비디오의 일부 구간만 다운로드합니다.
+
+        전체 파일을 받지 않고 구간에 해당하는 부분만 받습니다. DASH처럼 조각으로 나뉜 포맷은
+        구간과 겹치는 조각만 받고, 단일 파일 포맷은 FFmpeg가 시작 위치로 이동해 필요한 부분만 읽습니다.
+
+        Args:
+            url (str): YouTube 비디오 URL
+            start: 시작 시각 (초 또는 'HH:MM:SS')
+            end: 끝 시각 (초 또는 'HH:MM:SS')
+            quality (str): 비디오 품질 ('best', 'worst', '720p', '480p' 등)
+            info (dict): extract_info()로 미리 추출한 정보 (선택)
+            precise (bool): True이면 재인코딩하여 정확한 위치에서 자름 (기본: 키프레임 기준, 빠름)
+        """
+        self.last_file = None
+        try:
+            start = SectionDownloader.parse_time(start)
+            end = SectionDownloader.parse_time(end)
+        except ValueError as e:
+            print(f"구간 오류: {e}")
+            return False
+        if end <= start:
+            print(f"구간 오류: 끝 시각({end:g}초)은 시작 시각({start:g}초)보다 늦어야 합니다.")
+            return False
+        duration = (info or {}).get('duration')
+        if duration and start >= duration:
+            print(f"구간 오류: 시작 시각({start:g}초)이 영상 길이({duration}초)를 넘습니다.")
+            return False
+
+        video_id = self._video_id(url, info)
+        variant = SectionDownloader.variant(quality, start, end)
+        if self.archive.contains(video_id, DownloadArchive.CLIP, variant, self.download_path):
+            print(f"이미 다운로드한 구간입니다 (건너뜀): {url}")
+            self.logger.info(f"아카이브에 있는 구간 건너뜀 - URL: {url}, 구간: {variant}")
+            return True
+
+        format_spec, info, decision = self._choose_format(quality, info)
+        store_keys = self._store_keys(video_id, DownloadArchive.CLIP, variant, decision,
+                                      suffix=f"@{start:g}-{end:g}")
+        if self._restore_stored(video_id, DownloadArchive.CLIP, variant, store_keys):
+            return True
+
+        ydl_opts = self._get_base_ydl_opts()
+        ydl_opts['format'] = format_spec
+        # 같은 영상의 여러 구간이 서로 덮어쓰지 않도록 파일 이름에 구간 표시
+        ydl_opts['outtmpl'] = (f'{self.download_path}/%(title)s '
+                               f'[%(section_start>%H-%M-%S)s~%(section_end>%H-%M-%S)s].%(ext)s')
+
+        # 진행률 훅 추가
+        if hasattr(self, 'progress_callback') and self.progress_callback:
+            ydl_opts['progress_hooks'] = [self._progress_hook]
+
+        try:
+            self.logger.log_download_start(url, 'clip', quality=variant)
+            print(f"구간 다운로드 시작: {url} ({start:g}초 ~ {end:g}초)")
+            print(f"사용 포맷: {decision.describe() if decision else format_spec}")
+
+            with self.session_pool.session(ydl_opts) as ydl:
+                with self.section_downloader.section(ydl, start, end, precise=precise):
+                    result = self._download_with_ydl(ydl, url, info)
+
+            self.archive.add(video_id, DownloadArchive.CLIP, variant, self._record_file(result, store_keys))
+            print("구간 다운로드 완료!")
+            self.logger.log_download_success(url, 'clip')
+            return True
+        except Exception as e:
+            error_msg = str(e)
+            if "취소" in error_msg:
+                print("다운로드가 취소되었습니다.")
+                self.logger.info(f"다운로드 취소 - URL: {url}")
+            else:
+                print(f"구간 다운로드 오류: {error_msg}")
+                self.logger.log_download_failure(url, 'clip', error_msg)
+                import traceback
+                traceback.print_exc()
+            return False
+
 
     
-    def get_video_info(self, url):
-        """비디오 정보를 가져옵니다."""
+    def download_audio(self, url, audio_format='best', info=None):
+        """
+        YouTube 비디오의 오디오만 다운로드합니다.
+
+        기본값('best')은 가장 좋은 원본 오디오 스트림(m4a/opus)을 재인코딩 없이 그대로
+        저장하며, 다른 형식을 지정하면 후처리 스케줄러를 거쳐 FFmpeg로 변환합니다.
+
+        Args:
+            url (str): YouTube 비디오 URL
+            audio_format (str): 'best'(변환 없음), 'mp3', 'm4a', 'opus', 'flac', 'wav'
+            info (dict): extract_info()로 미리 추출한 정보 (선택)
+        """
+        self.last_file = None
+        audio_format = audio_format or 'best'
+        if audio_format not in self.AUDIO_FORMATS:
+            print(f"지원하지 않는 오디오 형식입니다: {audio_format} (사용 가능: {', '.join(self.AUDIO_FORMATS)})")
+            return False
+
+        video_id = self._video_id(url, info)
+        if self.archive.contains(video_id, DownloadArchive.AUDIO, audio_format, self.download_path):
+            print(f"이미 다운로드한 오디오입니다 (건너뜀): {url}")
+            self.logger.info(f"아카이브에 있는 오디오 건너뜀 - URL: {url}, 형식: {audio_format}")
+            return True
+
+        format_spec, info, decision = self._choose_audio_format(info)
+        store_keys = self._store_keys(video_id, DownloadArchive.AUDIO, audio_format, decision,
+                                      suffix='' if audio_format == 'best' else f">{audio_format}")
+        if self._restore_stored(video_id, DownloadArchive.AUDIO, audio_format, store_keys):
+            return True
+
         ydl_opts = self._get_base_ydl_opts()
-        ydl_opts['quiet'] = True
-        
+        ydl_opts['format'] = format_spec
+        if audio_format != 'best':
+            # 요청한 경우에만 변환 (원본과 같은 코덱이면 yt-dlp가 재인코딩 없이 컨테이너만 변경)
+            ydl_opts['postprocessors'] = [{'key': 'FFmpegExtractAudio', 'preferredcodec': audio_format}]
+
+        # 진행률 훅 추가
+        if hasattr(self, 'progress_callback') and self.progress_callback:
+            ydl_opts['progress_hooks'] = [self._progress_hook]
+
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                return {
-                    'title': info.get('title', 'N/A'),
-                    'duration': info.get('duration', 0),
-                    'uploader': info.get('uploader', 'N/A'),
-                    'view_count': info.get('view_count', 0)
-                }
+            self.logger.log_download_start(url, 'audio', quality=audio_format)
+            print(f"오디오 다운로드 시작: {url}")
+            print(f"사용 포맷: {decision.describe() if decision else format_spec}")
+            if audio_format != 'best':
+                print(f"다운로드 후 {audio_format} 형식으로 변환합니다.")
+
+            with self.session_pool.session(ydl_opts) as ydl:
+                result = self._download_with_ydl(ydl, url, info)
+
+            self.archive.add(video_id, DownloadArchive.AUDIO, audio_format, self._record_file(result, store_keys))
+            print("오디오 다운로드 완료!")
+            self.logger.log_download_success(url, 'audio')
+            return True
+        except Exception as e:
+            error_msg = str(e)
+            if "취소" in error_msg:
+                print("다운로드가 취소되었습니다.")
+                self.logger.info(f"다운로드 취소 - URL: {url}")
+            else:
+                print(f"오디오 다운로드 오류: {error_msg}")
+                self.logger.log_download_failure(url, 'audio', error_msg)
+                import traceback
+                traceback.print_exc()
+            return False
+
+    def get_video_info(self, url, info=None):
+        """
+        비디오 정보를 가져옵니다.
+
+        Args:
+            url (str): YouTube 비디오 URL
+            info (dict): extract_info()로 미리 추출한 정보 (선택)
+        """
+        try:
+            if info is None:
+                info = self.extract_info(url)
+            return {
+                'title': info.get('title', 'N/A'),
+                'duration': info.get('duration', 0),
+                'uploader': info.get('uploader', 'N/A'),
+                'view_count': info.get('view_count', 0)
+            }
         except Exception as e:
             print(f"정보 가져오기 오류: {str(e)}")
             import traceback
             traceback.print_exc()
             return None
-    def _find_available_subtitle_languages(self, url, requested_langs):
+    def _find_available_subtitle_languages(self, url, requested_langs, info=None):
         """
         요청한 언어 중 사용 가능한 자막 언어를 찾습니다.
 
         Args:
             url (str): YouTube 비디오 URL
             requested_langs (list): 요청한 언어 코드 리스트
+            info (dict): extract_info()로 미리 추출한 정보 (선택)
 
         Returns:
             tuple: (found_langs, available_subs, available_auto_subs)
         """
-        info_opts = self._get_base_ydl_opts()
-        info_opts['quiet'] = True
+        if info is None:
+            info = self.extract_info(url)
 
-        with yt_dlp.YoutubeDL(info_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            available_subs = info.get('subtitles', {})
-            available_auto_subs = info.get('automatic_captions', {})
+        available_subs = info.get('subtitles') or {}
+        available_auto_subs = info.get('automatic_captions') or {}
 
-            print(f"사용 가능한 수동 자막: {list(available_subs.keys())}")
-            print(f"사용 가능한 자동 자막: {list(available_auto_subs.keys())[:10]}")
+        print(f"사용 가능한 수동 자막: {list(available_subs.keys())}")
+        print(f"사용 가능한 자동 자막: {list(available_auto_subs.keys())[:10]}")
 
-            # 요청한 언어가 있는지 확인
-            found_langs = []
-            for lang in requested_langs:
-                if lang in available_subs or lang in available_auto_subs:
-                    found_langs.append(lang)
+        # 요청한 언어가 있는지 확인
+        found_langs = []
+        for lang in requested_langs:
+            if lang in available_subs or lang in available_auto_subs:
+                found_langs.append(lang)
 
-            # 요청한 언어가 없으면 대체 언어 찾기
-            if not found_langs:
-                print(f"⚠️  경고: 요청한 언어 {requested_langs} 중 사용 가능한 자막이 없습니다.")
+        # 요청한 언어가 없으면 대체 언어 찾기
+        if not found_langs:
+            print(f"⚠️  경고: 요청한 언어 {requested_langs} 중 사용 가능한 자막이 없습니다.")
 
-                all_available = list(set(list(available_subs.keys()) + list(available_auto_subs.keys())))
-                if all_available:
-                    print(f"사용 가능한 언어: {all_available[:10]}")
+            all_available = list(set(list(available_subs.keys()) + list(available_auto_subs.keys())))
+            if all_available:
+                print(f"사용 가능한 언어: {all_available[:10]}")
 
-                    # 언어 변형 자동 감지
-                    suggested_langs = []
-                    for req_lang in requested_langs:
-                        variants = [l for l in all_available if l.startswith(req_lang)]
-                        if variants:
-                            suggested_langs.extend(variants[:1])
-                            print(f"💡 {req_lang} 대체: {variants}")
+                # 언어 변형 자동 감지
+                suggested_langs = []
+                for req_lang in requested_langs:
+                    variants = [l for l in all_available if l.startswith(req_lang)]
+                    if variants:
+                        suggested_langs.extend(variants[:1])
+                        print(f"💡 {req_lang} 대체: {variants}")
 
-                    if suggested_langs:
-                        print(f"대체 언어로 다운로드 시도: {suggested_langs}")
-                        found_langs = suggested_langs
+                if suggested_langs:
+                    print(f"대체 언어로 다운로드 시도: {suggested_langs}")
+                    found_langs = suggested_langs
 
-            return found_langs, available_subs, available_auto_subs
+        return found_langs, available_subs, available_auto_subs
 
-    def _download_subtitle_by_language(self, url, lang):
+    def _download_subtitle_by_language(self, url, lang, info=None):
         """
         특정 언어의 자막을 다운로드합니다.
 
         Args:
             url (str): YouTube 비디오 URL
             lang (str): 언어 코드
+            info (dict): extract_info()로 미리 추출한 정보 (선택)
 
         Returns:
             bool: 성공 여부
@@ -245,41 +817,211 @@ class YouTubeDownloader:
             'writeautomaticsub': True,
             'subtitleslangs': [lang],
             'skip_download': True,
-            'subtitlesformat': 'srt',
-            'sleep_interval': 3,
-            'max_sleep_interval': 5,
-            'sleep_interval_subtitles': 3,
+            # SRT가 없으면 직접 변환할 수 있는 포맷을 받음
+            'subtitlesformat': 'srt/json3/srv3/vtt/best' if self.convert_subtitles else 'srt',
         })
 
         try:
-            with yt_dlp.YoutubeDL(sub_opts) as ydl:
-                ydl.download([url])
+            with self.session_pool.session(sub_opts) as ydl:
+                if info is not None:
+                    # 자막 파일 요청은 공유 속도 제한기로 간격 조절
+                    self._acquire_request_slot()
+                result = self._download_with_ydl(ydl, url, info)
+                if info is not None:
+                    self.rate_limiter.report()
+
+                path = None
+                if isinstance(result, dict):
+                    subtitle = (result.get('requested_subtitles') or {}).get(lang) or {}
+                    path = subtitle.get('filepath')
+                    if path:
+                        path = self._convert_subtitle(path, subtitle.get('ext'),
+                                                      rolling=self._is_auto_caption(result, lang))
+                self.archive.add(self._video_id(url, info), DownloadArchive.SUBTITLE, lang, path)
                 print(f"✅ '{lang}' 자막 다운로드 완료!")
                 return True
         except Exception as e:
             error_msg = str(e)
+            if info is not None:
+                self.rate_limiter.report(e)
             if '429' in error_msg or 'Too Many Requests' in error_msg:
                 print(f"⚠️  '{lang}' 자막: 요청 제한에 걸림 (건너뜀)")
             else:
                 print(f"⚠️  '{lang}' 자막 다운로드 실패: {error_msg}")
             return False
 
-    
-    def download_subtitles(self, url, languages=['ko', 'en']):
+    def _select_subtitle_track(self, info, lang):
+        """
+        수동 자막을 우선으로, 선호 포맷 순서에 따라 자막 트랙을 고릅니다.
+
+        Returns:
+            dict: 자막 트랙 ({'ext': ..., 'url': ...}) 또는 None
+        """
+        for source in (info.get('subtitles') or {}, info.get('automatic_captions') or {}):
+            tracks = [track for track in source.get(lang) or [] if track.get('url')]
+            if not tracks:
+                continue
+
+            if self.convert_subtitles:
+                preference = self.CONVERTIBLE_SUBTITLE_PREFERENCE
+            else:
+                preference = self.SUBTITLE_FORMAT_PREFERENCE
+            for ext in preference:
+                for track in tracks:
+                    if track.get('ext') == ext:
+                        return track
+            return tracks[0]
+        return None
+
+    def _is_auto_caption(self, info, lang):
+        """수동 자막이 없어 자동 생성 자막을 받는 언어인지 확인 (수동 자막을 우선으로 고르므로)"""
+        manual_tracks = (info.get('subtitles') or {}).get(lang) or []
+        return not any(track.get('url') for track in manual_tracks)
+
+    def _convert_subtitle(self, path, ext, rolling=False):
+        """
+        받은 자막을 SRT로 변환 (변환 설정이 꺼져 있거나 지원하지 않는 포맷이면 그대로)
+
+        Args:
+            rolling (bool): 자동 생성 자막이면 True (롤업 반복 줄 제거)
+
+        Returns:
+            str: 최종 자막 파일 경로
+        """
+        ext = (ext or os.path.splitext(path)[1].lstrip('.')).lower()
+        if not self.convert_subtitles or ext == 'srt' or not self.subtitle_converter.can_convert(ext):
+            return path
+        try:
+            return self.subtitle_converter.convert(path, fmt=ext, rolling=rolling)
+        except Exception as e:
+            self.logger.warning(f"자막 SRT 변환 실패, 원본 유지: {path} ({e})")
+            return path
+
+    def _fetch_subtitle_track(self, ydl, track, path):
+        """자막 트랙 URL 하나를 파일로 저장합니다."""
+        self._acquire_request_slot()
+        temp_path = f"{path}.part"
+        try:
+            response = ydl.urlopen(track['url'])
+            with open(temp_path, 'wb') as f:
+                while True:
+                    chunk = response.read(64 * 1024)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+            os.replace(temp_path, path)
+        except Exception as e:
+            self.rate_limiter.report(e)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.rate_limiter.report()
+
+    def _download_subtitles_bulk(self, info, langs):
+        """
+        한 번 추출한 정보로 여러 언어의 자막을 동시에 다운로드합니다.
+
+        자막 트랙 URL을 찾은 언어만 처리하며, 연결 수는 subtitle_connections로 제한합니다.
+
+        Args:
+            info (dict): extract_info()로 추출한 정보
+            langs (list): 언어 코드 리스트
+
+        Returns:
+            dict: {언어 코드: 성공 여부} (트랙을 찾은 언어만 포함)
+        """
+        tracks = {}
+        for lang in langs:
+            track = self._select_subtitle_track(info, lang)
+            if track:
+                tracks[lang] = track
+
+        if not tracks:
+            return {}
+
+        ydl_opts = self._get_base_ydl_opts()
+        ydl_opts['quiet'] = True
+
+        results = {}
+        with self.session_pool.session(ydl_opts) as ydl:
+            base_filename = ydl.prepare_filename(info)
+
+            def fetch(lang):
+                track = tracks[lang]
+                path = yt_dlp.utils.subtitles_filename(base_filename, lang, track.get('ext', 'vtt'), info.get('ext'))
+                try:
+                    self._fetch_subtitle_track(ydl, track, path)
+                    path = self._convert_subtitle(path, track.get('ext'), rolling=self._is_auto_caption(info, lang))
+                    self.archive.add(info.get('id'), DownloadArchive.SUBTITLE, lang, path)
+                    print(f"✅ '{lang}' 자막 다운로드 완료!")
+                    return True
+                except Exception as e:
+                    error_msg = str(e)
+                    if '429' in error_msg or 'Too Many Requests' in error_msg:
+                        print(f"⚠️  '{lang}' 자막: 요청 제한에 걸림 (건너뜀)")
+                    else:
+                        print(f"⚠️  '{lang}' 자막 다운로드 실패: {error_msg}")
+                    return False
+
+            print(f"자막 일괄 다운로드: {list(tracks.keys())}")
+            workers = max(1, min(self.subtitle_connections, len(tracks)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for lang, success in zip(tracks, executor.map(fetch, tracks)):
+                    results[lang] = success
+
+        return results
+
+    def _download_subtitle_languages(self, url, langs, info=None):
+        """
+        여러 언어의 자막을 다운로드합니다.
+
+        일괄 모드에서는 트랙 URL이 있는 언어를 한 번에 받고,
+        나머지 언어만 언어별 다운로드로 처리합니다.
+
+        Returns:
+            dict: {언어 코드: 성공 여부}
+        """
+        results = {}
+        if self.bulk_subtitles and info is not None:
+            results = self._download_subtitles_bulk(info, langs)
+
+        for lang in langs:
+            if lang in results:
+                continue
+            print(f"\n'{lang}' 자막 다운로드 중...")
+            results[lang] = self._download_subtitle_by_language(url, lang, info=info)
+
+        return results
+
+    def download_subtitles(self, url, languages=None, info=None):
         """
         YouTube 비디오의 자막을 다운로드합니다.
 
         Args:
             url (str): YouTube 비디오 URL
-            languages (list): 다운로드할 언어 코드 리스트
+            languages (list): 다운로드할 언어 코드 리스트 (기본: DEFAULT_SUBTITLE_LANGS)
+            info (dict): extract_info()로 미리 추출한 정보 (선택)
         """
+        self.last_file = None
+        languages = list(languages or self.DEFAULT_SUBTITLE_LANGS)
+        pending_langs = self._pending_subtitle_langs(self._video_id(url, info), languages)
+        if not pending_langs:
+            print(f"이미 다운로드한 자막입니다 (건너뜀): {url}")
+            self.logger.info(f"아카이브에 있는 자막 건너뜀 - URL: {url}, 언어: {languages}")
+            return True
+        languages = pending_langs
+
         try:
             self.logger.log_download_start(url, 'subtitles', subtitle_langs=languages)
             print(f"자막 다운로드 시작: {url}")
             print(f"요청 언어: {languages}")
 
+            # 정보는 한 번만 추출하고 이후 단계에서 재사용
+            if info is None:
+                info = self.extract_info(url)
+
             # 사용 가능한 자막 언어 찾기
-            found_langs, _, _ = self._find_available_subtitle_languages(url, languages)
+            found_langs, _, _ = self._find_available_subtitle_languages(url, languages, info=info)
 
             if not found_langs:
                 print("❌ 이 영상에는 요청한 언어의 자막이 없습니다.")
@@ -288,19 +1030,9 @@ class YouTubeDownloader:
 
             print(f"다운로드할 언어: {found_langs}")
 
-            # 언어별로 순차 다운로드 (429 오류 방지)
-            success_count = 0
-            for lang in found_langs:
-                print(f"\n'{lang}' 자막 다운로드 중...")
-
-                if self._download_subtitle_by_language(url, lang):
-                    success_count += 1
-
-                    # 다음 언어 다운로드 전 대기
-                    if lang != found_langs[-1]:
-                        import time
-                        print("다음 자막까지 3초 대기...")
-                        time.sleep(3)
+            # 요청 간격은 공유 속도 제한기가 조절
+            results = self._download_subtitle_languages(url, found_langs, info=info)
+            success_count = sum(1 for success in results.values() if success)
 
             if success_count > 0:
                 print(f"\n✅ 총 {success_count}/{len(found_langs)}개 언어 다운로드 완료!")
@@ -333,28 +1065,28 @@ class YouTubeDownloader:
 
 
     
-    def get_available_subtitles(self, url):
-        """사용 가능한 자막 언어 목록을 가져옵니다."""
-        ydl_opts = self._get_base_ydl_opts()
-        ydl_opts.update({
-            'quiet': True,
-            'no_warnings': True,
-        })
-        
+    def get_available_subtitles(self, url, info=None):
+        """
+        사용 가능한 자막 언어 목록을 가져옵니다.
+
+        Args:
+            url (str): YouTube 비디오 URL
+            info (dict): extract_info()로 미리 추출한 정보 (선택)
+        """
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            if info is None:
                 print("자막 정보 추출 중...")
-                info = ydl.extract_info(url, download=False)
-                subtitles = info.get('subtitles', {})
-                automatic_captions = info.get('automatic_captions', {})
-                
-                print(f"수동 자막: {len(subtitles)}개")
-                print(f"자동 자막: {len(automatic_captions)}개")
-                
-                return {
-                    'manual_subtitles': list(subtitles.keys()),
-                    'auto_subtitles': list(automatic_captions.keys())
-                }
+                info = self.extract_info(url)
+            subtitles = info.get('subtitles') or {}
+            automatic_captions = info.get('automatic_captions') or {}
+
+            print(f"수동 자막: {len(subtitles)}개")
+            print(f"자동 자막: {len(automatic_captions)}개")
+
+            return {
+                'manual_subtitles': list(subtitles.keys()),
+                'auto_subtitles': list(automatic_captions.keys())
+            }
         except yt_dlp.DownloadError as e:
             print(f"yt-dlp 다운로드 오류: {str(e)}")
             import traceback
@@ -366,67 +1098,77 @@ class YouTubeDownloader:
             traceback.print_exc()
             return None
     
-    def download_video_with_subtitles(self, url, quality='best', subtitle_langs=['ko', 'en']):
+    def download_video_with_subtitles(self, url, quality='best', subtitle_langs=None, info=None):
         """
         비디오와 자막을 함께 다운로드합니다.
 
+        정보 추출은 한 번만 수행하며, 같은 info로 포맷 선택, 비디오 다운로드,
+        자막 확인, 자막 다운로드를 모두 처리합니다.
+
         Args:
             url (str): YouTube 비디오 URL
             quality (str): 비디오 품질
-            subtitle_langs (list): 자막 언어 코드 리스트
-        """
-        # 품질 설정을 더 유연한 포맷으로 변환
-        format_map = {
-            'best': 'bv*+ba/b',
-            'worst': 'worst',
-            '720p': 'bv*[height<=720]+ba/b[height<=720]',
-            '480p': 'bv*[height<=480]+ba/b[height<=480]',
-            '360p': 'bv*[height<=360]+ba/b[height<=360]',
-        }
-
+            subtitle_langs (list): 자막 언어 코드 리스트 (기본: DEFAULT_SUBTITLE_LANGS)
+            info (dict): extract_info()로 미리 추출한 정보 (선택)
+        """
+        self.last_file = None
+        subtitle_langs = list(subtitle_langs or self.DEFAULT_SUBTITLE_LANGS)
         # 1단계: 비디오만 다운로드
         print(f"1단계: 비디오 다운로드")
-        video_opts = self._get_base_ydl_opts()
-        video_opts.update({
-            'format': format_map.get(quality, format_map['best']),
-        })
+
+        video_id = self._video_id(url, info)
+        video_archived = self.archive.contains(video_id, DownloadArchive.VIDEO, quality, self.download_path)
+        pending_langs = self._pending_subtitle_langs(video_id, subtitle_langs)
+        if video_archived and not pending_langs:
+            print(f"이미 다운로드한 비디오와 자막입니다 (건너뜀): {url}")
+            self.logger.info(f"아카이브에 있는 비디오+자막 건너뜀 - URL: {url}")
+            return True
 
         try:
-            with yt_dlp.YoutubeDL(video_opts) as ydl:
-                print(f"비디오 다운로드 시작: {url}")
-                print(f"사용 포맷: {format_map.get(quality, format_map['best'])}")
-                ydl.download([url])
-                print("✅ 비디오 다운로드 완료!")
+            if info is None:
+                info = self.extract_info(url)
+
+            if video_archived:
+                print("이미 다운로드한 비디오입니다 (건너뜀)")
+            else:
+                # 품질 설정과 포맷 목록으로 다운로드할 포맷 결정 (자막 단계는 원래 info 사용)
+                format_spec, video_info, decision = self._choose_format(quality, info)
+                store_keys = self._store_keys(video_id, DownloadArchive.VIDEO, quality, decision)
+                if not self._restore_stored(video_id, DownloadArchive.VIDEO, quality, store_keys):
+                    video_opts = self._get_base_ydl_opts()
+                    video_opts['format'] = format_spec
+
+                    with self.session_pool.session(video_opts) as ydl:
+                        print(f"비디오 다운로드 시작: {url}")
+                        print(f"사용 포맷: {decision.describe() if decision else format_spec}")
+                        result = self._download_with_ydl(ydl, url, video_info)
+                    self.archive.add(video_id, DownloadArchive.VIDEO, quality, self._record_file(result, store_keys))
+                    print("✅ 비디오 다운로드 완료!")
         except Exception as e:
             print(f"❌ 비디오 다운로드 실패: {str(e)}")
             return False
 
+        if not pending_langs:
+            print("\n요청한 자막은 이미 모두 다운로드되어 있습니다.")
+            return True
+        subtitle_langs = pending_langs
+
         # 2단계: 자막 다운로드
         print(f"\n2단계: 자막 다운로드")
         print(f"요청 자막 언어: {subtitle_langs}")
 
         try:
             # 사용 가능한 자막 언어 찾기
-            found_langs, _, _ = self._find_available_subtitle_languages(url, subtitle_langs)
+            found_langs, _, _ = self._find_available_subtitle_languages(url, subtitle_langs, info=info)
 
             if not found_langs:
                 print("⚠️  사용 가능한 자막이 없습니다.")
                 print("비디오만 다운로드되었습니다.")
                 return True  # 비디오는 성공했으므로 True
 
-            # 언어별로 순차 다운로드
-            success_count = 0
-            for lang in found_langs:
-                print(f"'{lang}' 자막 다운로드 중...")
-
-                if self._download_subtitle_by_language(url, lang):
-                    success_count += 1
-
-                    # 다음 언어 전 대기
-                    if lang != found_langs[-1]:
-                        import time
-                        print("3초 대기...")
-                        time.sleep(3)
+            # 요청 간격은 공유 속도 제한기가 조절
+            results = self._download_subtitle_languages(url, found_langs, info=info)
+            success_count = sum(1 for success in results.values() if success)
 
             print(f"\n✅ 완료! 비디오 + {success_count}/{len(found_langs)}개 언어 자막")
             return True
@@ -437,19 +1179,129 @@ class YouTubeDownloader:
             return True  # 비디오는 성공
 
 
+def _parse_mode(options):
+    """
+    CLI 옵션에서 다운로드 모드와 품질(오디오 형식) 결정
+
+    Returns:
+        tuple: (모드, 품질)
+
+    Raises:
+        ValueError: 오디오 형식이나 구간이 없거나 잘못된 경우
+    """
+    if '--subs-only' in options:
+        return 'subs_only', 'best'
+    if '--with-subs' in options:
+        return 'video_subs', 'best'
+    if '--audio-only' in options:
+        audio_format = 'best'
+        if '--audio-format' in options:
+            audio_format = _option_value(options, '--audio-format', "오디오 형식을 지정해주세요 (예: --audio-format mp3)")
+            if audio_format not in YouTubeDownloader.AUDIO_FORMATS:
+                raise ValueError(f"지원하지 않는 오디오 형식: {audio_format} "
+                                 f"(가능: {', '.join(YouTubeDownloader.AUDIO_FORMATS)})")
+        return 'audio_only', audio_format
+    if '--section' in options:
+        value = _option_value(options, '--section', "구간을 지정해주세요 (예: --section 1:00:00-1:00:30)")
+        start, end = SectionDownloader.parse_range(value)
+        return 'clip', SectionDownloader.variant('best', start, end)
+    return 'video_only', 'best'
+
+def _parse_workers(options, default=3):
+    """
+    CLI 옵션에서 동시 작업자 수 결정
+
+    Raises:
+        ValueError: 값이 없거나 1 이상의 정수가 아닌 경우
+    """
+    if '--workers' not in options:
+        return default
+    value = _option_value(options, '--workers', "작업자 수를 지정해주세요 (예: --workers 4)")
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        raise ValueError(f"작업자 수는 1 이상의 정수여야 합니다: {value}")
+    return workers
+
+def _option_value(options, flag, missing_message):
+    """flag 바로 다음 값 (없거나 다른 옵션이면 ValueError)"""
+    index = options.index(flag) + 1
+    if index >= len(options) or options[index].startswith('--'):
+        raise ValueError(missing_message)
+    return options[index]
+
+def _print_usage():
+    print("사용법:")
+    print("  python downloader.py <YouTube_URL>                    # 비디오 다운로드")
+    print("  python downloader.py <YouTube_URL> --subs-only       # 자막만 다운로드")
+    print("  python downloader.py <YouTube_URL> --with-subs       # 비디오+자막 다운로드")
+    print("  python downloader.py <YouTube_URL> --audio-only [--audio-format mp3]  # 오디오만 다운로드 (기본: 변환 없음)")
+    print("  python downloader.py <YouTube_URL> --section 1:00:00-1:00:30  # 구간만 다운로드")
+    print("  python downloader.py <YouTube_URL> --check-subs      # 사용가능한 자막 확인")
+    print("  python downloader.py <재생목록/채널_URL>              # 재생목록/채널 전체 다운로드")
+    print("  python downloader.py --batch urls.txt [--workers N] [--subs-only|--with-subs|--audio-only]  # 여러 URL 동시 다운로드")
+    print("  python downloader.py --resume [--workers N]          # 중단된 다운로드 이어받기")
+
 def main():
     """간단한 CLI 테스트"""
     downloader = YouTubeDownloader()
+
+    # 설정 파일의 요청 속도 제한, 포맷 선택 전략, 대역폭 제한, 콘텐츠 저장소 적용
+    from config import Config
+    config = Config()
+    downloader.rate_limiter.configure(max_rate=config.get('request_rate_limit'))
+    downloader.format_selector.configure(strategy=config.get('format_strategy'))
+    downloader.bandwidth_manager.configure_from_config(config)
+    downloader.content_store.configure_from_config(config)
     
     if len(sys.argv) < 2:
-        print("사용법:")
-        print("  python downloader.py <YouTube_URL>                    # 비디오 다운로드")
-        print("  python downloader.py <YouTube_URL> --subs-only       # 자막만 다운로드")
-        print("  python downloader.py <YouTube_URL> --with-subs       # 비디오+자막 다운로드")
-        print("  python downloader.py <YouTube_URL> --check-subs      # 사용가능한 자막 확인")
+        _print_usage()
         return
+
+    try:
+        mode, quality = _parse_mode(sys.argv[2:])
+        workers = _parse_workers(sys.argv[2:])
+    except ValueError as e:
+        print(f"옵션 오류: {e}")
+        _print_usage()
+        downloader.close()
+        sys.exit(1)
+
+    from job_journal import get_job_journal
+    journal = get_job_journal()
+
+    # 비정상 종료로 남은 작업 이어받기
+    if sys.argv[1] == '--resume':
+        from download_queue import run_resume
+
+        downloader.close()
+        sys.exit(run_resume(max_workers=workers, download_path=downloader.download_path))
+
+    pending = journal.pending_jobs()
+    if pending:
+        print(f"중단된 다운로드 {len(pending)}개가 있습니다. 이어받으려면: python downloader.py --resume")
     
+    # 여러 URL 일괄 다운로드
+    if sys.argv[1] == '--batch':
+        if len(sys.argv) < 3:
+            print("URL 목록 파일을 지정해주세요: python downloader.py --batch urls.txt")
+            return
+        from download_queue import run_batch
+
+        downloader.close()
+        sys.exit(run_batch(sys.argv[2], mode=mode, quality=quality, max_workers=workers,
+                           download_path=downloader.download_path))
+
     url = sys.argv[1]
+
+    # 재생목록/채널은 항목을 펼쳐 다운로드 큐로 처리
+    if downloader.validator.is_collection_url(url):
+        from download_queue import run_urls
+
+        downloader.close()
+        sys.exit(run_urls([url], mode=mode, quality=quality, download_path=downloader.download_path))
     
     # 자막 정보 확인
     if len(sys.argv) > 2 and sys.argv[2] == '--check-subs':
@@ -460,31 +1312,57 @@ def main():
             print(f"자동 자막: {', '.join(subs_info['auto_subtitles']) if subs_info['auto_subtitles'] else '없음'}")
         return
     
-    # 비디오 정보 출력
-    info = downloader.get_video_info(url)
-    if info:
-        print(f"\n제목: {info['title']}")
-        print(f"업로더: {info['uploader']}")
-        print(f"재생 시간: {info['duration']}초")
-        print(f"조회수: {info['view_count']:,}")
+    # 콘텐츠 저장소에 있으면 정보 추출 없이 복원
+    if downloader.restore_from_store(url, mode, quality):
+        return
+
+    # 비디오 정보 출력 (추출한 정보는 다운로드에 재사용)
+    try:
+        info = downloader.extract_info(url)
+    except Exception:
+        info = None
+
+    summary = downloader.get_video_info(url, info=info) if info else None
+    if summary:
+        print(f"\n제목: {summary['title']}")
+        print(f"업로더: {summary['uploader']}")
+        print(f"재생 시간: {summary['duration']}초")
+        print(f"조회수: {summary['view_count']:,}")
         print()
     
-    # 다운로드 모드 결정
-    if len(sys.argv) > 2:
-        if sys.argv[2] == '--subs-only':
+    # 진행 상황을 저널에 기록 (중간에 종료되면 --resume으로 이어받기)
+    job_id = journal.new_job_id()
+    journal.begin(job_id, url, {
+        'mode': mode,
+        'quality': quality,
+        'subtitle_langs': list(YouTubeDownloader.DEFAULT_SUBTITLE_LANGS),
+        'download_path': downloader.download_path,
+    })
+    downloader.set_progress_callback(lambda d: journal.track_progress(job_id, d))
+
+    success = False
+    try:
+        if mode == 'subs_only':
             # 자막만 다운로드
             print("자막만 다운로드합니다...")
-            downloader.download_subtitles(url)
-        elif sys.argv[2] == '--with-subs':
+            success = downloader.download_subtitles(url, info=info)
+        elif mode == 'video_subs':
             # 비디오+자막 다운로드
             print("비디오와 자막을 함께 다운로드합니다...")
-            downloader.download_video_with_subtitles(url)
+            success = downloader.download_video_with_subtitles(url, info=info)
+        elif mode == 'audio_only':
+            # 오디오만 다운로드
+            print("오디오만 다운로드합니다...")
+            success = downloader.download_audio(url, quality, info=info)
+        elif mode == 'clip':
+            # 구간만 다운로드
+            clip_quality, start, end = SectionDownloader.parse_variant(quality)
+            success = downloader.download_section(url, start, end, clip_quality, info=info)
         else:
             # 기본 비디오 다운로드
-            downloader.download_video(url)
-    else:
-        # 기본 비디오 다운로드
-        downloader.download_video(url)
+            success = downloader.download_video(url, info=info)
+    finally:
+        journal.finish(job_id, 'done' if success else 'failed')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,325 @@
+import re
+from logger import get_logger
+
+class FormatDecision:
+    """포맷 선택 결과 (로그 출력용 설명 포함)"""
+
+    def __init__(self, formats, strategy, quality, reason, estimated_bytes=None, candidates=0):
+        self.formats = formats
+        self.strategy = strategy
+        self.quality = quality
+        self.reason = reason
+        self.estimated_bytes = estimated_bytes
+        self.candidates = candidates
+
+    @property
+    def format_ids(self):
+        """선택한 포맷 ID 목록"""
+        return [f.get('format_id') for f in self.formats]
+
+    @property
+    def format_spec(self):
+        """yt-dlp 포맷 문자열 (예: '137+140' 또는 '18')"""
+        return '+'.join(str(format_id) for format_id in self.format_ids)
+
+    @property
+    def needs_merge(self):
+        """비디오/오디오 병합(FFmpeg) 필요 여부"""
+        return len(self.formats) > 1
+
+    @property
+    def height(self):
+        return max((f.get('height') or 0) for f in self.formats) or None
+
+    def describe(self):
+        """선택 결과 요약 문자열"""
+        size = f"{self.estimated_bytes / (1024 * 1024):.1f}MB" if self.estimated_bytes else "크기 미상"
+        merge = "병합 필요" if self.needs_merge else "병합 없음"
+        if self.height:
+            media = f"{self.height}p"
+        elif self.quality == FormatSelector.AUDIO:
+            media = f"오디오 {self.formats[0].get('ext')}"
+        else:
+            media = "?p"
+        return (
+            f"포맷 {self.format_spec} ({media}, {size}, {merge}) "
+            f"- 전략: {self.strategy}, 후보 {self.candidates}개, 이유: {self.reason}"
+        )
+
+    def to_dict(self):
+        return {
+            'format_spec': self.format_spec,
+            'needs_merge': self.needs_merge,
+            'height': self.height,
+            'estimated_bytes': self.estimated_bytes,
+            'strategy': self.strategy,
+            'quality': self.quality,
+            'reason': self.reason,
+            'candidates': self.candidates,
+        }
+
+class FormatSelector:
+    """info['formats']를 점수화하여 다운로드할 포맷을 고르는 엔진"""
+
+    # 포맷 목록을 모를 때 사용하는 기존 포맷 문자열
+    FALLBACK_FORMATS = {
+        'best': 'bv*+ba/b',  # 가장 호환성 좋은 포맷
+        'worst': 'worst',
+        '720p': 'bv*[height<=720]+ba/b[height<=720]',
+        '480p': 'bv*[height<=480]+ba/b[height<=480]',
+        '360p': 'bv*[height<=360]+ba/b[height<=360]',
+    }
+    # 오디오만 받을 때의 포맷 문자열 (포맷 목록을 모를 때)
+    AUDIO_FALLBACK_FORMAT = 'bestaudio[ext=m4a]/bestaudio/best'
+    AUDIO = 'audio'
+
+    # 변환 없이 저장할 때 선호하는 오디오 확장자 (재생 호환성 순)
+    NATIVE_AUDIO_EXTS = ('m4a', 'mp3', 'webm', 'opus', 'ogg')
+
+    # 선택 전략
+    BALANCED = 'balanced'  # 크기가 비슷하면 병합 없는/호환성 좋은 포맷 우선
+    SMALLEST = 'smallest'  # 전송량 최소
+    FASTEST = 'fastest'    # 병합 없는 포맷 우선 (완료까지 가장 빠름)
+    STRATEGIES = (BALANCED, SMALLEST, FASTEST)
+
+    # 코덱 호환성 순위 (작을수록 호환성 좋음)
+    CODEC_COMPATIBILITY = [('avc1', 0), ('h264', 0), ('vp9', 1), ('vp09', 1), ('av01', 2)]
+
+    # 병합 시 함께 쓸 수 있는 오디오 확장자 (비디오 확장자별)
+    COMPATIBLE_AUDIO = {
+        'mp4': ('m4a', 'mp4'),
+        'webm': ('webm',),
+    }
+
+    def __init__(self, strategy=BALANCED, size_tolerance=0.15, min_audio_abr=96):
+        """
+        포맷 선택 엔진 초기화
+
+        Args:
+            strategy (str): 'balanced', 'smallest', 'fastest'
+            size_tolerance (float): balanced 전략에서 같은 크기로 볼 차이 비율
+            min_audio_abr (float): smallest 전략에서 허용할 최소 오디오 비트레이트 (kbps)
+        """
+        self.strategy = strategy if strategy in self.STRATEGIES else self.BALANCED
+        self.size_tolerance = size_tolerance
+        self.min_audio_abr = min_audio_abr
+        self.logger = get_logger()
+
+    def configure(self, strategy=None):
+        """선택 전략 변경"""
+        if strategy in self.STRATEGIES:
+            self.strategy = strategy
+
+    def fallback_format(self, quality):
+        """포맷 목록 없이 사용할 포맷 문자열"""
+        return self.FALLBACK_FORMATS.get(quality, self.FALLBACK_FORMATS['best'])
+
+    def select(self, info, quality='best'):
+        """
+        추출한 정보에서 다운로드할 포맷 선택
+
+        Args:
+            info (dict): extract_info() 결과
+            quality (str): 'best', 'worst', '720p' 등
+
+        Returns:
+            FormatDecision: 선택 결과 (포맷 목록이 없으면 None)
+        """
+        formats = [f for f in (info or {}).get('formats') or [] if self._is_usable(f)]
+        if not formats:
+            return None
+
+        duration = (info or {}).get('duration')
+        progressive = [f for f in formats if self._has_video(f) and self._has_audio(f)]
+        video_only = [f for f in formats if self._has_video(f) and not self._has_audio(f)]
+        audio_only = [f for f in formats if self._has_audio(f) and not self._has_video(f)]
+
+        candidates = [[f] for f in progressive]
+        for video in video_only:
+            audio = self._pick_audio(video, audio_only, duration)
+            if audio:
+                candidates.append([video, audio])
+        if not candidates:
+            return None
+
+        # 1. 해상도 목표: 목표 이하에서 가장 높은 해상도 (없으면 목표를 넘는 가장 낮은 해상도)
+        target = self._target_height(quality)
+        heights = sorted({self._height(c) for c in candidates})
+        if quality == 'worst':
+            tier_height = heights[0]
+        elif target is None:
+            tier_height = heights[-1]
+        else:
+            below = [h for h in heights if h <= target]
+            tier_height = below[-1] if below else heights[0]
+        tier = [c for c in candidates if self._height(c) == tier_height]
+
+        # 2. 같은 해상도 안에서 전략에 따라 정렬
+        chosen, reason = self._rank(tier, duration)
+        decision = FormatDecision(
+            chosen, self.strategy, quality, reason,
+            estimated_bytes=self._estimate_bytes(chosen, duration),
+            candidates=len(candidates)
+        )
+        self.logger.info(f"포맷 선택: {decision.describe()}")
+        return decision
+
+    def select_audio(self, info):
+        """
+        재인코딩 없이 저장할 원본 오디오 스트림 선택
+
+        balanced/fastest는 비트레이트가 가장 높은 스트림과 차이가 size_tolerance 이내이면
+        호환성 좋은 확장자(m4a)를 우선하고, smallest는 min_audio_abr 이상에서 가장 작은 스트림을 고릅니다.
+
+        Args:
+            info (dict): extract_info() 결과
+
+        Returns:
+            FormatDecision: 선택 결과 (오디오 전용 포맷이 없으면 None)
+        """
+        audio_only = [
+            f for f in (info or {}).get('formats') or []
+            if self._is_usable(f) and self._has_audio(f) and not self._has_video(f)
+        ]
+        if not audio_only:
+            return None
+
+        duration = (info or {}).get('duration')
+
+        def bitrate(f):
+            return f.get('abr') or f.get('tbr') or 0
+
+        def ext_rank(f):
+            ext = f.get('ext')
+            return self.NATIVE_AUDIO_EXTS.index(ext) if ext in self.NATIVE_AUDIO_EXTS else len(self.NATIVE_AUDIO_EXTS)
+
+        if self.strategy == self.SMALLEST:
+            pool = [f for f in audio_only if bitrate(f) >= self.min_audio_abr] or audio_only
+            chosen = min(pool, key=lambda f: (self._estimate_bytes([f], duration) or float('inf'), ext_rank(f)))
+            reason = f"{self.min_audio_abr}kbps 이상에서 전송량이 가장 적음"
+        else:
+            best = max(bitrate(f) for f in audio_only)
+            close = [f for f in audio_only if bitrate(f) >= best * (1 - self.size_tolerance)]
+            chosen = min(close, key=lambda f: (ext_rank(f), -bitrate(f)))
+            if bitrate(chosen) < best:
+                reason = "비트레이트 차이가 작아 호환성 좋은 형식 선택"
+            else:
+                reason = "비트레이트가 가장 높은 원본 오디오"
+
+        decision = FormatDecision(
+            [chosen], self.strategy, self.AUDIO, reason,
+            estimated_bytes=self._estimate_bytes([chosen], duration),
+            candidates=len(audio_only)
+        )
+        self.logger.info(f"오디오 포맷 선택: {decision.describe()}")
+        return decision
+
+    def restrict_formats(self, info, decision):
+        """
+        선택한 포맷만 남긴 info 사본 반환
+
+        세션 풀의 옵션(포맷 문자열)은 그대로 두고 yt-dlp가 고를 수 있는
+        포맷만 제한합니다.
+        """
+        restricted = dict(info)
+        chosen_ids = set(decision.format_ids)
+        restricted['formats'] = [f for f in info.get('formats') or [] if f.get('format_id') in chosen_ids]
+        for key in ('requested_formats', 'requested_downloads', 'format_id'):
+            restricted.pop(key, None)
+        return restricted
+
+    def _rank(self, tier, duration):
+        def size(candidate):
+            estimated = self._estimate_bytes(candidate, duration)
+            return estimated if estimated is not None else float('inf')
+
+        def merge(candidate):
+            return 1 if len(candidate) > 1 else 0
+
+        def codec(candidate):
+            return self._codec_rank(candidate[0].get('vcodec'))
+
+        if self.strategy == self.SMALLEST:
+            chosen = min(tier, key=lambda c: (size(c), merge(c), codec(c)))
+            return chosen, "같은 해상도에서 전송량이 가장 적음"
+
+        if self.strategy == self.FASTEST:
+            chosen = min(tier, key=lambda c: (merge(c), size(c), codec(c)))
+            if merge(chosen):
+                return chosen, "병합 없는 포맷이 없어 가장 작은 병합 포맷 선택"
+            return chosen, "병합 없이 바로 완료"
+
+        # balanced: 가장 작은 후보와 크기가 비슷하면 병합 없음 > 코덱 호환성 > 크기 순
+        smallest = min(size(c) for c in tier)
+        if smallest == float('inf'):
+            close = tier
+        else:
+            close = [c for c in tier if size(c) <= smallest * (1 + self.size_tolerance)]
+        chosen = min(close, key=lambda c: (merge(c), codec(c), size(c)))
+        if not merge(chosen) and any(merge(c) for c in tier):
+            return chosen, "병합 포맷과 크기 차이가 작아 병합 생략"
+        if chosen is not min(tier, key=size):
+            return chosen, "크기 차이가 작아 호환성 좋은 코덱 선택"
+        return chosen, "같은 해상도에서 전송량이 가장 적음"
+
+    def _pick_audio(self, video, audio_only, duration):
+        """비디오와 같은 컨테이너로 병합할 수 있는 오디오 선택"""
+        compatible_exts = self.COMPATIBLE_AUDIO.get(video.get('ext'))
+        pool = [a for a in audio_only if compatible_exts is None or a.get('ext') in compatible_exts]
+        if not pool:
+            pool = audio_only
+        if not pool:
+            return None
+
+        if self.strategy == self.SMALLEST:
+            good_enough = [a for a in pool if (a.get('abr') or a.get('tbr') or 0) >= self.min_audio_abr]
+            if good_enough:
+                return min(good_enough, key=lambda a: self._estimate_bytes([a], duration) or float('inf'))
+        return max(pool, key=lambda a: (a.get('abr') or a.get('tbr') or 0))
+
+    def _estimate_bytes(self, candidate, duration):
+        total = 0
+        for f in candidate:
+            size = f.get('filesize') or f.get('filesize_approx')
+            if not size and f.get('tbr') and duration:
+                size = f['tbr'] * 1000 / 8 * duration
+            if not size:
+                return None
+            total += size
+        return int(total)
+
+    def _target_height(self, quality):
+        match = re.match(r'^(\d+)p$', str(quality or ''))
+        return int(match.group(1)) if match else None
+
+    def _height(self, candidate):
+        return candidate[0].get('height') or 0
+
+    def _codec_rank(self, vcodec):
+        vcodec = (vcodec or '').lower()
+        for prefix, rank in self.CODEC_COMPATIBILITY:
+            if vcodec.startswith(prefix):
+                return rank
+        return len(self.CODEC_COMPATIBILITY)
+
+    def _has_video(self, f):
+        return f.get('vcodec') not in (None, 'none')
+
+    def _has_audio(self, f):
+        return f.get('acodec') not in (None, 'none')
+
+    def _is_usable(self, f):
+        # 스토리보드 이미지, DRM 포맷 제외
+        if f.get('has_drm') or f.get('ext') == 'mhtml':
+            return False
+        return bool(f.get('format_id')) and (self._has_video(f) or self._has_audio(f))
+
+# 전역 포맷 선택 엔진 인스턴스 (설정의 전략을 모든 다운로더에 적용)
+_selector_instance = None
+
+def get_format_selector():
+    """전역 포맷 선택 엔진 인스턴스 가져오기"""
+    global _selector_instance
+    if _selector_instance is None:
+        _selector_instance = FormatSelector()
+    return _selector_instance
@@ -0,0 +1,325 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+from logger import get_logger
+
+class FragmentMeasurement:
+    """다운로드 하나의 처리량과 오류 측정 (진행률 훅과 yt-dlp 메시지로 수집)"""
+
+    THROTTLE_PATTERNS = ['429', 'too many requests']
+    ERROR_PATTERNS = ['got error', 'http error', 'timed out', 'connection reset', 'unable to download fragment']
+
+    def __init__(self, host, concurrency):
+        self.host = host
+        self.concurrency = concurrency
+        self.errors = 0
+        self.throttled = False
+
+        self._first = None  # (시각, 받은 bytes)
+        self._last = None
+        self._lock = threading.Lock()
+
+    def on_progress(self, d):
+        """yt-dlp 진행률 훅 (조각 다운로드 스레드에서 동시에 호출될 수 있음)"""
+        if d.get('status') != 'downloading' or d.get('downloaded_bytes') is None:
+            return
+        sample = (time.monotonic(), d['downloaded_bytes'])
+        with self._lock:
+            if self._first is None:
+                self._first = sample
+            self._last = sample
+
+    def on_message(self, message):
+        """yt-dlp 화면/경고 메시지에서 재시도 오류와 요청 제한(429) 감지"""
+        message = str(message).lower()
+        if any(pattern in message for pattern in self.THROTTLE_PATTERNS):
+            self.throttled = True
+            self.errors += 1
+        elif any(pattern in message for pattern in self.ERROR_PATTERNS):
+            self.errors += 1
+
+    def throughput(self, min_bytes=0, min_seconds=0):
+        """
+        측정한 처리량 (bytes/s)
+
+        Returns:
+            float: 처리량 (표본이 너무 작으면 None)
+        """
+        with self._lock:
+            if self._first is None:
+                return None
+            seconds = self._last[0] - self._first[0]
+            received = self._last[1] - self._first[1]
+        if seconds <= 0 or seconds < min_seconds or received < min_bytes:
+            return None
+        return received / seconds
+
+class FragmentTuner:
+    """처리량을 측정하여 호스트별 조각(fragment) 동시 다운로드 수를 조절하는 제어기"""
+
+    # 조각 단위로 받는 프로토콜 (concurrent_fragment_downloads가 적용됨)
+    FRAGMENT_PROTOCOLS = ('m3u8_native', 'http_dash_segments', 'http_dash_segments_generator', 'ism', 'f4m')
+
+    def __init__(self, state_file='cache/fragment_tuning.json', initial=4, min_concurrency=1, max_concurrency=16,
+                 min_sample_bytes=1024 * 1024, min_sample_seconds=2.0, gain_threshold=0.05,
+                 smoothing=0.5, error_penalty=0.5, stale_after=7 * 24 * 3600):
+        """
+        조각 동시 다운로드 제어기 초기화
+
+        다운로드가 끝날 때마다 사용한 동시 다운로드 수의 처리량을 기록하고, 한 단계 위가
+        아직 측정되지 않았거나 더 빠르면 올리고, 아래 단계가 더 빠르면 내립니다(언덕 오르기).
+        오류나 429가 발생하면 즉시 줄이며, 호스트별 결과는 파일에 저장되어 다음 실행에도 사용합니다.
+
+        Args:
+            state_file (str): 호스트별 측정 결과 파일 (None이면 저장하지 않음)
+            initial (int): 처음 보는 호스트의 동시 다운로드 수
+            min_concurrency (int): 최소 동시 다운로드 수
+            max_concurrency (int): 최대 동시 다운로드 수
+            min_sample_bytes (int): 처리량으로 인정할 최소 전송량
+            min_sample_seconds (float): 처리량으로 인정할 최소 측정 시간 (초)
+            gain_threshold (float): 한 단계 위를 계속 시도할 최소 처리량 향상 비율
+            smoothing (float): 처리량 지수 이동 평균에서 새 측정값의 비중
+            error_penalty (float): 오류 발생 시 해당 단계 처리량에 곱할 비율
+            stale_after (int): 이 시간(초)이 지난 측정값은 다시 측정
+        """
+        self.state_file = state_file
+        self.initial = initial
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.min_sample_bytes = min_sample_bytes
+        self.min_sample_seconds = min_sample_seconds
+        self.gain_threshold = gain_threshold
+        self.smoothing = smoothing
+        self.error_penalty = error_penalty
+        self.stale_after = stale_after
+        self.logger = get_logger()
+
+        self._hosts = None  # host -> {'concurrency', 'best', 'levels': {동시 수(str): {'throughput', 'updated'}}}
+        self._lock = threading.RLock()
+
+    def host_key(self, url):
+        """
+        측정 결과를 묶을 호스트 이름
+
+        CDN은 노드마다 호스트 이름이 다르므로(rr1---sn-xxx.googlevideo.com) 상위 도메인 단위로 묶습니다.
+        """
+        host = (urlsplit(url or '').hostname or '').lower()
+        labels = host.split('.')
+        if len(labels) > 2 and not host.replace('.', '').isdigit():
+            return '.'.join(labels[-2:])
+        return host
+
+    def concurrency_for(self, host):
+        """호스트에 사용할 동시 다운로드 수"""
+        with self._lock:
+            state = self._load().get(host)
+            concurrency = state['concurrency'] if state else self.initial
+        return self._clamp(concurrency)
+
+    def start(self, host):
+        """
+        측정 시작
+
+        Returns:
+            FragmentMeasurement: 진행률 훅과 메시지를 전달할 측정 객체
+        """
+        return FragmentMeasurement(host, self.concurrency_for(host))
+
+    def finish(self, measurement, error=None):
+        """
+        측정 종료 후 다음 동시 다운로드 수 결정
+
+        Args:
+            measurement (FragmentMeasurement): start()로 만든 측정 객체
+            error: 다운로드가 실패했으면 예외 (선택)
+
+        Returns:
+            int: 다음 다운로드에 사용할 동시 다운로드 수
+        """
+        if error is not None:
+            measurement.on_message(error)
+            measurement.errors = max(measurement.errors, 1)
+        throughput = measurement.throughput(self.min_sample_bytes, self.min_sample_seconds)
+        return self.record(measurement.host, measurement.concurrency, throughput,
+                           errors=measurement.errors, throttled=measurement.throttled)
+
+    def record(self, host, concurrency, throughput=None, errors=0, throttled=False):
+        """
+        측정 결과 반영
+
+        Args:
+            host (str): 호스트 (host_key 결과)
+            concurrency (int): 측정에 사용한 동시 다운로드 수
+            throughput (float): 처리량 (bytes/s, 표본이 작으면 None)
+            errors (int): 재시도/실패 횟수
+            throttled (bool): 요청 제한(429) 발생 여부
+
+        Returns:
+            int: 다음 다운로드에 사용할 동시 다운로드 수
+        """
+        now = time.time()
+        with self._lock:
+            hosts = self._load()
+            state = hosts.setdefault(host, {'concurrency': self.initial, 'best': None, 'levels': {}})
+            levels = state['levels']
+            self._drop_stale(levels, now)
+            level = levels.get(str(concurrency))
+
+            if throttled or errors:
+                # 오류/제한: 현재 단계 평가를 낮추고 동시 수를 줄임 (429는 절반으로)
+                if level is not None:
+                    level['throughput'] *= self.error_penalty
+                    level['updated'] = now
+                elif throughput is not None:
+                    levels[str(concurrency)] = {'throughput': throughput * self.error_penalty, 'updated': now}
+                next_concurrency = concurrency // 2 if throttled else concurrency - 1
+                reason = "요청 제한" if throttled else f"오류 {errors}회"
+            elif throughput is not None:
+                if level is None:
+                    levels[str(concurrency)] = {'throughput': throughput, 'updated': now}
+                else:
+                    level['throughput'] += self.smoothing * (throughput - level['throughput'])
+                    level['updated'] = now
+                next_concurrency, reason = self._climb(levels, concurrency)
+            else:
+                next_concurrency, reason = concurrency, "표본 부족"
+
+            next_concurrency = self._clamp(next_concurrency)
+            state['concurrency'] = next_concurrency
+            state['best'] = self._best(levels)
+            self._save()
+
+        if next_concurrency != concurrency:
+            self.logger.info(f"조각 동시 다운로드 조정 ({host}): {concurrency} -> {next_concurrency} ({reason})")
+        return next_concurrency
+
+    def stats(self):
+        """호스트별 현재 설정과 최고 처리량 단계"""
+        with self._lock:
+            return {
+                host: {'concurrency': state['concurrency'], 'best': state.get('best')}
+                for host, state in self._load().items()
+            }
+
+    def attach(self, ydl):
+        """
+        YoutubeDL 인스턴스의 조각 다운로드에 동시 다운로드 수 자동 조절 연결
+
+        params의 'fragment_autotune'이 켜져 있을 때만 동작합니다. 다운로드마다
+        params['concurrent_fragment_downloads']를 호스트별 값으로 바꾸고, 끝나면 원래 값으로 되돌립니다.
+        """
+        original_dl = ydl.dl
+        original_to_screen = ydl.to_screen
+        original_report_warning = ydl.report_warning
+        current = {'measurement': None}
+
+        def to_screen(message, *args, **kwargs):
+            if current['measurement'] is not None:
+                current['measurement'].on_message(message)
+            return original_to_screen(message, *args, **kwargs)
+
+        def report_warning(message, *args, **kwargs):
+            if current['measurement'] is not None:
+                current['measurement'].on_message(message)
+            return original_report_warning(message, *args, **kwargs)
+
+        def tuned_dl(name, info, subtitle=False, test=False):
+            fragmented = info.get('fragments') or info.get('protocol') in self.FRAGMENT_PROTOCOLS
+            if subtitle or test or not fragmented or not ydl.params.get('fragment_autotune'):
+                return original_dl(name, info, subtitle=subtitle, test=test)
+
+            url = info.get('fragment_base_url') or info.get('url')
+            measurement = self.start(self.host_key(url))
+            previous = ydl.params.get('concurrent_fragment_downloads')
+            ydl.params['concurrent_fragment_downloads'] = measurement.concurrency
+            ydl._progress_hooks.append(measurement.on_progress)
+            current['measurement'] = measurement
+            error = None
+            try:
+                return original_dl(name, info, subtitle=subtitle, test=test)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                current['measurement'] = None
+                ydl._progress_hooks.remove(measurement.on_progress)
+                if previous is None:
+                    ydl.params.pop('concurrent_fragment_downloads', None)
+                else:
+                    ydl.params['concurrent_fragment_downloads'] = previous
+                self.finish(measurement, error)
+
+        ydl.to_screen = to_screen
+        ydl.report_warning = report_warning
+        ydl.dl = tuned_dl
+        return ydl
+
+    def _climb(self, levels, concurrency):
+        """측정값으로 다음 단계 결정 (더 빠른 아래 단계 > 미측정 또는 더 빠른 위 단계 > 유지)"""
+        current = levels[str(concurrency)]['throughput']
+
+        lower = [int(n) for n in levels if int(n) < concurrency]
+        if lower:
+            best_lower = max(lower, key=lambda n: levels[str(n)]['throughput'])
+            if levels[str(best_lower)]['throughput'] > current:
+                return best_lower, "아래 단계가 더 빠름"
+
+        up = self._clamp(concurrency + max(1, concurrency // 2))
+        if up > concurrency:
+            upper = levels.get(str(up))
+            if upper is None:
+                return up, "위 단계 측정"
+            if upper['throughput'] > current * (1 + self.gain_threshold):
+                return up, "위 단계가 더 빠름"
+        return concurrency, "현재 단계 유지"
+
+    def _best(self, levels):
+        if not levels:
+            return None
+        return int(max(levels, key=lambda n: levels[n]['throughput']))
+
+    def _drop_stale(self, levels, now):
+        for n in [n for n, level in levels.items() if now - level.get('updated', 0) > self.stale_after]:
+            del levels[n]
+
+    def _clamp(self, concurrency):
+        return max(self.min_concurrency, min(self.max_concurrency, int(concurrency)))
+
+    def _load(self):
+        if self._hosts is not None:
+            return self._hosts
+
+        self._hosts = {}
+        if self.state_file and os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self._hosts = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"조각 다운로드 측정 결과 로드 실패: {e}")
+        return self._hosts
+
+    def _save(self):
+        if not self.state_file:
+            return
+        tmp_file = self.state_file + '.tmp'
+        try:
+            directory = os.path.dirname(self.state_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._hosts, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            self.logger.error(f"조각 다운로드 측정 결과 저장 실패: {e}")
+
+# 전역 조각 다운로드 제어기 인스턴스 (측정 결과를 모든 다운로더가 공유)
+_tuner_instance = None
+
+def get_fragment_tuner():
+    """전역 조각 다운로드 제어기 인스턴스 가져오기"""
+    global _tuner_instance
+    if _tuner_instance is None:
+        _tuner_instance = FragmentTuner()
+    return _tuner_instance
@@ -6,6 +6,12 @@ from downloader import YouTubeDownloader
 from config import Config
 from security import get_validator
 from history import get_history
+from rate_limiter import get_rate_limiter
+from job_journal import get_job_journal
+from format_selector import get_format_selector
+from bandwidth_manager import get_bandwidth_manager
+from content_store import get_content_store
+from section_downloader import SectionDownloader
 from tkinter import ttk, filedialog, messagebox
 import threading
 import os
@@ -23,6 +29,26 @@ import os
 from downloader import YouTubeDownloader
 
 class YouTubeDownloaderGUI:
+    # 히스토리 검색: 입력이 멈춘 뒤 검색할 때까지 기다리는 시간 (ms)
+    HISTORY_SEARCH_DELAY_MS = 250
+    # 히스토리 창: 한 번에 가져올 기록 수와 다음 페이지를 미리 가져올 스크롤 위치 (0~1)
+    HISTORY_PAGE_SIZE = 100
+    HISTORY_PREFETCH_AT = 0.8
+    # 히스토리 표의 열 (제목, 정렬 열, 너비)
+    HISTORY_COLUMNS = (
+        ('시간', 'timestamp', 150),
+        ('제목', 'title', 300),
+        ('모드', 'mode', 100),
+        ('품질', 'quality', 80),
+        ('상태', 'status', 80),
+    )
+    HISTORY_STATUS_FILTERS = {'전체': None, '성공': 'success', '실패': 'failed', '취소': 'cancelled'}
+    HISTORY_STATUS_ICONS = {
+        'success': '✅',
+        'failed': '❌',
+        'cancelled': '⚠️'
+    }
+
     def __init__(self, root):
             self.root = root
             self.root.title("YouTube 다운로더")
@@ -34,11 +60,26 @@ class YouTubeDownloaderGUI:
             default_download_path = os.path.join(os.path.expanduser("~"), "Downloads", "YouTube")
             self.downloader = YouTubeDownloader(download_path=default_download_path)
 
+            # 요청 속도 제한 설정 적용 (모든 다운로더가 공유)
+            get_rate_limiter().configure(max_rate=self.config.get('request_rate_limit'))
+            # 포맷 선택 전략 적용 (모든 다운로더가 공유)
+            get_format_selector().configure(strategy=self.config.get('format_strategy'))
+            # 전체 대역폭 제한과 시간대 프로필 적용 (모든 다운로드가 공유)
+            self.bandwidth_manager = get_bandwidth_manager()
+            self.bandwidth_manager.configure_from_config(self.config)
+            self.config.subscribe(self._on_config_changed)
+            # 콘텐츠 저장소 사용 여부와 위치 적용 (모든 다운로더가 공유)
+            get_content_store().configure_from_config(self.config)
+
             self.validator = get_validator()
             self.history = get_history()
+            self.journal = get_job_journal()
             self.setup_ui()
             self.load_settings()
 
+            # 이전 실행에서 중단된 다운로드 확인
+            self.root.after(500, self.check_interrupted_downloads)
+
 
 
     def format_error_message(self, error):
@@ -120,19 +161,47 @@ class YouTubeDownloaderGUI:
         default_mode = self.config.get('default_download_mode', 'video_only')
         self.download_mode.set(default_mode)
 
+        # 전체 속도 제한
+        self.bandwidth_spinbox.set(self.config.get('bandwidth_limit', 0))
+
+    def apply_bandwidth_limit(self):
+        """속도 제한 입력값을 진행 중인 다운로드에 바로 적용하고 저장합니다."""
+        try:
+            limit = max(0, int(float(self.bandwidth_spinbox.get() or 0)))
+        except ValueError:
+            self.bandwidth_spinbox.set(self.config.get('bandwidth_limit', 0))
+            return
+
+        if limit == self.config.get('bandwidth_limit', 0):
+            return
+        # 대역폭 관리자에는 설정 변경 알림(_on_config_changed)으로 적용
+        self.config.set('bandwidth_limit', limit)
+        self.log_message(f"속도 제한 변경: {f'{limit:,}KB/s' if limit else '제한 없음'}")
+
+    def _on_config_changed(self, key, value):
+        """설정 변경 알림 (대역폭과 콘텐츠 저장소 설정은 진행 중인 다운로드에 바로 적용)"""
+        if key in ('bandwidth_limit', 'bandwidth_profiles'):
+            self.bandwidth_manager.configure_from_config(self.config)
+        elif key in ('content_store', 'content_store_path'):
+            get_content_store().configure_from_config(self.config)
+
     def save_current_settings(self):
         """현재 UI 설정을 저장합니다."""
-        self.config.set('download_path', self.path_entry.get().strip())
-        self.config.set('default_quality', self.quality_combo.get())
-        self.config.set('default_subtitle_lang', self.subtitle_lang_combo.get())
-        self.config.set('default_download_mode', self.download_mode.get())
+        self.config.update({
+            'download_path': self.path_entry.get().strip(),
+            'default_quality': self.quality_combo.get(),
+            'default_subtitle_lang': self.subtitle_lang_combo.get(),
+            'default_download_mode': self.download_mode.get(),
+        })
     def save_settings_clicked(self):
         """설정 저장 버튼 클릭 시 호출"""
         self.save_current_settings()
+        # 사용자가 직접 저장한 설정은 바로 파일에 기록
+        self.config.flush()
         messagebox.showinfo("설정 저장", "현재 설정이 저장되었습니다.\n다음 실행 시 자동으로 적용됩니다.")
-    def validate_url(self, url):
+    def validate_url(self, url, allow_collections=False):
         """URL 유효성 검증"""
-        is_valid, error_msg = self.validator.validate_youtube_url(url)
+        is_valid, error_msg = self.validator.validate_youtube_url(url, allow_collections=allow_collections)
         if not is_valid:
             messagebox.showerror("URL 오류", error_msg)
             self.log_message(f"❌ URL 검증 실패: {error_msg}")
@@ -192,7 +261,12 @@ class YouTubeDownloaderGUI:
             self.log_message("⚠️ 다운로드 취소 요청...")
             self.cancel_button.config(state='disabled')
     def show_history(self):
-        """다운로드 히스토리 창 표시"""
+        """
+        다운로드 히스토리 창 표시
+
+        기록 수와 관계없이 바로 열리도록 첫 페이지만 가져오고, 아래로 스크롤하면 다음 페이지를
+        작업 스레드에서 가져와 붙입니다. 정렬과 상태 필터는 히스토리 저장소에서 처리합니다.
+        """
         history_window = tk.Toplevel(self.root)
         history_window.title("다운로드 히스토리")
         history_window.geometry("800x500")
@@ -201,7 +275,7 @@ class YouTubeDownloaderGUI:
         main_frame = ttk.Frame(history_window, padding="10")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
-        # 통계 표시
+        # 통계 표시 (집계 카운터를 읽으므로 기록 수와 관계없이 바로 표시)
         stats = self.history.get_statistics()
         stats_text = (
             f"총 다운로드: {stats['total']}개 | "
@@ -212,67 +286,136 @@ class YouTubeDownloaderGUI:
         )
         ttk.Label(main_frame, text=stats_text).grid(row=0, column=0, columnspan=2, pady=(0, 10))
 
+        # 검색 (입력하는 동안 검색)과 상태 필터
+        search_frame = ttk.Frame(main_frame)
+        search_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
+        ttk.Label(search_frame, text="검색:").pack(side=tk.LEFT)
+        search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=search_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        ttk.Label(search_frame, text="상태:").pack(side=tk.LEFT)
+        status_combo = ttk.Combobox(search_frame, values=list(self.HISTORY_STATUS_FILTERS), width=8, state='readonly')
+        status_combo.set('전체')
+        status_combo.pack(side=tk.LEFT, padx=(5, 0))
+
         # 트리뷰 (테이블)
         tree_frame = ttk.Frame(main_frame)
-        tree_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        tree_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
 
         # 스크롤바
         scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        # 트리뷰 생성
-        columns = ('시간', '제목', '모드', '품질', '상태')
-        tree = ttk.Treeview(tree_frame, columns=columns, show='headings', yscrollcommand=scrollbar.set)
+        # 트리뷰 생성 (제목을 누르면 그 열로 정렬)
+        columns = [heading for heading, _, _ in self.HISTORY_COLUMNS]
+        tree = ttk.Treeview(tree_frame, columns=columns, show='headings')
         scrollbar.config(command=tree.yview)
-
-        # 컬럼 설정
-        tree.heading('시간', text='시간')
-        tree.heading('제목', text='제목')
-        tree.heading('모드', text='모드')
-        tree.heading('품질', text='품질')
-        tree.heading('상태', text='상태')
-
-        tree.column('시간', width=150)
-        tree.column('제목', width=300)
-        tree.column('모드', width=100)
-        tree.column('품질', width=80)
-        tree.column('상태', width=80)
+        for heading, sort_key, width in self.HISTORY_COLUMNS:
+            tree.heading(heading, text=heading, command=lambda key=sort_key: sort_by(key))
+            tree.column(heading, width=width)
 
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        # 데이터 로드
-        for record in self.history.get_all_downloads():
-            timestamp = record.get('timestamp', '')
-            if timestamp:
-                # ISO 형식을 읽기 쉬운 형식으로 변환
-                from datetime import datetime
-                try:
-                    dt = datetime.fromisoformat(timestamp)
-                    timestamp = dt.strftime('%Y-%m-%d %H:%M')
-                except:
-                    pass
-
-            title = record.get('title', 'N/A')
-            if len(title) > 40:
-                title = title[:37] + '...'
-
-            mode = record.get('mode', 'N/A')
-            quality = record.get('quality', 'N/A') or 'N/A'
-            status = record.get('status', 'N/A')
+        # 현재 보기 상태 (generation이 바뀌면 이전 요청의 결과는 버림)
+        view = {
+            'sort': 'id', 'descending': True, 'status': None, 'query': '',
+            'cursor': None, 'offset': 0, 'exhausted': False, 'loading': False, 'generation': 0,
+            'search_after_id': None,
+        }
 
-            # 상태에 따라 아이콘 추가
-            status_icons = {
-                'success': '✅',
-                'failed': '❌',
-                'cancelled': '⚠️'
-            }
-            status_display = f"{status_icons.get(status, '')} {status}"
+        def load_more():
+            if view['loading'] or view['exhausted']:
+                return
+            view['loading'] = True
+            generation = view['generation']
+            params = dict(view)
 
-            tree.insert('', tk.END, values=(timestamp, title, mode, quality, status_display))
+            def worker():
+                try:
+                    if params['query'].strip():
+                        records = self.history.search_downloads(
+                            params['query'], limit=self.HISTORY_PAGE_SIZE, offset=params['offset'],
+                            status=params['status'])
+                        cursor = None if len(records) < self.HISTORY_PAGE_SIZE else params['offset'] + len(records)
+                    else:
+                        records, cursor = self.history.get_downloads_page(
+                            limit=self.HISTORY_PAGE_SIZE, cursor=params['cursor'], sort=params['sort'],
+                            descending=params['descending'], status=params['status'])
+                except Exception as e:
+                    self.log_message(f"히스토리 조회 실패: {e}")
+                    records, cursor = [], None
+                try:
+                    history_window.after(0, lambda: append_page(generation, records, cursor))
+                except (tk.TclError, RuntimeError):
+                    pass  # 조회 중에 창을 닫음
+
+            threading.Thread(target=worker, daemon=True).start()
+
+        def append_page(generation, records, cursor):
+            if generation != view['generation'] or not history_window.winfo_exists():
+                return
+            # 보이는 페이지의 행만 이때 표시 형식으로 변환
+            for record in records:
+                iid = str(record.get('id'))
+                if not tree.exists(iid):
+                    tree.insert('', tk.END, iid=iid, values=self._format_history_row(record))
+            if view['query'].strip():
+                view['offset'] = cursor or view['offset']
+            else:
+                view['cursor'] = cursor
+            view['exhausted'] = cursor is None
+            view['loading'] = False
+            # 창을 채우지 못했으면 다음 페이지도 가져옴
+            if not view['exhausted'] and tree.yview()[1] >= self.HISTORY_PREFETCH_AT:
+                load_more()
+
+        def reload():
+            view['generation'] += 1
+            view.update(cursor=None, offset=0, exhausted=False, loading=False)
+            tree.delete(*tree.get_children())
+            for heading, sort_key, _ in self.HISTORY_COLUMNS:
+                mark = ''
+                if sort_key == view['sort'] or (sort_key == 'timestamp' and view['sort'] == 'id'):
+                    mark = ' ▼' if view['descending'] else ' ▲'
+                tree.heading(heading, text=heading + mark)
+            load_more()
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= self.HISTORY_PREFETCH_AT:
+                load_more()
+
+        tree.configure(yscrollcommand=on_scroll)
+
+        def sort_by(key):
+            key = 'id' if key == 'timestamp' else key
+            view['descending'] = not view['descending'] if view['sort'] == key else key in ('id', 'file_size')
+            view['sort'] = key
+            reload()
+
+        def on_status_changed(event=None):
+            view['status'] = self.HISTORY_STATUS_FILTERS[status_combo.get()]
+            reload()
+
+        status_combo.bind('<<ComboboxSelected>>', on_status_changed)
+
+        # 검색은 입력이 멈춘 뒤 실행
+        def run_search():
+            view['search_after_id'] = None
+            view['query'] = search_var.get()
+            reload()
+
+        def on_search_changed(*args):
+            if view['search_after_id'] is not None:
+                history_window.after_cancel(view['search_after_id'])
+            view['search_after_id'] = history_window.after(self.HISTORY_SEARCH_DELAY_MS, run_search)
+
+        search_var.trace_add('write', on_search_changed)
+
+        reload()
 
         # 버튼 프레임
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=2, column=0, columnspan=2, pady=(10, 0))
+        button_frame.grid(row=3, column=0, columnspan=2, pady=(10, 0))
 
         def clear_history():
             if messagebox.askyesno("확인", "모든 히스토리를 삭제하시겠습니까?"):
@@ -287,14 +430,24 @@ class YouTubeDownloaderGUI:
         history_window.columnconfigure(0, weight=1)
         history_window.rowconfigure(0, weight=1)
         main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(1, weight=1)
-
+        main_frame.rowconfigure(2, weight=1)
 
+    def _format_history_row(self, record):
+        """히스토리 기록 하나를 표 한 줄로 변환 (시간은 ISO 문자열을 잘라 그대로 사용)"""
+        timestamp = (record.get('timestamp') or '')[:16].replace('T', ' ')
 
+        title = record.get('title') or 'N/A'
+        if len(title) > 40:
+            title = title[:37] + '...'
 
+        mode = record.get('mode') or 'N/A'
+        quality = record.get('quality') or 'N/A'
+        status = record.get('status') or 'N/A'
 
+        # 상태에 따라 아이콘 추가
+        status_display = f"{self.HISTORY_STATUS_ICONS.get(status, '')} {status}"
+        return (timestamp, title, mode, quality, status_display)
 
-    
     def setup_ui(self):
         # 메인 프레임
         main_frame = ttk.Frame(self.root, padding="10")
@@ -334,6 +487,8 @@ class YouTubeDownloaderGUI:
                        value="subs_only").grid(row=0, column=1, sticky=tk.W, padx=(20, 0))
         ttk.Radiobutton(mode_frame, text="비디오+자막", variable=self.download_mode, 
                        value="video_subs").grid(row=0, column=2, sticky=tk.W, padx=(20, 0))
+        ttk.Radiobutton(mode_frame, text="오디오만", variable=self.download_mode, 
+                       value="audio_only").grid(row=0, column=3, sticky=tk.W, padx=(20, 0))
         
         # 자막 언어 설정
         subtitle_frame = ttk.Frame(main_frame)
@@ -358,6 +513,32 @@ class YouTubeDownloaderGUI:
         self.quality_combo = ttk.Combobox(quality_frame, values=['best', 'worst', '720p', '480p', '360p'], width=15)
         self.quality_combo.set('best')
         self.quality_combo.grid(row=0, column=1, padx=(10, 0), sticky=tk.W)
+
+        # 전체 속도 제한 (다운로드 중에도 바로 적용)
+        ttk.Label(quality_frame, text="속도 제한 (KB/s, 0=무제한):").grid(row=0, column=2, padx=(20, 0), sticky=tk.W)
+        self.bandwidth_spinbox = ttk.Spinbox(quality_frame, from_=0, to=1000000, increment=256, width=10,
+                                             command=self.apply_bandwidth_limit)
+        self.bandwidth_spinbox.grid(row=0, column=3, padx=(10, 0), sticky=tk.W)
+        self.bandwidth_spinbox.bind('<Return>', lambda e: self.apply_bandwidth_limit())
+        self.bandwidth_spinbox.bind('<FocusOut>', lambda e: self.apply_bandwidth_limit())
+
+        # 오디오 형식 (best는 변환 없이 원본 스트림 저장)
+        ttk.Label(quality_frame, text="오디오 형식:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        self.audio_format_combo = ttk.Combobox(quality_frame, values=YouTubeDownloader.AUDIO_FORMATS,
+                                               width=15, state='readonly')
+        self.audio_format_combo.set('best')
+        self.audio_format_combo.grid(row=1, column=1, padx=(10, 0), pady=(5, 0), sticky=tk.W)
+
+        # 구간 다운로드 (비워 두면 전체, 예: 1:00:00 ~ 1:00:30)
+        ttk.Label(quality_frame, text="구간 (선택):").grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        section_frame = ttk.Frame(quality_frame)
+        section_frame.grid(row=2, column=1, columnspan=3, padx=(10, 0), pady=(5, 0), sticky=tk.W)
+        self.section_start_entry = ttk.Entry(section_frame, width=10)
+        self.section_start_entry.grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(section_frame, text="~").grid(row=0, column=1, padx=5)
+        self.section_end_entry = ttk.Entry(section_frame, width=10)
+        self.section_end_entry.grid(row=0, column=2, sticky=tk.W)
+        ttk.Label(section_frame, text="(HH:MM:SS, 비디오만 모드)").grid(row=0, column=3, padx=(10, 0), sticky=tk.W)
         
         # 버튼들
         button_frame = ttk.Frame(main_frame)
@@ -533,7 +714,7 @@ class YouTubeDownloaderGUI:
             return
         
         # URL 검증
-        if not self.validate_url(url):
+        if not self.validate_url(url, allow_collections=True):
             return
         
         download_path = self.path_entry.get().strip()
@@ -546,6 +727,26 @@ class YouTubeDownloaderGUI:
         
         quality = self.quality_combo.get()
         mode = self.download_mode.get()
+        if mode == 'audio_only':
+            quality = self.audio_format_combo.get() or 'best'
+
+        # 구간을 입력하면 해당 부분만 다운로드 (비디오만 모드, 단일 영상)
+        section = None
+        section_start = self.section_start_entry.get().strip()
+        section_end = self.section_end_entry.get().strip()
+        if section_start or section_end:
+            if mode != 'video_only' or self.validator.is_collection_url(url):
+                messagebox.showwarning("경고", "구간 다운로드는 '비디오만' 모드에서 단일 영상에만 사용할 수 있습니다.")
+                return
+            try:
+                section = SectionDownloader.parse_range(f"{section_start or 0}-{section_end}")
+            except ValueError as e:
+                messagebox.showerror("구간 오류", f"구간을 HH:MM:SS 형식으로 입력해주세요.\n{e}")
+                return
+            mode = 'clip'
+            # 아카이브/저널/히스토리에는 품질과 구간을 합친 값으로 기록
+            clip_quality = quality
+            quality = SectionDownloader.variant(quality, *section)
         
         # 자막 언어 (단일 선택)
         subtitle_lang = self.subtitle_lang_combo.get().strip()
@@ -553,6 +754,11 @@ class YouTubeDownloaderGUI:
             subtitle_lang = 'ko'  # 기본값
         subtitle_langs = [subtitle_lang]  # 리스트로 변환 (기존 코드 호환)
         
+        # 재생목록/채널은 다운로드 큐로 처리
+        if self.validator.is_collection_url(url):
+            self.download_collection(url, download_path, mode, quality, subtitle_langs)
+            return
+        
         # 다운로드 경로 설정
         self.downloader.download_path = download_path
         
@@ -562,7 +768,20 @@ class YouTubeDownloaderGUI:
         self.downloader.set_cancel_flag(self.cancel_flag)
         
         # 진행률 콜백 설정
-        self.downloader.set_progress_callback(self.update_progress)
+        # 진행 상황을 저널에도 기록 (프로그램이 갑자기 종료되면 다음 실행 시 이어받기)
+        job_id = self.journal.new_job_id()
+        self.journal.begin(job_id, url, {
+            'mode': mode,
+            'quality': quality,
+            'subtitle_langs': subtitle_langs,
+            'download_path': download_path,
+        })
+
+        def on_progress(d):
+            self.journal.track_progress(job_id, d)
+            self.update_progress(d)
+
+        self.downloader.set_progress_callback(on_progress)
         
         # 진행률 초기화
         self.reset_progress()
@@ -571,7 +790,10 @@ class YouTubeDownloaderGUI:
         mode_messages = {
             'video_only': "비디오 다운로드를 시작합니다...",
             'subs_only': f"자막 다운로드를 시작합니다... (언어: {subtitle_lang})",
-            'video_subs': f"비디오+자막 다운로드를 시작합니다... (언어: {subtitle_lang})"
+            'video_subs': f"비디오+자막 다운로드를 시작합니다... (언어: {subtitle_lang})",
+            'audio_only': f"오디오 다운로드를 시작합니다... (형식: {quality})",
+            'clip': "구간 다운로드를 시작합니다..." if section is None else
+                    f"구간 다운로드를 시작합니다... ({section_start or '0'} ~ {section_end})"
         }
         
         self.info_text.delete(1.0, tk.END)
@@ -582,23 +804,43 @@ class YouTubeDownloaderGUI:
             try:
                 success = False
                 video_title = "Unknown"
+                video_uploader = None
+
+                # 이미 받은 항목은 정보 조회 없이 건너뜀
+                if self.downloader.is_archived(url, mode, quality, subtitle_langs):
+                    success = True
+                    self.log_message("✅ 이미 다운로드한 항목입니다. 다운로드를 건너뜁니다.")
+                    self.progress_label.config(text="완료!")
+                    return
                 
-                # 비디오 정보 가져오기 (제목 기록용)
-                try:
-                    info = self.downloader.get_video_info(url)
-                    if info:
+                # 콘텐츠 저장소에 있으면 정보 조회 없이 링크로 복원
+                info = None
+                if self.downloader.restore_from_store(url, mode, quality):
+                    success = True
+                    self.log_message("저장소에 있는 파일을 다운로드 없이 복원했습니다.")
+                else:
+                    # 비디오 정보는 한 번만 추출하여 제목 기록과 다운로드에 재사용
+                    try:
+                        info = self.downloader.extract_info(url)
                         video_title = info.get('title', 'Unknown')
-                except:
+                        video_uploader = info.get('uploader')
+                    except:
+                        pass
+
+                if success:
                     pass
-                
-                if mode == 'video_only':
-                    success = self.downloader.download_video(url, quality)
+                elif mode == 'video_only':
+                    success = self.downloader.download_video(url, quality, info=info)
                 elif mode == 'subs_only':
                     self.log_message(f"요청된 자막 언어: {subtitle_langs}")
-                    success = self.downloader.download_subtitles(url, subtitle_langs)
+                    success = self.downloader.download_subtitles(url, subtitle_langs, info=info)
                 elif mode == 'video_subs':
                     self.log_message(f"요청된 자막 언어: {subtitle_langs}")
-                    success = self.downloader.download_video_with_subtitles(url, quality, subtitle_langs)
+                    success = self.downloader.download_video_with_subtitles(url, quality, subtitle_langs, info=info)
+                elif mode == 'audio_only':
+                    success = self.downloader.download_audio(url, quality, info=info)
+                elif mode == 'clip':
+                    success = self.downloader.download_section(url, section[0], section[1], clip_quality, info=info)
                 
                 # 히스토리에 기록
                 if self.cancel_flag.is_set():
@@ -609,7 +851,7 @@ class YouTubeDownloaderGUI:
                         title=video_title,
                         mode=mode,
                         quality=quality if mode != 'subs_only' else None,
-                        subtitle_langs=subtitle_langs if mode != 'video_only' else None,
+                        subtitle_langs=subtitle_langs if mode in ('subs_only', 'video_subs') else None,
                         status='cancelled'
                     )
                 elif success:
@@ -617,15 +859,20 @@ class YouTubeDownloaderGUI:
                     self.progress_label.config(text="완료!")
                     # URL을 최근 목록에 추가
                     self.config.add_recent_url(url)
-                    # 히스토리에 기록
+                    # 히스토리에 기록 (받은 파일의 경로, 크기, 해시 포함)
+                    file_info = self.downloader.last_file or {}
                     self.history.add_download(
                         url=url,
                         title=video_title,
                         mode=mode,
                         quality=quality if mode != 'subs_only' else None,
-                        subtitle_langs=subtitle_langs if mode != 'video_only' else None,
-                        file_path=download_path,
-                        status='success'
+                        subtitle_langs=subtitle_langs if mode in ('subs_only', 'video_subs') else None,
+                        file_path=file_info.get('file_path') or download_path,
+                        file_size=file_info.get('file_size'),
+                        status='success',
+                        sha256=file_info.get('sha256'),
+                        fast_hash=file_info.get('fast_hash'),
+                        uploader=video_uploader
                     )
                     
                     # 다운로드 완료 메시지 (폴더 열기 옵션)
@@ -644,7 +891,7 @@ class YouTubeDownloaderGUI:
                         title=video_title,
                         mode=mode,
                         quality=quality if mode != 'subs_only' else None,
-                        subtitle_langs=subtitle_langs if mode != 'video_only' else None,
+                        subtitle_langs=subtitle_langs if mode in ('subs_only', 'video_subs') else None,
                         status='failed'
                     )
                     messagebox.showerror("오류", "다운로드에 실패했습니다.")
@@ -654,10 +901,97 @@ class YouTubeDownloaderGUI:
                 self.reset_progress()
                 messagebox.showerror("오류", error_msg)
             finally:
+                if self.cancel_flag.is_set():
+                    state = 'cancelled'
+                else:
+                    state = 'done' if success else 'failed'
+                self.journal.finish(job_id, state)
+                # 이후 정보 조회가 지난 취소 요청에 영향받지 않도록 해제
+                self.downloader.set_cancel_flag(None)
                 self.enable_buttons()  # 완료 후 버튼 활성화
         
         threading.Thread(target=download_thread, daemon=True).start()
 
+    def download_collection(self, url, download_path, mode, quality, subtitle_langs):
+        """재생목록/채널의 모든 비디오를 다운로드 큐로 다운로드"""
+        def submit(queue):
+            queue.submit_collection(url, mode=mode, quality=quality, subtitle_langs=subtitle_langs)
+            self.config.add_recent_url(url)
+
+        self.run_queue_download(f"재생목록/채널 항목을 가져오는 중: {url}", download_path, submit)
+
+    def check_interrupted_downloads(self):
+        """이전 실행에서 끝나지 않은 다운로드가 있으면 이어받을지 확인"""
+        pending = self.journal.pending_jobs()
+        if not pending:
+            return
+
+        titles = "\n".join(f"• {entry['url']}" for entry in pending[:5])
+        if len(pending) > 5:
+            titles += f"\n... 외 {len(pending) - 5}개"
+
+        if messagebox.askyesno(
+            "중단된 다운로드",
+            f"이전에 끝나지 않은 다운로드가 {len(pending)}개 있습니다.\n\n{titles}\n\n"
+            "받아 둔 부분부터 이어서 다운로드하시겠습니까?"
+        ):
+            download_path = self.path_entry.get().strip() or "downloads"
+            self.run_queue_download(
+                f"중단된 다운로드 {len(pending)}개를 이어서 받습니다...",
+                download_path, lambda queue: queue.resume_from_journal()
+            )
+        else:
+            # 이어받지 않기로 한 작업은 다음 실행 시 다시 묻지 않음
+            for entry in pending:
+                self.journal.finish(entry['id'], 'cancelled')
+
+    def run_queue_download(self, start_message, download_path, submit):
+        """
+        다운로드 큐로 여러 작업을 백그라운드에서 처리
+
+        Args:
+            start_message (str): 시작 시 표시할 메시지
+            download_path (str): 기본 저장 경로
+            submit: 큐에 작업을 추가하는 함수 submit(queue)
+        """
+        from download_queue import DownloadQueue
+
+        self.cancel_flag = threading.Event()
+        self.reset_progress()
+        self.info_text.delete(1.0, tk.END)
+        self.log_message(start_message)
+        self.disable_buttons()
+
+        def on_job_update(job):
+            if job.is_finished:
+                self.log_message(f"[{job.state}] {job.title or job.url}")
+
+        def queue_thread():
+            queue = DownloadQueue(download_path=download_path, history=self.history,
+                                  on_job_update=on_job_update, journal=self.journal)
+            try:
+                submit(queue)
+
+                # 취소 버튼을 누르면 남은 작업과 항목 추가를 모두 중단
+                while not queue.wait(timeout=0.5):
+                    if self.cancel_flag.is_set():
+                        queue.cancel_all()
+
+                counts = queue.counts()
+                self.log_message(
+                    f"✅ 처리 완료 - 완료: {counts['done']}개, "
+                    f"실패: {counts['failed']}개, 취소: {counts['cancelled']}개"
+                )
+            except Exception as e:
+                error_msg = self.format_error_message(e)
+                self.log_message(error_msg)
+                messagebox.showerror("오류", error_msg)
+            finally:
+                queue.shutdown(wait=False)
+                self.enable_buttons()
+
+        threading.Thread(target=queue_thread, daemon=True).start()
+
     def check_ffmpeg(self):
         """FFmpeg 설치 여부 확인 및 안내"""
         import subprocess
@@ -1,47 +1,249 @@
 import json
 import os
-from datetime import datetime
-from pathlib import Path
+import sqlite3
+import threading
+from datetime import datetime, timedelta
 
 class DownloadHistory:
     """다운로드 히스토리 관리 클래스"""
-    
-    def __init__(self, history_file='download_history.json'):
+
+    # 기록 항목 (SQLite 열 순서)
+    FIELDS = ('timestamp', 'url', 'video_id', 'title', 'uploader', 'mode', 'quality', 'subtitle_langs',
+              'file_path', 'file_size', 'sha256', 'fast_hash', 'status')
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS downloads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            url TEXT,
+            video_id TEXT,
+            title TEXT,
+            uploader TEXT,
+            mode TEXT,
+            quality TEXT,
+            subtitle_langs TEXT,
+            file_path TEXT,
+            file_size INTEGER,
+            sha256 TEXT,
+            fast_hash TEXT,
+            status TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_downloads_video_id ON downloads (video_id);
+        CREATE INDEX IF NOT EXISTS idx_downloads_status ON downloads (status);
+        CREATE INDEX IF NOT EXISTS idx_downloads_timestamp ON downloads (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_downloads_sha256 ON downloads (sha256);
+        CREATE INDEX IF NOT EXISTS idx_downloads_title_sort ON downloads (COALESCE(title, ''), id);
+    """
+
+    # 집계 카운터 (전체, 상태, 모드, 품질, 날짜 'YYYY-MM-DD'별 개수와 용량)
+    # 기록 추가/삭제와 같은 트랜잭션에서 트리거로 갱신하므로 다른 프로세스의 기록도 반영됨
+    STATS_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS download_stats (
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            bytes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, key)
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS downloads_stats_insert AFTER INSERT ON downloads BEGIN
+            INSERT INTO download_stats (dimension, key, count, bytes)
+            VALUES ('total', '', 1, COALESCE(NEW.file_size, 0)),
+                   ('status', COALESCE(NEW.status, ''), 1, COALESCE(NEW.file_size, 0)),
+                   ('mode', COALESCE(NEW.mode, ''), 1, COALESCE(NEW.file_size, 0)),
+                   ('quality', COALESCE(NEW.quality, ''), 1, COALESCE(NEW.file_size, 0)),
+                   ('day', substr(NEW.timestamp, 1, 10), 1, COALESCE(NEW.file_size, 0))
+            ON CONFLICT (dimension, key) DO UPDATE SET
+                count = count + excluded.count, bytes = bytes + excluded.bytes;
+        END;
+        CREATE TRIGGER IF NOT EXISTS downloads_stats_delete AFTER DELETE ON downloads BEGIN
+            UPDATE download_stats SET count = count - 1, bytes = bytes - COALESCE(OLD.file_size, 0)
+            WHERE (dimension = 'total' AND key = '')
+               OR (dimension = 'status' AND key = COALESCE(OLD.status, ''))
+               OR (dimension = 'mode' AND key = COALESCE(OLD.mode, ''))
+               OR (dimension = 'quality' AND key = COALESCE(OLD.quality, ''))
+               OR (dimension = 'day' AND key = substr(OLD.timestamp, 1, 10));
+            DELETE FROM download_stats WHERE count <= 0;
+        END;
+    """
+
+    # 제목/업로더/URL/비디오 ID 트라이그램 색인 (기록 추가/삭제 때 트리거로 갱신)
+    SEARCH_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS downloads_search USING fts5(
+            title, uploader, url, video_id,
+            content='downloads', content_rowid='id', tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS downloads_search_insert AFTER INSERT ON downloads BEGIN
+            INSERT INTO downloads_search (rowid, title, uploader, url, video_id)
+            VALUES (NEW.id, NEW.title, NEW.uploader, NEW.url, NEW.video_id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS downloads_search_delete AFTER DELETE ON downloads BEGIN
+            INSERT INTO downloads_search (downloads_search, rowid, title, uploader, url, video_id)
+            VALUES ('delete', OLD.id, OLD.title, OLD.uploader, OLD.url, OLD.video_id);
+        END;
+    """
+
+    # 페이지 조회에서 정렬할 수 있는 열과 NULL 대신 사용할 값
+    SORT_COLUMNS = {
+        'id': None,
+        'timestamp': "''",
+        'title': "''",
+        'uploader': "''",
+        'mode': "''",
+        'quality': "''",
+        'status': "''",
+        'file_size': 0,
+    }
+
+    # 검색 순위 가중치 (제목, 업로더, URL, 비디오 ID)
+    SEARCH_WEIGHTS = (10.0, 5.0, 1.0, 8.0)
+
+    # 트라이그램 색인으로 찾을 수 있는 최소 글자 수 (더 짧은 단어는 후보에서 직접 확인)
+    MIN_GRAM = 3
+
+    # 스키마 버전 (PRAGMA user_version), 1: 집계 카운터, 2: 업로더 열과 검색 색인
+    SCHEMA_VERSION = 2
+
+    def __init__(self, history_file='download_history.db', archive=None, busy_timeout=10.0):
         """
         히스토리 관리자 초기화
-        
+
+        기록은 SQLite(WAL 모드)에 저장하므로 완료 한 건마다 한 줄만 추가하고, 여러 작업자가
+        동시에 기록하면 한 트랜잭션으로 묶어 커밋합니다(그룹 커밋). WAL 모드에서는 다른
+        프로세스(GUI와 CLI 등)가 같은 파일을 동시에 읽고 쓸 수 있습니다.
+
+        예전 JSON 파일(.json)을 지정하거나 같은 이름의 JSON 파일이 있으면 .db 파일로 옮깁니다.
+
         Args:
             history_file (str): 히스토리 파일 경로
+            archive: 기록 삭제 시 함께 정리할 DownloadArchive (None이면 전역 아카이브)
+            busy_timeout (float): 다른 프로세스가 쓰는 중일 때 기다릴 최대 시간 (초)
         """
-        self.history_file = history_file
-        self.history = self._load_history()
-    
-    def _load_history(self):
-        """히스토리 파일을 로드합니다."""
-        if os.path.exists(self.history_file):
+        root, ext = os.path.splitext(history_file)
+        self.history_file = root + '.db' if ext == '.json' else history_file
+        self.legacy_file = root + '.json'
+        self.archive = archive
+        self.busy_timeout = busy_timeout
+        # 여러 다운로드 작업자가 동시에 기록할 수 있으므로 잠금 사용
+        self._lock = threading.RLock()
+
+        # 그룹 커밋: 기록을 대기열에 넣고, 커밋 중인 작업자가 없으면 직접 대기열 전체를 커밋
+        self._commit_cond = threading.Condition()
+        self._pending = []
+        self._queued = 0      # 지금까지 대기열에 넣은 기록 수
+        self._committed = 0   # 지금까지 커밋을 마친 기록 수 (실패한 배치 포함)
+        self._committing = False
+        self._failed_tickets = set()  # 저장에 실패한 기록의 번호 (기록을 넣은 작업자가 확인하면 제거)
+        self._failed_count = 0        # 저장에 실패한 기록 수
+        self._reported_failures = 0   # save_history()가 이미 알린 실패 수
+
+        self._conn = self._connect()
+        self._migrate_legacy()
+
+    def _connect(self):
+        directory = os.path.dirname(self.history_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 트랜잭션은 직접 관리 (쓰기는 BEGIN IMMEDIATE로 시작해 다른 프로세스와 충돌을 피함)
+        conn = sqlite3.connect(self.history_file, timeout=self.busy_timeout,
+                               isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        # SQLite의 lower()는 ASCII만 바꾸므로 검색에는 파이썬 str.lower 사용
+        conn.create_function('py_lower', 1, lambda value: value.lower() if isinstance(value, str) else value,
+                             deterministic=True)
+        conn.executescript(self.SCHEMA)
+        self._upgrade_schema(conn)
+        return conn
+
+    def _upgrade_schema(self, conn):
+        """예전 데이터베이스는 없던 열을 추가하고 집계 카운터와 검색 색인을 한 번만 채움"""
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(downloads)')}
+        if 'uploader' not in columns:
             try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"히스토리 파일 로드 실패: {e}")
-                return []
-        return []
-    
-    def save_history(self):
-        """현재 히스토리를 파일에 저장합니다."""
+                conn.execute('ALTER TABLE downloads ADD COLUMN uploader TEXT')
+            except sqlite3.OperationalError:
+                pass  # 다른 프로세스가 먼저 추가함
+        conn.executescript(self.STATS_SCHEMA)
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.history, f, indent=4, ensure_ascii=False)
-            return True
+            conn.executescript(self.SEARCH_SCHEMA)
+            self.indexed_search = True
+        except sqlite3.OperationalError as e:
+            # FTS5/트라이그램을 지원하지 않는 SQLite에서는 검색할 때 전체를 확인
+            print(f"히스토리 검색 색인을 사용할 수 없음: {e}")
+            self.indexed_search = False
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # 트리거가 생긴 뒤의 기록까지 포함하도록 잠근 상태에서 다시 계산
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < 2 and self.indexed_search:
+                conn.execute("INSERT INTO downloads_search (downloads_search) VALUES ('rebuild')")
+            if version < 1:
+                conn.execute('DELETE FROM download_stats')
+                for dimension, expression in (('total', "''"), ('status', "COALESCE(status, '')"),
+                                              ('mode', "COALESCE(mode, '')"), ('quality', "COALESCE(quality, '')"),
+                                              ('day', 'substr(timestamp, 1, 10)')):
+                    conn.execute(
+                        f"INSERT INTO download_stats (dimension, key, count, bytes) "
+                        f"SELECT '{dimension}', {expression}, COUNT(*), COALESCE(SUM(file_size), 0) "
+                        f"FROM downloads GROUP BY 2"
+                    )
+            # 검색 색인을 만들지 못했으면 다음에 다시 시도하도록 버전 1에 머묾
+            target = self.SCHEMA_VERSION if self.indexed_search else 1
+            if version < target:
+                conn.execute(f'PRAGMA user_version = {target}')
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _migrate_legacy(self):
+        """예전 JSON 히스토리를 한 번만 옮기고 파일 이름을 바꿔 둠"""
+        if not os.path.exists(self.legacy_file):
+            return
+        try:
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                records = json.load(f)
         except Exception as e:
-            print(f"히스토리 파일 저장 실패: {e}")
-            return False
-    
-    def add_download(self, url, title, mode, quality=None, subtitle_langs=None, 
-                     file_path=None, file_size=None, status='success'):
+            print(f"히스토리 파일 로드 실패: {e}")
+            return
+
+        with self._lock:
+            if self._conn.execute('SELECT 1 FROM downloads LIMIT 1').fetchone() is None:
+                # JSON은 최신 항목이 맨 앞이므로 오래된 것부터 넣어 id 순서를 맞춤
+                records = [dict(record) for record in reversed(records) if isinstance(record, dict)]
+                if not self._write_batch(records):
+                    return  # 옮기지 못했으면 JSON 파일을 남겨 두고 다음 실행 때 다시 시도
+        os.replace(self.legacy_file, self.legacy_file + '.migrated')
+
+    def close(self):
+        """대기 중인 기록을 커밋하고 연결 닫기"""
+        self.save_history()
+        with self._lock:
+            self._conn.close()
+
+    def save_history(self):
+        """
+        대기 중인 기록을 모두 커밋 (기록은 추가할 때마다 커밋되므로 보통은 할 일 없음)
+
+        Returns:
+            bool: 성공 여부 (지난번 호출 이후 저장에 실패한 기록이 있으면 False)
+        """
+        with self._commit_cond:
+            target = self._queued
+            while self._committed < target:
+                self._commit_cond.wait()
+            failed = self._failed_count - self._reported_failures
+            self._reported_failures = self._failed_count
+        return failed == 0
+
+    def add_download(self, url, title, mode, quality=None, subtitle_langs=None,
+                     file_path=None, file_size=None, status='success', sha256=None, fast_hash=None,
+                     uploader=None):
         """
         다운로드 기록 추가
-        
+
         Args:
             url (str): YouTube URL
             title (str): 비디오 제목
@@ -51,117 +253,409 @@ class DownloadHistory:
             file_path (str): 저장된 파일 경로
             file_size (int): 파일 크기 (bytes)
             status (str): 다운로드 상태 (success, failed, cancelled)
+            sha256 (str): 파일 SHA-256 (무결성 확인, 중복 확인용)
+            fast_hash (str): 빠른 비암호 해시 ('xxh64:...' 또는 'crc32:...')
+            uploader (str): 업로더 (검색용)
+
+        Returns:
+            bool: 저장 성공 여부 (이 기록이 들어간 트랜잭션이 실패하면 False)
         """
         record = {
             'timestamp': datetime.now().isoformat(),
             'url': url,
             'title': title,
+            'uploader': uploader,
             'mode': mode,
             'quality': quality,
             'subtitle_langs': subtitle_langs,
             'file_path': file_path,
             'file_size': file_size,
+            'sha256': sha256,
+            'fast_hash': fast_hash,
             'status': status
         }
-        
-        self.history.insert(0, record)  # 최신 항목을 맨 앞에
-        
-        # 최대 100개까지만 유지
-        if len(self.history) > 100:
-            self.history = self.history[:100]
-        
-        self.save_history()
-    
+
+        with self._commit_cond:
+            self._pending.append(record)
+            self._queued += 1
+            ticket = self._queued
+
+            # 앞선 커밋이 끝날 때까지 쌓인 기록은 다음 작업자가 한 번에 커밋
+            while self._committed < ticket:
+                if self._committing:
+                    self._commit_cond.wait()
+                    continue
+
+                batch, self._pending = self._pending, []
+                first_ticket = self._committed + 1
+                self._committing = True
+                self._commit_cond.release()
+                written = False
+                try:
+                    written = self._write_batch(batch)
+                finally:
+                    self._commit_cond.acquire()
+                    self._committing = False
+                    if not written:
+                        # 같은 배치에 묶인 작업자 모두에게 실패를 알림
+                        self._failed_tickets.update(range(first_ticket, first_ticket + len(batch)))
+                        self._failed_count += len(batch)
+                    self._committed += len(batch)
+                    self._commit_cond.notify_all()
+
+            if ticket in self._failed_tickets:
+                self._failed_tickets.discard(ticket)
+                return False
+        return True
+
+    def _write_batch(self, records):
+        """
+        기록 여러 개를 한 트랜잭션으로 추가
+
+        Returns:
+            bool: 커밋 성공 여부 (실패하면 배치 전체가 롤백됨)
+        """
+        if not records:
+            return True
+        rows = [self._to_row(record) for record in records]
+        placeholders = ', '.join('?' for _ in self.FIELDS)
+        try:
+            with self._lock:
+                self._conn.execute('BEGIN IMMEDIATE')
+                try:
+                    self._conn.executemany(
+                        f"INSERT INTO downloads ({', '.join(self.FIELDS)}) VALUES ({placeholders})", rows
+                    )
+                    self._conn.execute('COMMIT')
+                except BaseException:
+                    self._conn.execute('ROLLBACK')
+                    raise
+        except sqlite3.Error as e:
+            print(f"히스토리 파일 저장 실패: {e}")
+            return False
+        return True
+
+    def _to_row(self, record):
+        record = dict(record)
+        if not record.get('video_id'):
+            from security import get_validator
+            record['video_id'] = get_validator().extract_video_id(record.get('url') or '')
+        if record.get('sha256'):
+            record['sha256'] = record['sha256'].lower()
+        if record.get('subtitle_langs') is not None:
+            record['subtitle_langs'] = json.dumps(record['subtitle_langs'], ensure_ascii=False)
+        record.setdefault('timestamp', datetime.now().isoformat())
+        return tuple(record.get(field) for field in self.FIELDS)
+
+    def _to_record(self, row):
+        record = dict(row)
+        if record.get('subtitle_langs') is not None:
+            record['subtitle_langs'] = json.loads(record['subtitle_langs'])
+        return record
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_record(row) for row in rows]
+
     def get_recent_downloads(self, limit=10):
         """
         최근 다운로드 목록 가져오기
-        
+
         Args:
             limit (int): 가져올 최대 개수
-            
+
         Returns:
             list: 다운로드 기록 목록
         """
-        return self.history[:limit]
-    
+        return self._query('SELECT * FROM downloads ORDER BY id DESC LIMIT ?', (limit,))
+
     def get_all_downloads(self):
-        """모든 다운로드 기록 가져오기"""
-        return self.history
-    
+        """모든 다운로드 기록 가져오기 (최신 항목이 맨 앞)"""
+        return self._query('SELECT * FROM downloads ORDER BY id DESC')
+
+    def get_downloads_page(self, limit=100, cursor=None, sort='id', descending=True, status=None):
+        """
+        다운로드 기록을 한 페이지씩 가져오기
+
+        OFFSET 대신 마지막 항목의 (정렬 값, id)부터 이어서 읽으므로 몇 번째 페이지든
+        앞부분을 다시 읽지 않습니다.
+
+        Args:
+            limit (int): 페이지 크기
+            cursor (tuple): 이전 페이지가 반환한 다음 페이지 위치 (None이면 처음부터)
+            sort (str): 정렬 열 (SORT_COLUMNS 중 하나)
+            descending (bool): 내림차순 여부
+            status (str): 이 상태의 기록만 (None이면 전부)
+
+        Returns:
+            tuple: (기록 목록, 다음 페이지 위치 또는 None(마지막 페이지))
+        """
+        if sort not in self.SORT_COLUMNS:
+            raise ValueError(f"정렬할 수 없는 열: {sort}")
+
+        # NULL은 비교할 수 없으므로 빈 값으로 바꿔 정렬 (id는 항상 있음)
+        key = 'id' if sort == 'id' else f"COALESCE({sort}, {self.SORT_COLUMNS[sort]})"
+        order = 'DESC' if descending else 'ASC'
+        compare = '<' if descending else '>'
+
+        conditions, params = [], []
+        if status is not None:
+            conditions.append('status = ?')
+            params.append(status)
+        if cursor is not None:
+            if sort == 'id':
+                conditions.append(f'id {compare} ?')
+                params.append(cursor[1])
+            else:
+                conditions.append(f'({key}, id) {compare} (?, ?)')
+                params += list(cursor)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ''
+
+        records = self._query(
+            f"SELECT * FROM downloads {where}ORDER BY {key} {order}, id {order} LIMIT ?", params + [limit]
+        )
+        if len(records) < limit:
+            return records, None
+        last = records[-1]
+        value = last['id'] if sort == 'id' else last.get(sort)
+        if value is None:
+            value = self.SORT_COLUMNS[sort] if isinstance(self.SORT_COLUMNS[sort], int) else ''
+        return records, (value, last['id'])
+
+    def count_downloads(self, status=None):
+        """
+        기록 수 (집계 카운터를 읽으므로 기록 수와 관계없이 바로 끝남)
+
+        Args:
+            status (str): 이 상태의 기록만 (None이면 전부)
+        """
+        dimension, key = ('total', '') if status is None else ('status', status)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT count FROM download_stats WHERE dimension = ? AND key = ?', (dimension, key)
+            ).fetchone()
+        return row[0] if row else 0
+
     def get_downloads_by_status(self, status):
         """
         특정 상태의 다운로드 기록 가져오기
-        
+
         Args:
             status (str): 상태 (success, failed, cancelled)
-            
+
         Returns:
             list: 필터링된 다운로드 기록
         """
-        return [record for record in self.history if record.get('status') == status]
-    
-    def search_downloads(self, query):
+        return self._query('SELECT * FROM downloads WHERE status = ? ORDER BY id DESC', (status,))
+
+    def get_downloads_by_video(self, video_id):
+        """
+        특정 비디오의 다운로드 기록 가져오기
+
+        Args:
+            video_id (str): 비디오 ID
+
+        Returns:
+            list: 다운로드 기록 (최신 항목이 맨 앞)
         """
-        제목이나 URL로 다운로드 기록 검색
-        
+        return self._query('SELECT * FROM downloads WHERE video_id = ? ORDER BY id DESC', (video_id,))
+
+    def search_downloads(self, query, limit=None, offset=0, fuzzy=True, status=None):
+        """
+        제목, 업로더, URL, 비디오 ID로 다운로드 기록 검색
+
+        트라이그램 색인으로 단어가 포함된(부분 일치, 입력 중인 앞부분 포함) 기록만 찾아
+        제목 일치를 우선으로 순위를 매깁니다. 3글자보다 짧은 단어는 색인으로 찾을 수 없으므로
+        다른 단어로 좁힌 후보에서 확인합니다. 일치하는 기록이 없으면 검색어의 트라이그램이 많이
+        겹치는 기록을 찾습니다 (오타 허용).
+
         Args:
-            query (str): 검색어
-            
+            query (str): 검색어 (공백으로 나눈 단어가 모두 포함된 기록)
+            limit (int): 가져올 최대 개수 (None이면 전부)
+            offset (int): 건너뛸 개수 (페이지 이동)
+            fuzzy (bool): 일치하는 기록이 없을 때 비슷한 기록 찾기
+            status (str): 이 상태의 기록만 (None이면 전부)
+
         Returns:
-            list: 검색 결과
-        """
-        query_lower = query.lower()
-        results = []
-        
-        for record in self.history:
-            title = record.get('title', '').lower()
-            url = record.get('url', '').lower()
-            
-            if query_lower in title or query_lower in url:
-                results.append(record)
-        
-        return results
-    
+            list: 검색 결과 (순위순)
+        """
+        terms = query.lower().split()
+        if not terms or not self.indexed_search:
+            return self._scan_search(terms, limit, offset, status)
+
+        long_terms = [term for term in terms if len(term) >= self.MIN_GRAM]
+        short_terms = [term for term in terms if len(term) < self.MIN_GRAM]
+        if not long_terms:
+            return self._scan_search(terms, limit, offset, status)
+
+        results = self._match_search(' AND '.join(self._quote(term) for term in long_terms),
+                                     short_terms, limit, offset, status)
+        if results or not fuzzy or offset:
+            return results
+
+        grams = self._trigrams(''.join(terms))
+        if len(grams) < 2:
+            return results
+        return self._match_search(' OR '.join(self._quote(gram) for gram in grams), [], limit, offset, status)
+
+    def _match_search(self, expression, short_terms, limit, offset, status=None):
+        """색인 검색 (bm25 순위, 짧은 단어는 후보에서 확인)"""
+        conditions = ''.join(f" AND {self._SEARCH_TEXT} > 0" for _ in short_terms)
+        params = [expression] + list(short_terms)
+        if status is not None:
+            conditions += ' AND d.status = ?'
+            params.append(status)
+        params += [-1 if limit is None else limit, offset]
+        weights = ', '.join(str(weight) for weight in self.SEARCH_WEIGHTS)
+        return self._query(
+            f"SELECT d.* FROM downloads_search JOIN downloads d ON d.id = downloads_search.rowid "
+            f"WHERE downloads_search MATCH ?{conditions} "
+            f"ORDER BY bm25(downloads_search, {weights}), d.id DESC LIMIT ? OFFSET ?",
+            params
+        )
+
+    # 짧은 단어를 직접 확인할 검색 대상 (제목, 업로더, URL, 비디오 ID)
+    _SEARCH_TEXT = ("instr(py_lower(coalesce(d.title, '') || ' ' || coalesce(d.uploader, '') || ' ' || "
+                    "coalesce(d.url, '') || ' ' || coalesce(d.video_id, '')), ?)")
+
+    def _scan_search(self, terms, limit, offset, status=None):
+        """색인 없이 최신 기록부터 확인 (짧은 단어만 입력한 경우, 최신 기록부터 limit개를 찾으면 멈춤)"""
+        conditions = [f"{self._SEARCH_TEXT} > 0" for _ in terms]
+        params = list(terms)
+        if status is not None:
+            conditions.append('d.status = ?')
+            params.append(status)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ''
+        return self._query(
+            f"SELECT d.* FROM downloads d {where}ORDER BY d.id DESC LIMIT ? OFFSET ?",
+            params + [-1 if limit is None else limit, offset]
+        )
+
+    @staticmethod
+    def _quote(term):
+        return '"' + term.replace('"', '""') + '"'
+
+    def _trigrams(self, text):
+        return list(dict.fromkeys(text[i:i + self.MIN_GRAM] for i in range(len(text) - self.MIN_GRAM + 1)))
+
+    def find_by_hash(self, sha256):
+        """
+        같은 내용(SHA-256)의 다운로드 기록 찾기 (다른 컴퓨터에서 받은 파일과 중복 확인 등)
+
+        Args:
+            sha256 (str): 파일 SHA-256
+
+        Returns:
+            list: 내용이 같은 다운로드 기록
+        """
+        if not sha256:
+            return []
+        return self._query('SELECT * FROM downloads WHERE sha256 = ? ORDER BY id DESC', (sha256.lower(),))
+
     def get_statistics(self):
         """
         다운로드 통계 가져오기
-        
+
+        기록할 때 갱신한 집계 카운터를 읽기만 하므로 기록 수와 관계없이 바로 끝납니다.
+
         Returns:
-            dict: 통계 정보
-        """
-        total = len(self.history)
-        success = len([r for r in self.history if r.get('status') == 'success'])
-        failed = len([r for r in self.history if r.get('status') == 'failed'])
-        cancelled = len([r for r in self.history if r.get('status') == 'cancelled'])
-        
-        total_size = sum(r.get('file_size', 0) for r in self.history if r.get('file_size'))
-        
+            dict: 통계 정보 (상태/모드/품질별 {'count', 'bytes'} 포함)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dimension, key, count, bytes FROM download_stats WHERE dimension != 'day'"
+            ).fetchall()
+
+        groups = {dimension: {} for dimension in ('status', 'mode', 'quality')}
+        total, total_size = 0, 0
+        for dimension, key, count, size in rows:
+            if dimension == 'total':
+                total, total_size = count, size
+            elif dimension in groups:
+                groups[dimension][key or None] = {'count': count, 'bytes': size}
+
+        def status_count(status):
+            return groups['status'].get(status, {}).get('count', 0)
+
         return {
             'total': total,
-            'success': success,
-            'failed': failed,
-            'cancelled': cancelled,
+            'success': status_count('success'),
+            'failed': status_count('failed'),
+            'cancelled': status_count('cancelled'),
             'total_size': total_size,
-            'total_size_mb': total_size / (1024 * 1024) if total_size else 0
+            'total_size_mb': total_size / (1024 * 1024) if total_size else 0,
+            'by_status': groups['status'],
+            'by_mode': groups['mode'],
+            'by_quality': groups['quality'],
         }
-    
+
+    def get_daily_statistics(self, days=30, until=None):
+        """
+        날짜별 다운로드 수와 용량 (저장 공간 계획용)
+
+        Args:
+            days (int): 조회할 일 수 (until 포함)
+            until (date): 마지막 날짜 (기본: 오늘)
+
+        Returns:
+            list: 오래된 날짜부터 [{'date': 'YYYY-MM-DD', 'count', 'bytes'}, ...] (기록 없는 날은 0)
+        """
+        until = until or datetime.now().date()
+        dates = [(until - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)]
+        if not dates:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, count, bytes FROM download_stats WHERE dimension = 'day' AND key BETWEEN ? AND ?",
+                (dates[0], dates[-1])
+            ).fetchall()
+        found = {key: (count, size) for key, count, size in rows}
+        return [{'date': date, 'count': found.get(date, (0, 0))[0], 'bytes': found.get(date, (0, 0))[1]}
+                for date in dates]
+
+    def _get_archive(self):
+        if self.archive is None:
+            from download_archive import get_download_archive
+            self.archive = get_download_archive()
+        return self.archive
+
     def clear_history(self):
-        """모든 히스토리 삭제"""
-        self.history = []
+        """모든 히스토리 삭제 (다운로드 아카이브도 함께 비워 다시 받을 수 있게 함)"""
         self.save_history()
-    
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            self._conn.execute('DELETE FROM downloads')
+            self._conn.execute('DELETE FROM download_stats')
+            self._conn.execute('COMMIT')
+            self._get_archive().clear()
+
     def delete_record(self, index):
         """
         특정 기록 삭제
-        
+
         Args:
-            index (int): 삭제할 기록의 인덱스
+            index (int): 삭제할 기록의 인덱스 (최신 항목이 0)
         """
-        if 0 <= index < len(self.history):
-            del self.history[index]
-            self.save_history()
-            return True
-        return False
+        if index < 0:
+            return False
+        self.save_history()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, url, video_id FROM downloads ORDER BY id DESC LIMIT 1 OFFSET ?', (index,)
+            ).fetchone()
+            if row is None:
+                return False
+            self._conn.execute('DELETE FROM downloads WHERE id = ?', (row['id'],))
+
+        # 삭제한 기록의 비디오는 다시 다운로드할 수 있도록 아카이브에서도 제거
+        video_id = row['video_id']
+        if not video_id:
+            from security import get_validator
+            video_id = get_validator().extract_video_id(row['url'] or '')
+        if video_id:
+            self._get_archive().remove_video(video_id)
+        return True
 
 # 전역 히스토리 인스턴스
 _history_instance = None
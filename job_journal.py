@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+import time
+import uuid
+from logger import get_logger
+
+class JobJournal:
+    """다운로드 작업 진행 상황을 기록하는 추가 전용(append-only) 저널"""
+
+    # 작업 단계
+    QUEUED = 'queued'
+    EXTRACTING = 'extracting'
+    DOWNLOADING = 'downloading'
+    POSTPROCESSING = 'postprocessing'
+
+    def __init__(self, journal_file='cache/job_journal.jsonl', max_records=1000):
+        """
+        작업 저널 초기화
+
+        기록은 한 줄에 하나씩 추가만 하며 매번 디스크에 강제로 기록(fsync)하므로,
+        프로세스가 갑자기 종료되어도 마지막 상태까지 남습니다.
+
+        Args:
+            journal_file (str): 저널 파일 경로
+            max_records (int): 이 줄 수를 넘으면 끝난 작업 기록을 정리
+        """
+        self.journal_file = journal_file
+        self.max_records = max_records
+        self.logger = get_logger()
+
+        self._lock = threading.Lock()
+        self._record_count = None
+        self._tracked = {}  # job_id -> (단계, 기록한 .part 파일 집합)
+
+    def new_job_id(self):
+        """새 작업 ID 생성"""
+        return uuid.uuid4().hex
+
+    def begin(self, job_id, url, options):
+        """
+        작업 시작 기록
+
+        Args:
+            job_id (str): 작업 ID
+            url (str): YouTube URL
+            options (dict): 다시 실행할 때 필요한 옵션 (mode, quality, subtitle_langs, download_path)
+        """
+        self._tracked[job_id] = (self.QUEUED, set())
+        self._append({'op': 'start', 'id': job_id, 'url': url, 'options': options})
+
+    def set_phase(self, job_id, phase):
+        """작업 단계 변경 기록 (같은 단계는 다시 기록하지 않음)"""
+        current, part_files = self._tracked.get(job_id, (None, set()))
+        if current == phase:
+            return
+        self._tracked[job_id] = (phase, part_files)
+        self._append({'op': 'phase', 'id': job_id, 'phase': phase})
+
+    def add_part_file(self, job_id, path):
+        """이어받기에 사용할 임시(.part) 파일 경로 기록"""
+        phase, part_files = self._tracked.setdefault(job_id, (None, set()))
+        if path in part_files:
+            return
+        part_files.add(path)
+        self._append({'op': 'part', 'id': job_id, 'path': os.path.abspath(path)})
+
+    def track_progress(self, job_id, d):
+        """
+        yt-dlp 진행률 정보로 단계와 임시 파일 기록
+
+        Args:
+            job_id (str): 작업 ID
+            d (dict): yt-dlp 진행률 딕셔너리
+        """
+        status = d.get('status')
+        if status == 'downloading':
+            self.set_phase(job_id, self.DOWNLOADING)
+            if d.get('tmpfilename'):
+                self.add_part_file(job_id, d['tmpfilename'])
+        elif status == 'finished':
+            self.set_phase(job_id, self.POSTPROCESSING)
+
+    def finish(self, job_id, state):
+        """
+        작업 종료 기록 (완료, 실패, 취소 모두 이어받기 대상에서 제외)
+
+        Args:
+            job_id (str): 작업 ID
+            state (str): 최종 상태
+        """
+        self._tracked.pop(job_id, None)
+        self._append({'op': 'finish', 'id': job_id, 'state': state})
+
+        if self._record_count is not None and self._record_count > self.max_records:
+            self.compact()
+
+    def pending_jobs(self):
+        """
+        끝나지 않은 작업 목록 (프로세스가 비정상 종료되어 남은 작업)
+
+        Returns:
+            list: [{'id', 'url', 'options', 'phase', 'part_files', 'started_at'}, ...]
+        """
+        with self._lock:
+            records = self._read_records()
+        return list(self._replay(records).values())
+
+    def compact(self):
+        """끝난 작업 기록을 제거하고 진행 중인 작업 기록만 남김"""
+        with self._lock:
+            records = self._read_records()
+            pending = self._replay(records)
+            kept = [record for record in records if record.get('id') in pending]
+
+            tmp_file = self.journal_file + '.tmp'
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    for record in kept:
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.journal_file)
+                self._record_count = len(kept)
+            except OSError as e:
+                self.logger.error(f"작업 저널 정리 실패: {e}")
+
+    def _append(self, record):
+        record['time'] = time.time()
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            try:
+                if self._record_count is None:
+                    self._record_count = len(self._read_records())
+
+                directory = os.path.dirname(self.journal_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._record_count += 1
+            except OSError as e:
+                self.logger.error(f"작업 저널 기록 실패: {e}")
+
+    def _read_records(self):
+        if not os.path.exists(self.journal_file):
+            return []
+
+        records = []
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # 기록 도중 종료되어 잘린 줄은 무시
+                    continue
+        return records
+
+    def _replay(self, records):
+        jobs = {}
+        for record in records:
+            job_id = record.get('id')
+            op = record.get('op')
+
+            if op == 'start':
+                job = jobs.setdefault(job_id, {'part_files': []})
+                job.update({
+                    'id': job_id,
+                    'url': record.get('url'),
+                    'options': record.get('options') or {},
+                    'phase': self.QUEUED,
+                    'started_at': record.get('time'),
+                })
+            elif job_id not in jobs:
+                continue
+            elif op == 'phase':
+                jobs[job_id]['phase'] = record.get('phase')
+            elif op == 'part':
+                if record.get('path') not in jobs[job_id]['part_files']:
+                    jobs[job_id]['part_files'].append(record.get('path'))
+            elif op == 'finish':
+                del jobs[job_id]
+        return jobs
+
+def partial_bytes(entry):
+    """저널 항목의 임시 파일에 이미 받아 둔 바이트 수"""
+    total = 0
+    for path in entry.get('part_files', []):
+        if path and os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+# 전역 작업 저널 인스턴스
+_journal_instance = None
+
+def get_job_journal():
+    """전역 작업 저널 인스턴스 가져오기"""
+    global _journal_instance
+    if _journal_instance is None:
+        _journal_instance = JobJournal()
+    return _journal_instance
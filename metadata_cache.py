@@ -0,0 +1,245 @@
+import json
+import os
+import re
+import threading
+import time
+import copy
+from collections import OrderedDict
+from logger import get_logger
+
+class MetadataCache:
+    """비디오 메타데이터 캐시 (메모리 LRU + 디스크)"""
+
+    # 서명된 스트림 URL의 만료 시각 (?expire=1700000000 또는 /expire/1700000000/)
+    EXPIRE_PATTERN = re.compile(r'(?:[?&]expire=|/expire/)(\d+)')
+
+    # 다시 시도해도 결과가 같은 오류 (비공개/삭제된 영상)
+    NEGATIVE_ERROR_PATTERNS = [
+        'private video',
+        'video unavailable',
+        'this video is not available',
+        'video has been removed',
+        'has been terminated',
+        'members-only content',
+    ]
+
+    def __init__(self, cache_dir='cache/metadata', max_entries=128,
+                 default_ttl=6 * 3600, negative_ttl=30 * 60, expire_margin=10 * 60):
+        """
+        메타데이터 캐시 초기화
+
+        Args:
+            cache_dir (str): 디스크 캐시 디렉토리 (None이면 메모리만 사용)
+            max_entries (int): 메모리에 유지할 최대 항목 수
+            default_ttl (int): 기본 유효 시간 (초)
+            negative_ttl (int): 비공개/삭제 영상 오류의 유효 시간 (초)
+            expire_margin (int): 스트림 URL 만료 전 여유 시간 (초)
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.expire_margin = expire_margin
+        self.logger = get_logger()
+
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, video_id):
+        """
+        캐시된 항목 가져오기
+
+        Args:
+            video_id (str): 비디오 ID
+
+        Returns:
+            dict: {'info': ..., 'error': ..., 'expires_at': ...} 또는 None
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(video_id)
+            if entry is not None:
+                if entry['expires_at'] > now:
+                    self._memory.move_to_end(video_id)
+                    return copy.deepcopy(entry)
+                del self._memory[video_id]
+
+            entry = self._read_disk(video_id)
+            if entry is None:
+                return None
+
+            if entry.get('expires_at', 0) <= now:
+                self._delete_disk(video_id)
+                return None
+
+            self._remember(video_id, entry)
+            return copy.deepcopy(entry)
+
+    def put(self, video_id, info):
+        """
+        추출한 비디오 정보를 캐시에 저장
+
+        스트림 URL이 만료되기 전까지만 유효하도록 TTL을 계산하며,
+        이미 만료가 임박한 정보는 저장하지 않습니다.
+
+        Args:
+            video_id (str): 비디오 ID
+            info (dict): yt-dlp info 딕셔너리
+
+        Returns:
+            bool: 저장 여부
+        """
+        ttl = self.compute_ttl(info)
+        if ttl <= 0:
+            self.logger.debug(f"메타데이터 캐시 생략 (URL 만료 임박): {video_id}")
+            return False
+
+        entry = {
+            'info': self._sanitize(info),
+            'error': None,
+            'expires_at': time.time() + ttl,
+        }
+        self._store(video_id, entry)
+        return True
+
+    def put_negative(self, video_id, error_message):
+        """
+        비공개/삭제 영상 오류를 캐시에 저장
+
+        Args:
+            video_id (str): 비디오 ID
+            error_message (str): 오류 메시지
+        """
+        entry = {
+            'info': None,
+            'error': str(error_message),
+            'expires_at': time.time() + self.negative_ttl,
+        }
+        self._store(video_id, entry)
+
+    def invalidate(self, video_id):
+        """특정 비디오의 캐시 삭제"""
+        with self._lock:
+            self._memory.pop(video_id, None)
+            self._delete_disk(video_id)
+
+    def clear(self):
+        """모든 캐시 삭제"""
+        with self._lock:
+            self._memory.clear()
+            if self.cache_dir and os.path.exists(self.cache_dir):
+                for filename in os.listdir(self.cache_dir):
+                    if filename.endswith('.json'):
+                        try:
+                            os.remove(os.path.join(self.cache_dir, filename))
+                        except OSError:
+                            pass
+
+    def is_negative_error(self, error_message):
+        """다시 시도해도 실패할 오류인지 확인"""
+        message = str(error_message).lower()
+        return any(pattern in message for pattern in self.NEGATIVE_ERROR_PATTERNS)
+
+    def compute_ttl(self, info):
+        """
+        info의 스트림 URL 만료 시각을 반영한 유효 시간 계산
+
+        Args:
+            info (dict): yt-dlp info 딕셔너리
+
+        Returns:
+            float: 유효 시간 (초), 0 이하이면 캐시하지 않음
+        """
+        expires = [int(value) for value in self.EXPIRE_PATTERN.findall(' '.join(self._iter_urls(info)))]
+        if not expires:
+            return self.default_ttl
+
+        return min(self.default_ttl, min(expires) - time.time() - self.expire_margin)
+
+    def _iter_urls(self, info):
+        """info 안의 스트림 URL 목록"""
+        formats = list(info.get('formats') or []) + list(info.get('requested_formats') or [])
+        for item in [info] + formats:
+            for key in ('url', 'manifest_url', 'fragment_base_url'):
+                value = item.get(key)
+                if isinstance(value, str):
+                    yield value
+
+    def _sanitize(self, obj):
+        """JSON으로 저장 가능한 형태로 변환 (내부용 '__' 키 제거)"""
+        if isinstance(obj, dict):
+            return {
+                str(k): self._sanitize(v) for k, v in obj.items()
+                if not str(k).startswith('__')
+            }
+        if isinstance(obj, (list, tuple, set)):
+            return [self._sanitize(v) for v in obj]
+        if obj is None or isinstance(obj, (str, int, float, bool)):
+            return obj
+        return str(obj)
+
+    def _store(self, video_id, entry):
+        with self._lock:
+            self._remember(video_id, entry)
+            self._write_disk(video_id, entry)
+
+    def _remember(self, video_id, entry):
+        """메모리 LRU에 추가 (최대 개수 초과 시 가장 오래된 항목 제거)"""
+        self._memory[video_id] = entry
+        self._memory.move_to_end(video_id)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, video_id):
+        safe_id = re.sub(r'[^\w-]', '_', video_id)
+        return os.path.join(self.cache_dir, f"{safe_id}.json")
+
+    def _read_disk(self, video_id):
+        if not self.cache_dir:
+            return None
+
+        path = self._disk_path(video_id)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"메타데이터 캐시 읽기 실패: {path}, 에러: {e}")
+            self._delete_disk(video_id)
+            return None
+
+    def _write_disk(self, video_id, entry):
+        if not self.cache_dir:
+            return
+
+        path = self._disk_path(video_id)
+        temp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except Exception as e:
+            self.logger.warning(f"메타데이터 캐시 저장 실패: {path}, 에러: {e}")
+
+    def _delete_disk(self, video_id):
+        if not self.cache_dir:
+            return
+
+        try:
+            os.remove(self._disk_path(video_id))
+        except OSError:
+            pass
+
+# 전역 캐시 인스턴스
+_cache_instance = None
+
+def get_metadata_cache():
+    """전역 메타데이터 캐시 인스턴스 가져오기"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = MetadataCache()
+    return _cache_instance
@@ -0,0 +1,301 @@
+import atexit
+import heapq
+import itertools
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from logger import get_logger
+
+class PostProcessTask:
+    """스케줄러에 제출된 후처리 작업 하나"""
+
+    def __init__(self, step, func, priority):
+        self.step = step
+        self.func = func
+        self.priority = priority
+        self.queued_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self._done = threading.Event()
+
+    @property
+    def wait_time(self):
+        """대기열에서 기다린 시간 (초)"""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.queued_at
+
+    @property
+    def run_time(self):
+        """실제 실행 시간 (초)"""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def cancel(self):
+        """
+        아직 시작하지 않은 작업 취소
+
+        Returns:
+            bool: 취소 성공 여부 (이미 시작했으면 False)
+        """
+        if self.started_at is not None:
+            return False
+        self.cancelled = True
+        self._done.set()
+        return True
+
+    def wait(self, timeout=None):
+        """작업이 끝날 때까지 대기"""
+        return self._done.wait(timeout)
+
+    def get_result(self):
+        """결과 반환 (작업 중 발생한 예외는 다시 발생)"""
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+class PostProcessScheduler:
+    """FFmpeg 후처리(병합, 자막 변환, 삽입)를 CPU 코어 수만큼만 동시에 실행하는 스케줄러"""
+
+    # 숫자가 작을수록 먼저 실행 (짧게 끝나는 작업을 먼저 처리하여 평균 대기 시간 감소)
+    STEP_PRIORITIES = {
+        'FFmpegSubtitlesConvertor': 0,
+        'FFmpegEmbedSubtitle': 1,
+        'FFmpegMerger': 2,
+    }
+    DEFAULT_PRIORITY = 3
+
+    # 스케줄러를 거치는 yt-dlp 후처리기 (파일 이동 등 CPU를 쓰지 않는 단계는 제외)
+    SCHEDULED_PREFIX = 'FFmpeg'
+
+    def __init__(self, max_workers=None, history_size=200):
+        """
+        후처리 스케줄러 초기화
+
+        다운로드 작업자 수와 관계없이 동시에 실행되는 FFmpeg 프로세스는
+        max_workers개로 제한됩니다.
+
+        Args:
+            max_workers (int): 동시에 실행할 최대 후처리 수 (기본값: CPU 코어 수)
+            history_size (int): 보관할 최근 작업 기록 수
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.logger = get_logger()
+
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._history = deque(maxlen=history_size)
+        self._workers = []
+        self._closed = False
+
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._worker, name=f'postprocess-{i}', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        atexit.register(self.shutdown)
+
+    def submit(self, step, func, priority=None):
+        """
+        후처리 작업 제출
+
+        Args:
+            step (str): 단계 이름 (예: 'FFmpegMerger')
+            func: 실행할 함수 (인자 없음)
+            priority (int): 우선순위 (작을수록 먼저, 기본값: 단계별 우선순위)
+
+        Returns:
+            PostProcessTask: 제출된 작업
+        """
+        if priority is None:
+            priority = self.STEP_PRIORITIES.get(step, self.DEFAULT_PRIORITY)
+
+        task = PostProcessTask(step, func, priority)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("후처리 스케줄러가 종료되었습니다.")
+            heapq.heappush(self._heap, (priority, next(self._counter), task))
+            self._condition.notify()
+        return task
+
+    def run(self, step, func, priority=None, cancel_event=None):
+        """
+        후처리 작업을 제출하고 끝날 때까지 대기
+
+        Args:
+            step (str): 단계 이름
+            func: 실행할 함수 (인자 없음)
+            priority (int): 우선순위 (선택)
+            cancel_event: 시작 전에 설정되면 작업을 취소할 threading.Event (선택)
+
+        Returns:
+            func의 반환값
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            raise Exception("사용자가 다운로드를 취소했습니다.")
+
+        task = self.submit(step, func, priority)
+        if cancel_event is not None:
+            while not task.wait(0.2):
+                if cancel_event.is_set():
+                    # 작업자가 작업을 꺼내는 것과 동시에 취소되지 않도록 잠금 안에서 처리
+                    with self._condition:
+                        cancelled = task.cancel()
+                    if cancelled:
+                        raise Exception("사용자가 다운로드를 취소했습니다.")
+        return task.get_result()
+
+    def run_ffmpeg(self, args, ffmpeg_location=None, step='ffmpeg', priority=None, cancel_event=None):
+        """
+        ffmpeg 명령을 스케줄러를 통해 실행
+
+        Args:
+            args (list): ffmpeg 인자 (실행 파일 제외)
+            ffmpeg_location (str): ffmpeg 실행 파일 또는 폴더 경로 (없으면 PATH에서 검색)
+            step (str): 단계 이름
+            priority (int): 우선순위 (선택)
+            cancel_event: 취소 이벤트 (선택)
+
+        Returns:
+            subprocess.CompletedProcess: 실행 결과
+        """
+        executable = self.resolve_ffmpeg(ffmpeg_location)
+
+        def run_process():
+            return subprocess.run([executable, *args], capture_output=True, check=True)
+
+        return self.run(step, run_process, priority=priority, cancel_event=cancel_event)
+
+    def resolve_ffmpeg(self, ffmpeg_location=None):
+        """ffmpeg_location 옵션 값을 실행 파일 경로로 변환"""
+        if not ffmpeg_location:
+            return 'ffmpeg'
+        if os.path.isdir(ffmpeg_location):
+            return os.path.join(ffmpeg_location, 'ffmpeg.exe' if os.name == 'nt' else 'ffmpeg')
+        return ffmpeg_location
+
+    def attach(self, ydl, cancel_event_getter=None):
+        """
+        YoutubeDL 인스턴스의 FFmpeg 후처리가 스케줄러를 거치도록 연결
+
+        Args:
+            ydl: yt_dlp.YoutubeDL 인스턴스
+            cancel_event_getter: 현재 취소 이벤트를 반환하는 함수 (선택)
+        """
+        original_run_pp = ydl.run_pp
+
+        def scheduled_run_pp(pp, infodict):
+            step = self._step_name(pp)
+            if not step.startswith(self.SCHEDULED_PREFIX):
+                return original_run_pp(pp, infodict)
+
+            cancel_event = cancel_event_getter() if cancel_event_getter else None
+            return self.run(step, lambda: original_run_pp(pp, infodict), cancel_event=cancel_event)
+
+        ydl.run_pp = scheduled_run_pp
+        return ydl
+
+    def timings(self):
+        """최근 작업 기록 목록 (단계, 우선순위, 대기 시간, 실행 시간, 성공 여부)"""
+        with self._condition:
+            return list(self._history)
+
+    def summary(self):
+        """
+        단계별 처리 통계
+
+        Returns:
+            dict: {단계: {'count', 'failed', 'avg_wait', 'avg_run', 'total_run'}}
+        """
+        result = {}
+        for record in self.timings():
+            stats = result.setdefault(record['step'], {
+                'count': 0, 'failed': 0, 'total_wait': 0.0, 'total_run': 0.0
+            })
+            stats['count'] += 1
+            stats['total_wait'] += record['wait_time']
+            stats['total_run'] += record['run_time']
+            if not record['success']:
+                stats['failed'] += 1
+
+        for stats in result.values():
+            stats['avg_wait'] = stats['total_wait'] / stats['count']
+            stats['avg_run'] = stats['total_run'] / stats['count']
+            del stats['total_wait']
+        return result
+
+    def pending_count(self):
+        """대기 중인 작업 수"""
+        with self._condition:
+            return sum(1 for _, _, task in self._heap if not task.cancelled)
+
+    def shutdown(self, wait=True):
+        """스케줄러 종료 (대기 중인 작업은 모두 실행 후 종료)"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        if wait:
+            for worker in self._workers:
+                if worker is not threading.current_thread():
+                    worker.join()
+
+    def _step_name(self, pp):
+        try:
+            return pp.pp_key()
+        except Exception:
+            return type(pp).__name__
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._heap and not self._closed:
+                    self._condition.wait()
+                if not self._heap:
+                    return
+                _, _, task = heapq.heappop(self._heap)
+                if task.cancelled:
+                    continue
+                task.started_at = time.monotonic()
+
+            try:
+                task.result = task.func()
+            except BaseException as e:
+                task.error = e
+            task.finished_at = time.monotonic()
+
+            record = {
+                'step': task.step,
+                'priority': task.priority,
+                'wait_time': task.wait_time,
+                'run_time': task.run_time,
+                'success': task.error is None,
+            }
+            with self._condition:
+                self._history.append(record)
+            self.logger.debug(
+                f"후처리 완료: {task.step} (대기 {task.wait_time:.2f}초, 실행 {task.run_time:.2f}초)"
+            )
+            task._done.set()
+
+# 전역 후처리 스케줄러 인스턴스 (프로세스 내 모든 다운로더가 공유)
+_scheduler_instance = None
+_scheduler_lock = threading.Lock()
+
+def get_postprocess_scheduler():
+    """전역 후처리 스케줄러 인스턴스 가져오기"""
+    global _scheduler_instance
+    with _scheduler_lock:
+        if _scheduler_instance is None:
+            _scheduler_instance = PostProcessScheduler()
+        return _scheduler_instance
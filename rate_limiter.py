@@ -0,0 +1,149 @@
+import threading
+import time
+from logger import get_logger
+
+class AdaptiveRateLimiter:
+    """AIMD 방식으로 요청 속도를 조절하는 토큰 버킷"""
+
+    THROTTLE_PATTERNS = ['429', 'too many requests']
+
+    def __init__(self, max_rate=1.0, capacity=3, min_rate=0.05,
+                 increase_step=0.05, decrease_factor=0.5):
+        """
+        속도 제한기 초기화
+
+        YouTube가 요청을 제한하지 않을 때는 max_rate까지 조금씩 속도를 올리고,
+        429 응답을 받으면 즉시 속도를 절반으로 줄입니다.
+
+        Args:
+            max_rate (float): 초당 최대 요청 수 (0 이하이면 제한 없음)
+            capacity (int): 한 번에 몰아서 보낼 수 있는 최대 요청 수
+            min_rate (float): 초당 최소 요청 수
+            increase_step (float): 성공 시 증가량 (초당 요청 수)
+            decrease_factor (float): 제한 감지 시 곱할 비율
+        """
+        self.max_rate = max_rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.logger = get_logger()
+
+        self._rate = max_rate
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def current_rate(self):
+        """현재 초당 허용 요청 수"""
+        return self._rate
+
+    def configure(self, max_rate=None, capacity=None):
+        """
+        설정 변경 (실행 중에도 적용)
+
+        Args:
+            max_rate (float): 초당 최대 요청 수
+            capacity (int): 최대 버스트 크기
+        """
+        with self._lock:
+            self._refill()
+            if max_rate is not None:
+                self.max_rate = max_rate
+                if max_rate <= 0 or self._rate <= 0:
+                    self._rate = max_rate
+                else:
+                    self._rate = min(self._rate, max_rate)
+            if capacity is not None:
+                self.capacity = capacity
+                self._tokens = min(self._tokens, float(capacity))
+
+    def acquire(self, cancel_event=None, timeout=None):
+        """
+        요청 하나를 보낼 수 있을 때까지 대기
+
+        Args:
+            cancel_event: 설정되면 대기를 중단할 threading.Event (선택)
+            timeout (float): 최대 대기 시간 (초, 선택)
+
+        Returns:
+            bool: 허가 여부 (취소 또는 시간 초과 시 False)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                if self.max_rate <= 0:
+                    return True
+
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_time = (1 - self._tokens) / self._rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_time = min(wait_time, remaining)
+
+            if cancel_event is not None:
+                if cancel_event.wait(wait_time):
+                    return False
+            else:
+                time.sleep(wait_time)
+
+    def on_success(self):
+        """요청 성공 시 속도를 조금씩 올림 (가산 증가)"""
+        with self._lock:
+            if self.max_rate <= 0:
+                return
+            self._refill()
+            self._rate = min(self.max_rate, self._rate + self.increase_step)
+
+    def on_throttled(self):
+        """요청 제한 감지 시 속도를 크게 줄임 (승산 감소)"""
+        with self._lock:
+            if self.max_rate <= 0:
+                return
+            self._refill()
+            self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+            # 쌓여 있던 토큰도 버려서 바로 다음 요청이 나가지 않도록 함
+            self._tokens = 0.0
+        self.logger.warning(f"요청 제한 감지 - 요청 속도를 초당 {self._rate:.2f}회로 낮춥니다.")
+
+    def report(self, error=None):
+        """
+        요청 결과 반영
+
+        Args:
+            error: 실패 시 예외 또는 오류 메시지 (성공이면 None)
+        """
+        if error is None:
+            self.on_success()
+        elif self.is_throttle_error(error):
+            self.on_throttled()
+
+    def is_throttle_error(self, error):
+        """요청 제한(429) 오류인지 확인"""
+        message = str(error).lower()
+        return any(pattern in message for pattern in self.THROTTLE_PATTERNS)
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        if self._rate > 0:
+            self._tokens = min(float(self.capacity), self._tokens + elapsed * self._rate)
+
+# 전역 속도 제한기 인스턴스 (프로세스 내 모든 다운로더가 공유)
+_rate_limiter_instance = None
+
+def get_rate_limiter():
+    """전역 속도 제한기 인스턴스 가져오기"""
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        _rate_limiter_instance = AdaptiveRateLimiter()
+    return _rate_limiter_instance
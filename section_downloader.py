@@ -0,0 +1,280 @@
+import os
+import re
+from contextlib import contextmanager
+from yt_dlp.utils import download_range_func
+from logger import get_logger
+
+class SectionDownloader:
+    """영상의 일부 구간(클립)만 다운로드"""
+
+    # 조각 목록과 조각별 길이를 알 수 있는 프로토콜 (겹치는 조각만 받을 수 있음)
+    FRAGMENT_PROTOCOLS = ('http_dash_segments',)
+
+    TIME_PATTERN = re.compile(r'^(?:(?:(\d+):)?(\d+):)?(\d+(?:\.\d+)?)$')
+
+    def __init__(self):
+        """
+        구간 다운로더 초기화
+
+        yt-dlp의 download_ranges로 구간을 지정하면 단일 파일(progressive) 포맷은 FFmpeg가
+        시작 위치로 바로 이동(HTTP Range)해서 필요한 부분만 읽고 키프레임 기준으로 자릅니다.
+        DASH처럼 조각 목록이 있는 포맷은 구간과 겹치는 조각만 받은 뒤 FFmpeg로 잘라냅니다.
+        """
+        self.logger = get_logger()
+
+    @classmethod
+    def parse_time(cls, value):
+        """
+        시각을 초로 변환
+
+        Args:
+            value: 초(숫자 또는 '90', '90.5') 또는 'MM:SS', 'HH:MM:SS(.ms)' 문자열
+
+        Returns:
+            float: 초
+        """
+        if isinstance(value, (int, float)):
+            seconds = float(value)
+        else:
+            match = cls.TIME_PATTERN.match(str(value).strip())
+            if not match:
+                raise ValueError(f"잘못된 시각 형식: {value}")
+            hours, minutes, seconds = match.groups()
+            seconds = (int(hours or 0) * 60 + int(minutes or 0)) * 60 + float(seconds)
+        if seconds < 0:
+            raise ValueError(f"시각은 0 이상이어야 합니다: {value}")
+        return seconds
+
+    @classmethod
+    def parse_range(cls, text):
+        """
+        '시작-끝' 문자열을 (시작, 끝) 초로 변환 (예: '1:00:00-1:00:30')
+
+        Returns:
+            tuple: (시작 초, 끝 초)
+        """
+        start, separator, end = str(text).partition('-')
+        if not separator:
+            raise ValueError(f"구간은 '시작-끝' 형식이어야 합니다: {text}")
+        start, end = cls.parse_time(start), cls.parse_time(end)
+        if end <= start:
+            raise ValueError(f"끝 시각은 시작 시각보다 늦어야 합니다: {text}")
+        return start, end
+
+    @staticmethod
+    def variant(quality, start, end):
+        """
+        품질과 구간을 합친 이름 (예: 'best@3600-3630')
+
+        아카이브, 작업 저널, 다운로드 큐에서 clip 모드의 품질 값으로 사용합니다.
+        """
+        return f"{quality}@{start:g}-{end:g}"
+
+    @classmethod
+    def parse_variant(cls, text):
+        """
+        variant()로 만든 이름을 다시 나눔
+
+        Returns:
+            tuple: (품질, 시작 초, 끝 초)
+        """
+        quality, separator, section = str(text).rpartition('@')
+        if not separator:
+            raise ValueError(f"구간 정보가 없습니다: {text}")
+        start, end = cls.parse_range(section)
+        return quality or 'best', start, end
+
+    def select_fragments(self, fragments, start, end=None):
+        """
+        구간과 겹치는 조각만 선택
+
+        조각별 길이(duration)로 시간축을 계산하며, 맨 앞의 초기화 조각(길이 없음)은 항상 포함합니다.
+
+        Args:
+            fragments (list): yt-dlp 조각 목록
+            start (float): 시작 초
+            end (float): 끝 초 (None이면 끝까지)
+
+        Returns:
+            tuple: (선택한 조각 목록, 첫 조각의 시작 초), 길이를 모르는 조각이 있으면 None
+        """
+        selected = []
+        offset = None
+        position = 0.0
+        media_seen = False
+
+        for fragment in fragments:
+            duration = fragment.get('duration')
+            if duration is None:
+                if media_seen:
+                    return None
+                selected.append(fragment)  # 초기화 조각
+                continue
+            media_seen = True
+
+            fragment_end = position + float(duration)
+            if fragment_end > start and (end is None or position < end):
+                if offset is None:
+                    offset = position
+                selected.append(fragment)
+            position = fragment_end
+            if end is not None and position >= end:
+                break
+
+        if offset is None:
+            return None
+        return selected, offset
+
+    @contextmanager
+    def section(self, ydl, start, end, precise=False):
+        """
+        YoutubeDL 인스턴스가 이 구간만 다운로드하도록 설정 (종료 시 원래 설정으로 복원)
+
+        세션 풀의 인스턴스를 재사용하므로 옵션에 넣지 않고 사용하는 동안만 params를 바꿉니다.
+
+        Args:
+            ydl: yt_dlp.YoutubeDL 인스턴스
+            start (float): 시작 초
+            end (float): 끝 초
+            precise (bool): True이면 재인코딩하여 정확한 위치에서 자름 (기본: 키프레임 기준)
+        """
+        keys = ('download_ranges', 'force_keyframes_at_cuts')
+        previous = {key: ydl.params[key] for key in keys if key in ydl.params}
+        ydl.params['download_ranges'] = download_range_func(None, [(start, end)])
+        ydl.params['force_keyframes_at_cuts'] = precise
+        try:
+            yield ydl
+        finally:
+            for key in keys:
+                if key in previous:
+                    ydl.params[key] = previous[key]
+                else:
+                    ydl.params.pop(key, None)
+
+    def attach(self, ydl, run_ffmpeg=None):
+        """
+        YoutubeDL 인스턴스의 구간 다운로드에서 조각 포맷은 겹치는 조각만 받도록 연결
+
+        구간이 지정되지 않았거나 조각 길이를 알 수 없으면 yt-dlp 기본 동작(FFmpeg)을 사용합니다.
+
+        Args:
+            ydl: yt_dlp.YoutubeDL 인스턴스
+            run_ffmpeg: ffmpeg 인자 목록을 실행하는 함수 (후처리 스케줄러 경유, 없으면 기본 동작만 사용)
+        """
+        original_dl = ydl.dl
+
+        def section_dl(name, info, subtitle=False, test=False):
+            start = info.get('section_start')
+            end = info.get('section_end')
+            if subtitle or test or run_ffmpeg is None or name == '-' or (start is None and end is None):
+                return original_dl(name, info, subtitle=subtitle, test=test)
+
+            # 병합 포맷(비디오+오디오)은 포맷마다 따로 받은 뒤 합침
+            requested = info.get('requested_formats')
+            if requested:
+                formats = [{**info, **f} for f in requested]
+                if not any(self._sliceable(f, start or 0, end) for f in formats):
+                    return original_dl(name, info, subtitle=subtitle, test=test)
+                return self._download_merged(original_dl, name, formats, start or 0, end, ydl, run_ffmpeg)
+
+            if not self._sliceable(info, start or 0, end):
+                return original_dl(name, info, subtitle=subtitle, test=test)
+            return self._download_fragments(original_dl, name, info, start or 0, end, ydl, run_ffmpeg)
+
+        ydl.dl = section_dl
+        return ydl
+
+    def _sliceable(self, info, start, end):
+        return (
+            info.get('protocol') in self.FRAGMENT_PROTOCOLS
+            and isinstance(info.get('fragments'), list)
+            and self.select_fragments(info['fragments'], start, end) is not None
+        )
+
+    def _download_fragments(self, original_dl, name, info, start, end, ydl, run_ffmpeg):
+        """겹치는 조각만 받은 뒤 구간 밖 부분을 잘라냄"""
+        if not self._sliceable(info, start, end):
+            # 병합 포맷 중 단일 파일 포맷은 yt-dlp 기본 동작(FFmpeg 구간 다운로드) 사용
+            return original_dl(name, info)
+
+        fragments, offset = self.select_fragments(info['fragments'], start, end)
+        clipped = dict(info)
+        clipped['fragments'] = fragments
+        # 구간 정보가 있으면 yt-dlp가 FFmpeg로 전체를 읽으므로 조각 다운로더를 쓰도록 제거
+        for key in ('section_start', 'section_end', 'requested_formats', 'filesize', 'filesize_approx'):
+            clipped.pop(key, None)
+
+        self.logger.info(
+            f"구간 다운로드 ({start:g}s-{'' if end is None else f'{end:g}s'}): "
+            f"조각 {len(fragments)}/{len(info['fragments'])}개만 받음"
+        )
+        success, real_download = original_dl(name, clipped)
+        if success and real_download:
+            self._trim(name, start - offset, None if end is None else end - start,
+                       ydl.params.get('force_keyframes_at_cuts'), run_ffmpeg)
+        return success, real_download
+
+    def _download_merged(self, original_dl, name, formats, start, end, ydl, run_ffmpeg):
+        root, ext = os.path.splitext(name)
+        parts = []
+        real_download = False
+        try:
+            for fmt in formats:
+                part = f"{root}.f{fmt.get('format_id')}.section.{fmt.get('ext') or ext.lstrip('.')}"
+                fmt = dict(fmt)
+                fmt.pop('requested_formats', None)
+                success, real = self._download_fragments(original_dl, part, fmt, start, end, ydl, run_ffmpeg)
+                if not success:
+                    return False, real_download
+                parts.append(part)
+                real_download = real_download or real
+
+            args = ['-y', '-loglevel', 'error']
+            for part in parts:
+                args += ['-i', part]
+            for index in range(len(parts)):
+                args += ['-map', str(index)]
+            run_ffmpeg(args + ['-c', 'copy', name], step='ffmpeg_merge')
+            return True, True
+        finally:
+            for part in parts:
+                if os.path.exists(part):
+                    os.remove(part)
+
+    def _trim(self, path, offset, duration, precise, run_ffmpeg):
+        """
+        받은 조각 파일에서 구간만 남김
+
+        Args:
+            offset (float): 파일 안에서의 시작 위치 (초)
+            duration (float): 구간 길이 (초, None이면 끝까지)
+            precise (bool): 재인코딩 여부 (False면 스트림 복사로 키프레임 기준 자르기)
+        """
+        root, ext = os.path.splitext(path)
+        temp_path = f"{root}.trim{ext}"
+        args = ['-y', '-loglevel', 'error', '-ss', f"{max(offset, 0):.3f}", '-i', path]
+        if duration is not None:
+            args += ['-t', f"{duration:.3f}"]
+        args += ['-map', '0']
+        if not precise:
+            args += ['-c', 'copy']
+        args.append(temp_path)
+
+        try:
+            run_ffmpeg(args, step='ffmpeg_trim')
+            os.replace(temp_path, path)
+        except Exception as e:
+            # 자르지 못해도 구간을 포함한 조각 단위 파일은 남김
+            self.logger.warning(f"구간 자르기 실패, 조각 단위로 저장: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+# 전역 구간 다운로더 인스턴스
+_section_downloader_instance = None
+
+def get_section_downloader():
+    """전역 구간 다운로더 인스턴스 가져오기"""
+    global _section_downloader_instance
+    if _section_downloader_instance is None:
+        _section_downloader_instance = SectionDownloader()
+    return _section_downloader_instance
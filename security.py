@@ -14,6 +14,14 @@ class SecurityValidator:
         r'^https?://(www\.)?youtube\.com/v/[\w-]+',
     ]
     
+    # 재생목록/채널 URL 패턴
+    COLLECTION_PATTERNS = [
+        r'^https?://(www\.|m\.)?youtube\.com/playlist\?(.*&)?list=[\w-]+',
+        r'^https?://(www\.|m\.)?youtube\.com/channel/UC[\w-]+',
+        r'^https?://(www\.|m\.)?youtube\.com/@[\w.-]+',
+        r'^https?://(www\.|m\.)?youtube\.com/(c|user)/[\w.-]+',
+    ]
+    
     # 허용된 도메인
     ALLOWED_DOMAINS = [
         'youtube.com',
@@ -25,12 +33,13 @@ class SecurityValidator:
     def __init__(self):
         self.logger = get_logger()
     
-    def validate_youtube_url(self, url):
+    def validate_youtube_url(self, url, allow_collections=False):
         """
         YouTube URL 유효성 검증
         
         Args:
             url (str): 검증할 URL
+            allow_collections (bool): 재생목록/채널 URL 허용 여부
             
         Returns:
             tuple: (is_valid, error_message)
@@ -57,6 +66,11 @@ class SecurityValidator:
             self.logger.warning(f"허용되지 않은 도메인: {parsed.netloc}")
             return False, f"YouTube URL만 허용됩니다. (입력된 도메인: {parsed.netloc})"
         
+        # 재생목록/채널 URL
+        if allow_collections and self.is_collection_url(url):
+            self.logger.info(f"URL 검증 성공: {url} (재생목록/채널)")
+            return True, ""
+        
         # YouTube URL 패턴 검증
         is_valid_pattern = any(re.match(pattern, url) for pattern in self.YOUTUBE_PATTERNS)
         
@@ -112,6 +126,43 @@ class SecurityValidator:
         
         return None
     
+    def is_collection_url(self, url):
+        """
+        재생목록/채널 URL인지 확인
+        
+        watch?v=...&list=... 처럼 비디오 ID가 있는 URL은 단일 비디오로 취급합니다.
+        
+        Args:
+            url (str): YouTube URL
+            
+        Returns:
+            bool: 재생목록/채널 URL 여부
+        """
+        if not url or not isinstance(url, str):
+            return False
+        
+        url = url.strip()
+        return any(re.match(pattern, url) for pattern in self.COLLECTION_PATTERNS)
+    
+    def extract_playlist_id(self, url):
+        """
+        YouTube URL에서 재생목록 ID 추출
+        
+        Args:
+            url (str): YouTube URL
+            
+        Returns:
+            str: 재생목록 ID 또는 None
+        """
+        try:
+            parsed = urlparse(url)
+            if 'youtube.com' in parsed.netloc:
+                return parse_qs(parsed.query).get('list', [None])[0]
+        except Exception as e:
+            self.logger.error(f"재생목록 ID 추출 중 오류: {e}")
+        
+        return None
+    
     def sanitize_filename(self, filename):
         """
         파일명에서 위험한 문자 제거
@@ -0,0 +1,505 @@
+import http.client
+import json
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+from urllib.parse import urlsplit, urljoin
+from logger import get_logger
+from bandwidth_manager import current_job
+
+class RangeNotSupported(Exception):
+    """서버가 Range 요청을 무시함"""
+
+class SegmentedDownloadError(Exception):
+    """구간 다운로드 실패"""
+
+class ConnectionPool:
+    """호스트별로 재사용하는 HTTP 연결 풀 (keep-alive)"""
+
+    def __init__(self, max_idle_per_host=8, timeout=30):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self._idle = {}  # (scheme, host, port) -> [connection, ...]
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        """연결 가져오기 (대기 중인 연결이 없으면 새로 생성)"""
+        with self._lock:
+            connections = self._idle.get(key)
+            if connections:
+                return connections.pop()
+
+        return self.connect(key)
+
+    def connect(self, key):
+        """새 연결 생성"""
+        scheme, host, port = key
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def release(self, key, connection, reusable=True):
+        """연결 반납 (응답을 끝까지 읽은 연결만 재사용)"""
+        if reusable:
+            with self._lock:
+                connections = self._idle.setdefault(key, [])
+                if len(connections) < self.max_idle_per_host:
+                    connections.append(connection)
+                    return
+        connection.close()
+
+    def close(self):
+        """대기 중인 모든 연결 종료"""
+        with self._lock:
+            connections = [c for group in self._idle.values() for c in group]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+class SegmentedDownloader:
+    """크기를 아는 단일 파일을 여러 구간으로 나누어 동시에 받는 다운로더"""
+
+    CONTENT_RANGE_PATTERN = re.compile(r'bytes (\d+)-(\d+)/(\d+|\*)')
+    MAX_REDIRECTS = 5
+
+    def __init__(self, connections=4, segment_size=4 * 1024 * 1024, min_size=8 * 1024 * 1024,
+                 chunk_size=64 * 1024, retries=3, timeout=30):
+        """
+        구간 다운로더 초기화
+
+        Args:
+            connections (int): 동시 연결 수
+            segment_size (int): 구간 하나의 크기 (bytes)
+            min_size (int): 이보다 작은 파일은 구간으로 나누지 않음
+            chunk_size (int): 한 번에 읽는 크기
+            retries (int): 구간별 재시도 횟수 (받은 위치부터 이어받음)
+            timeout (int): 연결 시간 제한 (초)
+        """
+        self.connections = connections
+        self.segment_size = segment_size
+        self.min_size = min_size
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.pool = ConnectionPool(max_idle_per_host=max(connections, 1) * 2, timeout=timeout)
+        self.logger = get_logger()
+
+    def download(self, url, path, headers=None, progress_hook=None, cancel_event=None, connections=None,
+                 throttle=None, cookies=None):
+        """
+        파일 다운로드
+
+        서버가 Range를 지원하면 구간별로 동시에 받아 파일의 해당 위치에 바로 쓰고,
+        지원하지 않으면 연결 하나로 처음부터 받습니다.
+
+        Args:
+            url (str): 파일 URL
+            path (str): 저장 경로
+            headers (dict): 요청 헤더 (선택)
+            progress_hook: yt-dlp 형식 진행률 딕셔너리를 받는 함수 (선택)
+            cancel_event: 설정되면 다운로드를 중단할 threading.Event (선택)
+            connections (int): 이번 다운로드의 동시 연결 수 (기본값: self.connections)
+            throttle: 받은 바이트 수를 넘기면 속도 제한만큼 대기하는 함수 (선택)
+            cookies: URL을 받아 Cookie 헤더 값을 돌려주는 함수 (선택, 리다이렉트된 URL마다 다시 계산)
+
+        Returns:
+            int: 받은 파일 크기 (bytes)
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            raise SegmentedDownloadError("사용자가 다운로드를 취소했습니다.")
+
+        headers = dict(headers or {})
+        part_path = path + '.segmented.part'
+        state_path = path + '.segmented.json'
+
+        url, response, connection, key = self._open(url, headers, byte_range=(0, 0), cookies=cookies)
+        if response.status != 206:
+            # Range 무시: 이미 열린 응답으로 전체를 받음
+            self.logger.info(f"서버가 Range를 지원하지 않아 단일 연결로 다운로드: {url}")
+            self._remove(state_path)
+            return self._download_single(response, connection, key, path, part_path, progress_hook, cancel_event,
+                                         throttle)
+
+        total = self._parse_content_range(response)[2]
+        response.read()
+        self.pool.release(key, connection)
+        if total is None:
+            raise SegmentedDownloadError("Content-Range에 전체 크기가 없습니다.")
+
+        try:
+            return self._download_segments(url, headers, total, path, part_path, state_path,
+                                           progress_hook, cancel_event, connections or self.connections, throttle,
+                                           cookies)
+        except RangeNotSupported:
+            self.logger.warning(f"구간 요청이 거부되어 단일 연결로 다시 다운로드: {url}")
+            self._remove(state_path)
+            url, response, connection, key = self._open(url, headers, cookies=cookies)
+            return self._download_single(response, connection, key, path, part_path, progress_hook, cancel_event,
+                                         throttle)
+
+    def attach(self, ydl, cancel_event_getter=None):
+        """
+        YoutubeDL 인스턴스의 단일 파일 HTTP 다운로드가 구간 다운로드를 사용하도록 연결
+
+        params의 'segmented_connections'가 1보다 클 때만 동작하며, 조각(fragment)
+        포맷, min_size보다 작거나 크기를 모르는 파일, 프록시/속도 제한 사용 시에는
+        yt-dlp 기본 다운로더를 씁니다. 구간(클립) 다운로드는 FFmpeg가 필요한 부분만 읽으므로
+        제외합니다. 병합 포맷은 비디오/오디오 파일마다 따로 적용됩니다.
+
+        요청에는 yt-dlp HTTP 다운로더처럼 ydl.cookiejar의 쿠키를 붙이고, 취소되면
+        기본 다운로더로 다시 받지 않고 중단합니다 (받은 구간은 남겨 두어 이어받기에 사용).
+
+        Args:
+            ydl: yt_dlp.YoutubeDL 인스턴스
+            cancel_event_getter: 현재 작업의 취소 threading.Event를 돌려주는 함수 (선택)
+        """
+        original_dl = ydl.dl
+
+        def cookie_header(url):
+            cookiejar = getattr(ydl, 'cookiejar', None)
+            if hasattr(cookiejar, 'get_cookie_header'):
+                return cookiejar.get_cookie_header(url)
+            if hasattr(ydl, '_calc_cookies'):
+                # 이전 버전 yt-dlp
+                return ydl._calc_cookies(url)
+            return None
+
+        def segmented_dl(name, info, subtitle=False, test=False):
+            connections = ydl.params.get('segmented_connections') or 0
+            size = info.get('filesize') or info.get('filesize_approx') or 0
+            usable = (
+                connections > 1 and not subtitle and not test and name != '-'
+                and info.get('protocol') in ('http', 'https')
+                and not info.get('fragments')
+                and info.get('section_start') is None and info.get('section_end') is None
+                and size >= self.min_size
+                and not ydl.params.get('proxy') and not ydl.params.get('ratelimit')
+                and not os.path.isfile(name)
+            )
+            if not usable:
+                return original_dl(name, info, subtitle=subtitle, test=test)
+
+            def hook(status):
+                status['info_dict'] = info
+                for ph in getattr(ydl, '_progress_hooks', []):
+                    ph(status)
+
+            headers = info.get('http_headers')
+            if headers is None and hasattr(ydl, '_calc_headers'):
+                headers = ydl._calc_headers(info)
+            # 이전 버전 yt-dlp는 http_headers에 쿠키를 직접 넣어 줌
+            cookies = None if 'Cookie' in (headers or {}) else cookie_header
+            cancel_event = cancel_event_getter() if cancel_event_getter else None
+            # 대역폭 관리자에 등록된 다운로드이면 작업자 스레드가 받은 즉시 속도 제한 적용
+            job = current_job()
+            throttle = None
+            if job is not None:
+                job.external_metering = True
+                throttle = job.consume
+            try:
+                self.download(info['url'], name, headers=headers, progress_hook=hook, cancel_event=cancel_event,
+                              connections=connections, throttle=throttle, cookies=cookies)
+            except (SegmentedDownloadError, OSError, http.client.HTTPException) as e:
+                if job is not None:
+                    job.external_metering = False
+                if cancel_event is not None and cancel_event.is_set():
+                    raise
+                # 기본 다운로더가 처음부터 다시 받으므로 구간 다운로드 임시 파일은 정리
+                self.logger.warning(f"구간 다운로드 실패, 기본 다운로더 사용: {e}")
+                self.discard(name)
+                return original_dl(name, info, subtitle=subtitle, test=test)
+            return True, True
+
+        ydl.dl = segmented_dl
+        return ydl
+
+    def discard(self, path):
+        """구간 다운로드 임시 파일과 상태 파일 삭제"""
+        self._remove(path + '.segmented.part')
+        self._remove(path + '.segmented.json')
+
+    def close(self):
+        """대기 중인 연결 종료"""
+        self.pool.close()
+
+    def _download_segments(self, url, headers, total, path, part_path, state_path, progress_hook, cancel_event,
+                           connections, throttle, cookies=None):
+        segments = []
+        for index, start in enumerate(range(0, total, self.segment_size)):
+            segments.append((index, start, min(start + self.segment_size, total) - 1))
+
+        # 이전에 받다가 중단된 구간 정보가 있으면 끝난 구간은 건너뜀
+        done = self._load_state(state_path, total, part_path)
+        if not done:
+            with open(part_path, 'wb') as f:
+                f.truncate(total)
+
+        state = {'done': set(done), 'received': sum(end - start + 1 for i, start, end in segments if i in done)}
+        state_lock = threading.Lock()
+        stop_event = threading.Event()
+        pending = queue.Queue()
+        for segment in segments:
+            if segment[0] not in done:
+                pending.put(segment)
+
+        def worker():
+            with open(part_path, 'r+b') as f:
+                while not stop_event.is_set():
+                    try:
+                        segment = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    if not self._fetch_segment(url, headers, segment, f, state, state_lock, stop_event, throttle,
+                                               cookies):
+                        # 중간에 멈춘 구간은 완료로 기록하지 않음 (이어받을 때 처음부터 다시 받음)
+                        return
+                    with state_lock:
+                        state['done'].add(segment[0])
+                        self._save_state(state_path, total, state['done'])
+
+        workers = max(1, min(connections, pending.qsize()))
+        started_at = time.time()
+        self.logger.info(f"구간 다운로드 시작: {total:,} bytes, {len(segments)}개 구간, 연결 {workers}개")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='segment') as executor:
+            futures = [executor.submit(worker) for _ in range(workers)]
+            try:
+                while True:
+                    finished, running = wait(futures, timeout=0.25, return_when=FIRST_EXCEPTION)
+                    for future in finished:
+                        if future.exception():
+                            raise future.exception()
+                    with state_lock:
+                        contiguous = self._contiguous_bytes(state['done'], len(segments), total)
+                    self._report(progress_hook, path, part_path, state['received'], total, started_at,
+                                 contiguous=contiguous)
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise SegmentedDownloadError("사용자가 다운로드를 취소했습니다.")
+                    if not running:
+                        break
+            except BaseException:
+                stop_event.set()
+                raise
+
+        # 모든 구간을 빠짐없이 받았는지 확인
+        missing = [index for index, _, _ in segments if index not in state['done']]
+        if missing or state['received'] != total or os.path.getsize(part_path) != total:
+            raise SegmentedDownloadError(f"받지 못한 구간이 있습니다: {missing[:10]}")
+
+        os.replace(part_path, path)
+        self._remove(state_path)
+        self._report(progress_hook, path, part_path, total, total, started_at, status='finished')
+        return total
+
+    def _fetch_segment(self, url, headers, segment, f, state, state_lock, stop_event, throttle=None, cookies=None):
+        """
+        구간 하나를 받아 파일의 해당 위치에 기록 (끊기면 받은 위치부터 재시도)
+
+        Returns:
+            bool: 구간 전체를 받았는지 여부 (취소나 다른 구간 실패로 중간에 멈추면 False)
+        """
+        index, start, end = segment
+        received = 0
+        attempts = 0
+
+        while start + received <= end:
+            if stop_event.is_set():
+                return False
+            try:
+                _, response, connection, key = self._open(url, headers, byte_range=(start + received, end),
+                                                          cookies=cookies)
+                if response.status == 200:
+                    response.close()
+                    connection.close()
+                    raise RangeNotSupported()
+                content_range = self._parse_content_range(response)
+                if response.status != 206 or content_range[0] != start + received:
+                    response.close()
+                    connection.close()
+                    raise RangeNotSupported()
+
+                f.seek(start + received)
+                while True:
+                    if stop_event.is_set():
+                        connection.close()
+                        return False
+                    chunk = response.read(min(self.chunk_size, end - start - received + 1))
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    received += len(chunk)
+                    with state_lock:
+                        state['received'] += len(chunk)
+                    if throttle is not None:
+                        throttle(len(chunk))
+                    if start + received > end:
+                        break
+
+                # 응답을 끝까지 읽었으면 연결 재사용
+                self.pool.release(key, connection, reusable=response.isclosed() and not response.will_close)
+            except RangeNotSupported:
+                raise
+            except (OSError, http.client.HTTPException) as e:
+                attempts += 1
+                if attempts > self.retries:
+                    raise SegmentedDownloadError(f"구간 {index} 다운로드 실패: {e}")
+                self.logger.debug(f"구간 {index} 재시도 ({attempts}/{self.retries}): {e}")
+                time.sleep(min(2 ** attempts * 0.1, 2))
+
+        f.flush()
+        return True
+
+    def _download_single(self, response, connection, key, path, part_path, progress_hook, cancel_event,
+                         throttle=None):
+        """Range 없이 연결 하나로 전체 다운로드"""
+        if response.status != 200:
+            response.close()
+            connection.close()
+            raise SegmentedDownloadError(f"HTTP 오류 {response.status}")
+
+        total = int(response.getheader('Content-Length') or 0) or None
+        received = 0
+        started_at = time.time()
+        last_report = 0
+
+        try:
+            with open(part_path, 'wb') as f:
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise SegmentedDownloadError("사용자가 다운로드를 취소했습니다.")
+                    chunk = response.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    received += len(chunk)
+                    if throttle is not None:
+                        throttle(len(chunk))
+                    if time.time() - last_report >= 0.25:
+                        last_report = time.time()
+                        self._report(progress_hook, path, part_path, received, total, started_at)
+        except BaseException:
+            connection.close()
+            raise
+        self.pool.release(key, connection)
+
+        if total is not None and received != total:
+            raise SegmentedDownloadError(f"받은 크기({received})가 Content-Length({total})와 다릅니다.")
+
+        os.replace(part_path, path)
+        self._report(progress_hook, path, part_path, received, received, started_at, status='finished')
+        return received
+
+    def _open(self, url, headers, byte_range=None, cookies=None):
+        """GET 요청 (리다이렉트 처리), Returns: (최종 URL, 응답, 연결, 풀 키)"""
+        base_headers = dict(headers)
+        if byte_range is not None:
+            base_headers['Range'] = f"bytes={byte_range[0]}-{byte_range[1]}"
+
+        for _ in range(self.MAX_REDIRECTS + 1):
+            # 쿠키는 URL(호스트, 경로)마다 달라지므로 리다이렉트할 때마다 다시 계산
+            request_headers = base_headers
+            cookie = cookies(url) if cookies else None
+            if cookie:
+                request_headers = dict(base_headers, Cookie=cookie)
+
+            parts = urlsplit(url)
+            port = parts.port or (443 if parts.scheme == 'https' else 80)
+            key = (parts.scheme, parts.hostname, port)
+            target = parts.path or '/'
+            if parts.query:
+                target += '?' + parts.query
+
+            connection = self.pool.acquire(key)
+            try:
+                connection.request('GET', target, headers=request_headers)
+                response = connection.getresponse()
+            except (OSError, http.client.HTTPException):
+                # 재사용한 연결이 서버에서 이미 닫혔을 수 있으므로 새 연결로 한 번 더 시도
+                connection.close()
+                connection = self.pool.connect(key)
+                connection.request('GET', target, headers=request_headers)
+                response = connection.getresponse()
+
+            if response.status in (301, 302, 303, 307, 308):
+                location = response.getheader('Location')
+                response.read()
+                self.pool.release(key, connection, reusable=not response.will_close)
+                url = urljoin(url, location)
+                continue
+
+            if response.status >= 400:
+                response.read()
+                self.pool.release(key, connection, reusable=not response.will_close)
+                raise SegmentedDownloadError(f"HTTP 오류 {response.status}: {url}")
+            return url, response, connection, key
+
+        raise SegmentedDownloadError("리다이렉트가 너무 많습니다.")
+
+    def _parse_content_range(self, response):
+        match = self.CONTENT_RANGE_PATTERN.match(response.getheader('Content-Range') or '')
+        if not match:
+            return None, None, None
+        total = None if match.group(3) == '*' else int(match.group(3))
+        return int(match.group(1)), int(match.group(2)), total
+
+    def _contiguous_bytes(self, done, count, total):
+        """파일 앞에서부터 빈틈없이 받은 크기 (순서대로 읽는 해시 계산에 사용)"""
+        index = 0
+        while index < count and index in done:
+            index += 1
+        return min(index * self.segment_size, total)
+
+    def _report(self, progress_hook, path, part_path, received, total, started_at, status='downloading',
+                contiguous=None):
+        if progress_hook is None:
+            return
+        elapsed = max(time.time() - started_at, 1e-6)
+        speed = received / elapsed
+        progress = {
+            'status': status,
+            'filename': path,
+            'tmpfilename': part_path,
+            'downloaded_bytes': received,
+            'total_bytes': total,
+            'elapsed': elapsed,
+            'speed': speed,
+            'eta': (total - received) / speed if total and speed else None,
+        }
+        if contiguous is not None:
+            # 여러 구간을 동시에 받으면 파일 중간이 비어 있으므로 앞에서부터 채워진 크기를 따로 알림
+            progress['contiguous_bytes'] = contiguous
+        progress_hook(progress)
+
+    def _load_state(self, state_path, total, part_path):
+        """중단된 구간 다운로드 상태 (크기가 같을 때만 사용)"""
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if (state.get('total') == total and state.get('segment_size') == self.segment_size
+                    and os.path.getsize(part_path) == total):
+                return set(state.get('done') or [])
+        except (OSError, ValueError):
+            pass
+        return set()
+
+    def _save_state(self, state_path, total, done):
+        tmp_path = state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'total': total, 'segment_size': self.segment_size, 'done': sorted(done)}, f)
+        os.replace(tmp_path, state_path)
+
+    def _remove(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+
+# 전역 구간 다운로더 인스턴스 (연결 풀을 모든 다운로더가 공유)
+_segmented_instance = None
+
+def get_segmented_downloader():
+    """전역 구간 다운로더 인스턴스 가져오기"""
+    global _segmented_instance
+    if _segmented_instance is None:
+        _segmented_instance = SegmentedDownloader()
+    return _segmented_instance
@@ -0,0 +1,123 @@
+import atexit
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import yt_dlp
+from logger import get_logger
+
+class YoutubeDLPool:
+    """재사용 가능한 YoutubeDL 인스턴스 풀"""
+
+    def __init__(self, max_idle_per_key=2, max_idle_total=8, factory=None):
+        """
+        세션 풀 초기화
+
+        인스턴스는 실제로 달라지는 옵션(포맷, 자막 설정 등)별로 묶어서 보관하며,
+        반납된 인스턴스는 HTTP 연결, 쿠키, 추출기 초기화 상태를 그대로 유지합니다.
+
+        Args:
+            max_idle_per_key (int): 옵션 조합별로 보관할 최대 대기 인스턴스 수
+            max_idle_total (int): 전체 대기 인스턴스 최대 수
+            factory: opts를 받아 YoutubeDL 인스턴스를 만드는 함수 (선택)
+        """
+        self.max_idle_per_key = max_idle_per_key
+        self.max_idle_total = max_idle_total
+        self.factory = factory or self._default_factory
+        self.logger = get_logger()
+
+        self._idle = OrderedDict()  # key -> [ydl, ...] (최근 사용 순)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        atexit.register(self.close)
+
+    @contextmanager
+    def session(self, opts):
+        """
+        옵션에 맞는 YoutubeDL 인스턴스를 빌려 사용합니다.
+
+        사용 중 예외가 발생한 인스턴스는 상태를 신뢰할 수 없으므로 폐기합니다.
+
+        Args:
+            opts (dict): yt-dlp 옵션
+
+        Yields:
+            yt_dlp.YoutubeDL: 사용할 인스턴스
+        """
+        key = self._make_key(opts)
+        ydl = self._acquire(key, opts)
+        try:
+            yield ydl
+        except BaseException:
+            self._dispose(ydl)
+            raise
+        else:
+            self._release(key, ydl)
+
+    def idle_count(self):
+        """대기 중인 인스턴스 수"""
+        with self._lock:
+            return sum(len(instances) for instances in self._idle.values())
+
+    def close(self):
+        """대기 중인 모든 인스턴스 종료 (쿠키 저장 포함) 후 종료 시 정리 등록 해제"""
+        with self._lock:
+            instances = [ydl for group in self._idle.values() for ydl in group]
+            self._idle.clear()
+            self._closed = True
+
+        for ydl in instances:
+            self._dispose(ydl)
+        # 등록해 두면 닫은 풀(과 이를 만든 다운로더)이 프로세스 종료까지 참조되어 남음
+        atexit.unregister(self.close)
+
+    def _default_factory(self, opts):
+        """with 블록 진입과 동일하게 인스턴스를 준비 (종료는 _dispose에서)"""
+        return yt_dlp.YoutubeDL(opts).__enter__()
+
+    def _make_key(self, opts):
+        """옵션을 비교 가능한 키로 변환"""
+        return json.dumps(opts, sort_keys=True, default=repr)
+
+    def _acquire(self, key, opts):
+        with self._lock:
+            instances = self._idle.get(key)
+            if instances:
+                ydl = instances.pop()
+                if not instances:
+                    del self._idle[key]
+                return ydl
+
+        self.logger.debug("새 YoutubeDL 세션 생성")
+        return self.factory(opts)
+
+    def _release(self, key, ydl):
+        evicted = []
+        with self._lock:
+            if self._closed:
+                evicted.append(ydl)
+            else:
+                instances = self._idle.setdefault(key, [])
+                self._idle.move_to_end(key)
+                instances.append(ydl)
+
+                if len(instances) > self.max_idle_per_key:
+                    evicted.append(instances.pop(0))
+
+                # 전체 한도 초과 시 가장 오래 사용하지 않은 옵션 그룹부터 정리
+                while sum(len(group) for group in self._idle.values()) > self.max_idle_total:
+                    oldest_key = next(iter(self._idle))
+                    oldest = self._idle[oldest_key]
+                    evicted.append(oldest.pop(0))
+                    if not oldest:
+                        del self._idle[oldest_key]
+
+        for instance in evicted:
+            self._dispose(instance)
+
+    def _dispose(self, ydl):
+        try:
+            ydl.__exit__(None, None, None)
+        except Exception as e:
+            self.logger.warning(f"YoutubeDL 세션 종료 실패: {e}")
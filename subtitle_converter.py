@@ -0,0 +1,269 @@
+import html
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from logger import get_logger
+
+class SubtitleCue:
+    """자막 한 줄 (시작/끝 시각은 밀리초)"""
+
+    __slots__ = ('start', 'end', 'text')
+
+    def __init__(self, start, end, text):
+        self.start = start
+        self.end = end
+        self.text = text
+
+class SubtitleConverter:
+    """VTT, JSON3, SRV1/2/3 자막을 외부 프로그램 없이 SRT로 변환하는 스트리밍 변환기"""
+
+    SUPPORTED_FORMATS = ('vtt', 'json3', 'srv1', 'srv2', 'srv3')
+
+    # VTT 시각 (시는 생략 가능): 00:01:02.345 또는 01:02.345
+    VTT_TIMESTAMP = r'(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})'
+    VTT_TIMING_PATTERN = re.compile(VTT_TIMESTAMP + r'\s+-->\s+' + VTT_TIMESTAMP)
+    # 태그 제거 (<c.colorE5E5E5>, <00:00:01.234>, </c> 등), SRT가 지원하는 b/i/u는 유지
+    TAG_PATTERN = re.compile(r'<(?!/?[biu]>)[^>]*>')
+    # 끝 시각이 없거나 시작보다 이른 자막에 줄 최소 표시 시간 (ms)
+    MIN_CUE_DURATION_MS = 1000
+
+    def __init__(self, chunk_size=64 * 1024):
+        """
+        자막 변환기 초기화
+
+        원본은 줄 단위(VTT), 이벤트 단위(JSON3), 요소 단위(SRV)로 읽고 변환한 자막을
+        바로 파일에 쓰므로, 긴 자동 생성 자막도 일정한 메모리로 처리합니다.
+
+        Args:
+            chunk_size (int): JSON3 파일을 읽는 단위 (bytes)
+        """
+        self.chunk_size = chunk_size
+        self.logger = get_logger()
+
+    def can_convert(self, ext):
+        """변환 가능한 자막 포맷인지 확인"""
+        return (ext or '').lower() in self.SUPPORTED_FORMATS
+
+    def convert(self, source_path, target_path=None, fmt=None, remove_source=True, rolling=False):
+        """
+        자막 파일을 SRT로 변환
+
+        Args:
+            source_path (str): 원본 자막 파일
+            target_path (str): 저장할 SRT 파일 (None이면 확장자만 .srt로 변경)
+            fmt (str): 원본 포맷 (None이면 확장자로 판단)
+            remove_source (bool): 변환 후 원본 삭제 여부
+            rolling (bool): 자동 생성 자막(롤업 방식)이면 True - 앞 자막에서 반복된 줄 제거
+
+        Returns:
+            str: SRT 파일 경로
+        """
+        fmt = (fmt or os.path.splitext(source_path)[1].lstrip('.')).lower()
+        if not self.can_convert(fmt):
+            raise ValueError(f"지원하지 않는 자막 포맷: {fmt}")
+        target_path = target_path or os.path.splitext(source_path)[0] + '.srt'
+
+        temp_path = f"{target_path}.part"
+        try:
+            with open(source_path, 'r', encoding='utf-8-sig', errors='replace') as source, \
+                    open(temp_path, 'w', encoding='utf-8') as target:
+                count = self.write_srt(self.iter_cues(source, fmt, rolling), target)
+            os.replace(temp_path, target_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        if remove_source and os.path.abspath(source_path) != os.path.abspath(target_path):
+            os.remove(source_path)
+        self.logger.debug(f"자막 변환 완료 ({fmt} -> srt, {count}개): {target_path}")
+        return target_path
+
+    def iter_cues(self, source, fmt, rolling=False):
+        """
+        열린 원본 파일에서 자막 줄을 하나씩 생성
+
+        롤업 중복 제거는 자동 생성 자막(rolling=True)에만 적용합니다.
+        수동 자막은 같은 대사가 연달아 나와도 그대로 둡니다.
+        """
+        if fmt == 'vtt':
+            cues = self._iter_vtt(source)
+        elif fmt == 'json3':
+            cues = self._iter_json3(source)
+        else:
+            cues = self._iter_srv(source)
+        if rolling:
+            cues = self._dedupe_rolling(cues)
+        return self._ensure_duration(cues)
+
+    def write_srt(self, cues, target):
+        """
+        자막 줄을 SRT 형식으로 기록
+
+        Returns:
+            int: 기록한 자막 수
+        """
+        index = 0
+        for cue in cues:
+            index += 1
+            target.write(f"{index}\n{self._srt_time(cue.start)} --> {self._srt_time(cue.end)}\n{cue.text}\n\n")
+        return index
+
+    def _iter_vtt(self, source):
+        timing = None
+        lines = []
+        skipping = False  # NOTE/STYLE/REGION 블록
+
+        for raw_line in source:
+            line = raw_line.rstrip('\r\n')
+            # 자동 생성 자막은 자막 안에 공백만 있는 줄이 있으므로 빈 줄만 구분자로 사용
+            if not line or (timing is None and not line.strip()):
+                if timing and lines:
+                    yield SubtitleCue(timing[0], timing[1], '\n'.join(lines))
+                timing, lines, skipping = None, [], False
+                continue
+            if skipping:
+                continue
+            if timing is None:
+                match = self.VTT_TIMING_PATTERN.search(line)
+                if match:
+                    timing = self._vtt_times(match)
+                elif line.startswith(('NOTE', 'STYLE', 'REGION')):
+                    skipping = True
+                # 그 외(WEBVTT 헤더, Kind:/Language: 메타데이터, 자막 ID)는 무시
+                continue
+            text = html.unescape(self.TAG_PATTERN.sub('', line)).strip()
+            if text:
+                lines.append(text)
+
+        if timing and lines:
+            yield SubtitleCue(timing[0], timing[1], '\n'.join(lines))
+
+    def _iter_json3(self, source):
+        for event in self._iter_json_array(source, 'events'):
+            if not isinstance(event, dict):
+                continue
+            segs = event.get('segs')
+            if not segs or 'tStartMs' not in event:
+                continue
+            text = ''.join(seg.get('utf8', '') for seg in segs).strip()
+            if not text:
+                continue
+            start = int(event['tStartMs'])
+            yield SubtitleCue(start, start + int(event.get('dDurationMs') or 0), text)
+
+    def _iter_srv(self, source):
+        """SRV1(<text start dur>), SRV2(<text t d>), SRV3(<p t d>)"""
+        parents = []
+        for event, element in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                parents.append(element)
+                continue
+            parents.pop()
+
+            if element.tag == 'text' and 'start' in element.attrib:
+                start = int(float(element.get('start')) * 1000)
+                duration = int(float(element.get('dur') or 0) * 1000)
+            elif element.tag in ('text', 'p') and 't' in element.attrib:
+                start = int(element.get('t'))
+                duration = int(element.get('d') or 0)
+            else:
+                continue
+
+            # SRV1은 엔티티가 한 번 더 이스케이프되어 있음 (&amp;#39;)
+            text = html.unescape(''.join(element.itertext())).strip()
+            # 처리한 요소는 트리에서 떼어내 메모리 사용량을 일정하게 유지
+            if parents:
+                parents[-1].remove(element)
+            if text:
+                yield SubtitleCue(start, start + duration, text)
+
+    def _dedupe_rolling(self, cues):
+        """
+        자동 생성 자막의 롤업(앞 자막 줄을 다음 자막에서 반복) 제거
+
+        바로 앞 자막과 같은 줄은 빼고, 남는 줄이 없는 자막은 건너뜁니다.
+        """
+        previous_lines = ()
+        for cue in cues:
+            lines = cue.text.split('\n')
+            new_lines = [line for line in lines if line not in previous_lines]
+            previous_lines = lines
+            if not new_lines:
+                continue
+            cue.text = '\n'.join(new_lines)
+            yield cue
+
+    def _ensure_duration(self, cues):
+        """길이가 0 이하인 자막은 버리지 않고 최소 표시 시간을 줌"""
+        for cue in cues:
+            if cue.end <= cue.start:
+                cue.end = cue.start + self.MIN_CUE_DURATION_MS
+            yield cue
+
+    def _iter_json_array(self, source, key):
+        """
+        JSON 파일의 최상위 배열 항목을 하나씩 생성 (전체를 메모리에 올리지 않음)
+
+        Args:
+            source: 열린 텍스트 파일
+            key (str): 배열이 들어 있는 최상위 키
+        """
+        decoder = json.JSONDecoder()
+        buffer = ''
+        position = 0
+        in_array = False
+        marker = f'"{key}"'
+
+        while True:
+            if not in_array:
+                index = buffer.find(marker)
+                bracket = buffer.find('[', index + len(marker)) if index >= 0 else -1
+                if bracket >= 0:
+                    buffer = buffer[bracket + 1:]
+                    position = 0
+                    in_array = True
+                    continue
+                # 키가 청크 경계에 걸칠 수 있으므로 키 이후(또는 끝부분)만 남김
+                buffer = buffer[index:] if index >= 0 else buffer[-len(marker):]
+            else:
+                # 공백과 구분자 건너뛰기
+                while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                    position += 1
+                if position < len(buffer) and buffer[position] == ']':
+                    return
+                if position < len(buffer):
+                    try:
+                        item, end = decoder.raw_decode(buffer, position)
+                    except ValueError:
+                        pass  # 항목이 아직 다 읽히지 않음 -> 다음 청크 읽기
+                    else:
+                        # null 항목도 위치를 넘겨야 뒤의 항목을 계속 읽음
+                        position = end
+                        yield item
+                        continue
+
+            chunk = source.read(self.chunk_size)
+            if not chunk:
+                return
+            if in_array:
+                buffer = buffer[position:] + chunk
+                position = 0
+            else:
+                buffer += chunk
+
+    def _vtt_times(self, match):
+        groups = match.groups()
+        return self._vtt_ms(groups[:4]), self._vtt_ms(groups[4:])
+
+    def _vtt_ms(self, groups):
+        hours, minutes, seconds, millis = groups
+        return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis)
+
+    def _srt_time(self, ms):
+        ms = max(int(ms), 0)
+        hours, ms = divmod(ms, 3600 * 1000)
+        minutes, ms = divmod(ms, 60 * 1000)
+        seconds, ms = divmod(ms, 1000)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
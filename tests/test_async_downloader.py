@@ -0,0 +1,120 @@
+import unittest
+import asyncio
+import threading
+import time
+from async_downloader import AsyncYouTubeDownloader
+
+class FakeDownloader:
+    """네트워크 없이 동작하는 테스트용 다운로더"""
+
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def __init__(self, duration=0.05):
+        self.duration = duration
+        self.cancel_flag = None
+        self.progress_callback = None
+        self.closed = False
+
+    def set_cancel_flag(self, cancel_flag):
+        self.cancel_flag = cancel_flag
+
+    def set_progress_callback(self, callback):
+        self.progress_callback = callback
+
+    def download_video(self, url, quality='best', info=None):
+        with FakeDownloader.lock:
+            FakeDownloader.active += 1
+            FakeDownloader.max_active = max(FakeDownloader.max_active, FakeDownloader.active)
+        try:
+            deadline = time.time() + self.duration
+            while time.time() < deadline:
+                if self.cancel_flag.is_set():
+                    return False
+                if self.progress_callback:
+                    self.progress_callback({'status': 'downloading', 'downloaded_bytes': 1})
+                time.sleep(0.01)
+            return True
+        finally:
+            with FakeDownloader.lock:
+                FakeDownloader.active -= 1
+
+    def get_video_info(self, url, info=None):
+        return {'title': f"제목 {url}"}
+
+    def close(self):
+        self.closed = True
+
+class TestAsyncYouTubeDownloader(unittest.IsolatedAsyncioTestCase):
+    """AsyncYouTubeDownloader 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        FakeDownloader.active = 0
+        FakeDownloader.max_active = 0
+        self.created = []
+
+    def make_downloader(self, duration=0.05, **kwargs):
+        def factory():
+            downloader = FakeDownloader(duration)
+            self.created.append(downloader)
+            return downloader
+
+        return AsyncYouTubeDownloader(downloader_factory=factory, **kwargs)
+
+    async def test_concurrency_is_bounded(self):
+        """동시에 실행되는 작업 수 제한"""
+        async with self.make_downloader(max_workers=2) as downloader:
+            results = await asyncio.gather(*[
+                downloader.download_video(f"https://youtu.be/{i}") for i in range(6)
+            ])
+
+        self.assertEqual(results, [True] * 6)
+        self.assertLessEqual(FakeDownloader.max_active, 2)
+        self.assertLessEqual(len(self.created), 2)
+        self.assertTrue(all(d.closed for d in self.created))
+
+    async def test_cancellation_sets_cancel_flag(self):
+        """코루틴 취소가 다운로더의 취소 플래그로 전달"""
+        downloader = self.make_downloader(duration=5)
+        task = asyncio.create_task(downloader.download_video('https://youtu.be/a'))
+        await asyncio.sleep(0.1)
+
+        started = time.time()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertLess(time.time() - started, 1)
+        self.assertEqual(FakeDownloader.active, 0)
+        await downloader.close()
+
+    async def test_progress_events(self):
+        """진행률 이벤트를 비동기 반복자로 수신"""
+        downloader = self.make_downloader()
+        events = []
+
+        async def collect():
+            async for event in downloader.progress_events():
+                events.append(event)
+
+        collector = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        await downloader.download_video('https://youtu.be/a')
+        await downloader.close()
+        await asyncio.wait_for(collector, 1)
+
+        self.assertTrue(events)
+        self.assertEqual(events[0]['url'], 'https://youtu.be/a')
+        self.assertEqual(events[0]['status'], 'downloading')
+
+    async def test_get_video_info(self):
+        """정보 조회 메서드도 코루틴으로 제공"""
+        async with self.make_downloader() as downloader:
+            info = await downloader.get_video_info('https://youtu.be/a')
+
+        self.assertEqual(info['title'], '제목 https://youtu.be/a')
+
+if __name__ == '__main__':
+    unittest.main()
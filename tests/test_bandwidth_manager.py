@@ -0,0 +1,142 @@
+import unittest
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock
+from bandwidth_manager import BandwidthManager, BandwidthProfile, current_job
+
+KB = 1024
+
+class FakeClock:
+    """sleep() 호출만큼 시간이 흐르는 가짜 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+class TestBandwidthManager(unittest.TestCase):
+    """BandwidthManager 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.clock = FakeClock()
+        self.manager = BandwidthManager(limit=300 * KB, clock=self.clock, sleep=self.clock.sleep,
+                                        now=lambda: datetime(2024, 1, 1, 12, 0))
+
+    def test_unlimited_does_not_wait(self):
+        """제한이 없으면 대기하지 않음"""
+        self.manager.configure(limit=0)
+        job = self.manager.register()
+
+        job.consume(100 * 1024 * KB)
+
+        self.assertEqual(self.clock.slept, 0)
+        self.assertEqual(job.rate, 0)
+
+    def test_total_limit_is_split_by_weight(self):
+        """전체 제한을 가중치 비율로 나눔"""
+        light = self.manager.register(weight=1)
+        heavy = self.manager.register(weight=2)
+
+        self.assertAlmostEqual(light.rate, 100 * KB)
+        self.assertAlmostEqual(heavy.rate, 200 * KB)
+
+        # 작업이 끝나면 남은 작업이 전체를 사용
+        self.manager.unregister(light)
+        self.assertAlmostEqual(heavy.rate, 300 * KB)
+
+    def test_unused_share_is_redistributed(self):
+        """적게 쓰는 작업의 남는 몫을 다른 작업에 재분배"""
+        idle = self.manager.register()
+        busy = self.manager.register()
+        self.assertAlmostEqual(busy.rate, 150 * KB)
+
+        self.manager._record_usage(idle, 10 * KB)
+        self.manager._record_usage(busy, 150 * KB)
+        self.clock.now += 1.0
+        self.manager._reallocate()
+
+        self.assertAlmostEqual(idle.rate, self.manager.min_rate)
+        self.assertGreater(busy.rate, 150 * KB)
+        self.assertLessEqual(idle.rate + busy.rate, 300 * KB)
+
+    def test_consume_enforces_rate(self):
+        """할당 속도를 넘으면 그만큼 대기"""
+        self.manager.configure(limit=100 * KB)
+        job = self.manager.register()
+
+        for _ in range(5):
+            job.consume(100 * KB)
+
+        self.assertAlmostEqual(self.clock.slept, 5.0, delta=0.6)
+
+    def test_runtime_change_applies_to_running_jobs(self):
+        """실행 중에 바꾼 제한이 진행 중인 작업에 바로 적용"""
+        job = self.manager.register()
+        self.manager.configure(limit=50 * KB)
+        self.assertAlmostEqual(job.rate, 50 * KB)
+
+    def test_cancel_stops_waiting(self):
+        """취소되면 대기를 멈춤"""
+        self.manager.configure(limit=1 * KB)
+        cancel_event = threading.Event()
+        job = self.manager.register(cancel_event=cancel_event)
+        cancel_event.set()
+
+        job.consume(1024 * KB)
+        self.assertEqual(self.clock.slept, 0)
+
+    def test_time_of_day_profile(self):
+        """시간대 프로필이 맞으면 프로필 제한 사용 (자정 넘김 포함)"""
+        office = BandwidthProfile('09:00', '18:00', 100 * KB)
+        night = BandwidthProfile.from_dict({'start': '23:00', 'end': '06:00', 'limit': 0})
+        self.manager.configure(profiles=[office, night])
+
+        self.assertEqual(self.manager.current_limit(), 100 * KB)
+        self.manager.now = lambda: datetime(2024, 1, 1, 2, 30)
+        self.assertEqual(self.manager.current_limit(), 0)
+        self.manager.now = lambda: datetime(2024, 1, 1, 20, 0)
+        self.assertEqual(self.manager.current_limit(), 300 * KB)
+
+    def test_configure_from_config(self):
+        """설정 값(KB/s)과 프로필 적용"""
+        config = {'bandwidth_limit': 512, 'bandwidth_profiles': [{'start': '11:00', 'end': '13:00', 'limit': 64}]}
+        self.manager.configure_from_config(config)
+
+        self.assertEqual(self.manager.limit, 512 * KB)
+        self.assertEqual(self.manager.current_limit(), 64 * KB)
+
+    def test_attach_registers_job_during_download(self):
+        """attach 후 다운로드 동안만 작업을 등록하고 진행률로 사용량 측정"""
+        ydl = MagicMock()
+        ydl._progress_hooks = []
+        seen = {}
+
+        def fake_dl(name, info, subtitle=False, test=False):
+            job = current_job()
+            seen['weight'] = job.weight
+            seen['registered'] = job.id in self.manager.allocations()
+            for downloaded in (1000 * KB, 1100 * KB, 1200 * KB):
+                for hook in ydl._progress_hooks:
+                    hook({'status': 'downloading', 'downloaded_bytes': downloaded, 'tmpfilename': 'a.part'})
+            return True, True
+
+        ydl.dl = fake_dl
+        self.manager.attach(ydl, weight_getter=lambda: 3)
+
+        self.assertEqual(ydl.dl('a.mp4', {}), (True, True))
+        self.assertEqual(seen, {'weight': 3, 'registered': True})
+        self.assertEqual(self.manager.allocations(), {})
+        self.assertEqual(ydl._progress_hooks, [])
+        self.assertIsNone(current_job())
+        # 이어받기로 이미 있던 1000KB는 제외하고 200KB만 측정 (300KB/s 제한)
+        self.assertAlmostEqual(self.clock.slept, 200 / 300, delta=0.3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,8 @@ import unittest
 import os
 import json
 import tempfile
+import threading
+from unittest.mock import patch
 from config import Config
 
 class TestConfig(unittest.TestCase):
@@ -18,6 +20,7 @@ class TestConfig(unittest.TestCase):
     
     def tearDown(self):
         """각 테스트 후에 실행"""
+        self.config.close()
         # 임시 파일 삭제
         if os.path.exists(self.temp_file.name):
             os.unlink(self.temp_file.name)
@@ -34,7 +37,8 @@ class TestConfig(unittest.TestCase):
         self.config.set('download_path', '/custom/path')
         self.assertEqual(self.config.get('download_path'), '/custom/path')
         
-        # 파일에서 다시 로드
+        # 저장 후 파일에서 다시 로드
+        self.config.flush()
         new_config = Config(config_file=self.temp_file.name)
         self.assertEqual(new_config.get('download_path'), '/custom/path')
     
@@ -81,16 +85,94 @@ class TestConfig(unittest.TestCase):
         self.config.reset_to_defaults()
         
         self.assertEqual(self.config.get('download_path'), 'downloads')
+
+    def test_reset_removes_extra_keys_and_notifies(self):
+        """초기화하면 기본값에 없는 항목도 지우고, 바뀐/삭제된 항목을 알림"""
+        self.config.update({'download_path': '/custom/path', 'custom_key': 1})
+        changes = []
+        self.config.subscribe(lambda key, value: changes.append((key, value)))
+
+        self.config.reset_to_defaults()
+
+        self.assertIsNone(self.config.get('custom_key'))
+        self.assertEqual(sorted(changes), [('custom_key', None), ('download_path', 'downloads')])
+        self.config.close()
+        with open(self.temp_file.name, 'r', encoding='utf-8') as f:
+            self.assertNotIn('custom_key', json.load(f))
     
     def test_save_and_load(self):
         """설정 저장 및 로드 테스트"""
         self.config.set('download_path', '/test/path')
         self.config.set('default_quality', '720p')
+        self.config.close()
         
         # 새 인스턴스로 로드
         new_config = Config(config_file=self.temp_file.name)
         self.assertEqual(new_config.get('download_path'), '/test/path')
         self.assertEqual(new_config.get('default_quality'), '720p')
 
+    def test_changes_are_batched(self):
+        """연속 변경은 바로 저장하지 않고 한 번에 저장"""
+        with patch.object(self.config, 'save_config', wraps=self.config.save_config) as save:
+            self.config.set('download_path', '/a')
+            self.config.set('default_quality', '720p')
+            self.config.add_recent_url('https://youtube.com/watch?v=test')
+            save.assert_not_called()
+
+            with open(self.temp_file.name, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), {})
+
+            self.config.flush()
+            self.config.flush()  # 변경이 없으면 다시 쓰지 않음
+            self.assertEqual(save.call_count, 1)
+
+        with open(self.temp_file.name, encoding='utf-8') as f:
+            saved = json.load(f)
+        self.assertEqual(saved['download_path'], '/a')
+        self.assertEqual(saved['recent_urls'], ['https://youtube.com/watch?v=test'])
+        self.assertFalse(os.path.exists(self.temp_file.name + '.tmp'))
+
+    def test_debounce_timer_saves(self):
+        """마지막 변경 후 지연 시간이 지나면 자동 저장"""
+        config = Config(config_file=self.temp_file.name, save_delay=0.05)
+        saved = threading.Event()
+        original = config.save_config
+
+        def save():
+            result = original()
+            saved.set()
+            return result
+
+        config.save_config = save
+        config.set('default_quality', '480p')
+        self.assertTrue(saved.wait(timeout=2))
+        config.close()
+        self.assertEqual(Config(config_file=self.temp_file.name).get('default_quality'), '480p')
+
+    def test_subscribers_notified(self):
+        """값이 바뀐 항목만 구독자에게 알림"""
+        changes = []
+        self.config.subscribe(lambda key, value: changes.append((key, value)))
+
+        self.config.update({'download_path': '/b', 'default_quality': 'best'})  # default_quality는 그대로
+        self.config.set('bandwidth_limit', 512)
+        self.assertEqual(changes, [('download_path', '/b'), ('bandwidth_limit', 512)])
+
+    def test_concurrent_recent_urls(self):
+        """여러 스레드에서 동시에 추가해도 항목을 잃지 않음"""
+        self.config.set('max_recent_urls', 100)
+
+        def worker(n):
+            for i in range(10):
+                self.config.add_recent_url(f"https://youtube.com/watch?v={n}-{i}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.config.get_recent_urls()), 50)
+
 if __name__ == '__main__':
     unittest.main()
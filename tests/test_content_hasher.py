@@ -0,0 +1,129 @@
+import unittest
+import os
+import hashlib
+import zlib
+import tempfile
+import shutil
+from unittest.mock import MagicMock
+from content_hasher import ContentHasher, IncrementalHash
+
+class TestContentHasher(unittest.TestCase):
+    """ContentHasher 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.hasher = ContentHasher(chunk_size=1024)
+        self.data = os.urandom(10 * 1024 + 123)
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _fake_ydl(self, writer):
+        ydl = MagicMock()
+        ydl._progress_hooks = []
+
+        def fake_dl(name, info, subtitle=False, test=False):
+            writer(name, lambda d: [hook(d) for hook in list(ydl._progress_hooks)])
+            return True, True
+
+        ydl.dl = fake_dl
+        self.hasher.attach(ydl)
+        return ydl
+
+    def test_incremental_hash_matches_hashlib(self):
+        """나누어 넣어도 한 번에 계산한 값과 같음"""
+        digest = IncrementalHash()
+        for i in range(0, len(self.data), 777):
+            digest.update(self.data[i:i + 777])
+
+        self.assertEqual(digest.sha256(), hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(digest.size, len(self.data))
+        self.assertIn(digest.fast_algorithm, ('xxh64', 'crc32'))
+        if digest.fast_algorithm == 'crc32':
+            self.assertEqual(digest.fast_hash(), f"crc32:{zlib.crc32(self.data):08x}")
+        self.assertIsNone(IncrementalHash(fast=False).fast_hash())
+
+    def test_sequential_download_is_hashed_while_writing(self):
+        """순서대로 쓰는 다운로드(.part 후 이름 변경)를 따라가며 해시 계산 (다시 읽지 않음)"""
+        def writer(name, report):
+            part = name + '.part'
+            with open(part, 'wb') as f:
+                for i in range(0, len(self.data), 512):
+                    f.write(self.data[i:i + 512])
+                    f.flush()
+                    report({'status': 'downloading', 'filename': name, 'tmpfilename': part,
+                            'downloaded_bytes': f.tell()})
+                # 이미 해시에 넣은 앞부분을 바꿔도 결과는 받은 내용 그대로 (파일을 다시 읽지 않음)
+                f.seek(0)
+                f.write(b'\0' * 100)
+            os.replace(part, name)
+            report({'status': 'finished', 'filename': name, 'downloaded_bytes': len(self.data)})
+
+        ydl = self._fake_ydl(writer)
+        name = os.path.join(self.temp_dir, 'video.mp4')
+        self.assertEqual(ydl.dl(name, {}), (True, True))
+
+        result = self.hasher.result_for(name)
+        self.assertEqual(result['sha256'], hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(result['file_size'], len(self.data))
+        # 결과는 한 번만 가져감
+        self.assertIsNone(self.hasher.result_for(name))
+
+    def test_segmented_download_follows_contiguous_prefix(self):
+        """미리 크기를 잡은 파일은 앞에서부터 채워진 부분까지만 읽음"""
+        def writer(name, report):
+            part = name + '.part'
+            with open(part, 'wb') as f:
+                f.truncate(len(self.data))
+            half = len(self.data) // 2
+            with open(part, 'r+b') as f:
+                # 뒷부분을 먼저 받음
+                f.seek(half)
+                f.write(self.data[half:])
+                f.flush()
+                report({'status': 'downloading', 'filename': name, 'tmpfilename': part,
+                        'downloaded_bytes': len(self.data) - half, 'contiguous_bytes': 0})
+                f.seek(0)
+                f.write(self.data[:half])
+            os.replace(part, name)
+            report({'status': 'finished', 'filename': name, 'downloaded_bytes': len(self.data)})
+
+        ydl = self._fake_ydl(writer)
+        name = os.path.join(self.temp_dir, 'segmented.mp4')
+        ydl.dl(name, {})
+
+        self.assertEqual(self.hasher.result_for(name)['sha256'], hashlib.sha256(self.data).hexdigest())
+
+    def test_changed_file_is_not_reported(self):
+        """후처리로 파일이 바뀌면 결과를 쓰지 않음"""
+        def writer(name, report):
+            with open(name, 'wb') as f:
+                f.write(self.data)
+            report({'status': 'finished', 'filename': name, 'downloaded_bytes': len(self.data)})
+
+        ydl = self._fake_ydl(writer)
+        name = os.path.join(self.temp_dir, 'fixed.m4a')
+        ydl.dl(name, {})
+        with open(name, 'ab') as f:
+            f.write(b'moov')
+
+        self.assertIsNone(self.hasher.result_for(name))
+        full = self.hasher.hash_file(name)
+        self.assertEqual(full['sha256'], hashlib.sha256(self.data + b'moov').hexdigest())
+
+    def test_untracked_download_is_skipped(self):
+        """진행률 보고가 없는 다운로드(FFmpeg 등)나 비활성화 시에는 계산하지 않음"""
+        def writer(name, report):
+            with open(name, 'wb') as f:
+                f.write(self.data)
+
+        ydl = self._fake_ydl(writer)
+        name = os.path.join(self.temp_dir, 'ffmpeg.mp4')
+        ydl.dl(name, {})
+        self.assertIsNone(self.hasher.result_for(name))
+
+if __name__ == '__main__':
+    unittest.main()
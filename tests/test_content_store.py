@@ -0,0 +1,121 @@
+import unittest
+import os
+import hashlib
+import tempfile
+import shutil
+from content_store import ContentStore
+
+class TestContentStore(unittest.TestCase):
+    """ContentStore 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.download_dir = os.path.join(self.temp_dir, 'downloads')
+        os.makedirs(self.download_dir)
+        self.store = ContentStore(store_dir=os.path.join(self.temp_dir, 'store'), enabled=True)
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, data):
+        path = os.path.join(self.download_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path, {'sha256': hashlib.sha256(data).hexdigest(), 'fast_hash': None, 'file_size': len(data)}
+
+    def test_add_and_materialize_hardlink(self):
+        """등록한 파일을 키로 찾아 다운로드 폴더에 링크로 복원 (복사하지 않음)"""
+        path, digest = self._write('영상.mp4', b'video data')
+        self.assertTrue(self.store.add(path, ['abc:video:best', 'abc:format:137+140'], digest))
+
+        entry = self.store.lookup(['abc:video:720p', 'abc:format:137+140'])
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry['sha256'], digest['sha256'])
+        self.assertEqual(entry['name'], '영상.mp4')
+        self.assertTrue(os.path.samefile(entry['path'], path))
+
+        # 다운로드 폴더의 파일을 지워도 저장소에서 링크로 복원
+        os.remove(path)
+        self.assertIn(self.store.materialize(entry, path), [('hardlink', path), ('reflink', path)])
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'video data')
+        self.assertEqual(self.store.materialize(entry, path), ('existing', path))
+
+        self.assertIsNone(self.store.lookup(['other:video:best']))
+
+    def test_materialize_keeps_different_file(self):
+        """같은 이름의 다른 파일은 지우지 않고 새 이름으로 복원"""
+        path, digest = self._write('영상.mp4', b'stored video')
+        self.store.add(path, ['a:video:best'], digest)
+        entry = self.store.lookup(['a:video:best'])
+
+        # 같은 제목의 다른 영상(또는 사용자 파일)이 그 자리에 있음
+        os.remove(path)
+        with open(path, 'wb') as f:
+            f.write(b'other video!')
+
+        method, restored = self.store.materialize(entry, path)
+        self.assertEqual(restored, os.path.join(self.download_dir, '영상 (1).mp4'))
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'other video!')
+        with open(restored, 'rb') as f:
+            self.assertEqual(f.read(), b'stored video')
+
+    def test_materialize_replaces_same_content_copy(self):
+        """내용이 같은 복사본은 저장소 링크로 교체"""
+        path, digest = self._write('a.mp4', b'same bytes')
+        self.store.add(path, ['a:video:best'], digest)
+        entry = self.store.lookup(['a:video:best'])
+
+        os.remove(path)
+        with open(path, 'wb') as f:
+            f.write(b'same bytes')
+
+        method, restored = self.store.materialize(entry, path)
+        self.assertEqual(restored, path)
+        self.assertTrue(os.path.samefile(path, entry['path']))
+        self.assertFalse(os.path.exists(path + '.restore'))
+
+    def test_duplicate_content_is_linked(self):
+        """내용이 같은 파일은 새로 받은 파일을 기존 파일의 링크로 바꿔 한 번만 보관"""
+        first, digest = self._write('a.mp4', b'same content')
+        second, _ = self._write('b.mp4', b'same content')
+        self.assertTrue(self.store.add(first, ['a:video:best'], digest))
+        self.assertTrue(self.store.add(second, ['b:video:best'], digest))
+
+        self.assertTrue(os.path.samefile(first, second))
+        self.assertEqual(self.store.stats()['objects'], 1)
+        self.assertEqual(self.store.stats()['keys'], 2)
+
+    def test_index_persists(self):
+        """색인은 파일에 저장되어 다음 실행에서도 사용"""
+        path, digest = self._write('a.m4a', b'audio')
+        self.store.add(path, ['a:audio:best'], digest)
+
+        reloaded = ContentStore(store_dir=self.store.store_dir, enabled=True)
+        self.assertEqual(reloaded.lookup(['a:audio:best'])['sha256'], digest['sha256'])
+
+    def test_modified_object_is_dropped(self):
+        """링크된 파일을 직접 수정해 내용이 바뀌면 저장소 항목을 버림"""
+        path, digest = self._write('a.mp4', b'original')
+        self.store.add(path, ['a:video:best'], digest)
+
+        with open(path, 'ab') as f:
+            f.write(b' edited')
+
+        self.assertIsNone(self.store.lookup(['a:video:best']))
+        self.assertEqual(self.store.stats()['keys'], 0)
+
+    def test_configure_from_config(self):
+        """설정으로 사용 여부와 위치 변경"""
+        store = ContentStore(store_dir=self.store.store_dir)
+        self.assertFalse(store.enabled)
+        store.configure_from_config({'content_store': True, 'content_store_path': os.path.join(self.temp_dir, 'other')})
+        self.assertTrue(store.enabled)
+        self.assertEqual(store.store_dir, os.path.join(self.temp_dir, 'other'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import os
+import tempfile
+import shutil
+from download_archive import DownloadArchive
+from history import DownloadHistory
+
+class TestDownloadArchive(unittest.TestCase):
+    """DownloadArchive 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive_file = os.path.join(self.temp_dir, 'archive', 'archive.txt')
+        self.archive = DownloadArchive(archive_file=self.archive_file)
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _file(self, name):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(b'data')
+        return path
+
+    def test_add_and_reload(self):
+        """기록한 항목은 다시 불러와도 유지"""
+        self.archive.add('abc', DownloadArchive.VIDEO, 'best', self._file('abc.mp4'))
+        self.archive.add('abc', DownloadArchive.SUBTITLE, 'ko', self._file('abc.ko.srt'))
+
+        reloaded = DownloadArchive(archive_file=self.archive_file)
+        self.assertTrue(reloaded.contains('abc', DownloadArchive.VIDEO, 'best'))
+        self.assertTrue(reloaded.contains('abc', DownloadArchive.SUBTITLE, 'ko'))
+        self.assertFalse(reloaded.contains('abc', DownloadArchive.VIDEO, '720p'))
+        self.assertEqual(len(reloaded), 2)
+
+    def test_is_complete_by_mode(self):
+        """다운로드 모드별 완료 여부"""
+        self.archive.add('abc', DownloadArchive.VIDEO, 'best', self._file('abc.mp4'))
+        self.archive.add('abc', DownloadArchive.SUBTITLE, 'ko', self._file('abc.ko.srt'))
+
+        self.assertTrue(self.archive.is_complete('abc', 'video_only', 'best'))
+        self.assertTrue(self.archive.is_complete('abc', 'subs_only', subtitle_langs=['ko']))
+        self.assertFalse(self.archive.is_complete('abc', 'subs_only', subtitle_langs=['ko', 'en']))
+        self.assertTrue(self.archive.is_complete('abc', 'video_subs', 'best', ['ko']))
+        self.assertFalse(self.archive.is_complete(None, 'video_only'))
+
+        # 오디오는 형식별로 따로 기록
+        self.assertFalse(self.archive.is_complete('abc', 'audio_only', 'best'))
+        self.archive.add('abc', DownloadArchive.AUDIO, 'best', self._file('abc.m4a'))
+        self.assertTrue(self.archive.is_complete('abc', 'audio_only', 'best'))
+        self.assertFalse(self.archive.is_complete('abc', 'audio_only', 'mp3'))
+
+    def test_missing_file_invalidates_entry(self):
+        """다운로드 폴더에서 파일이 삭제되면 기록도 무효"""
+        path = os.path.join(self.temp_dir, 'video.mp4')
+        with open(path, 'wb') as f:
+            f.write(b'video')
+        self.archive.add('abc', DownloadArchive.VIDEO, 'best', path)
+        self.assertTrue(self.archive.contains('abc', DownloadArchive.VIDEO, 'best'))
+
+        os.remove(path)
+        self.assertFalse(self.archive.contains('abc', DownloadArchive.VIDEO, 'best'))
+        self.assertFalse(DownloadArchive(archive_file=self.archive_file).contains('abc', DownloadArchive.VIDEO, 'best'))
+
+    def test_entries_without_path_are_not_archived(self):
+        """파일 경로를 모르는 다운로드는 기록하지 않고, 이전 버전의 경로 없는 기록은 무시"""
+        self.archive.add('abc', DownloadArchive.SUBTITLE, 'ko', None)
+        self.assertFalse(self.archive.contains('abc', DownloadArchive.SUBTITLE, 'ko'))
+        self.assertFalse(os.path.exists(self.archive_file))
+
+        os.makedirs(os.path.dirname(self.archive_file))
+        with open(self.archive_file, 'w', encoding='utf-8') as f:
+            f.write('old\tvideo\tbest\t\n')
+        reloaded = DownloadArchive(archive_file=self.archive_file)
+        self.assertFalse(reloaded.contains('old', DownloadArchive.VIDEO, 'best'))
+        self.assertEqual(len(reloaded), 0)
+
+    def test_other_folder_is_not_archived(self):
+        """다른 폴더에 받은 파일은 이 폴더의 다운로드로 보지 않음"""
+        folder_a = os.path.join(self.temp_dir, 'a')
+        folder_b = os.path.join(self.temp_dir, 'b')
+        os.makedirs(folder_a)
+        self.archive.add('abc', DownloadArchive.VIDEO, 'best', self._file(os.path.join('a', 'abc.mp4')))
+
+        self.assertTrue(self.archive.contains('abc', DownloadArchive.VIDEO, 'best', folder_a))
+        self.assertFalse(self.archive.contains('abc', DownloadArchive.VIDEO, 'best', folder_b))
+        self.assertFalse(self.archive.is_complete('abc', 'video_only', 'best', folder=folder_b))
+        self.assertTrue(self.archive.contains('abc', DownloadArchive.VIDEO, 'best', folder_a))
+
+    def test_removed_entries_are_compacted(self):
+        """삭제 표시는 다음 로드 때 정리"""
+        self.archive.add('abc', DownloadArchive.VIDEO, 'best', self._file('abc.mp4'))
+        self.archive.add('def', DownloadArchive.VIDEO, 'best', self._file('def.mp4'))
+        self.archive.remove_video('abc')
+
+        reloaded = DownloadArchive(archive_file=self.archive_file)
+        self.assertEqual(len(reloaded), 1)
+        with open(self.archive_file, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_history_delete_removes_archive_entries(self):
+        """히스토리 기록을 삭제하면 해당 비디오를 다시 받을 수 있음"""
+        history = DownloadHistory(history_file=os.path.join(self.temp_dir, 'history.json'), archive=self.archive)
+        history.add_download(url='https://youtu.be/dQw4w9WgXcQ', title='t', mode='video_only')
+        self.archive.add('dQw4w9WgXcQ', DownloadArchive.VIDEO, 'best', self._file('a.mp4'))
+        self.archive.add('other', DownloadArchive.VIDEO, 'best', self._file('b.mp4'))
+
+        history.delete_record(0)
+        self.assertFalse(self.archive.contains('dQw4w9WgXcQ', DownloadArchive.VIDEO, 'best'))
+        self.assertTrue(self.archive.contains('other', DownloadArchive.VIDEO, 'best'))
+
+        history.clear_history()
+        self.assertEqual(len(self.archive), 0)
+
+if __name__ == '__main__':
+    unittest.main()
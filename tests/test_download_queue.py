@@ -0,0 +1,279 @@
+import unittest
+import os
+import tempfile
+import shutil
+import threading
+from download_queue import DownloadQueue, DownloadJob, read_url_file
+from history import DownloadHistory
+from job_journal import JobJournal
+
+class FakeDownloader:
+    """네트워크 없이 동작하는 테스트용 다운로더"""
+
+    def __init__(self, results=None, gate=None, archived=None):
+        self.results = results or {}
+        self.archived = archived or set()
+        self.gate = gate
+        self.cancel_flag = None
+        self.download_path = None
+        self.closed = False
+        self.calls = []
+        self.last_file = None
+
+    def set_cancel_flag(self, cancel_flag):
+        self.cancel_flag = cancel_flag
+
+    def set_progress_callback(self, callback):
+        self.progress_callback = callback
+
+    def is_archived(self, url, mode='video_only', quality='best', subtitle_langs=None):
+        return url in self.archived
+
+    def extract_info(self, url):
+        return {'title': f"제목 {url[-1]}"}
+
+    def _run(self, name, url):
+        self.calls.append((name, url))
+        if self.gate:
+            self.gate.wait(5)
+        if self.cancel_flag.is_set():
+            return False
+        return self.results.get(url, True)
+
+    def download_video(self, url, quality='best', info=None):
+        success = self._run('video', url)
+        self.last_file = {'file_path': f"{self.download_path}/{url[-1]}.mp4", 'file_size': 123,
+                          'sha256': 'ab' * 32, 'fast_hash': 'crc32:0000abcd'} if success else None
+        return success
+
+    def download_subtitles(self, url, languages=None, info=None):
+        return self._run('subtitles', url)
+
+    def download_video_with_subtitles(self, url, quality='best', subtitle_langs=None, info=None):
+        return self._run('video_subs', url)
+
+    def iter_collection_entries(self, url):
+        for i in range(5):
+            yield f"https://youtu.be/{i}"
+
+    def close(self):
+        self.closed = True
+
+class TestDownloadQueue(unittest.TestCase):
+    """DownloadQueue 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.history = DownloadHistory(history_file=os.path.join(self.temp_dir, 'history.json'))
+        self.downloaders = []
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def make_queue(self, results=None, gate=None, archived=None, **kwargs):
+        def factory():
+            downloader = FakeDownloader(results, gate, archived)
+            self.downloaders.append(downloader)
+            return downloader
+
+        return DownloadQueue(download_path=self.temp_dir, history=self.history,
+                             downloader_factory=factory, **kwargs)
+
+    def test_jobs_complete_and_recorded(self):
+        """작업 완료 후 상태와 히스토리 기록"""
+        queue = self.make_queue(results={'https://youtu.be/b': False})
+        ok = queue.submit('https://youtu.be/a')
+        failed = queue.submit('https://youtu.be/b', mode='subs_only')
+
+        self.assertTrue(queue.wait(timeout=5))
+        queue.shutdown()
+
+        self.assertEqual(ok.state, DownloadJob.DONE)
+        self.assertEqual(ok.title, '제목 a')
+        self.assertEqual(failed.state, DownloadJob.FAILED)
+        self.assertEqual(self.history.get_statistics()['success'], 1)
+        self.assertEqual(self.history.get_statistics()['failed'], 1)
+        self.assertTrue(all(d.closed for d in self.downloaders))
+
+    def test_history_records_file_hash(self):
+        """받은 파일의 경로, 크기, 해시를 히스토리에 기록"""
+        queue = self.make_queue()
+        queue.submit('https://youtu.be/a')
+        self.assertTrue(queue.wait(timeout=5))
+        queue.shutdown()
+
+        record = self.history.get_all_downloads()[0]
+        self.assertEqual(record['file_path'], f"{self.temp_dir}/a.mp4")
+        self.assertEqual(record['file_size'], 123)
+        self.assertEqual(record['fast_hash'], 'crc32:0000abcd')
+        self.assertEqual(self.history.find_by_hash('AB' * 32), [record])
+
+    def test_mode_dispatch(self):
+        """모드별로 알맞은 다운로드 메서드 호출"""
+        queue = self.make_queue(max_workers=1)
+        queue.submit('https://youtu.be/a', mode='video_only')
+        queue.submit('https://youtu.be/b', mode='subs_only')
+        queue.submit('https://youtu.be/c', mode='video_subs')
+        queue.wait(timeout=5)
+        queue.shutdown()
+
+        calls = [name for name, _ in self.downloaders[0].calls]
+        self.assertEqual(calls, ['video', 'subtitles', 'video_subs'])
+
+    def test_per_host_limit(self):
+        """호스트별 동시 실행 수 제한"""
+        gate = threading.Event()
+        queue = self.make_queue(gate=gate, max_workers=4, per_host_limit=1)
+        jobs = queue.submit_many([f'https://youtu.be/{c}' for c in 'abc'])
+
+        # 작업이 시작될 때까지 잠시 대기
+        for _ in range(50):
+            if queue.counts()['running']:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual(queue.counts()['running'], 1)
+        gate.set()
+        queue.wait(timeout=5)
+        queue.shutdown()
+        self.assertTrue(all(job.state == DownloadJob.DONE for job in jobs))
+
+    def test_max_workers_run_concurrently(self):
+        """같은 호스트라도 max_workers개 작업이 동시에 실행됨"""
+        gate = threading.Event()
+        queue = self.make_queue(gate=gate, max_workers=4)
+        jobs = queue.submit_many([f'https://youtu.be/{c}' for c in 'abcdef'])
+
+        for _ in range(100):
+            if queue.counts()['running'] >= 4:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual(queue.counts()['running'], 4)
+        gate.set()
+        self.assertTrue(queue.wait(timeout=5))
+        queue.shutdown()
+        self.assertTrue(all(job.state == DownloadJob.DONE for job in jobs))
+
+    def test_host_limit_does_not_block_other_hosts(self):
+        """호스트 제한으로 기다리는 작업이 다른 호스트 작업의 작업자를 차지하지 않음"""
+        gate = threading.Event()
+        queue = self.make_queue(gate=gate, max_workers=2, per_host_limit=1)
+        queue.submit_many([f'https://youtu.be/{c}' for c in 'abc'])
+        other = queue.submit('https://vimeo.com/x')
+
+        for _ in range(100):
+            if other.state == DownloadJob.RUNNING:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual(other.state, DownloadJob.RUNNING)
+        self.assertEqual(queue.counts()['running'], 2)
+        gate.set()
+        self.assertTrue(queue.wait(timeout=5))
+        queue.shutdown()
+
+    def test_cancel_queued_job(self):
+        """대기 중인 작업 취소"""
+        gate = threading.Event()
+        queue = self.make_queue(gate=gate, max_workers=1)
+        first = queue.submit('https://youtu.be/a')
+        second = queue.submit('https://youtu.be/b')
+        second.cancel()
+        gate.set()
+
+        queue.wait(timeout=5)
+        queue.shutdown()
+        self.assertEqual(first.state, DownloadJob.DONE)
+        self.assertEqual(second.state, DownloadJob.CANCELLED)
+        self.assertEqual(self.history.get_statistics()['cancelled'], 1)
+
+    def test_job_update_callback(self):
+        """작업 상태 변경 콜백"""
+        states = []
+        queue = self.make_queue(on_job_update=lambda job: states.append(job.state))
+        queue.submit('https://youtu.be/a')
+        queue.wait(timeout=5)
+        queue.shutdown()
+
+        self.assertEqual(states, [DownloadJob.QUEUED, DownloadJob.RUNNING, DownloadJob.DONE])
+
+    def test_submit_collection_expands_entries(self):
+        """재생목록 항목을 발견되는 대로 작업으로 추가"""
+        queue = self.make_queue(max_workers=2, max_pending=2)
+        queue.submit_collection('https://www.youtube.com/playlist?list=PLtest')
+
+        self.assertTrue(queue.wait(timeout=5))
+        queue.shutdown()
+
+        urls = sorted(job.url for job in queue.jobs())
+        self.assertEqual(urls, [f"https://youtu.be/{i}" for i in range(5)])
+        self.assertEqual(queue.counts()[DownloadJob.DONE], 5)
+
+    def test_archived_jobs_are_skipped(self):
+        """이미 다운로드한 URL은 실행하지 않고 완료 처리"""
+        queue = self.make_queue(archived={'https://youtu.be/a'})
+        skipped = queue.submit('https://youtu.be/a')
+        downloaded = queue.submit('https://youtu.be/b')
+        queue.wait(timeout=5)
+        queue.shutdown()
+
+        self.assertEqual(skipped.state, DownloadJob.DONE)
+        self.assertTrue(skipped.skipped)
+        self.assertFalse(downloaded.skipped)
+        calls = [call for downloader in self.downloaders for call in downloader.calls]
+        self.assertEqual(calls, [('video', 'https://youtu.be/b')])
+        self.assertEqual(self.history.get_statistics()['total'], 1)
+
+    def test_resume_from_journal(self):
+        """비정상 종료로 남은 작업을 같은 옵션으로 다시 실행"""
+        journal = JobJournal(journal_file=os.path.join(self.temp_dir, 'journal.jsonl'))
+        journal.begin('crashed', 'https://youtu.be/a', {
+            'mode': 'subs_only', 'quality': 'best', 'subtitle_langs': ['en'], 'download_path': self.temp_dir
+        })
+
+        queue = self.make_queue(journal=journal)
+        jobs = queue.resume_from_journal()
+        self.assertTrue(queue.wait(timeout=5))
+        queue.shutdown()
+
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0].journal_id, 'crashed')
+        self.assertEqual(jobs[0].subtitle_langs, ['en'])
+        self.assertEqual(self.downloaders[0].calls, [('subtitles', 'https://youtu.be/a')])
+        self.assertEqual(journal.pending_jobs(), [])
+
+    def test_journal_records_submitted_jobs(self):
+        """큐에 추가한 작업은 끝날 때까지 저널에 미완료로 남음"""
+        journal = JobJournal(journal_file=os.path.join(self.temp_dir, 'journal.jsonl'))
+        gate = threading.Event()
+        queue = self.make_queue(gate=gate, journal=journal)
+        queue.submit('https://youtu.be/a')
+
+        self.assertEqual([entry['url'] for entry in journal.pending_jobs()], ['https://youtu.be/a'])
+        gate.set()
+        queue.wait(timeout=5)
+        queue.shutdown()
+        self.assertEqual(journal.pending_jobs(), [])
+
+    def test_default_subtitle_langs_match_single_download(self):
+        """언어를 지정하지 않은 자막 작업은 단일 다운로드와 같은 기본 언어를 받음"""
+        from downloader import YouTubeDownloader
+
+        job = DownloadJob('https://youtu.be/a', mode='subs_only')
+        self.assertEqual(job.subtitle_langs, list(YouTubeDownloader.DEFAULT_SUBTITLE_LANGS))
+        self.assertEqual(DownloadJob('https://youtu.be/a', subtitle_langs=['ja']).subtitle_langs, ['ja'])
+
+    def test_read_url_file(self):
+        """URL 목록 파일 읽기 (빈 줄, 주석 제외)"""
+        path = os.path.join(self.temp_dir, 'urls.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("# 주석\nhttps://youtu.be/a\n\n  https://youtu.be/b  \n")
+
+        self.assertEqual(read_url_file(path), ['https://youtu.be/a', 'https://youtu.be/b'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,14 @@
 import unittest
+import hashlib
 import os
 import tempfile
 import shutil
 from unittest.mock import Mock, patch, MagicMock
-from downloader import YouTubeDownloader
+from downloader import YouTubeDownloader, _parse_mode, _parse_workers
+from metadata_cache import MetadataCache
+from rate_limiter import AdaptiveRateLimiter
+from download_archive import DownloadArchive
+from content_store import ContentStore
 
 class TestYouTubeDownloader(unittest.TestCase):
     """YouTubeDownloader 클래스 테스트"""
@@ -12,7 +17,14 @@ class TestYouTubeDownloader(unittest.TestCase):
         """각 테스트 전에 실행"""
         # 임시 다운로드 디렉토리 생성
         self.temp_dir = tempfile.mkdtemp()
-        self.downloader = YouTubeDownloader(download_path=self.temp_dir)
+        self.cache = MetadataCache(cache_dir=os.path.join(self.temp_dir, 'cache'))
+        self.archive = DownloadArchive(archive_file=os.path.join(self.temp_dir, 'archive.txt'))
+        self.downloader = YouTubeDownloader(
+            download_path=self.temp_dir,
+            metadata_cache=self.cache,
+            rate_limiter=AdaptiveRateLimiter(max_rate=0),
+            archive=self.archive
+        )
     
     def tearDown(self):
         """각 테스트 후에 실행"""
@@ -113,13 +125,407 @@ class TestYouTubeDownloader(unittest.TestCase):
         self.assertIn('ja', subs_info['auto_subtitles'])
         self.assertIn('zh', subs_info['auto_subtitles'])
 
+    @patch('yt_dlp.YoutubeDL')
+    def test_video_with_subtitles_extracts_once(self, mock_ydl):
+        """비디오+자막 다운로드 시 정보 추출은 한 번만 수행"""
+        mock_info = {
+            'id': 'test',
+            'title': '테스트 비디오',
+            'subtitles': {'ko': []},
+            'automatic_captions': {}
+        }
+
+        mock_instance = MagicMock()
+        mock_instance.extract_info.return_value = mock_info
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        result = self.downloader.download_video_with_subtitles(
+            'https://youtube.com/watch?v=test', 'best', ['ko']
+        )
+
+        self.assertTrue(result)
+        self.assertEqual(mock_instance.extract_info.call_count, 1)
+        mock_instance.download.assert_not_called()
+        # 비디오 1회 + 자막 1회 모두 추출된 정보로 처리
+        self.assertEqual(mock_instance.process_ie_result.call_count, 2)
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_subtitles_bulk(self, mock_ydl):
+        """여러 언어 자막을 한 번의 추출로 일괄 다운로드"""
+        import io
+
+        mock_info = {
+            'id': 'test',
+            'title': '자막 테스트',
+            'ext': 'mp4',
+            'subtitles': {'ko': [
+                {'ext': 'json3', 'url': 'https://example.com/ko.json3'},
+                {'ext': 'vtt', 'url': 'https://example.com/ko.vtt'},
+            ]},
+            'automatic_captions': {'en': [{'ext': 'vtt', 'url': 'https://example.com/en.vtt'}]}
+        }
+
+        mock_instance = MagicMock()
+        mock_instance.extract_info.return_value = mock_info
+        mock_instance.prepare_filename.return_value = os.path.join(self.temp_dir, '자막 테스트.mp4')
+        mock_instance.urlopen.side_effect = lambda url: io.BytesIO(f"WEBVTT {url}".encode())
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        # 받은 원본 포맷 그대로 저장 (SRT 변환 끔)
+        self.downloader.convert_subtitles = False
+        result = self.downloader.download_subtitles('https://youtube.com/watch?v=test', ['ko', 'en'])
+
+        self.assertTrue(result)
+        self.assertEqual(mock_instance.extract_info.call_count, 1)
+        mock_instance.process_ie_result.assert_not_called()
+        mock_instance.download.assert_not_called()
+
+        ko_path = os.path.join(self.temp_dir, '자막 테스트.ko.vtt')
+        en_path = os.path.join(self.temp_dir, '자막 테스트.en.vtt')
+        with open(ko_path, encoding='utf-8') as f:
+            self.assertIn('ko.vtt', f.read())  # 선호 포맷(vtt) 선택
+        self.assertTrue(os.path.exists(en_path))
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_subtitles_bulk_converts_to_srt(self, mock_ydl):
+        """일괄 다운로드한 자막을 FFmpeg 없이 SRT로 변환"""
+        import io
+        import json
+
+        mock_info = {
+            'id': 'test',
+            'ext': 'mp4',
+            'subtitles': {'ko': [
+                {'ext': 'vtt', 'url': 'https://example.com/ko.vtt'},
+                {'ext': 'json3', 'url': 'https://example.com/ko.json3'},
+            ]},
+        }
+        json3 = json.dumps({'events': [{'tStartMs': 1500, 'dDurationMs': 2000, 'segs': [{'utf8': '안녕하세요'}]}]})
+
+        mock_instance = MagicMock()
+        mock_instance.prepare_filename.return_value = os.path.join(self.temp_dir, 'v.mp4')
+        mock_instance.urlopen.side_effect = lambda url: io.BytesIO(json3.encode())
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        results = self.downloader._download_subtitles_bulk(mock_info, ['ko'])
+
+        self.assertEqual(results, {'ko': True})
+        mock_instance.urlopen.assert_called_once_with('https://example.com/ko.json3')
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'v.ko.json3')))
+        with open(os.path.join(self.temp_dir, 'v.ko.srt'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), "1\n00:00:01,500 --> 00:00:03,500\n안녕하세요\n\n")
+        self.assertTrue(self.archive.contains('test', DownloadArchive.SUBTITLE, 'ko'))
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_subtitles_bulk_dedupes_only_auto_captions(self, mock_ydl):
+        """롤업 반복 줄은 자동 생성 자막에서만 제거"""
+        import io
+
+        vtt = (
+            "WEBVTT\n\n"
+            "00:00:01.000 --> 00:00:02.000\n안녕!\n\n"
+            "00:00:02.000 --> 00:00:03.000\n안녕!\n다음 줄\n"
+        )
+        mock_info = {
+            'id': 'test',
+            'subtitles': {'ko': [{'ext': 'vtt', 'url': 'https://example.com/ko.vtt'}]},
+            'automatic_captions': {'en': [{'ext': 'vtt', 'url': 'https://example.com/en.vtt'}]},
+        }
+
+        mock_instance = MagicMock()
+        mock_instance.prepare_filename.return_value = os.path.join(self.temp_dir, 'v.mp4')
+        mock_instance.urlopen.side_effect = lambda url: io.BytesIO(vtt.encode())
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        self.downloader._download_subtitles_bulk(mock_info, ['ko', 'en'])
+
+        with open(os.path.join(self.temp_dir, 'v.ko.srt'), encoding='utf-8') as f:
+            self.assertEqual(f.read().count('안녕!'), 2)
+        with open(os.path.join(self.temp_dir, 'v.en.srt'), encoding='utf-8') as f:
+            self.assertEqual(f.read().count('안녕!'), 1)
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_subtitles_bulk_reports_per_language(self, mock_ydl):
+        """일괄 다운로드 결과를 언어별로 반환"""
+        mock_info = {
+            'id': 'test',
+            'subtitles': {
+                'ko': [{'ext': 'vtt', 'url': 'https://example.com/ko.vtt'}],
+                'en': [{'ext': 'vtt', 'url': 'https://example.com/en.vtt'}],
+            },
+        }
+
+        def urlopen(url):
+            if 'en' in url:
+                raise Exception("HTTP Error 404")
+            import io
+            return io.BytesIO(b"WEBVTT")
+
+        mock_instance = MagicMock()
+        mock_instance.prepare_filename.return_value = os.path.join(self.temp_dir, 'v.mp4')
+        mock_instance.urlopen.side_effect = urlopen
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        results = self.downloader._download_subtitles_bulk(mock_info, ['ko', 'en', 'ja'])
+
+        self.assertEqual(results, {'ko': True, 'en': False})
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_extract_info_uses_metadata_cache(self, mock_ydl):
+        """같은 비디오를 다시 조회하면 캐시에서 반환"""
+        mock_instance = MagicMock()
+        mock_instance.extract_info.return_value = {'id': 'test', 'title': '캐시 테스트'}
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        first = self.downloader.extract_info('https://youtube.com/watch?v=test')
+        second = self.downloader.extract_info('https://youtu.be/test')
+
+        self.assertEqual(first['title'], second['title'])
+        self.assertEqual(mock_instance.extract_info.call_count, 1)
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_extract_info_negative_cache(self, mock_ydl):
+        """비공개 영상 오류는 캐시되어 재요청하지 않음"""
+        import yt_dlp
+
+        mock_instance = MagicMock()
+        mock_instance.extract_info.side_effect = yt_dlp.DownloadError("ERROR: Private video")
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        for _ in range(2):
+            with self.assertRaises(yt_dlp.DownloadError):
+                self.downloader.extract_info('https://youtube.com/watch?v=private')
+
+        self.assertEqual(mock_instance.extract_info.call_count, 1)
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_reuses_pooled_session(self, mock_ydl):
+        """같은 옵션의 연속 요청은 YoutubeDL 인스턴스를 재사용"""
+        mock_instance = MagicMock()
+        mock_instance.extract_info.return_value = {'title': '세션 테스트'}
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        self.downloader.extract_info('https://youtube.com/watch?v=first')
+        self.downloader.extract_info('https://youtube.com/watch?v=second')
+
+        self.assertEqual(mock_ydl.call_count, 1)
+        self.assertEqual(mock_instance.extract_info.call_count, 2)
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_get_video_info_with_preextracted_info(self, mock_ydl):
+        """미리 추출한 정보가 있으면 추가 추출 없음"""
+        info = self.downloader.get_video_info(
+            'https://youtube.com/watch?v=test',
+            info={'title': '미리 추출', 'duration': 10, 'uploader': 'u', 'view_count': 1}
+        )
+
+        self.assertEqual(info['title'], '미리 추출')
+        mock_ydl.assert_not_called()
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_iter_collection_entries(self, mock_ydl):
+        """채널 탭을 따라가며 비디오 URL을 차례로 반환"""
+        pages = {
+            'https://www.youtube.com/@test': {
+                '_type': 'playlist',
+                'entries': [
+                    {'_type': 'url', 'ie_key': 'YoutubeTab', 'url': 'https://www.youtube.com/@test/videos'},
+                ],
+            },
+            'https://www.youtube.com/@test/videos': {
+                '_type': 'playlist',
+                'entries': iter([{'_type': 'url', 'id': 'aaa'}, None, {'_type': 'url', 'id': 'bbb'}]),
+            },
+        }
+
+        mock_instance = MagicMock()
+        mock_instance.extract_info.side_effect = lambda url, **kwargs: pages[url]
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        urls = list(self.downloader.iter_collection_entries('https://www.youtube.com/@test'))
+
+        self.assertEqual(urls, [
+            'https://www.youtube.com/watch?v=aaa',
+            'https://www.youtube.com/watch?v=bbb',
+        ])
+        self.assertEqual(mock_instance.extract_info.call_count, 2)
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_archived_video_skips_network(self, mock_ydl):
+        """아카이브에 있는 비디오는 추출/다운로드 없이 건너뜀"""
+        video_path = os.path.join(self.temp_dir, 'video.mp4')
+        with open(video_path, 'wb') as f:
+            f.write(b'video')
+
+        mock_instance = MagicMock()
+        mock_instance.extract_info.return_value = {'id': 'abc', 'title': '아카이브 테스트'}
+        mock_instance.process_ie_result.return_value = {
+            'id': 'abc', 'requested_downloads': [{'filepath': video_path}]
+        }
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        url = 'https://youtube.com/watch?v=abc'
+        info = self.downloader.extract_info(url)
+        self.assertTrue(self.downloader.download_video(url, 'best', info=info))
+        self.assertTrue(self.downloader.is_archived(url, 'video_only', 'best'))
+
+        # 같은 요청은 네트워크 없이 완료
+        self.assertTrue(self.downloader.download_video(url, 'best'))
+        self.assertEqual(mock_instance.process_ie_result.call_count, 1)
+        mock_instance.download.assert_not_called()
+
+        # 다른 품질은 새로 다운로드 대상
+        self.assertFalse(self.downloader.is_archived(url, 'video_only', '720p'))
+
+        # 파일이 삭제되면 다시 다운로드 대상
+        os.remove(video_path)
+        self.assertFalse(self.downloader.is_archived(url, 'video_only', 'best'))
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_records_file_info(self, mock_ydl):
+        """받은 파일의 경로, 크기, SHA-256을 last_file에 기록 (병합 결과처럼 따라가지 못한 파일은 한 번 읽어 계산)"""
+        video_path = os.path.join(self.temp_dir, 'merged.mp4')
+        with open(video_path, 'wb') as f:
+            f.write(b'merged video')
+
+        mock_instance = MagicMock()
+        mock_instance.sanitize_info.side_effect = lambda info, remove_private_keys=False: info
+        mock_instance.process_ie_result.return_value = {'id': 'hash', 'requested_downloads': [{'filepath': video_path}]}
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        self.assertTrue(self.downloader.download_video('https://youtube.com/watch?v=hash', info={'id': 'hash'}))
+
+        self.assertEqual(self.downloader.last_file['file_path'], video_path)
+        self.assertEqual(self.downloader.last_file['file_size'], len(b'merged video'))
+        self.assertEqual(self.downloader.last_file['sha256'], hashlib.sha256(b'merged video').hexdigest())
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_content_store_restores_without_network(self, mock_ydl):
+        """콘텐츠 저장소를 켜면 지운 파일도 같은 요청은 네트워크 없이 링크로 복원"""
+        self.downloader.content_store = ContentStore(store_dir=os.path.join(self.temp_dir, 'store'), enabled=True)
+        video_path = os.path.join(self.temp_dir, 'stored.mp4')
+        with open(video_path, 'wb') as f:
+            f.write(b'stored video')
+
+        mock_instance = MagicMock()
+        mock_instance.sanitize_info.side_effect = lambda info, remove_private_keys=False: info
+        mock_instance.process_ie_result.return_value = {'id': 'dQw4w9WgXcQ', 'requested_downloads': [{'filepath': video_path}]}
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+        self.assertTrue(self.downloader.download_video(url, info={'id': 'dQw4w9WgXcQ'}))
+        self.assertEqual(self.downloader.content_store.stats()['objects'], 1)
+
+        # 다운로드 폴더에서 지우면 아카이브는 다시 받을 대상으로 보지만 저장소에서 복원
+        os.remove(video_path)
+        self.assertFalse(self.downloader.is_archived(url, 'video_only', 'best'))
+        self.assertTrue(self.downloader.restore_from_store(url, 'video_only', 'best'))
+
+        with open(video_path, 'rb') as f:
+            self.assertEqual(f.read(), b'stored video')
+        self.assertEqual(self.downloader.last_file['sha256'], hashlib.sha256(b'stored video').hexdigest())
+        self.assertTrue(self.downloader.is_archived(url, 'video_only', 'best'))
+        self.assertEqual(mock_instance.process_ie_result.call_count, 1)
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_video_uses_selected_formats(self, mock_ydl):
+        """포맷 선택 엔진이 고른 포맷만 yt-dlp에 전달"""
+        mock_instance = MagicMock()
+        mock_instance.sanitize_info.side_effect = lambda info, remove_private_keys=False: info
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        info = {'id': 'fmt', 'duration': 10, 'formats': [
+            {'format_id': '18', 'ext': 'mp4', 'height': 360, 'vcodec': 'avc1', 'acodec': 'mp4a', 'filesize': 900},
+            {'format_id': '134', 'ext': 'mp4', 'height': 360, 'vcodec': 'avc1', 'acodec': 'none', 'filesize': 800},
+            {'format_id': '140', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a', 'filesize': 300, 'abr': 128},
+        ]}
+
+        self.assertTrue(self.downloader.download_video('https://youtube.com/watch?v=fmt', '360p', info=info))
+
+        passed_info = mock_instance.process_ie_result.call_args[0][0]
+        self.assertEqual([f['format_id'] for f in passed_info['formats']], ['18'])
+        self.assertEqual(mock_ydl.call_args[0][0]['format'], 'bv*+ba/b')
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_audio_native_and_transcode(self, mock_ydl):
+        """오디오만: 기본은 원본 스트림 그대로, 형식을 지정하면 FFmpeg 변환"""
+        audio_path = os.path.join(self.temp_dir, 'aud.m4a')
+        with open(audio_path, 'wb') as f:
+            f.write(b'audio')
+
+        mock_instance = MagicMock()
+        mock_instance.sanitize_info.side_effect = lambda info, remove_private_keys=False: info
+        mock_instance.process_ie_result.return_value = {'id': 'aud', 'requested_downloads': [{'filepath': audio_path}]}
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        info = {'id': 'aud', 'duration': 10, 'formats': [
+            {'format_id': '18', 'ext': 'mp4', 'height': 360, 'vcodec': 'avc1', 'acodec': 'mp4a', 'filesize': 900},
+            {'format_id': '140', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a', 'filesize': 300, 'abr': 128},
+            {'format_id': '251', 'ext': 'webm', 'vcodec': 'none', 'acodec': 'opus', 'filesize': 290, 'abr': 130},
+        ]}
+        url = 'https://youtube.com/watch?v=aud'
+
+        self.assertTrue(self.downloader.download_audio(url, info=info))
+        opts = mock_ydl.call_args[0][0]
+        passed_info = mock_instance.process_ie_result.call_args[0][0]
+        self.assertEqual([f['format_id'] for f in passed_info['formats']], ['140'])
+        self.assertEqual(opts['format'], 'ba/b')
+        self.assertNotIn('postprocessors', opts)
+        self.assertTrue(self.downloader.is_archived(url, 'audio_only', 'best'))
+
+        self.assertTrue(self.downloader.download_audio(url, 'mp3', info=info))
+        opts = mock_ydl.call_args[0][0]
+        self.assertEqual(opts['postprocessors'], [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3'}])
+
+        self.assertFalse(self.downloader.download_audio(url, 'aiff', info=info))
+
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_section(self, mock_ydl):
+        """구간 다운로드: 처리하는 동안만 download_ranges 설정, 구간별 아카이브 기록"""
+        clip_path = os.path.join(self.temp_dir, 'clip.mp4')
+        with open(clip_path, 'wb') as f:
+            f.write(b'clip')
+
+        mock_instance = MagicMock()
+        mock_instance.params = {}
+        mock_instance.sanitize_info.side_effect = lambda info, remove_private_keys=False: info
+        seen = {}
+
+        def process(info, download=True):
+            seen['ranges'] = list(mock_instance.params['download_ranges'](info, mock_instance))
+            return {'id': 'clip', 'requested_downloads': [{'filepath': clip_path}]}
+
+        mock_instance.process_ie_result.side_effect = process
+        mock_ydl.return_value.__enter__.return_value = mock_instance
+
+        url = 'https://youtube.com/watch?v=clip'
+        info = {'id': 'clip', 'duration': 7200}
+        self.assertTrue(self.downloader.download_section(url, '1:00:00', '1:00:30', info=info))
+
+        self.assertEqual(seen['ranges'], [{'start_time': 3600.0, 'end_time': 3630.0}])
+        self.assertNotIn('download_ranges', mock_instance.params)
+        self.assertIn('section_start', mock_ydl.call_args[0][0]['outtmpl'])
+        self.assertTrue(self.downloader.is_archived(url, 'clip', 'best@3600-3630'))
+
+        # 잘못된 구간은 다운로드하지 않음
+        self.assertFalse(self.downloader.download_section(url, 30, 10, info=info))
+        self.assertFalse(self.downloader.download_section(url, 8000, 8010, info=info))
+        self.assertEqual(mock_instance.process_ie_result.call_count, 1)
+
 class TestYouTubeDownloaderIntegration(unittest.TestCase):
     """통합 테스트 (실제 다운로드는 하지 않음)"""
     
     def setUp(self):
         """각 테스트 전에 실행"""
         self.temp_dir = tempfile.mkdtemp()
-        self.downloader = YouTubeDownloader(download_path=self.temp_dir)
+        self.cache = MetadataCache(cache_dir=os.path.join(self.temp_dir, 'cache'))
+        self.archive = DownloadArchive(archive_file=os.path.join(self.temp_dir, 'archive.txt'))
+        self.downloader = YouTubeDownloader(
+            download_path=self.temp_dir,
+            metadata_cache=self.cache,
+            rate_limiter=AdaptiveRateLimiter(max_rate=0),
+            archive=self.archive
+        )
     
     def tearDown(self):
         """각 테스트 후에 실행"""
@@ -129,22 +535,53 @@ class TestYouTubeDownloaderIntegration(unittest.TestCase):
     @patch('yt_dlp.YoutubeDL')
     def test_download_video_success(self, mock_ydl):
         """비디오 다운로드 성공 시나리오"""
+        filepath = os.path.join(self.temp_dir, 'test.mp4')
+        with open(filepath, 'wb') as f:
+            f.write(b'video')
+
         mock_instance = MagicMock()
-        mock_instance.download.return_value = None
+        mock_instance.extract_info.return_value = {'id': 'test', 'requested_downloads': [{'filepath': filepath}]}
         mock_ydl.return_value.__enter__.return_value = mock_instance
         
         result = self.downloader.download_video('https://youtube.com/watch?v=test', 'best')
         self.assertTrue(result)
+        mock_instance.extract_info.assert_called_with('https://youtube.com/watch?v=test', download=True)
+
+        # 미리 추출한 정보 없이 받아도 파일 경로가 기록되어, 파일을 지우면 다시 받음
+        self.assertTrue(self.archive.contains('test', DownloadArchive.VIDEO, 'best'))
+        os.remove(filepath)
+        self.assertFalse(self.archive.contains('test', DownloadArchive.VIDEO, 'best'))
     
     @patch('yt_dlp.YoutubeDL')
     def test_download_video_failure(self, mock_ydl):
         """비디오 다운로드 실패 시나리오"""
         mock_instance = MagicMock()
-        mock_instance.download.side_effect = Exception("다운로드 실패")
+        mock_instance.extract_info.side_effect = Exception("다운로드 실패")
         mock_ydl.return_value.__enter__.return_value = mock_instance
         
         result = self.downloader.download_video('https://youtube.com/watch?v=test', 'best')
         self.assertFalse(result)
 
+class TestCommandLineOptions(unittest.TestCase):
+    """CLI 옵션 해석 테스트"""
+
+    def test_parse_mode_audio_format(self):
+        """오디오 형식은 지원 목록 안에서만 허용"""
+        self.assertEqual(_parse_mode(['--audio-only', '--audio-format', 'mp3']), ('audio_only', 'mp3'))
+        self.assertEqual(_parse_mode(['--audio-only']), ('audio_only', 'best'))
+        for options in (['--audio-only', '--audio-format'],
+                        ['--audio-only', '--audio-format', '--workers', '2'],
+                        ['--audio-only', '--audio-format', 'xyz']):
+            with self.assertRaises(ValueError):
+                _parse_mode(options)
+
+    def test_parse_workers(self):
+        """작업자 수는 1 이상의 정수만 허용"""
+        self.assertEqual(_parse_workers([]), 3)
+        self.assertEqual(_parse_workers(['--workers', '8']), 8)
+        for options in (['--workers'], ['--workers', 'many'], ['--workers', '0'], ['--workers', '-2']):
+            with self.assertRaises(ValueError):
+                _parse_workers(options)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from format_selector import FormatSelector
+
+def make_format(format_id, ext, height=None, vcodec='none', acodec='none', filesize=None, abr=None):
+    return {
+        'format_id': format_id, 'ext': ext, 'height': height,
+        'vcodec': vcodec, 'acodec': acodec, 'filesize': filesize, 'abr': abr,
+    }
+
+# YouTube와 비슷한 포맷 목록
+FORMATS = [
+    make_format('sb0', 'mhtml', vcodec='none', acodec='none'),
+    make_format('140', 'm4a', acodec='mp4a.40.2', filesize=3_000_000, abr=128),
+    make_format('139', 'm4a', acodec='mp4a.40.5', filesize=1_000_000, abr=48),
+    make_format('251', 'webm', acodec='opus', filesize=2_800_000, abr=130),
+    make_format('18', 'mp4', 360, vcodec='avc1.42001E', acodec='mp4a.40.2', filesize=9_000_000),
+    make_format('134', 'mp4', 360, vcodec='avc1.4d401e', filesize=7_000_000),
+    make_format('136', 'mp4', 720, vcodec='avc1.4d401f', filesize=30_000_000),
+    make_format('247', 'webm', 720, vcodec='vp9', filesize=20_000_000),
+    make_format('137', 'mp4', 1080, vcodec='avc1.640028', filesize=60_000_000),
+    make_format('248', 'webm', 1080, vcodec='vp9', filesize=58_000_000),
+]
+
+class TestFormatSelector(unittest.TestCase):
+    """FormatSelector 클래스 테스트"""
+
+    def select(self, quality, strategy='balanced', formats=FORMATS):
+        return FormatSelector(strategy=strategy).select({'formats': formats, 'duration': 100}, quality)
+
+    def test_respects_resolution_target(self):
+        """목표 해상도 이하에서 가장 높은 해상도 선택"""
+        self.assertEqual(self.select('best').height, 1080)
+        self.assertEqual(self.select('720p').height, 720)
+        self.assertEqual(self.select('480p').height, 360)
+        self.assertEqual(self.select('worst').height, 360)
+
+    def test_balanced_prefers_compatible_codec_when_sizes_close(self):
+        """크기가 비슷하면 호환성 좋은 코덱(avc1) 선택"""
+        decision = self.select('best')
+        self.assertEqual(decision.format_spec, '137+140')
+        self.assertTrue(decision.needs_merge)
+
+    def test_balanced_prefers_smaller_codec_when_savings_large(self):
+        """크기 차이가 크면 더 작은 코덱 선택"""
+        decision = self.select('720p')
+        self.assertEqual(decision.format_spec, '247+251')
+
+    def test_progressive_format_skips_merge(self):
+        """병합 없는 포맷이 비슷한 크기면 병합 생략"""
+        decision = self.select('360p')
+        self.assertEqual(decision.format_spec, '18')
+        self.assertFalse(decision.needs_merge)
+
+    def test_smallest_strategy(self):
+        """smallest 전략은 전송량 최소 (최소 오디오 품질 유지)"""
+        formats = [f for f in FORMATS if f['format_id'] != '134']
+        formats.append(make_format('134', 'mp4', 360, vcodec='avc1.4d401e', filesize=4_000_000))
+
+        decision = self.select('360p', strategy='smallest', formats=formats)
+        self.assertEqual(decision.format_spec, '134+140')
+        self.assertEqual(decision.estimated_bytes, 7_000_000)
+
+        # 같은 목록이라도 balanced 전략은 병합 없는 포맷과 비교
+        self.assertEqual(self.select('360p', formats=formats).format_spec, '134+140')
+        self.assertEqual(self.select('360p').format_spec, '18')
+
+    def test_fastest_strategy(self):
+        """fastest 전략은 병합 없는 포맷 우선"""
+        formats = FORMATS + [make_format('22', 'mp4', 720, vcodec='avc1.64001F', acodec='mp4a.40.2', filesize=45_000_000)]
+        decision = self.select('720p', strategy='fastest', formats=formats)
+        self.assertEqual(decision.format_spec, '22')
+
+    def test_no_formats_returns_none(self):
+        """포맷 목록이 없으면 기본 포맷 문자열 사용"""
+        selector = FormatSelector()
+        self.assertIsNone(selector.select({'formats': []}, 'best'))
+        self.assertIsNone(selector.select(None, 'best'))
+        self.assertEqual(selector.fallback_format('720p'), 'bv*[height<=720]+ba/b[height<=720]')
+        self.assertEqual(selector.fallback_format('unknown'), 'bv*+ba/b')
+
+    def test_restrict_formats(self):
+        """선택한 포맷만 남긴 정보 사본"""
+        selector = FormatSelector()
+        info = {'id': 'abc', 'formats': FORMATS, 'format_id': '137+140'}
+        decision = selector.select(info, '720p')
+        restricted = selector.restrict_formats(info, decision)
+
+        self.assertEqual([f['format_id'] for f in restricted['formats']], ['251', '247'])
+        self.assertNotIn('format_id', restricted)
+        self.assertEqual(len(info['formats']), len(FORMATS))
+
+    def test_select_audio(self):
+        """오디오 전용 스트림만 고르고, 비트레이트가 비슷하면 m4a 우선"""
+        info = {'formats': FORMATS, 'duration': 100}
+
+        balanced = FormatSelector().select_audio(info)
+        self.assertEqual(balanced.format_spec, '140')
+        self.assertIn('오디오 m4a', balanced.describe())
+
+        # smallest는 최소 비트레이트(96kbps) 이상에서 가장 작은 스트림 (48kbps 139번 제외)
+        smallest = FormatSelector(strategy='smallest').select_audio(info)
+        self.assertEqual(smallest.format_spec, '251')
+
+        # 비트레이트 차이가 크면 확장자보다 음질 우선
+        formats = [make_format('140', 'm4a', acodec='mp4a', abr=64), make_format('251', 'webm', acodec='opus', abr=160)]
+        self.assertEqual(FormatSelector().select_audio({'formats': formats}).format_spec, '251')
+
+        self.assertIsNone(FormatSelector().select_audio({'formats': [FORMATS[4]]}))
+
+    def test_decision_describe(self):
+        """선택 결과 설명 문자열"""
+        decision = self.select('best')
+        description = decision.describe()
+        self.assertIn('137+140', description)
+        self.assertIn('1080p', description)
+        self.assertEqual(decision.to_dict()['strategy'], 'balanced')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import os
+import tempfile
+import shutil
+from unittest.mock import MagicMock, patch
+from fragment_tuner import FragmentTuner, FragmentMeasurement
+
+MB = 1024 * 1024
+
+class TestFragmentTuner(unittest.TestCase):
+    """FragmentTuner 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.temp_dir, 'tuning.json')
+        self.tuner = FragmentTuner(state_file=self.state_file, initial=4, max_concurrency=16)
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _run(self, throughputs, start=4, rounds=8):
+        """동시 수별 처리량 표로 여러 번 측정한 뒤 최종 동시 수 반환"""
+        concurrency = start
+        for _ in range(rounds):
+            concurrency = self.tuner.record('example.com', concurrency, throughputs(concurrency))
+        return concurrency
+
+    def test_climbs_to_best_level_and_stays(self):
+        """처리량이 가장 높은 단계까지 올라간 뒤 유지"""
+        table = {4: 10 * MB, 6: 14 * MB, 9: 12 * MB, 13: 8 * MB}
+        final = self._run(lambda n: table.get(n, MB))
+
+        self.assertEqual(final, 6)
+        self.assertEqual(self.tuner.stats()['example.com']['best'], 6)
+
+    def test_throttling_halves_concurrency(self):
+        """429가 발생하면 동시 수를 절반으로 줄임"""
+        self.assertEqual(self.tuner.record('example.com', 8, 10 * MB, throttled=True), 4)
+        self.assertEqual(self.tuner.record('example.com', 4, None, errors=2), 3)
+        self.assertEqual(self.tuner.record('example.com', 1, None, throttled=True), 1)
+
+    def test_best_setting_is_remembered_between_runs(self):
+        """호스트별 설정을 파일에 저장하여 다음 실행에 사용"""
+        self.tuner.record('example.com', 4, 10 * MB)
+
+        reloaded = FragmentTuner(state_file=self.state_file, initial=4)
+        self.assertEqual(reloaded.concurrency_for('example.com'), 6)
+        self.assertEqual(reloaded.concurrency_for('other.com'), 4)
+
+    def test_host_key_groups_cdn_nodes(self):
+        """CDN 노드 호스트는 상위 도메인으로 묶음"""
+        self.assertEqual(
+            self.tuner.host_key('https://rr3---sn-abc.googlevideo.com/videoplayback?x=1'),
+            'googlevideo.com'
+        )
+        self.assertEqual(self.tuner.host_key('http://127.0.0.1:8000/a'), '127.0.0.1')
+
+    def test_measurement_ignores_small_samples(self):
+        """표본이 너무 작으면 처리량을 계산하지 않음"""
+        measurement = FragmentMeasurement('example.com', 4)
+        with patch('fragment_tuner.time.monotonic', side_effect=[0.0, 4.0]):
+            measurement.on_progress({'status': 'downloading', 'downloaded_bytes': 0})
+            measurement.on_progress({'status': 'downloading', 'downloaded_bytes': 8 * MB})
+
+        self.assertEqual(measurement.throughput(MB, 2), 2 * MB)
+        self.assertIsNone(measurement.throughput(16 * MB, 2))
+
+        measurement.on_message('[download] Got error: HTTP Error 429: Too Many Requests. Retrying fragment 3')
+        self.assertTrue(measurement.throttled)
+        self.assertEqual(measurement.errors, 1)
+
+    def test_attach_sets_concurrency_only_for_fragmented_formats(self):
+        """조각 포맷 다운로드 중에만 concurrent_fragment_downloads 변경"""
+        ydl = MagicMock()
+        ydl.params = {'fragment_autotune': True}
+        ydl._progress_hooks = []
+        seen = []
+
+        def fake_dl(name, info, subtitle=False, test=False):
+            seen.append(ydl.params.get('concurrent_fragment_downloads'))
+            ydl.to_screen('[download] Got error: HTTP Error 429: Too Many Requests')
+            return True, True
+
+        ydl.dl = fake_dl
+        self.tuner.attach(ydl)
+
+        ydl.dl('a.mp4', {'protocol': 'http_dash_segments', 'url': 'https://rr1---sn-x.googlevideo.com/a'})
+        ydl.dl('b.mp4', {'protocol': 'https', 'url': 'https://rr1---sn-x.googlevideo.com/b'})
+
+        self.assertEqual(seen, [4, None])
+        self.assertNotIn('concurrent_fragment_downloads', ydl.params)
+        self.assertEqual(ydl._progress_hooks, [])
+        # 첫 다운로드에서 429를 감지하여 절반으로 줄임
+        self.assertEqual(self.tuner.concurrency_for('googlevideo.com'), 2)
+
+if __name__ == '__main__':
+    unittest.main()
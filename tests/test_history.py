@@ -0,0 +1,237 @@
+import unittest
+import os
+import json
+import tempfile
+import shutil
+import threading
+import sqlite3
+from datetime import date
+from unittest.mock import patch
+from history import DownloadHistory
+
+class TestDownloadHistory(unittest.TestCase):
+    """DownloadHistory 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.history_file = os.path.join(self.temp_dir, 'history.db')
+        self.history = DownloadHistory(history_file=self.history_file)
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        self.history.close()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_add_and_query(self):
+        """기록 추가 후 최신순 조회, 상태/비디오/해시별 조회"""
+        self.history.add_download('https://youtu.be/dQw4w9WgXcQ', '첫 번째', 'video_only', quality='best',
+                                  file_size=100, sha256='AB' * 32)
+        self.history.add_download('https://youtu.be/aaaaaaaaaaa', '두 번째', 'subs_only',
+                                  subtitle_langs=['ko', 'en'], status='failed')
+
+        recent = self.history.get_recent_downloads(1)
+        self.assertEqual([r['title'] for r in recent], ['두 번째'])
+        self.assertEqual(recent[0]['subtitle_langs'], ['ko', 'en'])
+        self.assertEqual([r['title'] for r in self.history.get_all_downloads()], ['두 번째', '첫 번째'])
+        self.assertEqual(len(self.history.get_downloads_by_status('failed')), 1)
+        self.assertEqual(self.history.get_downloads_by_video('dQw4w9WgXcQ')[0]['title'], '첫 번째')
+        self.assertEqual(self.history.find_by_hash('ab' * 32)[0]['title'], '첫 번째')
+
+    def test_no_record_limit(self):
+        """예전처럼 100개에서 잘리지 않음"""
+        for i in range(150):
+            self.history.add_download(f'https://youtu.be/{i}', f'제목 {i}', 'video_only')
+        self.assertEqual(self.history.get_statistics()['total'], 150)
+
+    def test_concurrent_writers_group_commit(self):
+        """여러 작업자가 동시에 기록해도 모두 저장되고 추가가 끝나면 바로 조회 가능"""
+        def worker(n):
+            for i in range(25):
+                self.history.add_download(f'https://youtu.be/{n}-{i}', f'{n}-{i}', 'video_only', file_size=1)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = self.history.get_statistics()
+        self.assertEqual(stats['total'], 200)
+        self.assertEqual(stats['total_size'], 200)
+
+    def test_failed_write_is_reported(self):
+        """SQLite 쓰기가 실패하면 기록한 작업자와 save_history()에 실패를 알림"""
+        self.assertTrue(self.history.add_download('https://youtu.be/a', '성공', 'video_only'))
+
+        with patch.object(self.history, '_conn') as conn:
+            conn.execute.side_effect = sqlite3.OperationalError('disk I/O error')
+            self.assertFalse(self.history.add_download('https://youtu.be/b', '실패', 'video_only'))
+            self.assertFalse(self.history.save_history())
+
+        # 실패는 한 번만 알리고, 이후 기록은 정상 저장
+        self.assertTrue(self.history.save_history())
+        self.assertTrue(self.history.add_download('https://youtu.be/c', '다시 성공', 'video_only'))
+        self.assertEqual([r['title'] for r in self.history.get_all_downloads()], ['다시 성공', '성공'])
+
+    def test_shared_between_instances(self):
+        """같은 파일을 연 다른 인스턴스(다른 프로세스)가 쓴 기록도 보임"""
+        other = DownloadHistory(history_file=self.history_file)
+        try:
+            other.add_download('https://youtu.be/a', '다른 프로세스', 'video_only')
+            self.history.add_download('https://youtu.be/b', '이 프로세스', 'video_only')
+            self.assertEqual([r['title'] for r in other.get_all_downloads()], ['이 프로세스', '다른 프로세스'])
+        finally:
+            other.close()
+
+    def test_search_and_statistics(self):
+        """제목/URL 검색 (대소문자 무시)과 통계"""
+        self.history.add_download('https://youtu.be/a', 'Python 강좌', 'video_only', file_size=1024 * 1024)
+        self.history.add_download('https://youtu.be/b', '요리', 'video_only', status='cancelled')
+
+        self.assertEqual([r['title'] for r in self.history.search_downloads('python')], ['Python 강좌'])
+        self.assertEqual(len(self.history.search_downloads('YOUTU.BE')), 2)
+
+        stats = self.history.get_statistics()
+        self.assertEqual((stats['success'], stats['failed'], stats['cancelled']), (1, 0, 1))
+        self.assertEqual(stats['total_size_mb'], 1)
+
+    def test_statistics_counters_follow_add_and_delete(self):
+        """집계 카운터는 추가/삭제/전체 삭제 때 함께 갱신"""
+        self.history.add_download('https://youtu.be/a', 'a', 'video_only', quality='720p', file_size=300)
+        self.history.add_download('https://youtu.be/b', 'b', 'audio_only', quality='mp3', file_size=200)
+        self.history.add_download('https://youtu.be/c', 'c', 'video_only', quality='720p', status='failed')
+
+        stats = self.history.get_statistics()
+        self.assertEqual(stats['total'], 3)
+        self.assertEqual(stats['total_size'], 500)
+        self.assertEqual(stats['by_mode']['video_only'], {'count': 2, 'bytes': 300})
+        self.assertEqual(stats['by_quality']['mp3'], {'count': 1, 'bytes': 200})
+
+        self.history.delete_record(1)  # b
+        stats = self.history.get_statistics()
+        self.assertEqual((stats['total'], stats['total_size']), (2, 300))
+        self.assertNotIn('audio_only', stats['by_mode'])
+
+        self.history.clear_history()
+        stats = self.history.get_statistics()
+        self.assertEqual((stats['total'], stats['success'], stats['total_size']), (0, 0, 0))
+
+    def test_daily_statistics(self):
+        """날짜별 개수와 용량 (기록 없는 날은 0)"""
+        self.history._write_batch([
+            {'timestamp': '2024-03-01T10:00:00', 'url': 'https://youtu.be/a', 'status': 'success', 'file_size': 10},
+            {'timestamp': '2024-03-01T23:00:00', 'url': 'https://youtu.be/b', 'status': 'success', 'file_size': 5},
+            {'timestamp': '2024-03-03T08:00:00', 'url': 'https://youtu.be/c', 'status': 'failed'},
+        ])
+
+        daily = self.history.get_daily_statistics(days=3, until=date(2024, 3, 3))
+        self.assertEqual(daily, [
+            {'date': '2024-03-01', 'count': 2, 'bytes': 15},
+            {'date': '2024-03-02', 'count': 0, 'bytes': 0},
+            {'date': '2024-03-03', 'count': 1, 'bytes': 0},
+        ])
+
+    def test_counters_backfilled_for_old_database(self):
+        """집계 카운터와 검색 색인이 없던 데이터베이스는 열 때 기존 기록으로 채움"""
+        old_file = os.path.join(self.temp_dir, 'old.db')
+        conn = sqlite3.connect(old_file)
+        conn.executescript(DownloadHistory.SCHEMA)
+        conn.execute("INSERT INTO downloads (timestamp, url, title, mode, status, file_size) "
+                     "VALUES ('2024-01-01T00:00:00', 'u', 'old title', 'video_only', 'success', 42)")
+        conn.commit()
+        conn.close()
+
+        upgraded = DownloadHistory(history_file=old_file)
+        try:
+            stats = upgraded.get_statistics()
+            self.assertEqual((stats['total'], stats['success'], stats['total_size']), (1, 1, 42))
+            self.assertEqual(upgraded.search_downloads('old')[0]['title'], 'old title')
+            upgraded.add_download('https://youtu.be/a', 'a', 'video_only', file_size=8)
+            self.assertEqual(upgraded.get_statistics()['total_size'], 50)
+        finally:
+            upgraded.close()
+
+    def test_indexed_search(self):
+        """제목/업로더/URL/비디오 ID 부분 일치 검색, 제목 일치 우선, 페이지 나누기"""
+        self.history.add_download('https://youtu.be/dQw4w9WgXcQ', 'Never Gonna Give You Up', 'video_only',
+                                  uploader='Rick Astley')
+        self.history.add_download('https://youtu.be/aaaaaaaaaaa', '파이썬 기초 강좌', 'video_only',
+                                  uploader='코딩 채널')
+        self.history.add_download('https://youtu.be/bbbbbbbbbbb', 'Cooking show', 'video_only',
+                                  uploader='Python Kitchen')
+        self.history.add_download('https://youtu.be/ccccccccccc', 'Python tutorial', 'video_only')
+
+        # 입력 중인 앞부분, 업로더, 비디오 ID
+        self.assertEqual([r['title'] for r in self.history.search_downloads('pyth')],
+                         ['Python tutorial', 'Cooking show'])
+        self.assertEqual(self.history.search_downloads('astley')[0]['uploader'], 'Rick Astley')
+        self.assertEqual(self.history.search_downloads('dQw4w9')[0]['title'], 'Never Gonna Give You Up')
+
+        # 3글자보다 짧은 단어 (한국어 두 글자 단어 포함)
+        self.assertEqual([r['title'] for r in self.history.search_downloads('강좌')], ['파이썬 기초 강좌'])
+        self.assertEqual([r['title'] for r in self.history.search_downloads('파이썬 강좌')], ['파이썬 기초 강좌'])
+
+        # 페이지 나누기
+        self.assertEqual(len(self.history.search_downloads('youtu.be', limit=3)), 3)
+        self.assertEqual(len(self.history.search_downloads('youtu.be', limit=3, offset=3)), 1)
+
+        # 일치하는 기록이 없으면 비슷한 기록 (오타)
+        self.assertEqual(self.history.search_downloads('cookin shoow')[0]['title'], 'Cooking show')
+        self.assertEqual(self.history.search_downloads('cookin shoow', fuzzy=False), [])
+
+    def test_search_index_follows_delete(self):
+        """삭제한 기록은 검색되지 않음"""
+        self.history.add_download('https://youtu.be/a', '삭제될 영상 title', 'video_only')
+        self.history.delete_record(0)
+        self.assertEqual(self.history.search_downloads('title'), [])
+
+    def test_paged_listing(self):
+        """페이지 단위 조회 (정렬, 상태 필터, 다음 페이지 위치)"""
+        titles = ['d', None, 'b', 'e', 'a', 'c']
+        for i, title in enumerate(titles):
+            self.history.add_download(f'https://youtu.be/{i}', title, 'video_only',
+                                      status='failed' if i % 2 else 'success', file_size=i)
+
+        def collect(**kwargs):
+            pages, cursor = [], None
+            while True:
+                records, cursor = self.history.get_downloads_page(limit=2, cursor=cursor, **kwargs)
+                pages.append([r['title'] for r in records])
+                if cursor is None:
+                    return pages
+
+        self.assertEqual(collect(), [['c', 'a'], ['e', 'b'], [None, 'd'], []])
+        self.assertEqual(sum(collect(sort='title', descending=False), []), [None, 'a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(sum(collect(sort='file_size'), []), ['c', 'a', 'e', 'b', None, 'd'])
+        self.assertEqual(sum(collect(status='failed'), []), ['c', 'e', None])
+        self.assertEqual(self.history.count_downloads(), 6)
+        self.assertEqual(self.history.count_downloads('failed'), 3)
+
+        self.assertEqual([r['title'] for r in self.history.search_downloads('youtu', status='success')],
+                         ['a', 'b', 'd'])
+        with self.assertRaises(ValueError):
+            self.history.get_downloads_page(sort='url; DROP TABLE downloads')
+
+    def test_legacy_json_is_migrated(self):
+        """예전 JSON 히스토리는 한 번만 옮김 (최신 항목이 맨 앞인 순서 유지)"""
+        legacy_file = os.path.join(self.temp_dir, 'old.json')
+        with open(legacy_file, 'w', encoding='utf-8') as f:
+            json.dump([
+                {'timestamp': '2024-01-02T00:00:00', 'url': 'https://youtu.be/b', 'title': '새 기록',
+                 'mode': 'video_only', 'status': 'success'},
+                {'timestamp': '2024-01-01T00:00:00', 'url': 'https://youtu.be/a', 'title': '옛 기록',
+                 'mode': 'video_only', 'status': 'failed'},
+            ], f)
+
+        migrated = DownloadHistory(history_file=legacy_file)
+        try:
+            self.assertEqual(migrated.history_file, os.path.join(self.temp_dir, 'old.db'))
+            self.assertEqual([r['title'] for r in migrated.get_all_downloads()], ['새 기록', '옛 기록'])
+            self.assertFalse(os.path.exists(legacy_file))
+        finally:
+            migrated.close()
+
+if __name__ == '__main__':
+    unittest.main()
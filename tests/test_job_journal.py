@@ -0,0 +1,81 @@
+import unittest
+import os
+import tempfile
+import shutil
+from job_journal import JobJournal, partial_bytes
+
+class TestJobJournal(unittest.TestCase):
+    """JobJournal 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal_file = os.path.join(self.temp_dir, 'journal', 'jobs.jsonl')
+        self.journal = JobJournal(journal_file=self.journal_file)
+        self.options = {'mode': 'video_only', 'quality': 'best', 'download_path': self.temp_dir}
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_unfinished_jobs_are_pending(self):
+        """종료 기록이 없는 작업만 미완료로 반환"""
+        self.journal.begin('a', 'https://youtu.be/a', self.options)
+        self.journal.begin('b', 'https://youtu.be/b', self.options)
+        self.journal.finish('a', 'done')
+
+        # 새 프로세스에서 다시 읽는 상황
+        pending = JobJournal(journal_file=self.journal_file).pending_jobs()
+
+        self.assertEqual([entry['id'] for entry in pending], ['b'])
+        self.assertEqual(pending[0]['url'], 'https://youtu.be/b')
+        self.assertEqual(pending[0]['options'], self.options)
+        self.assertEqual(pending[0]['phase'], JobJournal.QUEUED)
+
+    def test_track_progress_records_phase_and_part_files(self):
+        """진행률로 단계와 .part 파일 기록 (중복 기록 없음)"""
+        part_file = os.path.join(self.temp_dir, 'video.mp4.part')
+        with open(part_file, 'wb') as f:
+            f.write(b'x' * 1024)
+
+        self.journal.begin('a', 'https://youtu.be/a', self.options)
+        for _ in range(3):
+            self.journal.track_progress('a', {'status': 'downloading', 'tmpfilename': part_file})
+
+        entry = self.journal.pending_jobs()[0]
+        self.assertEqual(entry['phase'], JobJournal.DOWNLOADING)
+        self.assertEqual(entry['part_files'], [os.path.abspath(part_file)])
+        self.assertEqual(partial_bytes(entry), 1024)
+
+        with open(self.journal_file, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 3)  # start, phase, part
+
+        self.journal.track_progress('a', {'status': 'finished'})
+        self.assertEqual(self.journal.pending_jobs()[0]['phase'], JobJournal.POSTPROCESSING)
+
+    def test_truncated_last_line_is_ignored(self):
+        """기록 도중 종료되어 잘린 마지막 줄 무시"""
+        self.journal.begin('a', 'https://youtu.be/a', self.options)
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"op": "finish", "id": "a"')
+
+        pending = self.journal.pending_jobs()
+        self.assertEqual(len(pending), 1)
+
+    def test_compact_keeps_only_pending_records(self):
+        """정리 후 진행 중인 작업 기록만 남음"""
+        journal = JobJournal(journal_file=self.journal_file, max_records=5)
+        journal.begin('keep', 'https://youtu.be/keep', self.options)
+        for i in range(5):
+            journal.begin(str(i), f'https://youtu.be/{i}', self.options)
+            journal.finish(str(i), 'done')
+
+        with open(self.journal_file, encoding='utf-8') as f:
+            lines = f.readlines()
+
+        self.assertLessEqual(len(lines), 5)
+        self.assertEqual([entry['id'] for entry in journal.pending_jobs()], ['keep'])
+
+if __name__ == '__main__':
+    unittest.main()
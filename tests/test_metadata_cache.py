@@ -0,0 +1,98 @@
+import unittest
+import os
+import time
+import tempfile
+import shutil
+from metadata_cache import MetadataCache
+
+class TestMetadataCache(unittest.TestCase):
+    """MetadataCache 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = MetadataCache(cache_dir=self.temp_dir, max_entries=2)
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_put_and_get(self):
+        """저장 및 조회 테스트"""
+        self.cache.put('abc', {'id': 'abc', 'title': '제목'})
+
+        entry = self.cache.get('abc')
+        self.assertEqual(entry['info']['title'], '제목')
+        self.assertIsNone(entry['error'])
+
+    def test_returns_copy(self):
+        """반환된 정보를 수정해도 캐시는 변하지 않음"""
+        self.cache.put('abc', {'id': 'abc', 'title': '제목'})
+        self.cache.get('abc')['info']['title'] = '변경'
+
+        self.assertEqual(self.cache.get('abc')['info']['title'], '제목')
+
+    def test_lru_eviction_falls_back_to_disk(self):
+        """메모리에서 밀려난 항목은 디스크에서 다시 로드"""
+        for video_id in ('a', 'b', 'c'):
+            self.cache.put(video_id, {'id': video_id})
+
+        self.assertNotIn('a', self.cache._memory)
+        self.assertEqual(self.cache.get('a')['info']['id'], 'a')
+
+    def test_persists_across_instances(self):
+        """재시작 후에도 디스크 캐시 유지"""
+        self.cache.put('abc', {'id': 'abc'})
+
+        new_cache = MetadataCache(cache_dir=self.temp_dir)
+        self.assertEqual(new_cache.get('abc')['info']['id'], 'abc')
+
+    def test_ttl_respects_stream_url_expire(self):
+        """스트림 URL의 expire 값으로 유효 시간 계산"""
+        expire = int(time.time()) + 3600
+        info = {'formats': [
+            {'url': f'https://rr1.googlevideo.com/videoplayback?expire={expire}&id=1'},
+            {'manifest_url': f'https://manifest.googlevideo.com/api/expire/{expire + 100}/id/1'},
+        ]}
+
+        ttl = self.cache.compute_ttl(info)
+        self.assertLessEqual(ttl, 3600 - self.cache.expire_margin)
+        self.assertGreater(ttl, 0)
+
+    def test_expired_urls_not_cached(self):
+        """만료가 임박한 정보는 저장하지 않음"""
+        expire = int(time.time()) + 60
+        info = {'formats': [{'url': f'https://rr1.googlevideo.com/videoplayback?expire={expire}'}]}
+
+        self.assertFalse(self.cache.put('abc', info))
+        self.assertIsNone(self.cache.get('abc'))
+
+    def test_expired_entry_removed(self):
+        """유효 시간이 지난 항목은 반환하지 않음"""
+        cache = MetadataCache(cache_dir=self.temp_dir, default_ttl=-1)
+        cache._store('abc', {'info': {'id': 'abc'}, 'error': None, 'expires_at': time.time() - 1})
+
+        self.assertIsNone(cache.get('abc'))
+        self.assertFalse(os.path.exists(cache._disk_path('abc')))
+
+    def test_negative_cache(self):
+        """비공개/삭제 영상 오류 캐시"""
+        self.assertTrue(self.cache.is_negative_error('ERROR: [youtube] abc: Private video'))
+        self.assertFalse(self.cache.is_negative_error('HTTP Error 429: Too Many Requests'))
+
+        self.cache.put_negative('abc', 'Private video')
+        entry = self.cache.get('abc')
+        self.assertIsNone(entry['info'])
+        self.assertEqual(entry['error'], 'Private video')
+
+    def test_sanitize_removes_private_keys(self):
+        """내부용 키와 직렬화 불가능한 값 정리"""
+        self.cache.put('abc', {'id': 'abc', '__post_extractor': object(), 'tags': ('a', 'b')})
+
+        info = self.cache.get('abc')['info']
+        self.assertNotIn('__post_extractor', info)
+        self.assertEqual(info['tags'], ['a', 'b'])
+
+if __name__ == '__main__':
+    unittest.main()
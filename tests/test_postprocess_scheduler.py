@@ -0,0 +1,154 @@
+import unittest
+import os
+import tempfile
+import shutil
+import threading
+import time
+from postprocess_scheduler import PostProcessScheduler
+
+class FakePP:
+    """pp_key만 가진 테스트용 후처리기"""
+
+    def __init__(self, key):
+        self.key = key
+
+    def pp_key(self):
+        return self.key
+
+class FakeYDL:
+    """run_pp만 가진 테스트용 YoutubeDL"""
+
+    def __init__(self):
+        self.threads = []
+
+    def run_pp(self, pp, infodict):
+        self.threads.append((pp.pp_key(), threading.current_thread().name))
+        return infodict
+
+class TestPostProcessScheduler(unittest.TestCase):
+    """PostProcessScheduler 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.schedulers = []
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        for scheduler in self.schedulers:
+            scheduler.shutdown()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def make_scheduler(self, max_workers):
+        scheduler = PostProcessScheduler(max_workers=max_workers)
+        self.schedulers.append(scheduler)
+        return scheduler
+
+    def test_default_pool_size_is_cpu_count(self):
+        """기본 작업자 수는 CPU 코어 수"""
+        scheduler = self.make_scheduler(None)
+        self.assertEqual(scheduler.max_workers, os.cpu_count() or 1)
+
+    def test_concurrency_is_bounded(self):
+        """동시에 실행되는 후처리 수 제한"""
+        scheduler = self.make_scheduler(2)
+        lock = threading.Lock()
+        state = {'active': 0, 'max': 0}
+
+        def step():
+            with lock:
+                state['active'] += 1
+                state['max'] = max(state['max'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+
+        tasks = [scheduler.submit('FFmpegMerger', step) for _ in range(8)]
+        for task in tasks:
+            task.get_result()
+
+        self.assertEqual(state['max'], 2)
+
+    def test_priority_order(self):
+        """우선순위가 높은(숫자가 작은) 작업부터 실행"""
+        scheduler = self.make_scheduler(1)
+        gate = threading.Event()
+        order = []
+
+        blocker = scheduler.submit('block', lambda: gate.wait(5))
+        time.sleep(0.05)  # 작업자가 blocker를 실행하도록 대기
+        tasks = [
+            scheduler.submit('FFmpegMerger', lambda: order.append('merge')),
+            scheduler.submit('other', lambda: order.append('other')),
+            scheduler.submit('FFmpegSubtitlesConvertor', lambda: order.append('convert')),
+            scheduler.submit('FFmpegEmbedSubtitle', lambda: order.append('embed')),
+        ]
+        gate.set()
+        for task in [blocker] + tasks:
+            task.get_result()
+
+        self.assertEqual(order, ['convert', 'embed', 'merge', 'other'])
+
+    def test_timings_and_summary(self):
+        """단계별 대기/실행 시간 기록"""
+        scheduler = self.make_scheduler(1)
+        scheduler.run('FFmpegMerger', lambda: time.sleep(0.02))
+
+        with self.assertRaises(ValueError):
+            scheduler.run('FFmpegMerger', self._raise_value_error)
+
+        records = scheduler.timings()
+        self.assertEqual(len(records), 2)
+        self.assertGreaterEqual(records[0]['run_time'], 0.02)
+        self.assertFalse(records[1]['success'])
+
+        summary = scheduler.summary()['FFmpegMerger']
+        self.assertEqual(summary['count'], 2)
+        self.assertEqual(summary['failed'], 1)
+
+    def test_cancel_before_start(self):
+        """시작 전 취소된 작업은 실행하지 않음"""
+        scheduler = self.make_scheduler(1)
+        gate = threading.Event()
+        ran = []
+        scheduler.submit('block', lambda: gate.wait(5))
+        time.sleep(0.05)  # 작업자가 blocker를 실행하도록 대기
+
+        cancel_event = threading.Event()
+        threading.Timer(0.1, cancel_event.set).start()
+        with self.assertRaises(Exception):
+            scheduler.run('FFmpegMerger', lambda: ran.append(True), cancel_event=cancel_event)
+        gate.set()
+        scheduler.shutdown()
+
+        self.assertEqual(ran, [])
+
+    def test_attach_routes_ffmpeg_steps_only(self):
+        """FFmpeg 후처리만 스케줄러 작업자에서 실행"""
+        scheduler = self.make_scheduler(1)
+        ydl = scheduler.attach(FakeYDL())
+
+        info = {'id': 'test'}
+        self.assertIs(ydl.run_pp(FakePP('FFmpegMerger'), info), info)
+        ydl.run_pp(FakePP('MoveFiles'), info)
+
+        threads = dict(ydl.threads)
+        self.assertTrue(threads['FFmpegMerger'].startswith('postprocess-'))
+        self.assertEqual(threads['MoveFiles'], threading.current_thread().name)
+
+    def test_resolve_ffmpeg_location(self):
+        """ffmpeg_location 값을 실행 파일 경로로 변환"""
+        scheduler = self.make_scheduler(1)
+        ffmpeg_name = 'ffmpeg.exe' if os.name == 'nt' else 'ffmpeg'
+
+        self.assertEqual(scheduler.resolve_ffmpeg(None), 'ffmpeg')
+        self.assertEqual(scheduler.resolve_ffmpeg(self.temp_dir), os.path.join(self.temp_dir, ffmpeg_name))
+        self.assertEqual(scheduler.resolve_ffmpeg('/opt/ffmpeg'), '/opt/ffmpeg')
+
+    @staticmethod
+    def _raise_value_error():
+        raise ValueError("변환 실패")
+
+if __name__ == '__main__':
+    unittest.main()
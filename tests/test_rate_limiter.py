@@ -0,0 +1,75 @@
+import unittest
+import threading
+import time
+from rate_limiter import AdaptiveRateLimiter
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """AdaptiveRateLimiter 클래스 테스트"""
+
+    def test_burst_then_wait(self):
+        """버스트 크기만큼은 바로 허가하고 이후에는 대기"""
+        limiter = AdaptiveRateLimiter(max_rate=20, capacity=2)
+
+        start = time.monotonic()
+        for _ in range(3):
+            self.assertTrue(limiter.acquire())
+        elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.03)
+
+    def test_unlimited(self):
+        """max_rate가 0이면 제한 없음"""
+        limiter = AdaptiveRateLimiter(max_rate=0, capacity=1)
+        for _ in range(100):
+            self.assertTrue(limiter.acquire(timeout=0))
+
+    def test_timeout(self):
+        """제한 시간 안에 허가를 받지 못하면 False"""
+        limiter = AdaptiveRateLimiter(max_rate=0.1, capacity=1)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire(timeout=0.01))
+
+    def test_cancel_event(self):
+        """취소 이벤트가 설정되면 대기 중단"""
+        limiter = AdaptiveRateLimiter(max_rate=0.1, capacity=1)
+        limiter.acquire()
+
+        cancel_event = threading.Event()
+        threading.Timer(0.02, cancel_event.set).start()
+        self.assertFalse(limiter.acquire(cancel_event=cancel_event))
+
+    def test_aimd(self):
+        """429 감지 시 절반으로 감소, 성공 시 조금씩 증가"""
+        limiter = AdaptiveRateLimiter(max_rate=1.0, min_rate=0.1, increase_step=0.1, decrease_factor=0.5)
+
+        limiter.report(Exception("HTTP Error 429: Too Many Requests"))
+        self.assertAlmostEqual(limiter.current_rate, 0.5)
+
+        limiter.report()
+        self.assertAlmostEqual(limiter.current_rate, 0.6)
+
+        for _ in range(10):
+            limiter.on_success()
+        self.assertAlmostEqual(limiter.current_rate, 1.0)
+
+        for _ in range(10):
+            limiter.on_throttled()
+        self.assertAlmostEqual(limiter.current_rate, 0.1)
+
+    def test_other_errors_do_not_throttle(self):
+        """요청 제한이 아닌 오류는 속도에 영향 없음"""
+        limiter = AdaptiveRateLimiter(max_rate=1.0)
+        limiter.report(Exception("Private video"))
+        self.assertAlmostEqual(limiter.current_rate, 1.0)
+
+    def test_configure(self):
+        """실행 중 설정 변경"""
+        limiter = AdaptiveRateLimiter(max_rate=2.0)
+        limiter.configure(max_rate=0.5)
+        self.assertAlmostEqual(limiter.current_rate, 0.5)
+
+        limiter.configure(max_rate=0)
+        self.assertTrue(limiter.acquire(timeout=0))
+
+if __name__ == '__main__':
+    unittest.main()
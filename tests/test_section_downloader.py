@@ -0,0 +1,154 @@
+import unittest
+import os
+import tempfile
+import shutil
+from unittest.mock import MagicMock
+from section_downloader import SectionDownloader
+
+def make_fragments(count, duration=10):
+    """초기화 조각 + 길이가 같은 미디어 조각 목록"""
+    return [{'url': 'init'}] + [{'url': f'seg{i}', 'duration': duration} for i in range(count)]
+
+class TestSectionDownloader(unittest.TestCase):
+    """SectionDownloader 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.downloader = SectionDownloader()
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _fake_ydl(self):
+        ydl = MagicMock()
+        ydl.params = {}
+        calls = []
+
+        def fake_dl(name, info, subtitle=False, test=False):
+            calls.append((name, info))
+            with open(name, 'wb') as f:
+                f.write(b'data')
+            return True, True
+
+        ydl.dl = fake_dl
+        return ydl, calls
+
+    def test_parse_time_and_range(self):
+        """초, MM:SS, HH:MM:SS 형식 변환"""
+        self.assertEqual(SectionDownloader.parse_time(90), 90.0)
+        self.assertEqual(SectionDownloader.parse_time('90.5'), 90.5)
+        self.assertEqual(SectionDownloader.parse_time('1:30'), 90.0)
+        self.assertEqual(SectionDownloader.parse_time('01:00:30'), 3630.0)
+        self.assertEqual(SectionDownloader.parse_range('1:00:00-1:00:30'), (3600.0, 3630.0))
+
+        for bad in ('abc', '', '-5'):
+            with self.assertRaises(ValueError):
+                SectionDownloader.parse_time(bad)
+        with self.assertRaises(ValueError):
+            SectionDownloader.parse_range('1:00-0:30')
+        with self.assertRaises(ValueError):
+            SectionDownloader.parse_range('90')
+
+    def test_variant_round_trip(self):
+        """품질과 구간을 합친 이름을 다시 나눔"""
+        variant = SectionDownloader.variant('720p', 3600.0, 3630.5)
+        self.assertEqual(variant, '720p@3600-3630.5')
+        self.assertEqual(SectionDownloader.parse_variant(variant), ('720p', 3600.0, 3630.5))
+        with self.assertRaises(ValueError):
+            SectionDownloader.parse_variant('best')
+
+    def test_select_fragments(self):
+        """구간과 겹치는 조각과 초기화 조각만 선택"""
+        fragments = make_fragments(720)  # 2시간 (10초 x 720)
+
+        selected, offset = self.downloader.select_fragments(fragments, 3605, 3635)
+        self.assertEqual([f['url'] for f in selected], ['init', 'seg360', 'seg361', 'seg362', 'seg363'])
+        self.assertEqual(offset, 3600)
+
+        # 길이를 모르는 조각이 있으면 선택하지 않음
+        self.assertIsNone(self.downloader.select_fragments([{'url': 'a', 'duration': 5}, {'url': 'b'}], 0, 10))
+        # 구간이 영상 밖이면 None
+        self.assertIsNone(self.downloader.select_fragments(make_fragments(3), 100, 110))
+
+    def test_section_context_restores_params(self):
+        """사용하는 동안만 download_ranges 설정"""
+        ydl = MagicMock()
+        ydl.params = {'force_keyframes_at_cuts': False}
+
+        with self.downloader.section(ydl, 60, 90, precise=True):
+            ranges = list(ydl.params['download_ranges']({}, ydl))
+            self.assertEqual(ranges, [{'start_time': 60, 'end_time': 90}])
+            self.assertTrue(ydl.params['force_keyframes_at_cuts'])
+
+        self.assertEqual(ydl.params, {'force_keyframes_at_cuts': False})
+
+    def test_attach_downloads_only_overlapping_fragments(self):
+        """조각 포맷은 겹치는 조각만 받고 FFmpeg로 구간만 남김"""
+        ydl, calls = self._fake_ydl()
+        run_ffmpeg = MagicMock()
+        self.downloader.attach(ydl, run_ffmpeg=run_ffmpeg)
+
+        name = os.path.join(self.temp_dir, 'clip.mp4')
+        info = {'protocol': 'http_dash_segments', 'fragments': make_fragments(720),
+                'section_start': 3605, 'section_end': 3635, 'filesize': 10 ** 9}
+        self.assertEqual(ydl.dl(name, info), (True, True))
+
+        passed = calls[0][1]
+        self.assertEqual(len(passed['fragments']), 5)
+        self.assertNotIn('section_start', passed)
+        self.assertNotIn('filesize', passed)
+
+        args = run_ffmpeg.call_args[0][0]
+        self.assertEqual(args[args.index('-ss') + 1], '5.000')
+        self.assertEqual(args[args.index('-t') + 1], '30.000')
+        self.assertIn('copy', args)
+
+    def test_attach_passes_through_other_downloads(self):
+        """구간이 없거나 단일 파일 포맷이면 yt-dlp 기본 동작"""
+        ydl, calls = self._fake_ydl()
+        run_ffmpeg = MagicMock()
+        self.downloader.attach(ydl, run_ffmpeg=run_ffmpeg)
+        name = os.path.join(self.temp_dir, 'full.mp4')
+
+        whole = {'protocol': 'http_dash_segments', 'fragments': make_fragments(3)}
+        progressive = {'protocol': 'https', 'url': 'https://example.com/v.mp4', 'section_start': 10, 'section_end': 20}
+        ydl.dl(name, whole)
+        ydl.dl(name, progressive)
+
+        self.assertIs(calls[0][1], whole)
+        self.assertIs(calls[1][1], progressive)
+        run_ffmpeg.assert_not_called()
+
+    def test_attach_merged_formats(self):
+        """병합 포맷은 포맷별로 구간만 받은 뒤 합침"""
+        ydl, calls = self._fake_ydl()
+        run_ffmpeg = MagicMock()
+        self.downloader.attach(ydl, run_ffmpeg=run_ffmpeg)
+
+        name = os.path.join(self.temp_dir, 'merged.mp4')
+        info = {
+            'section_start': 25, 'section_end': 35, 'protocol': 'http_dash_segments+https',
+            'requested_formats': [
+                {'format_id': '137', 'ext': 'mp4', 'protocol': 'http_dash_segments', 'fragments': make_fragments(10)},
+                {'format_id': '140', 'ext': 'm4a', 'protocol': 'https', 'url': 'https://example.com/a.m4a'},
+            ],
+        }
+        self.assertEqual(ydl.dl(name, info), (True, True))
+
+        video_info, audio_info = calls[0][1], calls[1][1]
+        self.assertEqual(len(video_info['fragments']), 3)
+        # 단일 파일 오디오는 구간 정보를 유지하여 FFmpeg가 필요한 부분만 읽음
+        self.assertEqual(audio_info['section_start'], 25)
+        self.assertNotIn('requested_formats', audio_info)
+
+        merge_args = run_ffmpeg.call_args_list[-1][0][0]
+        self.assertEqual(merge_args[-1], name)
+        self.assertEqual(run_ffmpeg.call_args_list[-1][1]['step'], 'ffmpeg_merge')
+        # 포맷별 임시 파일은 정리
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+if __name__ == '__main__':
+    unittest.main()
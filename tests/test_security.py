@@ -45,6 +45,35 @@ class TestSecurityValidator(unittest.TestCase):
                 self.assertFalse(is_valid, f"URL should be invalid: {url}")
                 self.assertIsNotNone(error_msg)
     
+    def test_collection_urls(self):
+        """재생목록/채널 URL 테스트"""
+        collection_urls = [
+            "https://www.youtube.com/playlist?list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf",
+            "https://www.youtube.com/channel/UCtest",
+            "https://www.youtube.com/@handle",
+            "https://www.youtube.com/c/SomeChannel",
+        ]
+
+        for url in collection_urls:
+            with self.subTest(url=url):
+                self.assertTrue(self.validator.is_collection_url(url))
+                self.assertFalse(self.validator.validate_youtube_url(url)[0])
+                is_valid, error_msg = self.validator.validate_youtube_url(url, allow_collections=True)
+                self.assertTrue(is_valid, f"URL should be valid: {url}, Error: {error_msg}")
+
+        # 비디오 ID가 있는 재생목록 링크는 단일 비디오
+        self.assertFalse(self.validator.is_collection_url(
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLtest"
+        ))
+
+    def test_extract_playlist_id(self):
+        """재생목록 ID 추출 테스트"""
+        self.assertEqual(
+            self.validator.extract_playlist_id("https://www.youtube.com/playlist?list=PLtest123"),
+            "PLtest123"
+        )
+        self.assertIsNone(self.validator.extract_playlist_id("https://youtu.be/dQw4w9WgXcQ"))
+
     def test_extract_video_id(self):
         """비디오 ID 추출 테스트"""
         test_cases = [
@@ -0,0 +1,200 @@
+import unittest
+import os
+import re
+import json
+import tempfile
+import shutil
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from unittest.mock import MagicMock
+from segmented_downloader import SegmentedDownloader, SegmentedDownloadError
+
+CONTENT = bytes(range(256)) * 4096  # 1MB
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Range 요청을 지원하는 테스트용 HTTP 핸들러"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get('Range')))
+            server.cookies.append(self.headers.get('Cookie'))
+
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/file')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        match = re.match(r'bytes=(\d+)-(\d+)', self.headers.get('Range') or '')
+        if match and server.supports_range:
+            start, end = int(match.group(1)), min(int(match.group(2)), len(CONTENT) - 1)
+            body = CONTENT[start:end + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(CONTENT)}')
+        else:
+            body = CONTENT
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestSegmentedDownloader(unittest.TestCase):
+    """SegmentedDownloader 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'video.mp4')
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.cookies = []
+        self.server.supports_range = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+        self.downloader = SegmentedDownloader(connections=4, segment_size=100 * 1024, min_size=0,
+                                              chunk_size=16 * 1024)
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        self.downloader.close()
+        self.server.shutdown()
+        self.server.server_close()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _ranges(self):
+        return [r for _, r in self.server.requests if r and r != 'bytes=0-0']
+
+    def test_parallel_ranges_produce_exact_content(self):
+        """구간을 나누어 받아도 원본과 같은 파일 생성 (리다이렉트 포함)"""
+        events = []
+        size = self.downloader.download(self.base_url + '/redirect', self.path, progress_hook=events.append)
+
+        self.assertEqual(size, len(CONTENT))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+        self.assertEqual(len(self._ranges()), 11)  # 1MB / 100KB
+        self.assertEqual(events[-1]['status'], 'finished')
+        self.assertEqual(events[-1]['downloaded_bytes'], len(CONTENT))
+        self.assertFalse(os.path.exists(self.path + '.segmented.part'))
+        self.assertFalse(os.path.exists(self.path + '.segmented.json'))
+
+    def test_falls_back_to_single_stream_without_range(self):
+        """Range를 지원하지 않는 서버는 단일 연결로 받음"""
+        self.server.supports_range = False
+
+        self.downloader.download(self.base_url + '/file', self.path)
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_resumes_only_missing_segments(self):
+        """상태 파일이 있으면 끝나지 않은 구간만 다시 받음"""
+        part_path = self.path + '.segmented.part'
+        with open(part_path, 'wb') as f:
+            f.write(CONTENT[:500 * 1024] + b'\0' * (len(CONTENT) - 500 * 1024))
+        with open(self.path + '.segmented.json', 'w', encoding='utf-8') as f:
+            json.dump({'total': len(CONTENT), 'segment_size': 100 * 1024, 'done': [0, 1, 2, 3, 4]}, f)
+
+        self.downloader.download(self.base_url + '/file', self.path)
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+        starts = sorted(int(re.match(r'bytes=(\d+)', r).group(1)) for r in self._ranges())
+        self.assertEqual(starts[0], 500 * 1024)
+        self.assertEqual(len(starts), 6)
+
+    def test_resume_after_cancel_mid_segment(self):
+        """구간 중간에 취소한 뒤 이어받아도 원본과 같은 파일 생성"""
+        cancel_event = threading.Event()
+        received = [0]
+
+        def throttle(size):
+            received[0] += size
+            if received[0] >= 150 * 1024:
+                cancel_event.set()
+            if cancel_event.is_set():
+                threading.Event().wait(0.1)  # 취소가 감지될 때까지 구간을 끝내지 못하게 늦춤
+
+        with self.assertRaises(SegmentedDownloadError):
+            self.downloader.download(self.base_url + '/file', self.path, cancel_event=cancel_event,
+                                     throttle=throttle)
+        self.assertTrue(os.path.exists(self.path + '.segmented.part'))
+
+        self.downloader.download(self.base_url + '/file', self.path)
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_cancel_stops_download(self):
+        """취소하면 예외가 발생하고 완료 파일은 만들지 않음"""
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with self.assertRaises(SegmentedDownloadError):
+            self.downloader.download(self.base_url + '/file', self.path, cancel_event=cancel_event)
+
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_attach_uses_segments_for_large_http_formats(self):
+        """attach 후 HTTP 단일 파일 포맷은 구간 다운로드, 조각 포맷은 기본 다운로더"""
+        ydl = MagicMock()
+        ydl.params = {'segmented_connections': 4}
+        ydl.cookiejar.get_cookie_header.return_value = 'SID=abc'
+        original_dl = ydl.dl
+        hook = MagicMock()
+        ydl._progress_hooks = [hook]
+        self.downloader.attach(ydl)
+
+        info = {'url': self.base_url + '/file', 'protocol': 'http', 'filesize': len(CONTENT),
+                'http_headers': {'User-Agent': 'test'}}
+        self.assertEqual(ydl.dl(self.path, info), (True, True))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+        self.assertIs(hook.call_args[0][0]['info_dict'], info)
+        original_dl.assert_not_called()
+        # 모든 구간 요청에 yt-dlp 쿠키 저장소의 쿠키를 붙임
+        self.assertEqual(set(self.server.cookies), {'SID=abc'})
+        ydl.cookiejar.get_cookie_header.assert_called_with(self.base_url + '/file')
+
+        fragmented = dict(info, fragments=[{'url': 'x'}], protocol='http_dash_segments')
+        ydl.dl(self.path + '.2', fragmented)
+        original_dl.assert_called_once()
+
+        # 구간 다운로드는 FFmpeg가 필요한 부분만 읽도록 기본 다운로더에 맡김
+        ydl.dl(self.path + '.3', dict(info, section_start=10, section_end=20))
+        self.assertEqual(original_dl.call_count, 2)
+
+    def test_attach_cancel_does_not_fall_back(self):
+        """작업이 취소되면 기본 다운로더로 다시 받지 않고 중단"""
+        ydl = MagicMock()
+        ydl.params = {'segmented_connections': 4}
+        ydl.cookiejar.get_cookie_header.return_value = None
+        ydl._progress_hooks = []
+        original_dl = ydl.dl
+        cancel_event = threading.Event()
+        cancel_event.set()
+        self.downloader.attach(ydl, cancel_event_getter=lambda: cancel_event)
+
+        info = {'url': self.base_url + '/file', 'protocol': 'http', 'filesize': len(CONTENT), 'http_headers': {}}
+        with self.assertRaises(SegmentedDownloadError):
+            ydl.dl(self.path, info)
+
+        original_dl.assert_not_called()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.server.requests, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import gc
+import weakref
+from unittest.mock import MagicMock
+from session_pool import YoutubeDLPool
+
+class TestYoutubeDLPool(unittest.TestCase):
+    """YoutubeDLPool 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.created = []
+
+        def factory(opts):
+            ydl = MagicMock()
+            ydl.opts = opts
+            self.created.append(ydl)
+            return ydl
+
+        self.pool = YoutubeDLPool(max_idle_per_key=2, max_idle_total=3, factory=factory)
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        self.pool.close()
+
+    def test_reuses_instance_for_same_options(self):
+        """같은 옵션이면 같은 인스턴스 재사용"""
+        with self.pool.session({'format': 'best'}) as first:
+            pass
+        with self.pool.session({'format': 'best'}) as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.created), 1)
+
+    def test_separates_different_options(self):
+        """옵션이 다르면 별도 인스턴스 사용"""
+        with self.pool.session({'format': 'best'}) as first:
+            pass
+        with self.pool.session({'format': 'worst'}) as second:
+            pass
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.opts, {'format': 'worst'})
+
+    def test_concurrent_borrow_gets_separate_instances(self):
+        """동시에 빌리면 서로 다른 인스턴스 사용"""
+        with self.pool.session({'format': 'best'}) as first:
+            with self.pool.session({'format': 'best'}) as second:
+                self.assertIsNot(first, second)
+
+        self.assertEqual(self.pool.idle_count(), 2)
+
+    def test_discards_instance_on_error(self):
+        """예외가 발생한 인스턴스는 폐기"""
+        with self.assertRaises(RuntimeError):
+            with self.pool.session({'format': 'best'}) as ydl:
+                raise RuntimeError("실패")
+
+        ydl.__exit__.assert_called_once()
+        self.assertEqual(self.pool.idle_count(), 0)
+
+    def test_idle_limits(self):
+        """대기 인스턴스 수 제한"""
+        for fmt in ('a', 'b'):
+            with self.pool.session({'format': fmt}):
+                with self.pool.session({'format': fmt}):
+                    with self.pool.session({'format': fmt}):
+                        pass
+
+        self.assertEqual(self.pool.idle_count(), 3)
+        disposed = [ydl for ydl in self.created if ydl.__exit__.called]
+        self.assertEqual(len(disposed), len(self.created) - 3)
+
+    def test_close_disposes_idle_instances(self):
+        """풀 종료 시 대기 인스턴스 정리"""
+        with self.pool.session({'format': 'best'}) as ydl:
+            pass
+
+        self.pool.close()
+        ydl.__exit__.assert_called_once()
+        self.assertEqual(self.pool.idle_count(), 0)
+
+    def test_closed_pool_is_released(self):
+        """닫은 풀은 종료 시 정리 목록에서 빠져 메모리에서 해제됨"""
+        pool = YoutubeDLPool(factory=lambda opts: MagicMock())
+        with pool.session({'format': 'best'}):
+            pass
+        ref = weakref.ref(pool)
+
+        pool.close()
+        del pool
+        gc.collect()
+        self.assertIsNone(ref())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import unittest
+import io
+import os
+import json
+import tempfile
+import shutil
+import tracemalloc
+from subtitle_converter import SubtitleConverter
+
+class TestSubtitleConverter(unittest.TestCase):
+    """SubtitleConverter 클래스 테스트"""
+
+    def setUp(self):
+        """각 테스트 전에 실행"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.converter = SubtitleConverter(chunk_size=16)
+
+    def tearDown(self):
+        """각 테스트 후에 실행"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _convert_text(self, text, fmt, rolling=False):
+        output = io.StringIO()
+        self.converter.write_srt(self.converter.iter_cues(io.StringIO(text), fmt, rolling), output)
+        return output.getvalue()
+
+    def test_vtt_with_metadata_and_tags(self):
+        """VTT 헤더, NOTE/STYLE 블록, 태그 제거 (b/i/u 유지)"""
+        vtt = (
+            "WEBVTT\nKind: captions\nLanguage: ko\n\n"
+            "NOTE 이 블록은 무시\n\n"
+            "STYLE\n::cue { color: red }\n\n"
+            "intro\n00:01.000 --> 00:03.500 align:start\n<c.colorE5E5E5>안녕</c> <i>세상</i> &amp; 친구\n\n"
+            "01:02:03.004 --> 01:02:05.000\n둘째 줄\n"
+        )
+
+        self.assertEqual(self._convert_text(vtt, 'vtt'), (
+            "1\n00:00:01,000 --> 00:00:03,500\n안녕 <i>세상</i> & 친구\n\n"
+            "2\n01:02:03,004 --> 01:02:05,000\n둘째 줄\n\n"
+        ))
+
+    def test_vtt_auto_caption_rollup_is_deduplicated(self):
+        """자동 생성 자막의 롤업 반복 줄 제거"""
+        vtt = (
+            "WEBVTT\n\n"
+            "00:00:00.000 --> 00:00:02.500 align:start position:0%\n \n"
+            "hello<00:00:00.480><c> world</c>\n\n"
+            "00:00:02.500 --> 00:00:02.510 align:start position:0%\nhello world\n \n\n"
+            "00:00:02.510 --> 00:00:05.000 align:start position:0%\nhello world\n"
+            "this<00:00:02.800><c> is</c>\n"
+        )
+
+        self.assertEqual(self._convert_text(vtt, 'vtt', rolling=True), (
+            "1\n00:00:00,000 --> 00:00:02,500\nhello world\n\n"
+            "2\n00:00:02,510 --> 00:00:05,000\nthis is\n\n"
+        ))
+
+    def test_manual_vtt_keeps_repeated_lines(self):
+        """수동 자막은 반복되는 대사와 길이 0인 자막을 지우지 않음"""
+        vtt = (
+            "WEBVTT\n\n"
+            "00:00:01.000 --> 00:00:02.000\n안녕!\n\n"
+            "00:00:02.000 --> 00:00:03.000\n안녕!\n\n"
+            "00:00:04.000 --> 00:00:04.000\n짧은 자막\n"
+        )
+
+        self.assertEqual(self._convert_text(vtt, 'vtt'), (
+            "1\n00:00:01,000 --> 00:00:02,000\n안녕!\n\n"
+            "2\n00:00:02,000 --> 00:00:03,000\n안녕!\n\n"
+            "3\n00:00:04,000 --> 00:00:05,000\n짧은 자막\n\n"
+        ))
+
+    def test_json3_streamed_across_chunk_boundaries(self):
+        """작은 청크로 읽어도 JSON3 이벤트를 정확히 변환"""
+        data = json.dumps({
+            'wireMagic': 'pb3',
+            'events': [
+                {'tStartMs': 0, 'dDurationMs': 1000, 'id': 1},
+                {'tStartMs': 1000, 'dDurationMs': 2000, 'segs': [{'utf8': '첫 '}, {'utf8': '문장 "인용"'}]},
+                {'tStartMs': 2900, 'dDurationMs': 100, 'aAppend': 1, 'segs': [{'utf8': '\n'}]},
+                {'tStartMs': 3000, 'dDurationMs': 1500, 'segs': [{'utf8': '[음악]'}]},
+            ],
+        }, ensure_ascii=False)
+
+        self.assertEqual(self._convert_text(data, 'json3'), (
+            "1\n00:00:01,000 --> 00:00:03,000\n첫 문장 \"인용\"\n\n"
+            "2\n00:00:03,000 --> 00:00:04,500\n[음악]\n\n"
+        ))
+
+    def test_json3_null_event_does_not_stop_parsing(self):
+        """events 배열의 null 항목 뒤의 자막도 모두 변환"""
+        data = ('{"events": [{"tStartMs": 0, "dDurationMs": 1000, "segs": [{"utf8": "앞"}]}, null, '
+                '{"tStartMs": 1000, "dDurationMs": 1000, "segs": [{"utf8": "뒤"}]}]}')
+
+        self.assertEqual(self._convert_text(data, 'json3'), (
+            "1\n00:00:00,000 --> 00:00:01,000\n앞\n\n"
+            "2\n00:00:01,000 --> 00:00:02,000\n뒤\n\n"
+        ))
+
+    def test_srv_formats(self):
+        """SRV1(초 단위), SRV2/SRV3(밀리초 단위) 변환"""
+        srv1 = ('<?xml version="1.0" encoding="utf-8" ?><transcript>'
+                '<text start="1.5" dur="2">It&amp;#39;s</text><text start="4" dur="1">끝</text></transcript>')
+        srv2 = '<timedtext><text t="1500" d="2000">둘째</text></timedtext>'
+        srv3 = ('<timedtext format="3"><body><p t="1500" d="2000"><s>셋</s><s t="300"> 째</s></p>'
+                '<p t="4000" d="10"></p></body></timedtext>')
+
+        self.assertEqual(self._convert_text(srv1, 'srv1'), (
+            "1\n00:00:01,500 --> 00:00:03,500\nIt's\n\n"
+            "2\n00:00:04,000 --> 00:00:05,000\n끝\n\n"
+        ))
+        self.assertEqual(self._convert_text(srv2, 'srv2'), "1\n00:00:01,500 --> 00:00:03,500\n둘째\n\n")
+        self.assertEqual(self._convert_text(srv3, 'srv3'), "1\n00:00:01,500 --> 00:00:03,500\n셋 째\n\n")
+
+    def test_convert_file_replaces_source(self):
+        """파일 변환 후 .srt만 남김"""
+        source = os.path.join(self.temp_dir, 'video.ko.vtt')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write("WEBVTT\n\n00:00:01.000 --> 00:00:02.000\n안녕\n")
+
+        target = self.converter.convert(source)
+
+        self.assertEqual(target, os.path.join(self.temp_dir, 'video.ko.srt'))
+        self.assertFalse(os.path.exists(source))
+        with open(target, encoding='utf-8') as f:
+            self.assertIn('안녕', f.read())
+
+        with self.assertRaises(ValueError):
+            self.converter.convert(target, fmt='ttml')
+
+    def test_large_json3_uses_constant_memory(self):
+        """큰 자막 파일도 전체를 메모리에 올리지 않음"""
+        source = os.path.join(self.temp_dir, 'large.json3')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('{"events": [')
+            for i in range(20000):
+                if i:
+                    f.write(',')
+                f.write(json.dumps({'tStartMs': i * 1000, 'dDurationMs': 900, 'segs': [{'utf8': f'자막 {i} ' * 5}]}))
+            f.write(']}')
+        source_size = os.path.getsize(source)
+
+        converter = SubtitleConverter()
+        tracemalloc.start()
+        try:
+            target = converter.convert(source)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # 원본(약 3MB)과 관계없이 읽기 버퍼 정도만 사용
+        self.assertGreater(source_size, 3 * 1024 * 1024)
+        self.assertLess(peak, 1024 * 1024)
+        with open(target, encoding='utf-8') as f:
+            self.assertEqual(sum(1 for line in f if '-->' in line), 20000)
+
+if __name__ == '__main__':
+    unittest.main()